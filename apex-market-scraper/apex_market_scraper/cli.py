@@ -62,6 +62,11 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Export a small sample dataset (no scraping)",
     )
+    export_p.add_argument(
+        "--delta",
+        action="store_true",
+        help="Export only new, changed or delisted listings (overrides export.mode)",
+    )
 
     schedule_p = subparsers.add_parser("schedule", help="Run scrape+export on a cadence")
     schedule_p.add_argument(
@@ -138,6 +143,9 @@ def main(argv: list[str] | None = None) -> None:
         else:
             records = scrape_all_sites(cfg, settings)
 
+        if args.delta:
+            cfg.export.mode = "delta"
+
         written = export_records(records, cfg.export)
         for p in written:
             logger.info("Wrote export: %s", p)
@@ -22,6 +22,10 @@ class RuntimeSettings(BaseSettings):
     proxies: str | None = None
     proxies_file: Path | None = None
 
+    http_cache: bool = True
+    http_cache_path: Path | None = None
+    robots_ttl_seconds: float = 24 * 60 * 60
+
     def resolved_proxies(self) -> list[str]:
         if self.proxies:
             return [p.strip() for p in self.proxies.split(",") if p.strip()]
@@ -5,7 +5,12 @@ from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-ExportFormat = Literal["csv", "xlsx"]
+ExportFormat = Literal["csv", "xlsx", "parquet", "arrow"]
+ExportMode = Literal["full", "delta"]
+
+
+def _default_formats() -> list[ExportFormat]:
+    return ["csv"]
 
 
 class SchedulerConfig(BaseModel):
@@ -15,6 +20,27 @@ class SchedulerConfig(BaseModel):
         ..., description="How often to run a scrape+export cycle (12–24 hours inclusive)."
     )
 
+    align_to_wall_clock: bool = Field(
+        True,
+        description=(
+            "Run on UTC wall-clock boundaries of the cadence (e.g. 00:00 and 12:00 for 12h) "
+            "instead of sleeping a fixed interval after each cycle."
+        ),
+    )
+    jitter_seconds: int = Field(
+        300, ge=0, description="Random delay (0..jitter_seconds) added to every scheduled run."
+    )
+    lock_path: Path | None = Field(
+        default=None,
+        description=(
+            "Lock file that prevents overlapping cycles (default: <output_dir>/.scheduler.lock)."
+        ),
+    )
+    metrics_path: Path | None = Field(
+        default=None,
+        description="JSON-lines run history (default: <output_dir>/run_metrics.jsonl).",
+    )
+
     @field_validator("cadence_hours")
     @classmethod
     def _validate_cadence(cls, v: int) -> int:
@@ -27,7 +53,7 @@ class ExportConfig(BaseModel):
     model_config = ConfigDict(validate_assignment=True)
 
     output_dir: Path = Field(Path("out"), description="Local output directory.")
-    formats: list[ExportFormat] = Field(default_factory=lambda: ["csv"])
+    formats: list[ExportFormat] = Field(default_factory=_default_formats)
     apex_bot_drop_dir: Path | None = Field(
         default=None,
         description=(
@@ -36,6 +62,23 @@ class ExportConfig(BaseModel):
         ),
     )
     dataset_name: str = Field("market_listings", description="Base filename for exports.")
+    mode: ExportMode = Field(
+        "full",
+        description=(
+            "'full' exports every scraped listing. 'delta' exports only listings that are new, "
+            "changed price/stock, or were delisted since the previous run."
+        ),
+    )
+    history_path: Path | None = Field(
+        default=None,
+        description=(
+            "Price-history database updated on every export "
+            "(default: <output_dir>/price_history.sqlite3)."
+        ),
+    )
+
+    def resolved_history_path(self) -> Path:
+        return self.history_path or self.output_dir / "price_history.sqlite3"
 
 
 class SiteConfig(BaseModel):
@@ -45,6 +88,11 @@ class SiteConfig(BaseModel):
     kind: str
     enabled: bool = True
     api_key_env: str | None = None
+    cadence_hours: float | None = Field(
+        default=None,
+        gt=0,
+        description="Per-site schedule for fast-moving sites (default: scheduler.cadence_hours).",
+    )
     params: dict[str, Any] = Field(default_factory=dict)
 
 
@@ -54,3 +102,9 @@ class AppConfig(BaseModel):
     scheduler: SchedulerConfig
     export: ExportConfig
     sites: list[SiteConfig] = Field(default_factory=list)
+
+    def resolved_lock_path(self) -> Path:
+        return self.scheduler.lock_path or self.export.output_dir / ".scheduler.lock"
+
+    def resolved_metrics_path(self) -> Path:
+        return self.scheduler.metrics_path or self.export.output_dir / "run_metrics.jsonl"
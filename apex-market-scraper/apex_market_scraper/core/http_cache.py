@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+from apex_market_scraper.core.models import RequestSpec
+
+DEFAULT_ROBOTS_TTL_SECONDS = 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    cache_key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_sha256 TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    raw_items TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS robots (
+    origin TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class CachedPage:
+    etag: str | None
+    last_modified: str | None
+    body_sha256: str
+    size_bytes: int
+    raw_items: list[Mapping[str, Any]]
+    fetched_at: float
+
+
+def cache_key(spec: RequestSpec) -> str:
+    if not spec.params:
+        return spec.url
+    return f"{spec.url}|{urlencode(sorted((str(k), str(v)) for k, v in spec.params.items()))}"
+
+
+def body_digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class HttpCache:
+    """On-disk validator cache for conditional GETs.
+
+    Stores the ETag/Last-Modified validators, a hash of the body and the raw
+    items parsed from it per request, so unchanged pages (a 304, or a 200 with
+    an identical body) can skip parsing entirely. Also caches robots.txt bodies
+    for ``robots_ttl_seconds``.
+    """
+
+    def __init__(
+        self, path: Path, *, robots_ttl_seconds: float = DEFAULT_ROBOTS_TTL_SECONDS
+    ) -> None:
+        self.path = path
+        self.robots_ttl_seconds = robots_ttl_seconds
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get_page(self, spec: RequestSpec) -> CachedPage | None:
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT etag, last_modified, body_sha256, size_bytes, raw_items, fetched_at
+                FROM pages WHERE cache_key = ?
+                """,
+                (cache_key(spec),),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedPage(
+            etag=row[0],
+            last_modified=row[1],
+            body_sha256=row[2],
+            size_bytes=int(row[3]),
+            raw_items=json.loads(row[4]),
+            fetched_at=float(row[5]),
+        )
+
+    def put_page(
+        self,
+        spec: RequestSpec,
+        *,
+        etag: str | None,
+        last_modified: str | None,
+        body_sha256: str,
+        size_bytes: int,
+        raw_items: list[Mapping[str, Any]],
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO pages (
+                    cache_key, etag, last_modified, body_sha256, size_bytes, raw_items, fetched_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    cache_key(spec),
+                    etag,
+                    last_modified,
+                    body_sha256,
+                    size_bytes,
+                    json.dumps([dict(item) for item in raw_items], default=str),
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+
+    def get_robots(self, origin: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, fetched_at FROM robots WHERE origin = ?",
+                (origin,),
+            ).fetchone()
+        if row is None or time.time() - float(row[1]) > self.robots_ttl_seconds:
+            return None
+        return str(row[0])
+
+    def put_robots(self, origin: str, body: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO robots (origin, body, fetched_at) VALUES (?, ?, ?)",
+                (origin, body, time.time()),
+            )
+            self._conn.commit()
@@ -11,6 +11,7 @@ from urllib.robotparser import RobotFileParser
 
 import requests
 
+from apex_market_scraper.core.http_cache import DEFAULT_ROBOTS_TTL_SECONDS, CachedPage, HttpCache
 from apex_market_scraper.core.models import HttpResponse, RequestSpec
 
 logger = logging.getLogger(__name__)
@@ -57,12 +58,15 @@ class ResilientHttpClient:
         session: requests.Session | None = None,
         user_agents: list[str] | None = None,
         proxies: list[str] | None = None,
+        cache: HttpCache | None = None,
     ) -> None:
         self._session = session or requests.Session()
         self._user_agents = user_agents or list(_DEFAULT_USER_AGENTS)
         self._proxies = proxies or []
+        self.cache = cache
+        self._robots_ttl_seconds = cache.robots_ttl_seconds if cache else DEFAULT_ROBOTS_TTL_SECONDS
 
-        self._robots_by_origin: dict[str, RobotFileParser] = {}
+        self._robots_by_origin: dict[str, tuple[RobotFileParser, float]] = {}
         self._last_request_at: dict[str, float] = {}
 
     def close(self) -> None:
@@ -109,11 +113,16 @@ class ResilientHttpClient:
         parsed = urlparse(url)
         origin = f"{parsed.scheme}://{parsed.netloc}"
 
-        rp = self._robots_by_origin.get(origin)
-        if rp is None:
-            robots_url = f"{origin}/robots.txt"
-            rp = RobotFileParser()
-            rp.set_url(robots_url)
+        cached = self._robots_by_origin.get(origin)
+        if cached is not None and time.monotonic() - cached[1] <= self._robots_ttl_seconds:
+            return cached[0].can_fetch(user_agent, url)
+
+        robots_url = f"{origin}/robots.txt"
+        rp = RobotFileParser()
+        rp.set_url(robots_url)
+
+        body = self.cache.get_robots(origin) if self.cache else None
+        if body is None:
             try:
                 resp = self._session.get(
                     robots_url,
@@ -121,15 +130,14 @@ class ResilientHttpClient:
                     timeout=10,
                     allow_redirects=True,
                 )
-                if resp.ok:
-                    rp.parse(resp.text.splitlines())
-                else:
-                    rp.parse([])
+                body = resp.text if resp.ok else ""
+                if self.cache:
+                    self.cache.put_robots(origin, body)
             except requests.RequestException:
-                rp.parse([])
-
-            self._robots_by_origin[origin] = rp
+                body = ""
+        rp.parse(body.splitlines())
 
+        self._robots_by_origin[origin] = (rp, time.monotonic())
         return rp.can_fetch(user_agent, url)
 
     def request(
@@ -141,7 +149,14 @@ class ResilientHttpClient:
         respect_robots: bool = True,
         throttle_seconds: float = 0.0,
         retry: RetryConfig | None = None,
+        validators: CachedPage | None = None,
     ) -> HttpResponse:
+        """Perform ``spec`` with retries, throttling and robots.txt checks.
+
+        When ``validators`` from a previous fetch are given, the request is
+        made conditional (If-None-Match / If-Modified-Since) and a 304 is
+        returned as-is with an empty body.
+        """
         if dry_run:
             return HttpResponse(
                 url=spec.url,
@@ -158,6 +173,11 @@ class ResilientHttpClient:
 
         user_agent = self._pick_user_agent()
         headers = {"User-Agent": user_agent, **spec.headers}
+        if validators is not None:
+            if validators.etag:
+                headers.setdefault("If-None-Match", validators.etag)
+            if validators.last_modified:
+                headers.setdefault("If-Modified-Since", validators.last_modified)
 
         if respect_robots and not self._robots_allowed(url=spec.url, user_agent=user_agent):
             raise RobotsTxtDisallowed(f"Blocked by robots.txt: {spec.url}")
@@ -185,12 +205,22 @@ class ResilientHttpClient:
                 if resp.status_code == 429 or 500 <= resp.status_code <= 599:
                     raise RetryableStatusError(resp.status_code)
 
+                # Decode once, the same way requests does, and keep the codec so a
+                # parse worker can rebuild the text from the raw bytes.
+                encoding = resp.encoding or resp.apparent_encoding or "utf-8"
+                content = bytes(resp.content)
+                try:
+                    text = content.decode(encoding, errors="replace")
+                except LookupError:
+                    encoding = "utf-8"
+                    text = content.decode(encoding, errors="replace")
                 return HttpResponse(
                     url=str(resp.url),
                     status_code=int(resp.status_code),
                     headers={str(k): str(v) for k, v in resp.headers.items()},
-                    text=str(resp.text),
-                    content=bytes(resp.content),
+                    text=text,
+                    content=content,
+                    encoding=encoding,
                 )
             except (requests.Timeout, requests.ConnectionError, RetryableStatusError) as exc:
                 last_exc = exc
@@ -77,6 +77,11 @@ class SiteMetadata:
     raw_records_parsed: int = 0
     records_normalized: int = 0
 
+    bytes_fetched: int = 0
+    pages_not_modified: int = 0
+    pages_skipped: int = 0
+    bytes_saved: int = 0
+
     errors: list[str] = field(default_factory=list)
 
 
@@ -100,6 +105,11 @@ class HttpResponse:
     text: str
     content: bytes
     is_dry_run: bool = False
+    encoding: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
 
 
 @dataclass(slots=True, frozen=True)
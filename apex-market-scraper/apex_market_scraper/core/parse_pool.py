@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from typing import Any
+
+from apex_market_scraper.config.models import SiteConfig
+from apex_market_scraper.core.models import HttpResponse, ProductRecord, RequestSpec
+
+
+@dataclass(slots=True)
+class PageJob:
+    """One fetched page waiting to be parsed and normalized.
+
+    ``response`` is None when the page was unchanged and ``raw_items`` came
+    from the HTTP cache. ``cache_digest`` is set when the parsed items should
+    be written back to the cache.
+    """
+
+    request: RequestSpec
+    response: HttpResponse | None
+    raw_items: list[Mapping[str, Any]] | None = None
+    cache_digest: str | None = None
+
+
+@dataclass(slots=True)
+class PageResult:
+    records: list[ProductRecord]
+    raw_count: int
+    # Only returned when the parent needs them for the HTTP cache
+    raw_items: list[Mapping[str, Any]] | None = None
+
+
+def to_wire(job: PageJob) -> PageJob:
+    """Strip the decoded text so only the raw body bytes cross the process boundary."""
+    if job.response is None:
+        return job
+    return replace(job, response=replace(job.response, text=""))
+
+
+def from_wire(response: HttpResponse) -> HttpResponse:
+    if response.text or not response.content:
+        return response
+    text = response.content.decode(response.encoding or "utf-8", errors="replace")
+    return replace(response, text=text)
+
+
+# Scrapers rebuilt inside each worker process, keyed by class and site config
+_WORKER_SCRAPERS: dict[tuple[type[Any], str, str | None, str], Any] = {}
+
+
+def _worker_scraper(
+    scraper_cls: type[Any], site_json: str, api_key: str | None, task_id: str
+) -> Any:
+    key = (scraper_cls, site_json, api_key, task_id)
+    scraper = _WORKER_SCRAPERS.get(key)
+    if scraper is None:
+        scraper = scraper_cls(
+            site=SiteConfig.model_validate_json(site_json),
+            api_key=api_key,
+            task_id=task_id,
+        )
+        _WORKER_SCRAPERS[key] = scraper
+    return scraper
+
+
+def parse_pages(
+    scraper_cls: type[Any],
+    site_json: str,
+    api_key: str | None,
+    task_id: str,
+    jobs: list[PageJob],
+) -> list[PageResult]:
+    """Worker entry point: parse and normalize a batch of pages."""
+    scraper = _worker_scraper(scraper_cls, site_json, api_key, task_id)
+    results: list[PageResult] = []
+    for job in jobs:
+        if job.raw_items is not None:
+            raw_items = job.raw_items
+        else:
+            if job.response is None:
+                raise RuntimeError(f"Page job for {job.request.url} has no response to parse")
+            raw_items = scraper.parse_listing(from_wire(job.response), job.request)
+        results.append(
+            PageResult(
+                records=scraper.normalize_items(raw_items),
+                raw_count=len(raw_items),
+                raw_items=raw_items if job.cache_digest is not None else None,
+            )
+        )
+    return results
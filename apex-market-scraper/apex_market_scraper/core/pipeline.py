@@ -6,6 +6,8 @@ from uuid import uuid4
 
 from apex_market_scraper.config.loader import RuntimeSettings, get_site_api_key
 from apex_market_scraper.config.models import AppConfig, SiteConfig
+from apex_market_scraper.core.http_cache import HttpCache
+from apex_market_scraper.core.http_client import ResilientHttpClient
 from apex_market_scraper.core.logging import get_logger
 from apex_market_scraper.core.models import (
     ProductRecord,
@@ -28,6 +30,17 @@ def _select_sites(enabled_sites: list[SiteConfig], sites: str | Iterable[str]) -
     return [s for s in enabled_sites if s.name in wanted]
 
 
+def _open_http_client(
+    cfg: AppConfig, settings: RuntimeSettings, *, dry_run: bool
+) -> ResilientHttpClient | None:
+    """Shared client backed by the on-disk conditional-request cache, if enabled."""
+    if dry_run or not settings.http_cache:
+        return None
+    path = settings.http_cache_path or cfg.export.output_dir / ".http_cache.sqlite3"
+    cache = HttpCache(path, robots_ttl_seconds=settings.robots_ttl_seconds)
+    return ResilientHttpClient(proxies=settings.resolved_proxies(), cache=cache)
+
+
 def run_scrape(
     cfg: AppConfig,
     settings: RuntimeSettings,
@@ -83,6 +96,8 @@ def run_scrape(
     sites_attempted = 0
     sites_succeeded = 0
 
+    http_client = _open_http_client(cfg, settings, dry_run=dry_run)
+
     for site in selected_sites:
         sites_attempted += 1
         site_task_id = f"{pipeline_task_id}:{site.name}"
@@ -97,6 +112,7 @@ def run_scrape(
                 api_key=api_key,
                 task_id=site_task_id,
                 proxies=settings.resolved_proxies(),
+                http_client=http_client,
             )
             records, meta = scraper.scrape_with_metadata(dry_run=dry_run)
         except Exception as e:
@@ -128,7 +144,18 @@ def run_scrape(
 
         if not meta.errors:
             sites_succeeded += 1
-        slog.info("site.complete records=%s errors=%s", len(records), len(meta.errors))
+        slog.info(
+            "site.complete records=%s errors=%s pages_skipped=%s bytes_saved=%s",
+            len(records),
+            len(meta.errors),
+            meta.pages_skipped,
+            meta.bytes_saved,
+        )
+
+    if http_client is not None:
+        http_client.close()
+        if http_client.cache is not None:
+            http_client.cache.close()
 
     deduped_by_url: dict[str, ProductRecord] = {}
     for rec in all_records:
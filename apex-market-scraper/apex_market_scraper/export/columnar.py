@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pyarrow as pa
+
+# Arrow types of the Apex template columns, the hidden metadata columns and
+# the delta-export columns. Everything the bot stores as text stays a string.
+COLUMN_TYPES: Final[dict[str, str]] = {
+    "Main_Category": "string",
+    "Sub_Category": "string",
+    "Service_Name": "string",
+    "Variant_Name": "string",
+    "Price_USD": "float64",
+    "Start_Time": "string",
+    "Duration": "string",
+    "Refill_Period": "string",
+    "Additional_Info": "string",
+    "product_url": "string",
+    "source_site": "string",
+    "change_type": "string",
+    "previous_price": "float64",
+    "previous_stock": "int64",
+}
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ModuleNotFoundError as e:  # pragma: no cover
+        raise RuntimeError(
+            "pyarrow is required for parquet/arrow exports "
+            "(pip install 'apex-market-scraper[columnar]')"
+        ) from e
+    return pyarrow
+
+
+def _text(value: Any) -> str | None:
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def _number(value: Any) -> float | None:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _integer(value: Any) -> int | None:
+    if value is None or value == "":
+        return None
+    return int(value)
+
+
+_CONVERTERS: Final = {"string": _text, "float64": _number, "int64": _integer}
+
+
+def build_table(rows: list[dict[str, Any]], fieldnames: list[str]) -> pa.Table:
+    """Typed Arrow table of already-mapped template rows, built column by column."""
+    pa = _require_pyarrow()
+    arrays = []
+    fields = []
+    for name in fieldnames:
+        type_name = COLUMN_TYPES.get(name, "string")
+        convert = _CONVERTERS[type_name]
+        arrays.append(pa.array([convert(row.get(name)) for row in rows], type=type_name))
+        fields.append(pa.field(name, type_name))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def write_parquet(table: pa.Table, path: Path) -> None:
+    import pyarrow.parquet as pq
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, path, compression="zstd")
+
+
+def write_arrow(table: pa.Table, path: Path) -> None:
+    """Uncompressed Arrow IPC file, so readers can memory-map it without copying."""
+    pa = _require_pyarrow()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
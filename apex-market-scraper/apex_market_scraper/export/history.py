@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Final, Literal
+
+ChangeType = Literal["new", "price_changed", "stock_changed", "delisted"]
+
+DELTA_COLUMNS: Final[list[str]] = ["change_type", "previous_price", "previous_stock"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    dedupe_key TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    price REAL,
+    currency TEXT,
+    stock INTEGER,
+    record_json TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    delisted_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_listings_site_active ON listings(site, delisted_at);
+
+CREATE TABLE IF NOT EXISTS price_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dedupe_key TEXT NOT NULL,
+    change_type TEXT NOT NULL,
+    price REAL,
+    currency TEXT,
+    stock INTEGER,
+    observed_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_price_history_key ON price_history(dedupe_key, observed_at);
+"""
+
+
+def record_key(record: dict[str, Any]) -> str:
+    """Same key as ``ProductRecord.dedupe_key()`` for an exported record dict."""
+    return str(record.get("url") or "")
+
+
+class PriceHistoryStore:
+    """SQLite store of the last known state of every listing, plus a change log.
+
+    :meth:`apply` compares a scrape against the stored state and returns only
+    the listings that are new, changed price or stock, or disappeared.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> PriceHistoryStore:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def apply(
+        self,
+        records: Iterable[dict[str, Any]],
+        *,
+        observed_at: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """Record a scrape and return the changed records.
+
+        Each returned record is the exported dict plus ``change_type``,
+        ``previous_price`` and ``previous_stock``. Listings are only marked
+        ``delisted`` for sites that produced at least one record in this
+        scrape, so a site that failed does not delist its whole catalogue.
+        """
+        ts = (observed_at or datetime.now(tz=UTC)).isoformat()
+        current = {record_key(r): r for r in records if record_key(r)}
+        sites = {str(r.get("site") or "") for r in current.values()}
+
+        stored: dict[str, sqlite3.Row] = {}
+        keys = list(current)
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in self._conn.execute(
+                f"SELECT * FROM listings WHERE dedupe_key IN ({placeholders})", chunk
+            ):
+                stored[row["dedupe_key"]] = row
+
+        changes: list[dict[str, Any]] = []
+        upserts: list[tuple[Any, ...]] = []
+        history: list[tuple[Any, ...]] = []
+
+        for key, record in current.items():
+            price = record.get("price")
+            stock = record.get("stock")
+            previous = stored.get(key)
+
+            change: ChangeType | None
+            if previous is None or previous["delisted_at"] is not None:
+                change = "new"
+            elif previous["price"] != price:
+                change = "price_changed"
+            elif previous["stock"] != stock:
+                change = "stock_changed"
+            else:
+                change = None
+
+            upserts.append((
+                key,
+                str(record.get("site") or ""),
+                price,
+                record.get("currency"),
+                stock,
+                json.dumps(record, default=str),
+                ts,
+                ts,
+            ))
+            if change is None:
+                continue
+            history.append((key, change, price, record.get("currency"), stock, ts))
+            changes.append({
+                **record,
+                "change_type": change,
+                "previous_price": previous["price"] if previous is not None else None,
+                "previous_stock": previous["stock"] if previous is not None else None,
+            })
+
+        delisted: list[sqlite3.Row] = []
+        for site in sites:
+            for row in self._conn.execute(
+                "SELECT * FROM listings WHERE site = ? AND delisted_at IS NULL", (site,)
+            ):
+                if row["dedupe_key"] not in current:
+                    delisted.append(row)
+        for row in delisted:
+            history.append(
+                (row["dedupe_key"], "delisted", row["price"], row["currency"], row["stock"], ts)
+            )
+            changes.append({
+                **json.loads(row["record_json"]),
+                "stock": 0,
+                "change_type": "delisted",
+                "previous_price": row["price"],
+                "previous_stock": row["stock"],
+            })
+
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO listings (
+                    dedupe_key, site, price, currency, stock, record_json, first_seen, last_seen
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(dedupe_key) DO UPDATE SET
+                    site = excluded.site,
+                    price = excluded.price,
+                    currency = excluded.currency,
+                    stock = excluded.stock,
+                    record_json = excluded.record_json,
+                    last_seen = excluded.last_seen,
+                    delisted_at = NULL
+                """,
+                upserts,
+            )
+            self._conn.executemany(
+                "UPDATE listings SET delisted_at = ? WHERE dedupe_key = ?",
+                [(ts, row["dedupe_key"]) for row in delisted],
+            )
+            self._conn.executemany(
+                """
+                INSERT INTO price_history (
+                    dedupe_key, change_type, price, currency, stock, observed_at
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                history,
+            )
+
+        return changes
+
+    def history(self, key: str) -> list[dict[str, Any]]:
+        """Change log for one listing, oldest first."""
+        rows = self._conn.execute(
+            """
+            SELECT change_type, price, currency, stock, observed_at
+            FROM price_history WHERE dedupe_key = ? ORDER BY id
+            """,
+            (key,),
+        )
+        return [dict(row) for row in rows]
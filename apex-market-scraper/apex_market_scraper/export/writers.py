@@ -12,6 +12,8 @@ from typing import Any
 from openpyxl import Workbook
 
 from apex_market_scraper.config.models import ExportConfig
+from apex_market_scraper.export.columnar import build_table, write_arrow, write_parquet
+from apex_market_scraper.export.history import DELTA_COLUMNS, PriceHistoryStore
 
 logger = logging.getLogger(__name__)
 
@@ -86,22 +88,46 @@ def _compute_file_checksum(path: Path) -> str:
     return sha256_hash.hexdigest()
 
 
+def _with_extra_columns(
+    mapped: dict[str, Any], record: dict[str, Any], extra_columns: list[str]
+) -> dict[str, Any]:
+    for col in extra_columns:
+        mapped[col] = record.get(col, "")
+    return mapped
+
+
+def _template_rows(
+    records: list[dict[str, Any]],
+    use_apex_template: bool,
+    include_hidden_metadata: bool,
+    extra_columns: list[str] | None,
+) -> tuple[list[str], list[dict[str, Any]]]:
+    if not use_apex_template:
+        return sorted({k for r in records for k in r.keys()}), records
+
+    extra = extra_columns or []
+    fieldnames = APEX_TEMPLATE_COLUMNS.copy()
+    if include_hidden_metadata:
+        fieldnames.extend(HIDDEN_METADATA_COLUMNS)
+    fieldnames.extend(extra)
+    mapped_records = [
+        _with_extra_columns(_map_product_record_to_apex_template(r), r, extra) for r in records
+    ]
+    return fieldnames, mapped_records
+
+
 def write_csv(
     records: list[dict[str, Any]],
     path: Path,
     use_apex_template: bool = True,
     include_hidden_metadata: bool = True,
+    extra_columns: list[str] | None = None,
 ) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    if use_apex_template:
-        fieldnames = APEX_TEMPLATE_COLUMNS.copy()
-        if include_hidden_metadata:
-            fieldnames.extend(HIDDEN_METADATA_COLUMNS)
-        mapped_records = [_map_product_record_to_apex_template(r) for r in records]
-    else:
-        fieldnames = sorted({k for r in records for k in r.keys()})
-        mapped_records = records
+    fieldnames, mapped_records = _template_rows(
+        records, use_apex_template, include_hidden_metadata, extra_columns
+    )
 
     with path.open("w", encoding="utf-8", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -115,17 +141,13 @@ def write_xlsx(
     path: Path,
     use_apex_template: bool = True,
     include_hidden_metadata: bool = True,
+    extra_columns: list[str] | None = None,
 ) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    if use_apex_template:
-        fieldnames = APEX_TEMPLATE_COLUMNS.copy()
-        if include_hidden_metadata:
-            fieldnames.extend(HIDDEN_METADATA_COLUMNS)
-        mapped_records = [_map_product_record_to_apex_template(r) for r in records]
-    else:
-        fieldnames = sorted({k for r in records for k in r.keys()})
-        mapped_records = records
+    fieldnames, mapped_records = _template_rows(
+        records, use_apex_template, include_hidden_metadata, extra_columns
+    )
 
     wb = Workbook()
     ws = wb.active
@@ -144,11 +166,27 @@ def write_xlsx(
     wb.save(path)
 
 
+def write_columnar(
+    records: list[dict[str, Any]],
+    path: Path,
+    fmt: str,
+    extra_columns: list[str] | None = None,
+) -> None:
+    """Write the Apex template (plus hidden metadata) as typed Parquet or Arrow IPC."""
+    fieldnames, mapped_records = _template_rows(records, True, True, extra_columns)
+    table = build_table(mapped_records, fieldnames)
+    if fmt == "parquet":
+        write_parquet(table, path)
+    else:
+        write_arrow(table, path)
+
+
 def write_manifest(
     records: list[dict[str, Any]],
     output_dir: Path,
     dataset_name: str,
     exported_files: dict[str, str],
+    extra: dict[str, Any] | None = None,
 ) -> Path:
     """Write manifest.json with metadata about the scrape and exports."""
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -186,6 +224,8 @@ def write_manifest(
             site_timestamps[site]["last_record"] = record.get("scraped_at", "")
 
     manifest["site_metadata"] = site_timestamps
+    if extra:
+        manifest.update(extra)
 
     manifest_path = output_dir / f"{dataset_name}_manifest_{ts}.json"
     with manifest_path.open("w", encoding="utf-8") as f:
@@ -195,32 +235,74 @@ def write_manifest(
 
 
 def export_records(records: list[dict[str, Any]], cfg: ExportConfig) -> list[Path]:
-    """Export records to configured formats and generate manifest."""
+    """Export records to configured formats and generate manifest.
+
+    Every run applies the records to the price-history store, so history is
+    kept whichever mode is configured. In ``delta`` mode only the changed
+    records are exported, to ``<dataset>_delta_*`` files with extra change
+    columns. Delta files are not copied to the Apex bot drop directory, since
+    an import there replaces the whole catalogue.
+    """
     ts = _timestamp()
 
+    dataset_name = cfg.dataset_name
+    extra_columns: list[str] = []
+    manifest_extra: dict[str, Any] = {"mode": cfg.mode}
+    drop_dir = cfg.apex_bot_drop_dir
+
+    with PriceHistoryStore(cfg.resolved_history_path()) as store:
+        changed = store.apply(records)
+
+    if cfg.mode == "delta":
+        records = changed
+        dataset_name = f"{cfg.dataset_name}_delta"
+        extra_columns = DELTA_COLUMNS
+        drop_dir = None
+        changes: dict[str, int] = {}
+        for record in records:
+            changes[record["change_type"]] = changes.get(record["change_type"], 0) + 1
+        manifest_extra["changes"] = changes
+        logger.info("Delta export: %s changed listing(s) %s", len(records), changes)
+
     written: list[Path] = []
     exported_files: dict[str, str] = {}
 
     for fmt in cfg.formats:
-        out_path = cfg.output_dir / f"{cfg.dataset_name}_{ts}.{fmt}"
+        out_path = cfg.output_dir / f"{dataset_name}_{ts}.{fmt}"
         if fmt == "csv":
-            write_csv(records, out_path, use_apex_template=True, include_hidden_metadata=True)
+            write_csv(
+                records,
+                out_path,
+                use_apex_template=True,
+                include_hidden_metadata=True,
+                extra_columns=extra_columns,
+            )
         elif fmt == "xlsx":
-            write_xlsx(records, out_path, use_apex_template=True, include_hidden_metadata=True)
+            write_xlsx(
+                records,
+                out_path,
+                use_apex_template=True,
+                include_hidden_metadata=True,
+                extra_columns=extra_columns,
+            )
+        elif fmt in ("parquet", "arrow"):
+            write_columnar(records, out_path, fmt, extra_columns=extra_columns)
         else:
             raise ValueError(f"Unsupported export format: {fmt}")
 
         written.append(out_path)
         exported_files[fmt] = str(out_path)
 
-        if cfg.apex_bot_drop_dir is not None:
-            cfg.apex_bot_drop_dir.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(out_path, cfg.apex_bot_drop_dir / out_path.name)
+        if drop_dir is not None:
+            drop_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(out_path, drop_dir / out_path.name)
 
-    manifest_path = write_manifest(records, cfg.output_dir, cfg.dataset_name, exported_files)
+    manifest_path = write_manifest(
+        records, cfg.output_dir, dataset_name, exported_files, extra=manifest_extra
+    )
     written.append(manifest_path)
 
-    if cfg.apex_bot_drop_dir is not None and manifest_path.exists():
-        shutil.copy2(manifest_path, cfg.apex_bot_drop_dir / manifest_path.name)
+    if drop_dir is not None and manifest_path.exists():
+        shutil.copy2(manifest_path, drop_dir / manifest_path.name)
 
     return written
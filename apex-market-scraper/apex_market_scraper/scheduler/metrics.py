@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(slots=True)
+class SiteRunMetrics:
+    duration_seconds: float
+    requests: int
+    bytes_fetched: int
+    records: int
+    pages_skipped: int
+    errors: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class RunMetrics:
+    """One scheduler cycle, as appended to the run-metrics file."""
+
+    started_at: str
+    finished_at: str
+    sites: list[str]
+    stages: dict[str, float] = field(default_factory=dict)
+    site_metrics: dict[str, SiteRunMetrics] = field(default_factory=dict)
+    bytes_fetched: int = 0
+    records: int = 0
+    errors: list[str] = field(default_factory=list)
+    overran: bool = False
+    # Export files with the checksum from the manifest and the stat seen right after
+    # writing, so monitors can skip re-hashing files that have not been touched since
+    exports: list[dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def append_run_metrics(path: Path, metrics: RunMetrics) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(metrics.to_dict(), ensure_ascii=False) + "\n")
+
+
+def read_last_run(path: Path, *, tail_bytes: int = 64 * 1024) -> dict[str, Any] | None:
+    """Return the most recent run without reading the whole history."""
+    if not path.exists():
+        return None
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - tail_bytes))
+        lines = f.read().splitlines()
+    for line in reversed(lines):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            # First line of the tail may be cut in half
+            continue
+        if isinstance(entry, dict):
+            return entry
+    return None
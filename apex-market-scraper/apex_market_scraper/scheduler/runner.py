@@ -1,38 +1,231 @@
 from __future__ import annotations
 
+import json
 import logging
+import math
+import random
 import time
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
 
 from apex_market_scraper.config.loader import RuntimeSettings
 from apex_market_scraper.config.models import AppConfig
-from apex_market_scraper.core.pipeline import scrape_all_sites
+from apex_market_scraper.core.pipeline import run_scrape
 from apex_market_scraper.export.writers import export_records
+from apex_market_scraper.scheduler.lock import RunLock
+from apex_market_scraper.scheduler.metrics import RunMetrics, SiteRunMetrics, append_run_metrics
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on a single sleep, so wall-clock changes and suspends are noticed
+_MAX_SLEEP_SECONDS = 60.0
 
-def run_cycle(cfg: AppConfig, settings: RuntimeSettings) -> None:
-    records = scrape_all_sites(cfg, settings)
-    if not records:
-        logger.warning("No records scraped; skipping export")
-        return
 
-    written = export_records(records, cfg.export)
-    logger.info("Exported %s file(s): %s", len(written), ", ".join(p.name for p in written))
+def next_run_at(
+    now: float,
+    cadence_seconds: float,
+    *,
+    jitter_seconds: float = 0,
+    align: bool = True,
+    rng: random.Random | None = None,
+) -> float:
+    """Epoch time of the next run after ``now``.
 
+    Aligned schedules fire on UTC multiples of the cadence, so the cycle
+    length never shifts later runs and a slot missed by a long cycle is
+    skipped instead of run back-to-back. Jitter is capped at half the cadence.
+    """
+    if align:
+        base = (math.floor(now / cadence_seconds) + 1) * cadence_seconds
+    else:
+        base = now + cadence_seconds
+    jitter = min(jitter_seconds, cadence_seconds / 2)
+    if jitter > 0:
+        base += (rng or random).uniform(0, jitter)
+    return base
 
-def run_scheduler(cfg: AppConfig, settings: RuntimeSettings, *, once: bool = False) -> None:
-    cadence_seconds = int(cfg.scheduler.cadence_hours * 3600)
 
-    while True:
+def site_schedules(cfg: AppConfig) -> dict[float, list[str]]:
+    """Enabled sites grouped by cadence in seconds; sites sharing a cadence run together."""
+    groups: dict[float, list[str]] = {}
+    for site in cfg.sites:
+        if not site.enabled:
+            continue
+        hours = site.cadence_hours or cfg.scheduler.cadence_hours
+        groups.setdefault(hours * 3600, []).append(site.name)
+    return groups
+
+
+def _export_stats(written: list[Path]) -> list[dict[str, Any]]:
+    manifest_path = written[-1]
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    stats: list[dict[str, Any]] = []
+    for fmt, info in manifest.get("exports", {}).items():
+        path = Path(info["path"])
+        st = path.stat()
+        stats.append({
+            "format": fmt,
+            "path": str(path),
+            "checksum": info.get("checksum"),
+            "size_bytes": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        })
+    return stats
+
+
+def run_cycle(
+    cfg: AppConfig,
+    settings: RuntimeSettings,
+    *,
+    sites: str | Iterable[str] = "all",
+    carry_over: dict[str, list[dict[str, Any]]] | None = None,
+    budget_seconds: float | None = None,
+) -> RunMetrics | None:
+    """Scrape ``sites`` and export, unless another cycle holds the run lock.
+
+    With ``carry_over`` the export also includes the latest records of sites
+    that were not due this cycle (and of due sites that failed), so per-site
+    schedules still produce a complete catalogue. Returns the appended run
+    metrics, or None if the cycle was skipped.
+    """
+    lock = RunLock(cfg.resolved_lock_path())
+    if not lock.acquire():
+        logger.warning("Another cycle holds %s; skipping this run", lock.path)
+        return None
+    with lock:
+        return _run_locked(cfg, settings, sites, carry_over, budget_seconds)
+
+
+def _run_locked(
+    cfg: AppConfig,
+    settings: RuntimeSettings,
+    sites: str | Iterable[str],
+    carry_over: dict[str, list[dict[str, Any]]] | None,
+    budget_seconds: float | None,
+) -> RunMetrics:
+    started_at = datetime.now(tz=UTC)
+    t0 = time.monotonic()
+    metrics = RunMetrics(started_at=started_at.isoformat(), finished_at="", sites=[])
+
+    try:
+        result = run_scrape(cfg, settings, sites=sites)
+        metrics.stages["scrape"] = time.monotonic() - t0
+
+        fresh: dict[str, list[dict[str, Any]]] = {}
+        for rec in result.records:
+            fresh.setdefault(rec.site_name, []).append(rec.to_dict())
+
+        for name, meta in result.site_metadata.items():
+            site_records = fresh.get(name, [])
+            duration = (
+                (meta.finished_at - meta.started_at).total_seconds() if meta.finished_at else 0.0
+            )
+            metrics.site_metrics[name] = SiteRunMetrics(
+                duration_seconds=duration,
+                requests=meta.requests_executed,
+                bytes_fetched=meta.bytes_fetched,
+                records=len(site_records),
+                pages_skipped=meta.pages_skipped,
+                errors=list(meta.errors),
+            )
+            metrics.sites.append(name)
+            metrics.bytes_fetched += meta.bytes_fetched
+            metrics.errors.extend(f"{name}: {err}" for err in meta.errors)
+            if carry_over is not None and (site_records or not meta.errors):
+                carry_over[name] = site_records
+
+        if carry_over is not None:
+            records = [r for site_records in carry_over.values() for r in site_records]
+        else:
+            records = [r for site_records in fresh.values() for r in site_records]
+        metrics.records = len(records)
+
+        if not records:
+            logger.warning("No records scraped; skipping export")
+            return metrics
+
+        t_export = time.monotonic()
+        written = export_records(records, cfg.export)
+        metrics.stages["export"] = time.monotonic() - t_export
+        metrics.exports = _export_stats(written)
+        logger.info("Exported %s file(s): %s", len(written), ", ".join(p.name for p in written))
+        return metrics
+    except Exception as e:
+        metrics.errors.append(f"cycle: {e}")
+        raise
+    finally:
+        elapsed = time.monotonic() - t0
+        metrics.stages["total"] = elapsed
+        metrics.finished_at = datetime.now(tz=UTC).isoformat()
+        if budget_seconds is not None and elapsed > budget_seconds:
+            metrics.overran = True
+            logger.warning(
+                "Cycle took %.0fs, longer than its %.0fs cadence; missed runs are skipped",
+                elapsed,
+                budget_seconds,
+            )
+        append_run_metrics(cfg.resolved_metrics_path(), metrics)
+
+
+def run_scheduler(
+    cfg: AppConfig,
+    settings: RuntimeSettings,
+    *,
+    once: bool = False,
+    clock: Callable[[], float] = time.time,
+    sleep: Callable[[float], None] = time.sleep,
+    rng: random.Random | None = None,
+) -> None:
+    if once:
         run_cycle(cfg, settings)
+        return
 
-        if once:
-            return
+    groups = site_schedules(cfg)
+    if not groups:
+        logger.warning("No enabled sites to schedule")
+        return
+
+    rng = rng or random.Random()
+    carry_over: dict[str, list[dict[str, Any]]] = {}
+    # Everything runs once at startup, then each group follows its own cadence
+    due_at = {cadence: clock() for cadence in groups}
+
+    while True:
+        now = clock()
+        if any(at <= now for at in due_at.values()):
+            # Groups falling due within the jitter window join this cycle, so
+            # coinciding slots produce one export rather than several
+            window = now + cfg.scheduler.jitter_seconds
+            due = sorted(c for c, at in due_at.items() if at <= window)
+        else:
+            due = []
+        if due:
+            run_cycle(
+                cfg,
+                settings,
+                sites=[name for c in due for name in groups[c]],
+                carry_over=carry_over,
+                budget_seconds=min(due),
+            )
+            finished = clock()
+            for cadence in due:
+                due_at[cadence] = next_run_at(
+                    max(finished, due_at[cadence]),
+                    cadence,
+                    jitter_seconds=cfg.scheduler.jitter_seconds,
+                    align=cfg.scheduler.align_to_wall_clock,
+                    rng=rng,
+                )
+            next_due = min(due_at.values())
+            logger.info(
+                "Next run at %s",
+                datetime.fromtimestamp(next_due, tz=UTC).isoformat(timespec="seconds"),
+            )
 
-        logger.info("Sleeping for %s hour(s)", cfg.scheduler.cadence_hours)
         try:
-            time.sleep(cadence_seconds)
+            sleep(min(_MAX_SLEEP_SECONDS, max(0.0, min(due_at.values()) - clock())))
         except KeyboardInterrupt:
             logger.info("Scheduler interrupted")
             return
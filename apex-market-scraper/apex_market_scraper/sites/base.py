@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import abc
+from collections import deque
+from collections.abc import Iterator, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import replace
 from datetime import datetime, timezone
-from typing import Mapping
+from typing import Any
 
 from apex_market_scraper.config.models import SiteConfig
+from apex_market_scraper.core.http_cache import CachedPage, body_digest
 from apex_market_scraper.core.http_client import ResilientHttpClient, RetryConfig
 from apex_market_scraper.core.logging import get_logger
 from apex_market_scraper.core.models import HttpResponse, ProductRecord, RequestSpec, SiteMetadata
+from apex_market_scraper.core.parse_pool import PageJob, PageResult, parse_pages, to_wire
 
 
 class BaseSiteScraper(abc.ABC):
@@ -67,6 +72,168 @@ class BaseSiteScraper(abc.ABC):
     def _throttle_seconds(self) -> float:
         return float(self.site.params.get("throttle_seconds", 0.0))
 
+    def _uses_http_cache(self, request: RequestSpec) -> bool:
+        return (
+            self.http.cache is not None
+            and request.method.upper() == "GET"
+            and bool(self.site.params.get("conditional_requests", True))
+        )
+
+    def _cached_page(self, request: RequestSpec, *, dry_run: bool) -> CachedPage | None:
+        cache = self.http.cache
+        if dry_run or cache is None or not self._uses_http_cache(request):
+            return None
+        return cache.get_page(request)
+
+    def _parse_workers(self) -> int:
+        return int(self.site.params.get("parse_workers", 0))
+
+    def _prepare_page(
+        self,
+        response: HttpResponse,
+        request: RequestSpec,
+        cached: CachedPage | None,
+        meta: SiteMetadata,
+    ) -> PageJob:
+        """Decide whether ``response`` must be parsed or its cached items reused."""
+        if cached is not None and response.not_modified:
+            meta.pages_not_modified += 1
+            meta.pages_skipped += 1
+            meta.bytes_saved += cached.size_bytes
+            return PageJob(request=request, response=None, raw_items=list(cached.raw_items))
+
+        if (
+            response.is_dry_run
+            or response.not_modified
+            or self.http.cache is None
+            or not self._uses_http_cache(request)
+        ):
+            return PageJob(request=request, response=response)
+
+        digest = body_digest(response.content)
+        if cached is not None and digest == cached.body_sha256:
+            meta.pages_skipped += 1
+            return PageJob(request=request, response=None, raw_items=list(cached.raw_items))
+
+        return PageJob(request=request, response=response, cache_digest=digest)
+
+    def _store_parsed(self, job: PageJob, raw_items: list[Mapping[str, Any]]) -> None:
+        cache = self.http.cache
+        if job.cache_digest is None or job.response is None or cache is None:
+            return
+        headers = {k.lower(): v for k, v in job.response.headers.items()}
+        cache.put_page(
+            job.request,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            body_sha256=job.cache_digest,
+            size_bytes=len(job.response.content),
+            raw_items=raw_items,
+        )
+
+    def normalize_items(self, raw_items: list[Mapping[str, Any]]) -> list[ProductRecord]:
+        records: list[ProductRecord] = []
+        for raw in raw_items:
+            normalized = self.normalize_record(raw)
+            if normalized.site_name != self.site.name or normalized.site_kind != self.site.kind:
+                normalized = replace(
+                    normalized,
+                    site_name=self.site.name,
+                    site_kind=self.site.kind,
+                )
+            records.append(normalized)
+        return records
+
+    def _run_inline(self, job: PageJob) -> PageResult:
+        if job.raw_items is not None:
+            raw_items = job.raw_items
+        else:
+            if job.response is None:
+                raise RuntimeError(f"Page job for {job.request.url} has no response to parse")
+            raw_items = self.parse_listing(job.response, job.request)
+            self._store_parsed(job, raw_items)
+        return PageResult(records=self.normalize_items(raw_items), raw_count=len(raw_items))
+
+    def _fetch_pages(
+        self, requests_to_make: list[RequestSpec], meta: SiteMetadata, *, dry_run: bool
+    ) -> Iterator[PageJob]:
+        """Fetch stage: requests are issued one at a time, honouring throttle and robots."""
+        for req in requests_to_make:
+            cached = self._cached_page(req, dry_run=dry_run)
+            response = self.http.request(
+                req,
+                site_key=self.site.name,
+                dry_run=dry_run,
+                respect_robots=self._respect_robots(),
+                throttle_seconds=self._throttle_seconds(),
+                retry=self._retry_config(),
+                validators=cached,
+            )
+            if not response.is_dry_run:
+                meta.requests_executed += 1
+                meta.bytes_fetched += len(response.content)
+            yield self._prepare_page(response, req, cached, meta)
+
+    def _collect(
+        self, result: PageResult, records: list[ProductRecord], meta: SiteMetadata
+    ) -> None:
+        meta.raw_records_parsed += result.raw_count
+        records.extend(result.records)
+        meta.records_normalized = len(records)
+
+    def _parse_in_pool(
+        self,
+        pages: Iterator[PageJob],
+        records: list[ProductRecord],
+        meta: SiteMetadata,
+        workers: int,
+    ) -> None:
+        """Parse stage: batches of pages are parsed in worker processes.
+
+        At most ``parse_queue_batches`` batches are in flight. Once the queue is
+        full the fetch stage waits for the oldest batch, so memory stays bounded
+        and records keep their request order.
+        """
+        batch_pages = max(1, int(self.site.params.get("parse_batch_pages", 8)))
+        max_in_flight = max(1, int(self.site.params.get("parse_queue_batches", workers * 2)))
+        site_json = self.site.model_dump_json()
+        in_flight: deque[tuple[list[PageJob], Future[list[PageResult]]]] = deque()
+
+        def drain_oldest() -> None:
+            jobs, future = in_flight.popleft()
+            for job, result in zip(jobs, future.result(), strict=True):
+                if result.raw_items is not None:
+                    self._store_parsed(job, result.raw_items)
+                self._collect(result, records, meta)
+
+        def submit(batch: list[PageJob]) -> None:
+            if len(in_flight) >= max_in_flight:
+                drain_oldest()
+            future = pool.submit(
+                parse_pages,
+                type(self),
+                site_json,
+                self.api_key,
+                self.task_id,
+                [to_wire(job) for job in batch],
+            )
+            in_flight.append((batch, future))
+
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            batch: list[PageJob] = []
+            for job in pages:
+                batch.append(job)
+                if len(batch) >= batch_pages:
+                    submit(batch)
+                    batch = []
+            if batch:
+                submit(batch)
+            while in_flight:
+                drain_oldest()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
     def scrape_with_metadata(self, *, dry_run: bool = False) -> tuple[list[ProductRecord], SiteMetadata]:
         started_at = datetime.now(tz=timezone.utc)
         meta = SiteMetadata(
@@ -84,32 +251,13 @@ class BaseSiteScraper(abc.ABC):
 
         self.logger.info("scrape.start kind=%s dry_run=%s", self.site.kind, dry_run)
         try:
-            for req in requests_to_make:
-                response = self.http.request(
-                    req,
-                    site_key=self.site.name,
-                    dry_run=dry_run,
-                    respect_robots=self._respect_robots(),
-                    throttle_seconds=self._throttle_seconds(),
-                    retry=self._retry_config(),
-                )
-                if not response.is_dry_run:
-                    meta.requests_executed += 1
-
-                raw_items = self.parse_listing(response, req)
-                meta.raw_records_parsed += len(raw_items)
-
-                for raw in raw_items:
-                    normalized = self.normalize_record(raw)
-                    if normalized.site_name != self.site.name or normalized.site_kind != self.site.kind:
-                        normalized = replace(
-                            normalized,
-                            site_name=self.site.name,
-                            site_kind=self.site.kind,
-                        )
-                    records.append(normalized)
-
-                meta.records_normalized = len(records)
+            pages = self._fetch_pages(requests_to_make, meta, dry_run=dry_run)
+            workers = self._parse_workers()
+            if workers > 0 and not dry_run:
+                self._parse_in_pool(pages, records, meta, workers)
+            else:
+                for job in pages:
+                    self._collect(self._run_inline(job), records, meta)
 
             meta.finished_at = datetime.now(tz=timezone.utc)
             self.logger.info("scrape.success records=%s", len(records))
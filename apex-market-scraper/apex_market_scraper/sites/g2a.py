@@ -7,8 +7,11 @@ from urllib.parse import urljoin
 
 from apex_market_scraper.core.models import HttpResponse, ProductRecord, RequestSpec
 from apex_market_scraper.sites.base import BaseSiteScraper
+from apex_market_scraper.sites.html_extract import HtmlListingExtractor, clean_html
 from apex_market_scraper.sites.registry import register
 
+_LISTING_HTML = HtmlListingExtractor("product-card")
+
 
 @register("g2a")
 class G2AScraper(BaseSiteScraper):
@@ -146,12 +149,7 @@ class G2AScraper(BaseSiteScraper):
     def _parse_html_listings(self, html: str, base_url: str) -> list[Mapping[str, Any]]:
         listings: list[Mapping[str, Any]] = []
         
-        # G2A HTML structure patterns - updated to match their actual layout
-        listing_pattern = r'<div[^>]*class="[^"]*product-card[^"]*"[^>]*>(.*?)</div>\s*</div>'
-        matches = re.finditer(listing_pattern, html, re.DOTALL | re.IGNORECASE)
-        
-        for match in matches:
-            listing_html = match.group(1)
+        for listing_html in _LISTING_HTML.blocks(html):
             listing_data = self._extract_from_html(listing_html, base_url)
             
             if listing_data and self._has_critical_fields(listing_data):
@@ -222,58 +220,31 @@ class G2AScraper(BaseSiteScraper):
 
     def _extract_from_html(self, html: str, base_url: str) -> dict[str, Any] | None:
         try:
-            # Extract title
-            title_match = re.search(r'<h[23][^>]*class="[^"]*title[^"]*"[^>]*>(.*?)</h[23]>', html, re.DOTALL | re.IGNORECASE)
-            title = self._clean_html(title_match.group(1)) if title_match else ""
+            fields = _LISTING_HTML.fields(html)
+            title = fields.title
             
-            # Extract price with various G2A patterns
-            price_match = re.search(r'data-price="([^"]+)"', html)
-            if not price_match:
-                price_match = re.search(r'<span[^>]*class="[^"]*price[^"]*"[^>]*>.*?([0-9]+\.?[0-9]*)', html)
-            if not price_match:
-                price_match = re.search(r'[\$€£¥]\s*([0-9]+\.?[0-9]*)', html)
-            price = float(price_match.group(1)) if price_match else None
+            # Price: data attribute, then price span, then a bare currency amount
+            price_text = fields.price(symbol_fallback=True)
+            price = float(price_text) if price_text else None
             
-            # Extract currency
-            currency_match = re.search(r'data-currency="([^"]+)"', html)
-            if not currency_match:
-                currency_symbol_match = re.search(r'[\$€£¥]', html)
-                currency = None
-                if currency_symbol_match:
-                    currency_symbol = currency_symbol_match.group(0)
-                    currency_map = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY"}
-                    currency = currency_map.get(currency_symbol, self.default_currency)
-            else:
-                currency = currency_match.group(1) if currency_match else self.default_currency
-            
-            if not currency_match and not currency_symbol_match:
-                currency = self.default_currency
+            currency = (
+                fields.data.get("currency")
+                or fields.currency_symbol()
+                or self.default_currency
+            )
             
-            # Extract URL
-            url_match = re.search(r'href="([^"]+)"', html)
-            url = urljoin(base_url, url_match.group(1)) if url_match else base_url
+            url = urljoin(base_url, fields.href) if fields.href else base_url
             
-            # Extract stock
-            stock_match = re.search(r'data-stock="([^"]+)"', html)
-            stock = int(stock_match.group(1)) if stock_match else None
+            stock = int(fields.data["stock"]) if "stock" in fields.data else None
             
-            # Extract seller reputation
-            seller_rating_match = re.search(r'data-rating="([^"]+)"', html)
-            seller_rating = seller_rating_match.group(1) if seller_rating_match else None
+            seller_rating = fields.data.get("rating")
             
-            # Extract category
-            category_match = re.search(r'data-category="([^"]+)"', html)
-            category = category_match.group(1) if category_match else None
+            category = fields.data.get("category")
             
-            # Extract min/max pieces
-            min_pieces_match = re.search(r'data-min-pieces="([^"]+)"', html)
-            max_pieces_match = re.search(r'data-max-pieces="([^"]+)"', html)
-            min_pieces = int(min_pieces_match.group(1)) if min_pieces_match else None
-            max_pieces = int(max_pieces_match.group(1)) if max_pieces_match else None
+            min_pieces = int(fields.data["min-pieces"]) if "min-pieces" in fields.data else None
+            max_pieces = int(fields.data["max-pieces"]) if "max-pieces" in fields.data else None
             
-            # Extract delivery estimates
-            delivery_match = re.search(r'data-delivery="([^"]+)"', html)
-            delivery_eta = delivery_match.group(1) if delivery_match else None
+            delivery_eta = fields.data.get("delivery")
             
             return {
                 "title": title,
@@ -416,6 +387,4 @@ class G2AScraper(BaseSiteScraper):
         return warranty_str
 
     def _clean_html(self, text: str) -> str:
-        text = re.sub(r'<[^>]+>', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
\ No newline at end of file
+        return clean_html(text)
\ No newline at end of file
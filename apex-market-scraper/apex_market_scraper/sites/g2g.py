@@ -7,8 +7,11 @@ from urllib.parse import urljoin
 
 from apex_market_scraper.core.models import HttpResponse, ProductRecord, RequestSpec
 from apex_market_scraper.sites.base import BaseSiteScraper
+from apex_market_scraper.sites.html_extract import HtmlListingExtractor, clean_html
 from apex_market_scraper.sites.registry import register
 
+_LISTING_HTML = HtmlListingExtractor("listing-item")
+
 
 @register("g2g")
 class G2GScraper(BaseSiteScraper):
@@ -129,11 +132,7 @@ class G2GScraper(BaseSiteScraper):
     def _parse_html_listings(self, html: str, base_url: str) -> list[Mapping[str, Any]]:
         listings: list[Mapping[str, Any]] = []
         
-        listing_pattern = r'<div[^>]*class="[^"]*listing-item[^"]*"[^>]*>(.*?)</div>\s*</div>'
-        matches = re.finditer(listing_pattern, html, re.DOTALL | re.IGNORECASE)
-        
-        for match in matches:
-            listing_html = match.group(1)
+        for listing_html in _LISTING_HTML.blocks(html):
             listing_data = self._extract_from_html(listing_html, base_url)
             
             if listing_data and self._has_critical_fields(listing_data):
@@ -192,25 +191,19 @@ class G2GScraper(BaseSiteScraper):
 
     def _extract_from_html(self, html: str, base_url: str) -> dict[str, Any] | None:
         try:
-            title_match = re.search(r'<h[23][^>]*class="[^"]*title[^"]*"[^>]*>(.*?)</h[23]>', html, re.DOTALL | re.IGNORECASE)
-            title = self._clean_html(title_match.group(1)) if title_match else ""
+            fields = _LISTING_HTML.fields(html)
+            title = fields.title
             
-            price_match = re.search(r'data-price="([^"]+)"', html)
-            if not price_match:
-                price_match = re.search(r'<span[^>]*class="[^"]*price[^"]*"[^>]*>.*?([0-9]+\.?[0-9]*)', html)
-            price = float(price_match.group(1)) if price_match else None
+            price_text = fields.price()
+            price = float(price_text) if price_text else None
             
-            currency_match = re.search(r'data-currency="([^"]+)"', html)
-            currency = currency_match.group(1) if currency_match else self.default_currency
+            currency = fields.data.get("currency", self.default_currency)
             
-            url_match = re.search(r'href="([^"]+)"', html)
-            url = urljoin(base_url, url_match.group(1)) if url_match else base_url
+            url = urljoin(base_url, fields.href) if fields.href else base_url
             
-            stock_match = re.search(r'data-stock="([^"]+)"', html)
-            stock = int(stock_match.group(1)) if stock_match else None
+            stock = int(fields.data["stock"]) if "stock" in fields.data else None
             
-            seller_rating_match = re.search(r'data-rating="([^"]+)"', html)
-            seller_rating = seller_rating_match.group(1) if seller_rating_match else None
+            seller_rating = fields.data.get("rating")
             
             return {
                 "title": title,
@@ -334,6 +327,4 @@ class G2GScraper(BaseSiteScraper):
         return warranty_str
 
     def _clean_html(self, text: str) -> str:
-        text = re.sub(r'<[^>]+>', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        return clean_html(text)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Final
+
+_TAG_RE: Final = re.compile(r"<[^>]+>")
+_WHITESPACE_RE: Final = re.compile(r"\s+")
+_TITLE_RE: Final = re.compile(
+    r'<h[23][^>]*class="[^"]*title[^"]*"[^>]*>(.*?)</h[23]>', re.DOTALL | re.IGNORECASE
+)
+_PRICE_SPAN_RE: Final = re.compile(r'<span[^>]*class="[^"]*price[^"]*"[^>]*>.*?([0-9]+\.?[0-9]*)')
+_SYMBOL_PRICE_RE: Final = re.compile(r"[\$€£¥]\s*([0-9]+\.?[0-9]*)")
+_SYMBOL_RE: Final = re.compile(r"[\$€£¥]")
+_HREF_RE: Final = re.compile(r'href="([^"]+)"')
+# Every data-* attribute the site parsers read, matched in a single scan of the block
+_DATA_ATTR_RE: Final = re.compile(
+    r'data-(price|currency|stock|rating|category|min-pieces|max-pieces|delivery)="([^"]+)"'
+)
+
+CURRENCY_SYMBOLS: Final[dict[str, str]] = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY"}
+
+
+def clean_html(text: str) -> str:
+    text = _TAG_RE.sub("", text)
+    text = _WHITESPACE_RE.sub(" ", text)
+    return text.strip()
+
+
+@dataclass(slots=True)
+class ListingFields:
+    """Raw strings pulled out of one listing block; conversion is left to the site."""
+
+    block: str
+    title: str
+    href: str | None
+    data: dict[str, str] = field(default_factory=dict)
+
+    def price(self, *, symbol_fallback: bool = False) -> str | None:
+        if "price" in self.data:
+            return self.data["price"]
+        match = _PRICE_SPAN_RE.search(self.block)
+        if match is None and symbol_fallback:
+            match = _SYMBOL_PRICE_RE.search(self.block)
+        return match.group(1) if match else None
+
+    def currency_symbol(self) -> str | None:
+        match = _SYMBOL_RE.search(self.block)
+        return CURRENCY_SYMBOLS[match.group(0)] if match else None
+
+
+class HtmlListingExtractor:
+    """Precompiled extractor for ``<div class="...{container_class}...">`` listing cards.
+
+    Each card is located with one compiled pattern and its data-* attributes
+    are collected in a single pass, instead of one regex search per field.
+    The price-span and currency-symbol fallbacks are only evaluated when the
+    card lacks the corresponding data attribute.
+    """
+
+    def __init__(self, container_class: str) -> None:
+        self._container_re = re.compile(
+            rf'<div[^>]*class="[^"]*{re.escape(container_class)}[^"]*"[^>]*>(.*?)</div>\s*</div>',
+            re.DOTALL | re.IGNORECASE,
+        )
+
+    def blocks(self, html: str) -> Iterator[str]:
+        for match in self._container_re.finditer(html):
+            yield match.group(1)
+
+    def extract(self, html: str) -> Iterator[ListingFields]:
+        for block in self.blocks(html):
+            yield self.fields(block)
+
+    @staticmethod
+    def fields(block: str) -> ListingFields:
+        data: dict[str, str] = {}
+        for match in _DATA_ATTR_RE.finditer(block):
+            data.setdefault(match.group(1), match.group(2))
+
+        title_match = _TITLE_RE.search(block)
+        href_match = _HREF_RE.search(block)
+        return ListingFields(
+            block=block,
+            title=clean_html(title_match.group(1)) if title_match else "",
+            href=href_match.group(1) if href_match else None,
+            data=data,
+        )
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark export and bot-side ingest time of CSV, XLSX, Parquet and Arrow files."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+BOT_ROOT = ROOT.parent
+sys.path.insert(0, str(ROOT))
+
+from apex_market_scraper.export.writers import write_columnar, write_csv, write_xlsx  # noqa: E402
+
+FORMATS = ("csv", "xlsx", "parquet", "arrow")
+
+
+def synthetic_records(count: int) -> list[dict[str, Any]]:
+    """Listings shaped like scraper output, with a realistic spread of values."""
+    return [
+        {
+            "site": "g2g" if i % 2 else "g2a",
+            "category": f"Category {i % 40}",
+            "name": f"Listing {i}",
+            "description": f"Variant {i % 7} - {i % 1000} units",
+            "price": round(0.5 + (i % 5000) * 0.37, 2),
+            "source_updated_at": "2026-01-01T00:00:00+00:00",
+            "warranty": "30 days" if i % 3 else None,
+            "refill_available": bool(i % 2),
+            "sold_amount": i % 900,
+            "stock": i % 120,
+            "seller_rating": 4.5,
+            "url": f"https://market.invalid/listing/{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def _writer(fmt: str) -> Callable[[list[dict[str, Any]], Path], None]:
+    if fmt == "csv":
+        return write_csv
+    if fmt == "xlsx":
+        return write_xlsx
+    return lambda records, path: write_columnar(records, path, fmt)
+
+
+def _ingest(fmt: str) -> Callable[[Path], int] | None:
+    """The bot's parser for ``fmt``, or None when the bot cannot import it."""
+    sys.path.insert(0, str(BOT_ROOT))
+    try:
+        if fmt == "csv":
+            from cogs.product_import import _parse_and_validate_csv
+
+            return lambda path: len(_parse_and_validate_csv(path.read_bytes())["rows"])
+        if fmt in ("parquet", "arrow"):
+            from apex_core.columnar_import import parse_columnar_products
+
+            return lambda path: len(parse_columnar_products(path)["rows"])
+    except ImportError:
+        return None
+    return None
+
+
+def _timed(fn: Callable[[], Any]) -> tuple[float, Any]:
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def run(fmt: str, records: list[dict[str, Any]], directory: Path) -> dict[str, Any]:
+    path = directory / f"bench.{fmt}"
+    export_seconds, _ = _timed(lambda: _writer(fmt)(records, path))
+    result: dict[str, Any] = {
+        "format": fmt,
+        "records": len(records),
+        "file_bytes": path.stat().st_size,
+        "export_seconds": round(export_seconds, 3),
+        "ingest_seconds": None,
+        "ingested_rows": None,
+    }
+    ingest = _ingest(fmt)
+    if ingest is not None:
+        ingest_seconds, rows = _timed(lambda: ingest(path))
+        result["ingest_seconds"] = round(ingest_seconds, 3)
+        result["ingested_rows"] = rows
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--records", type=int, default=1_000_000, help="Listings to export (default: 1M)"
+    )
+    parser.add_argument(
+        "--formats", default=",".join(FORMATS), help="Comma-separated formats to run"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    records = synthetic_records(args.records)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [run(fmt, records, Path(tmp)) for fmt in formats]
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark the G2G/G2A HTML listing parsers on scaled-up test fixtures."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from apex_market_scraper.config.models import SiteConfig  # noqa: E402
+from apex_market_scraper.sites.g2a import G2AScraper  # noqa: E402
+from apex_market_scraper.sites.g2g import G2GScraper  # noqa: E402
+
+FIXTURES = {
+    "g2g": (G2GScraper, ROOT / "tests" / "fixtures" / "g2g" / "html_listing.html"),
+    "g2a": (G2AScraper, ROOT / "tests" / "fixtures" / "g2a" / "normal_listings.html"),
+}
+
+
+def scaled_body(fixture: Path, scale: int) -> str:
+    """Repeat the fixture's <body> contents ``scale`` times inside one document."""
+    html = fixture.read_text(encoding="utf-8")
+    head, _, rest = html.partition("<body>")
+    body, _, tail = rest.partition("</body>")
+    return f"{head}<body>{body * scale}</body>{tail}"
+
+
+def run(site: str, scale: int, repeat: int) -> dict[str, Any]:
+    scraper_cls, fixture = FIXTURES[site]
+    scraper = scraper_cls(site=SiteConfig(name=site, kind=site), api_key=None, task_id="bench")
+    html = scaled_body(fixture, scale)
+
+    timings: list[float] = []
+    listings = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        listings = len(scraper._parse_html_listings(html, "https://bench.invalid/"))
+        timings.append(time.perf_counter() - started)
+
+    best = min(timings)
+    return {
+        "site": site,
+        "scale": scale,
+        "html_bytes": len(html.encode("utf-8")),
+        "listings": listings,
+        "best_seconds": round(best, 4),
+        "listings_per_second": round(listings / best) if best else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scale", type=int, default=1000, help="Fixture repetitions (default: 1000)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per site; best is reported")
+    parser.add_argument("--sites", default="g2g,g2a", help="Comma-separated sites to benchmark")
+    args = parser.parse_args()
+
+    # Fixtures deliberately contain incomplete listings; keep the output readable
+    logging.disable(logging.WARNING)
+
+    sites = [site.strip() for site in args.sites.split(",") if site.strip()]
+    results = [run(site, args.scale, args.repeat) for site in sites]
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,11 @@ from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from apex_market_scraper.scheduler.metrics import read_last_run  # noqa: E402
+
 
 def check_export_recency(export_dir: Path, max_age_hours: int = 25) -> tuple[bool, str]:
     """Check if recent exports exist."""
@@ -29,6 +34,24 @@ def check_export_recency(export_dir: Path, max_age_hours: int = 25) -> tuple[boo
     return True, f"Latest CSV is recent: {latest_csv.name}"
 
 
+def check_last_run(last_run: dict[str, Any], max_age_hours: int = 25) -> tuple[bool, str]:
+    """Check the latest scheduler run from run metrics instead of file timestamps."""
+    finished_at = datetime.fromisoformat(last_run["finished_at"])
+    age_hours = (datetime.now(tz=UTC) - finished_at).total_seconds() / 3600
+    if age_hours > max_age_hours:
+        return False, f"Last run finished {age_hours:.1f} hours ago (max: {max_age_hours})"
+
+    errors = last_run.get("errors") or []
+    if errors:
+        return False, f"Last run had {len(errors)} error(s): {'; '.join(errors[:3])}"
+
+    stages = last_run.get("stages", {})
+    return True, (
+        f"Last run OK: {last_run.get('records', 0)} records, "
+        f"{last_run.get('bytes_fetched', 0)} bytes fetched in {stages.get('total', 0):.1f}s"
+    )
+
+
 def check_manifest_validity(manifest_path: Path) -> tuple[bool, str]:
     """Validate manifest.json structure and content."""
     if not manifest_path.exists():
@@ -53,6 +76,8 @@ def check_manifest_validity(manifest_path: Path) -> tuple[bool, str]:
             return False, f"Missing required field in manifest: {field}"
 
     if manifest["records_count"] == 0:
+        if manifest.get("mode") == "delta":
+            return True, "Delta manifest valid: no listings changed since the previous run"
         return False, "Manifest shows zero records (possible scrape failure)"
 
     records_count = manifest["records_count"]
@@ -75,11 +100,19 @@ def check_exports_exist(manifest: dict[str, Any]) -> tuple[bool, str]:
     return True, "All exported files exist and are accessible"
 
 
-def check_exports_integrity(manifest: dict[str, Any]) -> tuple[bool, str]:
-    """Verify checksums of exported files."""
+def check_exports_integrity(
+    manifest: dict[str, Any], last_run: dict[str, Any] | None = None
+) -> tuple[bool, str]:
+    """Verify checksums of exported files.
+
+    Files recorded in the run metrics with the same checksum, size and mtime
+    are trusted without being re-hashed.
+    """
     import hashlib
 
     mismatches = []
+    recorded = {e["path"]: e for e in (last_run or {}).get("exports", [])}
+    verified_by_metrics = 0
 
     for fmt, export_info in manifest.get("exports", {}).items():
         file_path = Path(export_info.get("path", ""))
@@ -88,6 +121,13 @@ def check_exports_integrity(manifest: dict[str, Any]) -> tuple[bool, str]:
         if not file_path.exists():
             continue
 
+        known = recorded.get(str(file_path))
+        if known is not None and known.get("checksum") == expected_checksum:
+            st = file_path.stat()
+            if st.st_size == known.get("size_bytes") and st.st_mtime_ns == known.get("mtime_ns"):
+                verified_by_metrics += 1
+                continue
+
         sha256_hash = hashlib.sha256()
         with file_path.open("rb") as f:
             for byte_block in iter(lambda: f.read(4096), b""):
@@ -100,6 +140,10 @@ def check_exports_integrity(manifest: dict[str, Any]) -> tuple[bool, str]:
     if mismatches:
         return False, f"Checksum mismatches: {'; '.join(mismatches)}"
 
+    if verified_by_metrics:
+        return True, (
+            f"All file checksums verified ({verified_by_metrics} unchanged since the last run)"
+        )
     return True, "All file checksums verified"
 
 
@@ -109,6 +153,10 @@ def check_site_coverage(
     """Check that all expected sites have data."""
     site_metadata = manifest.get("site_metadata", {})
 
+    if manifest.get("mode") == "delta":
+        # Delta exports only carry sites whose listings changed
+        return True, f"Delta export: {len(site_metadata)} sites with changes"
+
     if not site_metadata:
         return False, "No site metadata in manifest"
 
@@ -149,6 +197,11 @@ def main() -> int:
         type=str,
         help="Comma-separated list of expected sites (e.g., 'g2a,g2g')",
     )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        help="Scheduler run-metrics file (default: <export-dir>/run_metrics.jsonl)",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -168,8 +221,13 @@ def main() -> int:
 
     checks = []
 
-    check_ok, msg = check_export_recency(export_dir, args.max_age_hours)
-    checks.append({"name": "Export Recency", "ok": check_ok, "message": msg})
+    last_run = read_last_run(args.metrics_file or export_dir / "run_metrics.jsonl")
+    if last_run is not None:
+        check_ok, msg = check_last_run(last_run, args.max_age_hours)
+        checks.append({"name": "Last Run", "ok": check_ok, "message": msg})
+    else:
+        check_ok, msg = check_export_recency(export_dir, args.max_age_hours)
+        checks.append({"name": "Export Recency", "ok": check_ok, "message": msg})
 
     latest_manifest = max(
         export_dir.glob("*manifest*.json"),
@@ -186,7 +244,7 @@ def main() -> int:
         check_ok, msg = check_exports_exist(manifest)
         checks.append({"name": "Exports Exist", "ok": check_ok, "message": msg})
 
-        check_ok, msg = check_exports_integrity(manifest)
+        check_ok, msg = check_exports_integrity(manifest, last_run)
         checks.append({"name": "Integrity Check", "ok": check_ok, "message": msg})
 
         expected_sites = args.expected_sites.split(",") if args.expected_sites else None
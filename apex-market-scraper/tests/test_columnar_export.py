@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from apex_market_scraper.config.models import ExportConfig
+from apex_market_scraper.export.writers import (
+    APEX_TEMPLATE_COLUMNS,
+    HIDDEN_METADATA_COLUMNS,
+    export_records,
+)
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+RECORDS = [
+    {
+        "site": "g2g",
+        "category": "Games",
+        "name": "Gold",
+        "description": "100k",
+        "price": 4.5,
+        "stock": 3,
+        "url": "https://example.invalid/p/1",
+    },
+    {"site": "g2a", "category": "Keys", "name": "Key", "price": None, "url": "https://example.invalid/p/2"},
+]
+
+
+def test_parquet_and_arrow_exports_share_a_typed_schema(tmp_path: Path) -> None:
+    cfg = ExportConfig(output_dir=tmp_path, formats=["parquet", "arrow"])
+    written = export_records(RECORDS, cfg)
+
+    parquet_path = next(p for p in written if p.suffix == ".parquet")
+    arrow_path = next(p for p in written if p.suffix == ".arrow")
+
+    from_parquet = pq.read_table(parquet_path)
+    with pa.memory_map(str(arrow_path), "r") as source:
+        from_arrow = pa.ipc.open_file(source).read_all()
+
+    assert from_parquet.equals(from_arrow)
+    assert from_arrow.column_names == APEX_TEMPLATE_COLUMNS + HIDDEN_METADATA_COLUMNS
+    assert from_arrow.schema.field("Price_USD").type == pa.float64()
+    assert from_arrow.column("Price_USD").to_pylist() == [4.5, None]
+    assert from_arrow.column("Additional_Info").to_pylist() == ["Stock: 3", None]
+    assert from_arrow.column("product_url").to_pylist()[1] == "https://example.invalid/p/2"
+
+
+def test_delta_columnar_export_types_change_columns(tmp_path: Path) -> None:
+    cfg = ExportConfig(output_dir=tmp_path, formats=["parquet"], mode="delta")
+    written = export_records(RECORDS, cfg)
+
+    table = pq.read_table(next(p for p in written if p.suffix == ".parquet"))
+    assert table.schema.field("previous_stock").type == pa.int64()
+    assert table.column("change_type").to_pylist() == ["new", "new"]
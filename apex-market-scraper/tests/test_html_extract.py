@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from apex_market_scraper.config.models import SiteConfig
+from apex_market_scraper.sites.g2a import G2AScraper
+from apex_market_scraper.sites.g2g import G2GScraper
+from apex_market_scraper.sites.html_extract import HtmlListingExtractor, clean_html
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def _scaled(path: Path, scale: int) -> str:
+    html = path.read_text(encoding="utf-8")
+    head, _, rest = html.partition("<body>")
+    body, _, tail = rest.partition("</body>")
+    return f"{head}<body>{body * scale}</body>{tail}"
+
+
+def test_fields_collects_data_attributes_in_one_pass() -> None:
+    block = (
+        '<h2 class="card-title">Gold <b>x1000</b></h2>'
+        '<span data-price="" data-price="5.25" data-currency="EUR" data-stock="7">'
+        '<a href="/p/1">x</a> data-min-pieces="2"'
+    )
+    fields = HtmlListingExtractor.fields(block)
+
+    assert fields.title == "Gold x1000"
+    assert fields.href == "/p/1"
+    assert fields.price() == "5.25"
+    assert fields.data == {"price": "5.25", "currency": "EUR", "stock": "7", "min-pieces": "2"}
+
+
+def test_price_fallbacks() -> None:
+    span = HtmlListingExtractor.fields('<span class="price">USD 12.5</span>')
+    assert span.price() == "12.5"
+
+    symbol = HtmlListingExtractor.fields("<p>only £ 3.99 today</p>")
+    assert symbol.price() is None
+    assert symbol.price(symbol_fallback=True) == "3.99"
+    assert symbol.currency_symbol() == "GBP"
+
+
+def test_blocks_match_container_class_case_insensitively() -> None:
+    extractor = HtmlListingExtractor("listing-item")
+    html = (
+        '<DIV class="x Listing-Item"><h2 class="title">A</h2></div></div>'
+        '<div class="other">B</div></div>'
+    )
+    assert [f.title for f in extractor.extract(html)] == ["A"]
+    assert clean_html("  <i>a</i>\n b ") == "a b"
+
+
+@pytest.mark.parametrize(
+    ("scraper_cls", "fixture", "per_copy"),
+    [
+        (G2GScraper, FIXTURES_DIR / "g2g" / "html_listing.html", 2),
+        (G2AScraper, FIXTURES_DIR / "g2a" / "normal_listings.html", 5),
+    ],
+)
+def test_parsers_scale_to_thousand_fold_fixtures(
+    scraper_cls: type[G2GScraper] | type[G2AScraper], fixture: Path, per_copy: int
+) -> None:
+    kind = "g2g" if scraper_cls is G2GScraper else "g2a"
+    scraper = scraper_cls(site=SiteConfig(name=kind, kind=kind), api_key=None, task_id="t")
+
+    single = scraper._parse_html_listings(_scaled(fixture, 1), "https://example.invalid/")
+    scaled = scraper._parse_html_listings(_scaled(fixture, 1000), "https://example.invalid/")
+
+    assert len(single) == per_copy
+    assert len(scaled) == per_copy * 1000
+    assert scaled[-per_copy:] == single
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import pytest
+import requests
+
+from apex_market_scraper.config.models import SiteConfig
+from apex_market_scraper.core.http_cache import HttpCache
+from apex_market_scraper.core.http_client import ResilientHttpClient
+from apex_market_scraper.core.models import HttpResponse, ProductRecord, RequestSpec
+from apex_market_scraper.sites.base import BaseSiteScraper
+
+
+class _CountingScraper(BaseSiteScraper):
+    parses = 0
+
+    def build_requests(self) -> list[RequestSpec]:
+        return [RequestSpec(url="https://example.invalid/listings", params={"page": 1})]
+
+    def parse_listing(
+        self, response: HttpResponse, request: RequestSpec
+    ) -> list[Mapping[str, Any]]:
+        type(self).parses += 1
+        return [
+            {"name": line, "url": f"https://example.invalid/p/{line}"}
+            for line in response.text.split()
+        ]
+
+    def normalize_record(self, raw: Mapping[str, Any]) -> ProductRecord:
+        return ProductRecord(
+            site_name=self.site.name,
+            site_kind=self.site.kind,
+            product_name=str(raw["name"]),
+            category=None,
+            price=None,
+            currency=None,
+            description=None,
+            min_quantity=None,
+            max_quantity=None,
+            seller_rating=None,
+            sold_amount=None,
+            stock=None,
+            delivery_eta=None,
+            refill_available=None,
+            warranty=None,
+            product_url=str(raw["url"]),
+        )
+
+
+class _FakeServer:
+    def __init__(self, body: bytes, *, etag: str | None = '"v1"') -> None:
+        self.body = body
+        self.etag = etag
+        self.robots_fetches = 0
+        self.conditional_headers: list[dict[str, str]] = []
+
+    def get(self, url: str, **_kwargs: Any) -> requests.Response:
+        self.robots_fetches += 1
+        return self._response(url, 200, b"User-agent: *\nAllow: /\n")
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        headers = kwargs.get("headers") or {}
+        self.conditional_headers.append(
+            {k: v for k, v in headers.items() if k.startswith("If-")}
+        )
+        if self.etag and headers.get("If-None-Match") == self.etag:
+            return self._response(url, 304, b"")
+        resp = self._response(url, 200, self.body)
+        if self.etag:
+            resp.headers["ETag"] = self.etag
+        return resp
+
+    @staticmethod
+    def _response(url: str, status_code: int, body: bytes) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = status_code
+        resp.url = url
+        resp._content = body
+        resp.encoding = "utf-8"
+        return resp
+
+
+def _scraper(server: _FakeServer, cache: HttpCache) -> _CountingScraper:
+    session = requests.Session()
+    session.get = server.get  # type: ignore[method-assign]
+    session.request = server.request  # type: ignore[method-assign]
+    client = ResilientHttpClient(session=session, cache=cache)
+    site = SiteConfig(name="cached", kind="cached_test", params={"max_attempts": 1})
+    return _CountingScraper(site=site, api_key=None, task_id="t", http_client=client)
+
+
+@pytest.fixture(autouse=True)
+def _reset_parse_count() -> None:
+    _CountingScraper.parses = 0
+
+
+def test_not_modified_page_skips_parsing(tmp_path: Path) -> None:
+    server = _FakeServer(b"a b c")
+    cache = HttpCache(tmp_path / "cache.sqlite3")
+
+    first, meta1 = _scraper(server, cache).scrape_with_metadata()
+    second, meta2 = _scraper(server, cache).scrape_with_metadata()
+
+    assert [r.product_name for r in second] == [r.product_name for r in first] == ["a", "b", "c"]
+    assert _CountingScraper.parses == 1
+    assert server.conditional_headers[1] == {"If-None-Match": '"v1"'}
+    assert meta1.pages_skipped == 0
+    assert meta2.pages_not_modified == 1
+    assert meta2.pages_skipped == 1
+    assert meta2.bytes_saved == len(b"a b c")
+    # robots.txt is served from the on-disk cache for the second client
+    assert server.robots_fetches == 1
+
+
+def test_unchanged_body_without_validators_skips_parsing(tmp_path: Path) -> None:
+    server = _FakeServer(b"x y", etag=None)
+    cache = HttpCache(tmp_path / "cache.sqlite3")
+
+    _scraper(server, cache).scrape_with_metadata()
+    records, meta = _scraper(server, cache).scrape_with_metadata()
+
+    assert len(records) == 2
+    assert _CountingScraper.parses == 1
+    assert meta.pages_skipped == 1
+    assert meta.pages_not_modified == 0
+    assert meta.bytes_saved == 0
+
+    server.body = b"x y z"
+    records, meta = _scraper(server, cache).scrape_with_metadata()
+    assert len(records) == 3
+    assert _CountingScraper.parses == 2
+    assert meta.pages_skipped == 0
+
+
+def test_robots_cache_expires_after_ttl(tmp_path: Path) -> None:
+    cache = HttpCache(tmp_path / "cache.sqlite3", robots_ttl_seconds=0)
+    cache.put_robots("https://example.invalid", "User-agent: *\nDisallow: /\n")
+    assert cache.get_robots("https://example.invalid") is None
+
+    cache = HttpCache(tmp_path / "cache.sqlite3", robots_ttl_seconds=60)
+    assert cache.get_robots("https://example.invalid") == "User-agent: *\nDisallow: /\n"
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import pickle
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from apex_market_scraper.config.models import SiteConfig
+from apex_market_scraper.core.http_cache import HttpCache
+from apex_market_scraper.core.http_client import ResilientHttpClient
+from apex_market_scraper.core.models import HttpResponse, ProductRecord, RequestSpec
+from apex_market_scraper.core.parse_pool import PageJob, from_wire, to_wire
+from apex_market_scraper.sites.base import BaseSiteScraper
+
+
+class _PagedScraper(BaseSiteScraper):
+    def build_requests(self) -> list[RequestSpec]:
+        pages = int(self.site.params.get("pages", 1))
+        return [
+            RequestSpec(url="https://example.invalid/listings", params={"page": n})
+            for n in range(pages)
+        ]
+
+    def parse_listing(
+        self, response: HttpResponse, request: RequestSpec
+    ) -> list[Mapping[str, Any]]:
+        page = request.params["page"] if request.params else 0
+        return [{"name": f"{page}-{word}", "page": page} for word in response.text.split()]
+
+    def normalize_record(self, raw: Mapping[str, Any]) -> ProductRecord:
+        return ProductRecord(
+            site_name="ignored",
+            site_kind="ignored",
+            product_name=str(raw["name"]),
+            category=None,
+            price=None,
+            currency=None,
+            description=None,
+            min_quantity=None,
+            max_quantity=None,
+            seller_rating=None,
+            sold_amount=None,
+            stock=None,
+            delivery_eta=None,
+            refill_available=None,
+            warranty=None,
+            product_url=f"https://example.invalid/p/{raw['name']}",
+        )
+
+
+def _session(body: bytes) -> requests.Session:
+    def respond(url: str, status_code: int, content: bytes) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = status_code
+        resp.url = url
+        resp._content = content
+        resp.encoding = "utf-8"
+        resp.headers["ETag"] = '"v1"'
+        return resp
+
+    session = requests.Session()
+    session.get = lambda url, **_kw: respond(url, 200, b"User-agent: *\nAllow: /\n")  # type: ignore[method-assign]
+    session.request = lambda method, url, **_kw: respond(url, 200, body)  # type: ignore[method-assign]
+    return session
+
+
+def _names(records: list[ProductRecord]) -> list[tuple[str, str]]:
+    return [(r.product_name, r.product_url) for r in records]
+
+
+def _scrape(params: dict[str, Any], body: bytes, cache: HttpCache | None = None):
+    site = SiteConfig(
+        name="paged", kind="paged_test", params={"max_attempts": 1, "pages": 7, **params}
+    )
+    client = ResilientHttpClient(session=_session(body), cache=cache)
+    scraper = _PagedScraper(site=site, api_key=None, task_id="t", http_client=client)
+    return scraper.scrape_with_metadata()
+
+
+def test_process_pool_matches_inline_parsing() -> None:
+    body = "café ünï x".encode()
+    inline, inline_meta = _scrape({}, body)
+    pool_params = {"parse_workers": 2, "parse_batch_pages": 2, "parse_queue_batches": 1}
+    pooled, pooled_meta = _scrape(pool_params, body)
+
+    assert _names(pooled) == _names(inline)
+    assert len(pooled) == 21
+    assert pooled[0].product_name == "0-café"
+    assert {r.site_name for r in pooled} == {"paged"}
+    assert pooled_meta.errors == []
+    assert pooled_meta.requests_executed == inline_meta.requests_executed == 7
+    assert pooled_meta.raw_records_parsed == pooled_meta.records_normalized == 21
+
+
+def test_pool_results_are_written_to_http_cache(tmp_path: Path) -> None:
+    cache = HttpCache(tmp_path / "cache.sqlite3")
+    first, _ = _scrape({"parse_workers": 2}, b"a b", cache)
+    second, meta = _scrape({"parse_workers": 2}, b"a b", cache)
+
+    assert _names(second) == _names(first)
+    assert meta.pages_skipped == 7
+
+
+def test_wire_format_ships_bytes_only() -> None:
+    response = HttpResponse(
+        url="https://example.invalid",
+        status_code=200,
+        headers={},
+        text="naïve",
+        content="naïve".encode("latin-1"),
+        encoding="latin-1",
+    )
+    job = to_wire(PageJob(request=RequestSpec(url="https://example.invalid"), response=response))
+
+    assert job.response is not None and job.response.text == ""
+    restored = pickle.loads(pickle.dumps(job))
+    assert from_wire(restored.response).text == "naïve"
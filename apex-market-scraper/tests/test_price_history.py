@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+from typing import Any
+
+from apex_market_scraper.config.models import ExportConfig
+from apex_market_scraper.export.history import PriceHistoryStore
+from apex_market_scraper.export.writers import export_records
+
+
+def _record(
+    url: str, *, site: str = "g2g", price: float = 1.0, stock: int | None = 10
+) -> dict[str, Any]:
+    return {
+        "site": site, "name": url.rsplit("/", 1)[-1], "price": price, "stock": stock, "url": url
+    }
+
+
+def test_apply_reports_new_price_stock_and_delisted(tmp_path: Path) -> None:
+    with PriceHistoryStore(tmp_path / "history.sqlite3") as store:
+        scrape = [_record("https://x/a"), _record("https://x/b"), _record("https://x/c")]
+        first = store.apply(scrape)
+        assert [r["change_type"] for r in first] == ["new", "new", "new"]
+
+        assert store.apply(scrape) == []
+
+        changes = store.apply([
+            _record("https://x/a", price=2.5),
+            _record("https://x/b", stock=3),
+            _record("https://x/d"),
+        ])
+        by_url = {r["url"]: r for r in changes}
+        assert by_url["https://x/a"]["change_type"] == "price_changed"
+        assert by_url["https://x/a"]["previous_price"] == 1.0
+        assert by_url["https://x/b"]["change_type"] == "stock_changed"
+        assert by_url["https://x/b"]["previous_stock"] == 10
+        assert by_url["https://x/c"]["change_type"] == "delisted"
+        assert by_url["https://x/d"]["change_type"] == "new"
+
+        # A delisted listing that comes back is reported as new again
+        relisted = store.apply([
+            _record("https://x/a", price=2.5),
+            _record("https://x/b", stock=3),
+            _record("https://x/c"),
+            _record("https://x/d"),
+        ])
+        assert [(r["url"], r["change_type"]) for r in relisted] == [("https://x/c", "new")]
+
+        history = [h["change_type"] for h in store.history("https://x/c")]
+        assert history == ["new", "delisted", "new"]
+
+
+def test_sites_missing_from_a_scrape_are_not_delisted(tmp_path: Path) -> None:
+    with PriceHistoryStore(tmp_path / "history.sqlite3") as store:
+        store.apply([_record("https://x/a", site="g2g"), _record("https://y/a", site="g2a")])
+        # g2a failed this run: nothing from it should be delisted
+        assert store.apply([_record("https://x/a", site="g2g")]) == []
+
+
+def test_delta_export_writes_only_changes(tmp_path: Path) -> None:
+    cfg = ExportConfig(
+        output_dir=tmp_path / "out",
+        formats=["csv"],
+        apex_bot_drop_dir=tmp_path / "drop",
+        mode="delta",
+    )
+
+    export_records([_record("https://x/a"), _record("https://x/b")], cfg)
+    written = export_records([_record("https://x/a", price=9.0), _record("https://x/b")], cfg)
+
+    csv_path = next(p for p in written if p.suffix == ".csv")
+    assert csv_path.name.startswith("market_listings_delta_")
+    with csv_path.open(encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 1
+    assert rows[0]["product_url"] == "https://x/a"
+    assert rows[0]["change_type"] == "price_changed"
+    assert rows[0]["previous_price"] == "1.0"
+
+    manifest_path = next(p for p in written if p.suffix == ".json")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert manifest["mode"] == "delta"
+    assert manifest["changes"] == {"price_changed": 1}
+    assert (tmp_path / "out" / "price_history.sqlite3").exists()
+    # Partial files must never reach the bot's full-catalogue import
+    assert not (tmp_path / "drop").exists()
+
+
+def test_full_exports_keep_history_for_a_later_delta_run(tmp_path: Path) -> None:
+    cfg = ExportConfig(output_dir=tmp_path / "out", formats=["csv"], mode="full")
+
+    export_records([_record("https://x/a"), _record("https://x/b")], cfg)
+    written = export_records([_record("https://x/a", price=9.0), _record("https://x/b")], cfg)
+
+    csv_path = next(p for p in written if p.suffix == ".csv")
+    assert not csv_path.name.startswith("market_listings_delta_")
+    with csv_path.open(encoding="utf-8") as f:
+        assert len(list(csv.DictReader(f))) == 2
+    with PriceHistoryStore(cfg.resolved_history_path()) as store:
+        assert [h["change_type"] for h in store.history("https://x/a")] == ["new", "price_changed"]
+
+    # Switching to delta mode only reports what changed since the last full run
+    delta_cfg = cfg.model_copy(update={"mode": "delta"})
+    scrape = [_record("https://x/a", price=9.0), _record("https://x/b", stock=1)]
+    written = export_records(scrape, delta_cfg)
+    csv_path = next(p for p in written if p.suffix == ".csv")
+    with csv_path.open(encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [(r["product_url"], r["change_type"]) for r in rows] == [
+        ("https://x/b", "stock_changed")
+    ]
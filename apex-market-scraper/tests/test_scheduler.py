@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import random
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from apex_market_scraper.config.loader import RuntimeSettings
+from apex_market_scraper.config.models import AppConfig
+from apex_market_scraper.core.models import ProductRecord, ScrapeMetrics, ScrapeResult, SiteMetadata
+from apex_market_scraper.scheduler import runner
+from apex_market_scraper.scheduler.lock import RunLock
+from apex_market_scraper.scheduler.metrics import read_last_run
+
+HOUR = 3600.0
+# A UTC midnight, so 12h-aligned slots are easy to reason about
+EPOCH = datetime(2026, 1, 1, tzinfo=UTC).timestamp()
+
+
+def _record(site: str, n: int) -> ProductRecord:
+    return ProductRecord(
+        site_name=site,
+        site_kind="fake",
+        product_name=f"{site}-{n}",
+        category=None,
+        price=1.0,
+        currency="USD",
+        description=None,
+        min_quantity=None,
+        max_quantity=None,
+        seller_rating=None,
+        sold_amount=None,
+        stock=None,
+        delivery_eta=None,
+        refill_available=None,
+        warranty=None,
+        product_url=f"https://example.invalid/{site}/{n}",
+    )
+
+
+class _FakeScrape:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def __call__(self, cfg: AppConfig, settings: RuntimeSettings, *, sites: Any) -> ScrapeResult:
+        names = [s.name for s in cfg.sites if s.enabled] if sites == "all" else list(sites)
+        self.calls.append(names)
+        now = datetime.now(tz=UTC)
+        metadata = {
+            name: SiteMetadata(
+                site_name=name,
+                site_kind="fake",
+                task_id="t",
+                started_at=now,
+                finished_at=now,
+                requests_executed=1,
+                bytes_fetched=100,
+            )
+            for name in names
+        }
+        records = [_record(name, len(self.calls)) for name in names]
+        return ScrapeResult(
+            records=records,
+            site_metadata=metadata,
+            metrics=ScrapeMetrics(len(names), len(names), len(records), len(records)),
+            events=[],
+        )
+
+
+def _config(tmp_path: Path) -> AppConfig:
+    return AppConfig(
+        scheduler={"cadence_hours": 12, "jitter_seconds": 60},
+        export={"output_dir": tmp_path / "out"},
+        sites=[
+            {"name": "slow", "kind": "fake"},
+            {"name": "fast", "kind": "fake", "cadence_hours": 1},
+            {"name": "off", "kind": "fake", "enabled": False},
+        ],
+    )
+
+
+def test_next_run_at_aligns_to_wall_clock_with_bounded_jitter() -> None:
+    now = EPOCH + 5 * HOUR
+    assert runner.next_run_at(now, 12 * HOUR) == EPOCH + 12 * HOUR
+    assert runner.next_run_at(now, 12 * HOUR, align=False) == now + 12 * HOUR
+
+    rng = random.Random(1)
+    runs = [runner.next_run_at(now, HOUR, jitter_seconds=7200, rng=rng) for _ in range(50)]
+    assert all(EPOCH + 6 * HOUR <= at <= EPOCH + 6.5 * HOUR for at in runs)
+
+
+def test_cycle_is_skipped_while_another_holds_the_lock(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cfg = _config(tmp_path)
+    fake = _FakeScrape()
+    monkeypatch.setattr(runner, "run_scrape", fake)
+
+    with RunLock(cfg.resolved_lock_path()) as held:
+        assert held.acquire()
+        assert runner.run_cycle(cfg, RuntimeSettings()) is None
+    assert fake.calls == []
+    assert not cfg.resolved_metrics_path().exists()
+
+    metrics = runner.run_cycle(cfg, RuntimeSettings())
+    assert metrics is not None and metrics.records == 2
+
+
+def test_scheduler_runs_sites_on_their_own_cadence(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cfg = _config(tmp_path)
+    fake = _FakeScrape()
+    monkeypatch.setattr(runner, "run_scrape", fake)
+    clock = {"now": EPOCH + 10}
+
+    def sleep(seconds: float) -> None:
+        clock["now"] += max(seconds, 1.0)
+        if clock["now"] > EPOCH + 12.5 * HOUR:
+            raise KeyboardInterrupt
+
+    runner.run_scheduler(
+        cfg, RuntimeSettings(), clock=lambda: clock["now"], sleep=sleep, rng=random.Random(0)
+    )
+
+    assert fake.calls[0] == ["fast", "slow"]
+    assert fake.calls[1:12] == [["fast"]] * 11
+    assert sorted(fake.calls[12]) == ["fast", "slow"]
+
+    lines = cfg.resolved_metrics_path().read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(fake.calls)
+    last = read_last_run(cfg.resolved_metrics_path())
+    # The slow site's records are carried into exports from fast-only cycles
+    second = json.loads(lines[1])
+    assert second["sites"] == ["fast"]
+    assert second["records"] == 2
+    assert second["bytes_fetched"] == 100
+    assert set(second["stages"]) == {"scrape", "export", "total"}
+    assert last is not None and len(last["exports"]) == 1
+
+
+def test_monitor_uses_run_metrics_instead_of_rehashing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    spec = importlib.util.spec_from_file_location(
+        "monitor_exports", Path(__file__).parents[1] / "scripts" / "monitor_exports.py"
+    )
+    assert spec and spec.loader
+    monitor = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(monitor)
+
+    cfg = _config(tmp_path)
+    monkeypatch.setattr(runner, "run_scrape", _FakeScrape())
+    runner.run_cycle(cfg, RuntimeSettings())
+
+    last_run = read_last_run(cfg.resolved_metrics_path())
+    assert monitor.check_last_run(last_run)[0]
+
+    manifest_path = next(cfg.export.output_dir.glob("*manifest*.json"))
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    ok, message = monitor.check_exports_integrity(manifest, last_run)
+    assert ok and "unchanged since the last run" in message
+
+    csv_path = Path(manifest["exports"]["csv"]["path"])
+    csv_path.write_text("tampered", encoding="utf-8")
+    ok, message = monitor.check_exports_integrity(manifest, last_run)
+    assert not ok and "Checksum mismatches" in message
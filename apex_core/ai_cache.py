@@ -0,0 +1,193 @@
+"""Precomputed product context, keyword matching and response caching for AI support."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+# Terms that mark a question as being about the store or the bot itself
+PRODUCT_INDICATORS = (
+    "product", "buy", "purchase", "order", "price", "cost", "service",
+    "available", "stock", "catalog", "store", "shop", "item", "variant",
+    "category", "discount", "promo", "wallet", "balance", "refund",
+    "ticket", "support", "command", "/", "!", "bot",
+)
+
+# Maximum number of products rendered into the AI prompt
+PRODUCT_CONTEXT_LIMIT = 50
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class KeywordMatcher:
+    """Aho–Corasick automaton answering "does the text contain any keyword?".
+
+    Matching is case-insensitive substring matching, identical to checking
+    ``keyword in text.lower()`` for every keyword, but runs in a single pass
+    over the text regardless of how many keywords there are.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._terminal: list[bool] = [False]
+
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._terminal.append(False)
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._terminal[state] = True
+
+        # Breadth-first construction of failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._terminal[self._fail[next_state]]:
+                    self._terminal[next_state] = True
+
+    def matches(self, text: str) -> bool:
+        """Return True if any keyword occurs in ``text``."""
+        goto, fail, terminal = self._goto, self._fail, self._terminal
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if terminal[state]:
+                return True
+        return False
+
+
+def render_product_context(products: list) -> str:
+    """Render the product list shown to the AI model."""
+    if not products:
+        return "No products available."
+
+    lines = ["AVAILABLE PRODUCTS:"]
+    for product in products[:PRODUCT_CONTEXT_LIMIT]:
+        product = dict(product)
+        name = product.get("variant_name") or "Unknown"
+        category = product.get("main_category") or "Unknown"
+        subcategory = product.get("sub_category") or ""
+        price = f"${(product.get('price_cents') or 0) / 100:.2f}"
+        label = f"{category} > {subcategory}" if subcategory else category
+        lines.append(f"- {name} ({label}): {price}")
+
+    context = "\n".join(lines) + "\n"
+    if len(products) > PRODUCT_CONTEXT_LIMIT:
+        context += f"\n... and {len(products) - PRODUCT_CONTEXT_LIMIT} more products."
+    return context
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Product context and keyword matcher built for one catalog version."""
+
+    version: str
+    product_context: str
+    matcher: KeywordMatcher
+
+    def is_product_question(self, question: str) -> bool:
+        return self.matcher.matches(question)
+
+
+class ProductContextBuilder:
+    """Builds a :class:`CatalogSnapshot` once per catalog version."""
+
+    def __init__(self, db) -> None:
+        self.db = db
+        self._snapshot: Optional[CatalogSnapshot] = None
+
+    async def get_snapshot(self) -> CatalogSnapshot:
+        version = await self.db.get_catalog_version()
+        if self._snapshot is None or self._snapshot.version != version:
+            products = await self.db.get_all_products(active_only=True)
+            names = [dict(product).get("variant_name") or "" for product in products]
+            self._snapshot = CatalogSnapshot(
+                version=version,
+                product_context=render_product_context(products),
+                matcher=KeywordMatcher([*PRODUCT_INDICATORS, *names]),
+            )
+        return self._snapshot
+
+    async def context_for(self, question: str, snapshot: CatalogSnapshot) -> str:
+        """Products relevant to ``question``, best match first, from the search index.
+
+        Falls back to the snapshot's catalog overview when nothing matches.
+        """
+        products, _ = await self.db.search_products(
+            question, match_any=True, limit=PRODUCT_CONTEXT_LIMIT
+        )
+        return render_product_context(products) if products else snapshot.product_context
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question so trivially different phrasings share a cache entry."""
+    return _WHITESPACE.sub(" ", question.strip().lower()).rstrip("?!. ")
+
+
+class ResponseCache:
+    """LRU cache of AI responses with a TTL and hit-rate metrics."""
+
+    def __init__(self, *, max_entries: int = 512, ttl_seconds: float = 3600.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(question: str, tier: str, catalog_version: str, user_context: str = "") -> tuple:
+        """Build a cache key; personalised prompts only share entries with themselves."""
+        context_digest = hashlib.sha256(user_context.encode()).hexdigest() if user_context else ""
+        return (normalize_question(question), tier, catalog_version, context_digest)
+
+    def get(self, key: tuple) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: tuple, response: str) -> None:
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
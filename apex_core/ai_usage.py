@@ -0,0 +1,147 @@
+"""In-memory AI quota counters with batched persistence."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from typing import Optional
+
+from .logger import get_logger
+
+logger = get_logger()
+
+# Seconds between background flushes of buffered usage
+AI_USAGE_FLUSH_INTERVAL = 10.0
+# Flush early once this many questions are buffered
+AI_USAGE_MAX_PENDING = 200
+
+_USAGE_FIELDS = ("general_questions", "product_questions", "images_generated")
+
+
+class AIUsageTracker:
+    """Source of truth for daily AI quotas.
+
+    Each user's counters for the current day are loaded from ``ai_daily_usage``
+    once and then served from memory. Increments and ``ai_usage_logs`` rows are
+    buffered and written in one transaction per flush. Pending usage is flushed
+    on :meth:`close`, so at most one flush interval of usage is lost on a crash.
+    """
+
+    def __init__(
+        self,
+        db,
+        *,
+        flush_interval: float = AI_USAGE_FLUSH_INTERVAL,
+        max_pending: int = AI_USAGE_MAX_PENDING,
+    ) -> None:
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._usage_date: Optional[str] = None
+        self._counts: dict[int, dict[str, int]] = {}
+        self._pending: dict[tuple[int, str], dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(_USAGE_FIELDS, 0)
+        )
+        self._pending_logs: list[tuple] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _roll_date(self, usage_date: str) -> None:
+        # Counters are only kept for the current day
+        if usage_date != self._usage_date:
+            self._usage_date = usage_date
+            self._counts.clear()
+
+    async def get_usage(self, user_id: int, usage_date: str) -> dict[str, int]:
+        """Return the user's counters for ``usage_date``."""
+        self._roll_date(usage_date)
+        counts = self._counts.get(user_id)
+        if counts is None:
+            stored = await self.db.get_ai_daily_usage(user_id, usage_date)
+            # Another caller may have loaded (and incremented) while we awaited
+            counts = self._counts.setdefault(
+                user_id, {field: stored.get(field, 0) for field in _USAGE_FIELDS}
+            )
+        return dict(counts)
+
+    async def increment(self, user_id: int, usage_date: str, field: str) -> None:
+        """Count one unit of usage against the user's daily quota."""
+        if field not in _USAGE_FIELDS:
+            raise ValueError(f"Unknown AI usage field: {field}")
+        await self.get_usage(user_id, usage_date)
+        self._counts[user_id][field] += 1
+        self._pending[(user_id, usage_date)][field] += 1
+        await self._maybe_flush()
+
+    async def log(
+        self,
+        user_id: int,
+        tier: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cost_cents: int,
+        question_preview: str,
+    ) -> None:
+        """Buffer an ``ai_usage_logs`` row."""
+        self._pending_logs.append((
+            user_id, tier, model, input_tokens, output_tokens,
+            input_tokens + output_tokens, cost_cents, question_preview[:100],
+        ))
+        await self._maybe_flush()
+
+    async def _maybe_flush(self) -> None:
+        if len(self._pending) + len(self._pending_logs) >= self.max_pending:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write buffered usage in one transaction.
+
+        Returns:
+            Number of buffered rows written
+        """
+        async with self._flush_lock:
+            pending, self._pending = self._pending, defaultdict(
+                lambda: dict.fromkeys(_USAGE_FIELDS, 0)
+            )
+            logs, self._pending_logs = self._pending_logs, []
+            increments = [
+                (user_id, usage_date, *(delta[field] for field in _USAGE_FIELDS))
+                for (user_id, usage_date), delta in pending.items()
+            ]
+            if not increments and not logs:
+                return 0
+            try:
+                await self.db.flush_ai_usage(increments, logs)
+            except Exception:
+                # Keep the buffers so the next flush retries them
+                for key, delta in pending.items():
+                    for field, value in delta.items():
+                        self._pending[key][field] += value
+                self._pending_logs[:0] = logs
+                raise
+            return len(increments) + len(logs)
+
+    def start(self) -> None:
+        """Start the background flush loop."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush AI usage: {e}")
+
+    async def close(self) -> None:
+        """Stop the flush loop and persist everything still buffered."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
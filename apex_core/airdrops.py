@@ -0,0 +1,196 @@
+"""Airdrop claim engine that batches concurrent claims into single transactions."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+from .logger import get_logger
+
+logger = get_logger()
+
+# Seconds to collect concurrent claims before writing them together
+AIRDROP_BATCH_WINDOW = 0.05
+# Claims written per transaction
+AIRDROP_MAX_BATCH = 100
+
+# Claim outcomes
+CLAIMED = "claimed"
+NOT_FOUND = "not_found"
+EXPIRED = "expired"
+ALREADY_CLAIMED = "already_claimed"
+OWN_AIRDROP = "own_airdrop"
+EXHAUSTED = "exhausted"
+
+
+@dataclass
+class AirdropState:
+    """In-memory view of a persisted airdrop."""
+
+    id: int
+    code: str
+    creator_id: int
+    creator_name: str
+    total_amount_cents: int
+    per_claim_cents: int
+    max_claims: int
+    claim_count: int
+    expires_at: datetime
+    message: Optional[str] = None
+    claimed_by: set[int] = field(default_factory=set)
+    pending: dict[int, asyncio.Future] = field(default_factory=dict)
+    in_flight: set[int] = field(default_factory=set)
+    flush_task: Optional[asyncio.Task] = None
+
+    @property
+    def remaining(self) -> int:
+        return self.max_claims - self.claim_count
+
+    @property
+    def expired(self) -> bool:
+        return datetime.now(timezone.utc) >= self.expires_at
+
+
+@dataclass
+class ClaimResult:
+    """Outcome of a single claim attempt."""
+
+    status: str
+    airdrop: Optional[AirdropState] = None
+    balance_after_cents: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == CLAIMED
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+
+
+def format_timestamp(value: datetime) -> str:
+    """Format a datetime the way airdrop timestamps are stored (UTC)."""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class AirdropClaimEngine:
+    """Accepts airdrop claims from memory and persists them in batches.
+
+    Duplicate, late and self claims are rejected without touching the
+    database. Claims that pass are held for ``batch_window`` seconds (or until
+    ``max_batch`` are waiting) and written by :meth:`Database.claim_airdrop_batch`
+    in one transaction, whose ``UNIQUE`` constraint and conditional claim
+    counter remain the source of truth.
+    """
+
+    def __init__(
+        self,
+        db,
+        *,
+        batch_window: float = AIRDROP_BATCH_WINDOW,
+        max_batch: int = AIRDROP_MAX_BATCH,
+    ) -> None:
+        self.db = db
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._airdrops: dict[str, AirdropState] = {}
+        self._load_lock = asyncio.Lock()
+
+    def register(self, airdrop: AirdropState) -> None:
+        """Track a freshly created airdrop without reloading it."""
+        self._airdrops[airdrop.code] = airdrop
+
+    async def get(self, code: str) -> Optional[AirdropState]:
+        """Return the airdrop for ``code``, loading it from the database once."""
+        airdrop = self._airdrops.get(code)
+        if airdrop is not None:
+            return airdrop
+
+        async with self._load_lock:
+            airdrop = self._airdrops.get(code)
+            if airdrop is not None:
+                return airdrop
+            row = await self.db.get_airdrop(code)
+            if row is None:
+                return None
+            airdrop = AirdropState(
+                id=row["id"],
+                code=row["code"],
+                creator_id=row["creator_discord_id"],
+                creator_name=row["creator_name"] or "",
+                total_amount_cents=row["total_amount_cents"],
+                per_claim_cents=row["per_claim_cents"],
+                max_claims=row["max_claims"],
+                claim_count=row["claim_count"],
+                expires_at=_parse_timestamp(row["expires_at"]),
+                message=row["message"],
+                claimed_by=await self.db.get_airdrop_claimants(row["id"]),
+            )
+            self._airdrops[code] = airdrop
+            return airdrop
+
+    async def claim(self, code: str, user_id: int) -> ClaimResult:
+        """Claim ``code`` for ``user_id`` and wait for the batch to be written."""
+        airdrop = await self.get(code)
+        if airdrop is None:
+            return ClaimResult(NOT_FOUND)
+        if airdrop.expired:
+            self._forget(airdrop)
+            return ClaimResult(EXPIRED, airdrop)
+        if user_id == airdrop.creator_id:
+            return ClaimResult(OWN_AIRDROP, airdrop)
+        if user_id in airdrop.claimed_by or user_id in airdrop.pending or user_id in airdrop.in_flight:
+            return ClaimResult(ALREADY_CLAIMED, airdrop)
+        if airdrop.claim_count + len(airdrop.in_flight) + len(airdrop.pending) >= airdrop.max_claims:
+            return ClaimResult(EXHAUSTED, airdrop)
+
+        future = asyncio.get_running_loop().create_future()
+        airdrop.pending[user_id] = future
+        if len(airdrop.pending) >= self.max_batch:
+            await self._flush(airdrop)
+        elif airdrop.flush_task is None:
+            airdrop.flush_task = asyncio.create_task(self._flush_after_window(airdrop))
+        return await future
+
+    async def _flush_after_window(self, airdrop: AirdropState) -> None:
+        await asyncio.sleep(self.batch_window)
+        airdrop.flush_task = None
+        await self._flush(airdrop)
+
+    async def _flush(self, airdrop: AirdropState) -> None:
+        if airdrop.flush_task is not None and airdrop.flush_task is not asyncio.current_task():
+            airdrop.flush_task.cancel()
+            airdrop.flush_task = None
+        batch, airdrop.pending = airdrop.pending, {}
+        if not batch:
+            return
+
+        airdrop.in_flight.update(batch)
+        try:
+            balances = await self.db.claim_airdrop_batch(airdrop.id, list(batch))
+        except Exception as e:
+            logger.error(f"Failed to persist airdrop claims for {airdrop.code}: {e}", exc_info=True)
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            airdrop.in_flight.difference_update(batch)
+
+        airdrop.claim_count += len(balances)
+        airdrop.claimed_by.update(balances)
+        for user_id, future in batch.items():
+            if future.done():
+                continue
+            if user_id in balances:
+                future.set_result(ClaimResult(CLAIMED, airdrop, balances[user_id]))
+            elif airdrop.expired:
+                future.set_result(ClaimResult(EXPIRED, airdrop))
+            else:
+                future.set_result(ClaimResult(EXHAUSTED, airdrop))
+
+    def _forget(self, airdrop: AirdropState) -> None:
+        if not airdrop.pending and not airdrop.in_flight:
+            self._airdrops.pop(airdrop.code, None)
@@ -0,0 +1,258 @@
+"""Resumable, rate-adaptive DM broadcast engine backed by the announcement outbox."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, Optional, TypeVar
+
+import discord
+
+from .logger import get_logger
+
+logger = get_logger()
+
+T = TypeVar("T")
+
+# Outbox batch size; a crash can re-send at most one batch worth of DMs.
+BROADCAST_BATCH_SIZE = 25
+# Maximum concurrent in-flight DMs
+BROADCAST_CONCURRENCY = 5
+# Minimum seconds between progress callbacks
+BROADCAST_PROGRESS_INTERVAL = 5.0
+# Rate-limited sends are retried this many times before being marked failed
+BROADCAST_MAX_ATTEMPTS = 5
+
+
+class RecipientUnavailable(Exception):
+    """Raised by a send callable when a recipient can no longer be resolved."""
+
+
+@dataclass
+class BroadcastProgress:
+    """Snapshot of an announcement broadcast."""
+
+    announcement_id: int
+    sent: int = 0
+    failed: int = 0
+    pending: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.sent + self.failed + self.pending
+
+    @property
+    def done(self) -> bool:
+        return self.pending == 0
+
+
+class AdaptiveRateLimiter:
+    """Additive-increase / multiplicative-decrease pacing for outgoing DMs.
+
+    Sends are spaced ``1 / rate`` seconds apart. Each success nudges the rate up
+    towards ``max_rate``; a 429 halves it and pauses every sender until the
+    ``retry_after`` reported by Discord has elapsed.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = 1.0,
+        min_rate: float = 0.2,
+        max_rate: float = 5.0,
+        increase_step: float = 0.05,
+    ) -> None:
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.rate = min(max(rate, min_rate), max_rate)
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until the next send slot is available."""
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + 1.0 / self.rate
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_rate_limited(self, retry_after: float) -> None:
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._next_slot = max(self._next_slot, time.monotonic() + max(retry_after, 0.0))
+        logger.warning(
+            f"Broadcast rate limited | Retry after: {retry_after:.2f}s | New rate: {self.rate:.2f}/s"
+        )
+
+
+def _rate_limit_delay(error: Exception) -> Optional[float]:
+    """Return the retry-after delay if ``error`` is a rate limit response."""
+    if isinstance(error, discord.RateLimited):
+        return float(error.retry_after)
+    if isinstance(error, discord.HTTPException) and error.status == 429:
+        headers = getattr(error.response, "headers", None) or {}
+        try:
+            return float(headers.get("Retry-After", 1.0))
+        except (TypeError, ValueError):
+            return 1.0
+    return None
+
+
+def _describe_failure(error: Exception) -> str:
+    if isinstance(error, discord.Forbidden):
+        return "dms_disabled"
+    if isinstance(error, (discord.NotFound, RecipientUnavailable)):
+        return "recipient_unavailable"
+    return str(error) or error.__class__.__name__
+
+
+async def fan_out(
+    recipients: Iterable[T],
+    send: Callable[[T], Awaitable[None]],
+    *,
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    concurrency: int = BROADCAST_CONCURRENCY,
+    max_attempts: int = BROADCAST_MAX_ATTEMPTS,
+) -> tuple[int, int]:
+    """Send one-off notifications through the broadcast rate limiter.
+
+    Unlike :class:`BroadcastEngine` nothing is persisted, so this suits
+    notifications that follow a committed change, such as payout DMs.
+    Rate-limited sends are retried; other failures are only counted.
+
+    Returns:
+        Tuple of (sent, failed)
+    """
+    limiter = limiter or AdaptiveRateLimiter()
+    semaphore = asyncio.Semaphore(concurrency)
+    counts = {"sent": 0, "failed": 0}
+
+    async def deliver(recipient: T) -> None:
+        async with semaphore:
+            for attempt in range(1, max_attempts + 1):
+                await limiter.acquire()
+                try:
+                    await send(recipient)
+                except Exception as error:
+                    delay = _rate_limit_delay(error)
+                    if delay is not None:
+                        limiter.on_rate_limited(delay)
+                        if attempt < max_attempts:
+                            continue
+                    logger.debug(f"Notification failed | Recipient: {recipient} | Error: {_describe_failure(error)}")
+                    counts["failed"] += 1
+                    return
+                limiter.on_success()
+                counts["sent"] += 1
+                return
+
+    await asyncio.gather(*(deliver(recipient) for recipient in recipients))
+    return counts["sent"], counts["failed"]
+
+
+class BroadcastEngine:
+    """Drains an announcement's outbox, persisting every delivery outcome.
+
+    The engine is transport-agnostic: ``send`` receives a recipient's Discord ID
+    and must raise on failure. Because state lives in ``announcement_deliveries``
+    a broadcast can be resumed after a restart by calling :meth:`run` again.
+    """
+
+    def __init__(
+        self,
+        db,
+        *,
+        limiter: Optional[AdaptiveRateLimiter] = None,
+        batch_size: int = BROADCAST_BATCH_SIZE,
+        concurrency: int = BROADCAST_CONCURRENCY,
+        progress_interval: float = BROADCAST_PROGRESS_INTERVAL,
+        max_attempts: int = BROADCAST_MAX_ATTEMPTS,
+    ) -> None:
+        self.db = db
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.progress_interval = progress_interval
+        self.max_attempts = max_attempts
+
+    async def progress(self, announcement_id: int) -> BroadcastProgress:
+        counts = await self.db.get_announcement_delivery_counts(announcement_id)
+        return BroadcastProgress(
+            announcement_id=announcement_id,
+            sent=counts.get("sent", 0),
+            failed=counts.get("failed", 0),
+            pending=counts.get("pending", 0),
+        )
+
+    async def run(
+        self,
+        announcement_id: int,
+        send: Callable[[int], Awaitable[None]],
+        on_progress: Optional[Callable[[BroadcastProgress], Awaitable[None]]] = None,
+    ) -> BroadcastProgress:
+        """Deliver every pending recipient and mark the announcement completed."""
+        await self.db.set_announcement_status(announcement_id, "sending")
+        semaphore = asyncio.Semaphore(self.concurrency)
+        attempts: dict[int, int] = {}
+        last_progress = time.monotonic()
+
+        async def deliver(user_id: int) -> tuple[int, str, Optional[str]]:
+            async with semaphore:
+                await self.limiter.acquire()
+                try:
+                    await send(user_id)
+                except Exception as error:
+                    delay = _rate_limit_delay(error)
+                    if delay is not None:
+                        self.limiter.on_rate_limited(delay)
+                        attempts[user_id] = attempts.get(user_id, 0) + 1
+                        if attempts[user_id] < self.max_attempts:
+                            return user_id, "pending", "rate_limited"
+                        return user_id, "failed", "rate_limited"
+                    logger.debug(f"Broadcast delivery failed | User: {user_id} | Error: {error}")
+                    return user_id, "failed", _describe_failure(error)
+                self.limiter.on_success()
+                return user_id, "sent", None
+
+        while True:
+            batch = await self.db.get_pending_announcement_deliveries(
+                announcement_id, limit=self.batch_size
+            )
+            if not batch:
+                break
+
+            results = await asyncio.gather(*(deliver(user_id) for user_id in batch))
+            await self.db.record_announcement_deliveries(announcement_id, list(results))
+
+            if on_progress and time.monotonic() - last_progress >= self.progress_interval:
+                last_progress = time.monotonic()
+                await self._notify(on_progress, await self.progress(announcement_id))
+
+        final = await self.progress(announcement_id)
+        await self.db.update_announcement_stats(
+            announcement_id,
+            total_recipients=final.total,
+            successful_deliveries=final.sent,
+            failed_deliveries=final.failed,
+        )
+        await self.db.set_announcement_status(announcement_id, "completed")
+        logger.info(
+            f"Broadcast completed | Announcement: {announcement_id} | "
+            f"Sent: {final.sent} | Failed: {final.failed}"
+        )
+        return final
+
+    async def _notify(
+        self,
+        on_progress: Callable[[BroadcastProgress], Awaitable[None]],
+        progress: BroadcastProgress,
+    ) -> None:
+        try:
+            await on_progress(progress)
+        except Exception as error:
+            logger.debug(f"Broadcast progress callback failed: {error}")
@@ -0,0 +1,164 @@
+"""Streaming, compressed data exports that never hold a full table in memory."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal, Optional, Sequence
+
+import aiosqlite
+
+ExportFormat = Literal["csv", "jsonl"]
+
+# Rows fetched from the cursor per round trip
+EXPORT_CHUNK_SIZE = 1000
+# Default per-file cap (Discord's base attachment limit)
+DEFAULT_MAX_FILE_BYTES = 10 * 1024 * 1024
+# Headroom for data still buffered inside the gzip compressor when we rotate
+_ROTATE_HEADROOM_BYTES = 512 * 1024
+# Discord caps the whole message upload, not each attachment
+MAX_MESSAGE_UPLOAD_BYTES = 25 * 1024 * 1024
+MAX_ATTACHMENTS_PER_MESSAGE = 10
+# Room for the embed and multipart framing sent alongside the files
+_MESSAGE_OVERHEAD_BYTES = 64 * 1024
+
+
+@dataclass
+class ExportResult:
+    """Files produced by an export and how many rows they hold."""
+
+    files: list[Path] = field(default_factory=list)
+    rows: int = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.files)
+
+
+class _RotatingGzipWriter:
+    """Writes gzip-compressed CSV/JSONL, starting a new file near the size cap.
+
+    All methods block and are meant to run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        basename: str,
+        fmt: ExportFormat,
+        columns: Sequence[str],
+        max_file_bytes: int,
+    ) -> None:
+        self.directory = directory
+        self.basename = basename
+        self.fmt = fmt
+        self.columns = list(columns)
+        self.rotate_at = max(max_file_bytes - _ROTATE_HEADROOM_BYTES, max_file_bytes // 2)
+        self.files: list[Path] = []
+        self._raw: Optional[io.BufferedWriter] = None
+        self._gzip: Optional[gzip.GzipFile] = None
+        self._text: Optional[io.TextIOWrapper] = None
+        self._csv: Optional[Any] = None
+
+    def _open_next(self) -> None:
+        self.close()
+        part = len(self.files) + 1
+        suffix = "" if part == 1 else f"_part{part}"
+        path = self.directory / f"{self.basename}{suffix}.{self.fmt}.gz"
+        self._raw = path.open("wb")
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        self._text = io.TextIOWrapper(self._gzip, encoding="utf-8", newline="")
+        self.files.append(path)
+        if self.fmt == "csv":
+            self._csv = csv.writer(self._text)
+            self._csv.writerow(self.columns)
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        if self._text is None or self._raw.tell() >= self.rotate_at:
+            self._open_next()
+        if self.fmt == "csv":
+            self._csv.writerows(rows)
+        else:
+            self._text.writelines(
+                json.dumps(dict(zip(self.columns, row)), default=str) + "\n" for row in rows
+            )
+        self._text.flush()
+
+    def close(self) -> None:
+        if self._text is not None:
+            self._text.close()  # closes the gzip stream, which does not own the raw file
+            self._raw.close()
+            self._text = self._gzip = self._raw = self._csv = None
+
+
+async def stream_query_to_files(
+    connection: aiosqlite.Connection,
+    query: str,
+    params: Sequence[Any] = (),
+    *,
+    directory: Path,
+    basename: str,
+    fmt: ExportFormat = "csv",
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> ExportResult:
+    """Stream a query's rows into gzip-compressed files.
+
+    Rows are pulled with ``fetchmany`` and written from a worker thread, so
+    neither memory use nor event-loop blocking grows with the table size.
+    Output is split into several files once a file approaches
+    ``max_file_bytes``. No file is created when the query returns no rows.
+    """
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    result = ExportResult()
+    writer: Optional[_RotatingGzipWriter] = None
+    try:
+        async with connection.execute(query, params) as cursor:
+            columns = [column[0] for column in cursor.description]
+            while True:
+                rows = await cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                if writer is None:
+                    writer = _RotatingGzipWriter(directory, basename, fmt, columns, max_file_bytes)
+                await asyncio.to_thread(writer.write_rows, [tuple(row) for row in rows])
+                result.rows += len(rows)
+    finally:
+        if writer is not None:
+            await asyncio.to_thread(writer.close)
+            result.files = list(writer.files)
+    return result
+
+
+def batch_files_for_upload(
+    files: Sequence[Path],
+    *,
+    max_bytes: int = MAX_MESSAGE_UPLOAD_BYTES,
+    max_files: int = MAX_ATTACHMENTS_PER_MESSAGE,
+) -> list[list[Path]]:
+    """Group files, in order, into messages that each fit one upload request.
+
+    A file too large for any message still gets a message of its own, so the
+    caller sees Discord's error rather than a silently dropped part.
+    """
+    budget = max_bytes - _MESSAGE_OVERHEAD_BYTES
+    batches: list[list[Path]] = []
+    batch: list[Path] = []
+    batch_bytes = 0
+    for path in files:
+        size = path.stat().st_size
+        if batch and (batch_bytes + size > budget or len(batch) >= max_files):
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+        batch.append(path)
+        batch_bytes += size
+    if batch:
+        batches.append(batch)
+    return batches
@@ -6,9 +6,10 @@ import asyncio
 import json
 import logging
 import os
+import re
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, Sequence
 
 import aiosqlite
 
@@ -16,6 +17,60 @@ from .logger import get_logger
 
 logger = get_logger()
 
+# Current schema for new databases; regenerate with scripts/schema_snapshot.py
+SCHEMA_SNAPSHOT_PATH = Path(__file__).with_name("schema_snapshot.sql")
+SCHEMA_SNAPSHOT_HEADER = "-- schema_version: "
+
+# Columns of the products_fts index, with their bm25 weights: names outrank
+# tags, which outrank categories and free-text descriptions
+SEARCH_COLUMNS = {
+    "variant_name": 10.0,
+    "service_name": 5.0,
+    "main_category": 2.0,
+    "sub_category": 2.0,
+    "tags": 4.0,
+    "additional_info": 1.0,
+}
+_SEARCH_TOKEN = re.compile(r"\w+")
+
+# Statuses accepted by update_order_status and bulk_update_order_status
+ORDER_STATUSES = ("pending", "fulfilled", "refill", "refunded")
+
+# Unpaid cashback per referrer; {referrer_filter} narrows it to some referrers
+PENDING_CASHBACK_SQL = """
+    SELECT
+        referrer_user_id,
+        COUNT(*) as referral_count,
+        SUM(cashback_earned_cents - cashback_paid_cents) as pending_cents
+    FROM referrals
+    WHERE is_blacklisted = 0
+      AND (cashback_earned_cents - cashback_paid_cents) > 0
+      {referrer_filter}
+    GROUP BY referrer_user_id
+    HAVING pending_cents > 0
+"""
+
+
+def build_search_query(
+    text: str, *, columns: Optional[Sequence[str]] = None, match_any: bool = False
+) -> str:
+    """Turn free text into a safe FTS5 query of prefix terms.
+
+    Terms are ANDed by default; ``match_any`` ORs them instead, for ranking
+    products against a whole sentence. ``columns`` limits the match to those
+    index columns. Returns an empty string when the text has no terms.
+    """
+    tokens = dict.fromkeys(_SEARCH_TOKEN.findall(text.lower()))
+    if not tokens:
+        return ""
+    expression = (" OR " if match_any else " AND ").join(f'"{token}"*' for token in tokens)
+    if columns:
+        unknown = set(columns) - SEARCH_COLUMNS.keys()
+        if unknown:
+            raise ValueError(f"Unknown search columns: {', '.join(sorted(unknown))}")
+        return f"{{{' '.join(columns)}}} : ({expression})"
+    return expression
+
 
 class Database:
     """Async database handler using SQLite."""
@@ -24,7 +79,15 @@ class Database:
         self.db_path = Path(db_path)
         self._connection: Optional[aiosqlite.Connection] = None
         self._wallet_lock = asyncio.Lock()
-        self.target_schema_version = 24
+        self.target_schema_version = 29
+        self.schema_snapshot_path: Optional[Path] = SCHEMA_SNAPSHOT_PATH
+        # Bumped by writes that change the prices a user sees (see PricingService)
+        self.discounts_version = 0
+        self._user_pricing_versions: dict[int, int] = {}
+        self._has_search_index: Optional[bool] = None
+        # Discord IDs with a non-blacklisted referral, loaded on first purchase;
+        # buyers outside it skip the referral update
+        self._referred_users: Optional[set[int]] = None
         
         if connect_timeout is None:
             connect_timeout = float(os.getenv("DB_CONNECT_TIMEOUT", "5.0"))
@@ -91,6 +154,13 @@ class Database:
             await self._connection.close()
             self._connection = None
 
+    def pricing_version(self, discord_id: int) -> tuple[int, int]:
+        """Changes whenever the discounts table or the user's pricing inputs change."""
+        return self.discounts_version, self._user_pricing_versions.get(discord_id, 0)
+
+    def _invalidate_user_pricing(self, discord_id: int) -> None:
+        self._user_pricing_versions[discord_id] = self._user_pricing_versions.get(discord_id, 0) + 1
+
     async def _initialize_schema(self) -> None:
         """Initialize the database schema with versioning support."""
         if self._connection is None:
@@ -111,6 +181,15 @@ class Database:
         # Get current schema version
         current_version = await self._get_current_schema_version()
         logger.info(f"Current database schema version: {current_version}")
+        if current_version >= self.target_schema_version:
+            return
+
+        # A brand-new database gets the current schema in one transaction
+        if current_version == 0 and await self._bootstrap_from_snapshot():
+            logger.info(
+                f"Database schema created from snapshot at version {self.target_schema_version}"
+            )
+            return
 
         # Apply all pending migrations
         await self._apply_pending_migrations(current_version)
@@ -130,13 +209,100 @@ class Database:
         row = await cursor.fetchone()
         return row["version"] if row and row["version"] else 0
 
-    async def _apply_pending_migrations(self, current_version: int) -> None:
-        """Apply all pending migrations after the current version."""
+    async def _is_empty_database(self) -> bool:
+        """True when the database holds nothing but the migrations table."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            """
+            SELECT COUNT(*) FROM sqlite_master
+            WHERE name NOT LIKE 'sqlite_%' AND name != 'schema_migrations'
+            """
+        )
+        row = await cursor.fetchone()
+        return row[0] == 0
+
+    def _load_schema_snapshot(self) -> Optional[str]:
+        """The snapshot script, if one exists for the target schema version."""
+        if self.schema_snapshot_path is None:
+            return None
+        try:
+            script = self.schema_snapshot_path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+        header = script.partition("\n")[0]
+        if header.strip() != f"{SCHEMA_SNAPSHOT_HEADER}{self.target_schema_version}":
+            logger.warning(
+                f"Schema snapshot {self.schema_snapshot_path} does not match schema version "
+                f"{self.target_schema_version}; replaying migrations instead"
+            )
+            return None
+        return script
+
+    async def _bootstrap_from_snapshot(self) -> bool:
+        """Create the current schema on an empty database from the snapshot.
+
+        The snapshot and the migration records are applied in a single
+        transaction. Returns False when no usable snapshot is available or
+        the database already has tables from before schema versioning.
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        script = self._load_schema_snapshot()
+        if script is None or not await self._is_empty_database():
+            return False
+
+        try:
+            # executescript commits anything pending, then leaves our BEGIN open
+            await self._connection.executescript(f"BEGIN;\n{script}")
+            await self._connection.executemany(
+                "INSERT INTO schema_migrations (version, name) VALUES (?, ?)",
+                [(version, name) for version, (name, _) in sorted(self._migrations().items())],
+            )
+            await self._connection.commit()
+        except aiosqlite.Error as e:
+            # e.g. an SQLite build without FTS5; the migrations handle that case
+            await self._connection.rollback()
+            logger.warning(f"Schema snapshot could not be applied ({e}); replaying migrations instead")
+            return False
+        return True
+
+    async def get_schema_statements(self) -> list[str]:
+        """CREATE statements for every table, index and trigger, in creation order.
+
+        ``schema_migrations`` and SQLite's internal tables are left out. This is
+        the content of the schema snapshot.
+        """
         if self._connection is None:
             raise RuntimeError("Database connection not initialized.")
 
-        # Define all migrations in order
-        migrations = {
+        cursor = await self._connection.execute(
+            """
+            SELECT type, name, sql FROM sqlite_master
+            WHERE sql IS NOT NULL
+              AND name NOT LIKE 'sqlite_%'
+              AND name != 'schema_migrations'
+            ORDER BY rowid
+            """
+        )
+        rows = await cursor.fetchall()
+
+        # Shadow tables (e.g. products_fts_data) are created by their virtual table
+        virtual = [
+            row["name"] for row in rows
+            if row["type"] == "table" and row["sql"].upper().startswith("CREATE VIRTUAL TABLE")
+        ]
+        return [
+            row["sql"] for row in rows
+            if not (row["type"] == "table" and any(row["name"].startswith(f"{name}_") for name in virtual))
+        ]
+
+    def _migrations(self) -> dict:
+        """All migrations by version, as (name, coroutine function) pairs."""
+        return {
             1: ("base_schema", self._migration_v1),
             2: ("migrate_products_table", self._migration_v2),
             3: ("migrate_discounts_indexes", self._migration_v3),
@@ -161,8 +327,19 @@ class Database:
             22: ("wishlist_and_tags", self._migration_v22),
             23: ("atto_integration", self._migration_v23),
             24: ("crypto_wallets", self._migration_v24),
+            25: ("announcement_outbox", self._migration_v25),
+            26: ("airdrops_tables", self._migration_v26),
+            27: ("product_search_index", self._migration_v27),
+            28: ("products_category_listing_index", self._migration_v28),
+            29: ("warranty_notifications_sent", self._migration_v29),
         }
 
+    async def _apply_pending_migrations(self, current_version: int) -> None:
+        """Apply all pending migrations after the current version."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        migrations = self._migrations()
         for version in sorted(migrations.keys()):
             if version > current_version:
                 name, migration_fn = migrations[version]
@@ -645,15 +822,17 @@ class Database:
         if self._connection is None:
             raise RuntimeError("Database connection not initialized.")
 
-        await self._connection.execute(
-            """
-            INSERT INTO users (discord_id)
-            VALUES (?)
-            ON CONFLICT(discord_id) DO NOTHING
-            """,
-            (discord_id,),
-        )
-        await self._connection.commit()
+        # Held so the implicit transaction never overlaps another BEGIN IMMEDIATE
+        async with self._wallet_lock:
+            await self._connection.execute(
+                """
+                INSERT INTO users (discord_id)
+                VALUES (?)
+                ON CONFLICT(discord_id) DO NOTHING
+                """,
+                (discord_id,),
+            )
+            await self._connection.commit()
         row = await self.get_user(discord_id)
         if row is None:
             raise RuntimeError("Failed to create or retrieve user record.")
@@ -944,6 +1123,7 @@ class Database:
             ),
         )
         await self._connection.commit()
+        self.discounts_version += 1
         return cursor.lastrowid
 
     async def get_applicable_discounts(
@@ -973,6 +1153,25 @@ class Database:
         )
         return await cursor.fetchall()
 
+    async def get_active_discounts(self) -> list[aiosqlite.Row]:
+        """Every unexpired discount rule, in insertion order.
+
+        Loaded in one pass by :class:`~apex_core.pricing.DiscountEngine`, which
+        matches rules in memory instead of calling :meth:`get_applicable_discounts`
+        per product.
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            """
+            SELECT * FROM discounts
+            WHERE expires_at IS NULL OR expires_at >= CURRENT_TIMESTAMP
+            ORDER BY id
+            """
+        )
+        return await cursor.fetchall()
+
     async def get_all_products(self, *, active_only: bool = True) -> list[aiosqlite.Row]:
         if self._connection is None:
             raise RuntimeError("Database connection not initialized.")
@@ -985,6 +1184,21 @@ class Database:
         cursor = await self._connection.execute(query)
         return await cursor.fetchall()
 
+    async def get_catalog_version(self) -> str:
+        """Return a fingerprint of the active catalog that changes whenever it does."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            """
+            SELECT COUNT(*), MAX(id), MAX(updated_at), TOTAL(price_cents)
+            FROM products
+            WHERE is_active = 1
+            """
+        )
+        row = await cursor.fetchone()
+        return ":".join(str(value) for value in row)
+
     async def get_distinct_main_categories(self) -> list[str]:
         """Get all distinct main_category values from active products, sorted alphabetically."""
         if self._connection is None:
@@ -1018,6 +1232,26 @@ class Database:
         rows = await cursor.fetchall()
         return [row[0] for row in rows]
 
+    async def get_sub_category_anchors(self, main_category: str) -> list[tuple[str, int]]:
+        """Active sub-categories of a main_category with the lowest product ID in each, sorted by name.
+
+        The product ID identifies the sub-category in storefront component IDs.
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            """
+            SELECT sub_category, MIN(id)
+            FROM products
+            WHERE main_category = ? AND is_active = 1
+            GROUP BY sub_category
+            ORDER BY sub_category ASC
+            """,
+            (main_category,),
+        )
+        return [(row[0], row[1]) for row in await cursor.fetchall()]
+
     async def get_products_by_category(
         self, main_category: str, sub_category: str
     ) -> list[aiosqlite.Row]:
@@ -1035,6 +1269,73 @@ class Database:
         )
         return await cursor.fetchall()
 
+    async def get_products_page(
+        self,
+        main_category: str,
+        sub_category: str,
+        *,
+        name_query: Optional[str] = None,
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
+        limit: int = 10,
+    ) -> tuple[list[aiosqlite.Row], int]:
+        """One page of a sub-category's active products, plus the total matching count.
+
+        Products are in the order of :meth:`get_products_by_category`. Pages are
+        addressed by keyset: ``after_id`` is the last product of the previous
+        page, ``before_id`` the first product of the next one. ``name_query``
+        keeps products whose service or variant name matches it, as in
+        :meth:`search_products`. Served by idx_products_category_listing.
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        conditions = ["main_category = ?", "sub_category = ?", "is_active = 1"]
+        params: list = [main_category, sub_category]
+        if name_query:
+            terms = list(dict.fromkeys(_SEARCH_TOKEN.findall(name_query.lower())))
+            if terms and await self.has_search_index():
+                conditions.append("id IN (SELECT rowid FROM products_fts WHERE products_fts MATCH ?)")
+                params.append(build_search_query(name_query, columns=("variant_name", "service_name")))
+            elif terms:
+                conditions.extend(
+                    "LOWER(service_name || ' ' || variant_name) LIKE ?" for _ in terms
+                )
+                params.extend(f"%{term}%" for term in terms)
+
+        where = " AND ".join(conditions)
+        order = "ASC"
+        keyset = ""
+        anchor = after_id if after_id is not None else before_id
+        if anchor is not None:
+            operator = ">" if after_id is not None else "<"
+            order = "ASC" if after_id is not None else "DESC"
+            keyset = (
+                f"AND (service_name, variant_name, id) {operator} "
+                "(SELECT service_name, variant_name, id FROM products WHERE id = ?)"
+            )
+
+        # The count is answered from the index alone; the page walks it in order
+        cursor = await self._connection.execute(
+            f"""
+            SELECT *, (SELECT COUNT(*) FROM products WHERE {where}) AS total_count
+            FROM products
+            WHERE {where} {keyset}
+            ORDER BY service_name {order}, variant_name {order}, id {order}
+            LIMIT ?
+            """,
+            [*params, *params, *([anchor] if anchor is not None else []), limit],
+        )
+        rows = await cursor.fetchall()
+        if before_id is not None:
+            rows.reverse()
+        if rows:
+            return rows, rows[0]["total_count"]
+
+        # Past either end of the listing: the count still comes from the filters
+        cursor = await self._connection.execute(f"SELECT COUNT(*) FROM products WHERE {where}", params)
+        return [], (await cursor.fetchone())[0]
+
     async def find_product_by_fields(
         self,
         *,
@@ -1162,6 +1463,7 @@ class Database:
             (discord_id,),
         )
         await self._connection.commit()
+        self._invalidate_user_pricing(discord_id)
 
     async def get_manually_assigned_roles(self, discord_id: int) -> list[str]:
         if self._connection is None:
@@ -1181,6 +1483,20 @@ class Database:
         except (json.JSONDecodeError, TypeError):
             return []
 
+    async def get_role_sync_rows(self) -> list[aiosqlite.Row]:
+        """Spend, client flag and manual roles of every user, for role reconciliation."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            """
+            SELECT discord_id, total_lifetime_spent_cents, has_client_role, manually_assigned_roles
+            FROM users
+            ORDER BY discord_id
+            """
+        )
+        return await cursor.fetchall()
+
     async def add_manually_assigned_role(self, discord_id: int, role_name: str) -> None:
         if self._connection is None:
             raise RuntimeError("Database connection not initialized.")
@@ -1214,6 +1530,7 @@ class Database:
                 (json.dumps(roles), discord_id),
             )
             await self._connection.commit()
+            self._invalidate_user_pricing(discord_id)
 
     async def remove_manually_assigned_role(self, discord_id: int, role_name: str) -> None:
         if self._connection is None:
@@ -1248,6 +1565,7 @@ class Database:
                 (json.dumps(roles) if roles else None, discord_id),
             )
             await self._connection.commit()
+            self._invalidate_user_pricing(discord_id)
 
     async def create_ticket(
         self,
@@ -1263,24 +1581,30 @@ class Database:
         if self._connection is None:
             raise RuntimeError("Database connection not initialized.")
 
-        cursor = await self._connection.execute(
-            """
-            INSERT INTO tickets (
-                user_discord_id, channel_id, status, type, order_id, 
-                assigned_staff_id, priority
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                user_discord_id,
-                channel_id,
-                status,
-                ticket_type,
-                order_id,
-                assigned_staff_id,
-                priority,
-            ),
-        )
-        await self._connection.commit()
+        async with self._wallet_lock:
+            try:
+                cursor = await self._connection.execute(
+                    """
+                    INSERT INTO tickets (
+                        user_discord_id, channel_id, status, type, order_id, 
+                        assigned_staff_id, priority
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        user_discord_id,
+                        channel_id,
+                        status,
+                        ticket_type,
+                        order_id,
+                        assigned_staff_id,
+                        priority,
+                    ),
+                )
+                await self._connection.commit()
+            except Exception:
+                # A duplicate channel_id must not leave the implicit transaction open
+                await self._connection.rollback()
+                raise
         return cursor.lastrowid
 
     async def get_open_ticket_for_user(self, user_discord_id: int) -> Optional[aiosqlite.Row]:
@@ -1553,8 +1877,11 @@ class Database:
         async with self._wallet_lock:
             await self._connection.execute("BEGIN IMMEDIATE;")
             
-            # Ensure user exists
-            await self.ensure_user(user_discord_id)
+            # Ensure user exists (ensure_user would commit mid-transaction)
+            await self._connection.execute(
+                "INSERT INTO users (discord_id) VALUES (?) ON CONFLICT(discord_id) DO NOTHING",
+                (user_discord_id,),
+            )
             
             # Update lifetime spend only (not wallet balance)
             await self._connection.execute(
@@ -1566,6 +1893,7 @@ class Database:
                 """,
                 (price_paid_cents, user_discord_id),
             )
+            self._invalidate_user_pricing(user_discord_id)
             
             # Create order record with a dummy product_id (0 for manual orders)
             import json
@@ -1593,7 +1921,14 @@ class Database:
             )
             order_id = cursor.lastrowid
             
+            try:
+                cashback = await self._accrue_referral_cashback(user_discord_id, price_paid_cents)
+            except Exception:
+                await self._connection.rollback()
+                raise
+            
             await self._connection.commit()
+            self._log_referral_cashback(cashback, order_id)
             
             # Get updated lifetime spend
             cursor = await self._connection.execute(
@@ -1603,12 +1938,6 @@ class Database:
             row = await cursor.fetchone()
             new_lifetime_spend = row["total_lifetime_spent_cents"] if row else 0
             
-            # Log referral cashback if user was referred
-            try:
-                await self.log_referral_purchase(user_discord_id, order_id, price_paid_cents)
-            except Exception as e:
-                logger.error(f"Error logging referral purchase for user {user_discord_id}: {e}")
-            
             return order_id, new_lifetime_spend
 
     async def bulk_upsert_products(
@@ -1744,6 +2073,7 @@ class Database:
                 """,
                 (price_paid_cents, price_paid_cents, user_discord_id),
             )
+            self._invalidate_user_pricing(user_discord_id)
 
             cursor = await self._connection.execute(
                 """
@@ -1788,13 +2118,14 @@ class Database:
                 ),
             )
 
-            await self._connection.commit()
-
-            # Log referral cashback if user was referred
             try:
-                await self.log_referral_purchase(user_discord_id, order_id, price_paid_cents)
-            except Exception as e:
-                logger.error(f"Error logging referral purchase for user {user_discord_id}: {e}")
+                cashback = await self._accrue_referral_cashback(user_discord_id, price_paid_cents)
+            except Exception:
+                await self._connection.rollback()
+                raise
+
+            await self._connection.commit()
+            self._log_referral_cashback(cashback, order_id)
 
             return order_id, new_balance
 
@@ -1923,6 +2254,78 @@ class Database:
         )
         return await cursor.fetchall()
 
+    async def get_pending_warranty_notifications(self, days_ahead: int = 3) -> list[dict]:
+        """Expiring orders not yet notified, grouped per user.
+
+        Covers the same orders as :meth:`get_orders_expiring_soon`, minus those
+        whose current expiry is already in ``warranty_notifications_sent``, so a
+        renewed warranty is announced again. Each group is
+        ``{"user_discord_id": ..., "orders": [...]}`` with the orders carrying
+        ``product_name`` and in expiry order.
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            """
+            SELECT o.id, o.user_discord_id, o.product_id, o.status,
+                   o.warranty_expires_at, o.renewal_count,
+                   CASE
+                       WHEN o.product_id = 0 THEN COALESCE(
+                           CASE WHEN json_valid(o.order_metadata)
+                                THEN json_extract(o.order_metadata, '$.product_name') END,
+                           'Manual Order'
+                       )
+                       ELSE COALESCE(
+                           p.service_name || ' - ' || p.variant_name,
+                           'Product #' || o.product_id || ' (deleted)'
+                       )
+                   END AS product_name
+            FROM orders o
+            LEFT JOIN products p ON p.id = o.product_id
+            LEFT JOIN warranty_notifications_sent w
+                ON w.order_id = o.id AND w.warranty_expires_at = o.warranty_expires_at
+            WHERE o.warranty_expires_at IS NOT NULL
+              AND o.warranty_expires_at <= datetime('now', '+' || ? || ' days')
+              AND o.warranty_expires_at > datetime('now')
+              AND o.status IN ('fulfilled', 'refill')
+              AND w.order_id IS NULL
+            ORDER BY o.user_discord_id, o.warranty_expires_at, o.id
+            """,
+            (days_ahead,),
+        )
+        groups: list[dict] = []
+        for row in await cursor.fetchall():
+            order = dict(row)
+            if not groups or groups[-1]["user_discord_id"] != order["user_discord_id"]:
+                groups.append({"user_discord_id": order["user_discord_id"], "orders": []})
+            groups[-1]["orders"].append(order)
+        return groups
+
+    async def record_warranty_notifications(self, orders: Sequence[dict]) -> None:
+        """Mark orders as notified for their current warranty expiry."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+        if not orders:
+            return
+
+        async with self._wallet_lock:
+            try:
+                await self._connection.executemany(
+                    """
+                    INSERT INTO warranty_notifications_sent (order_id, warranty_expires_at)
+                    VALUES (?, ?)
+                    ON CONFLICT(order_id) DO UPDATE SET
+                        warranty_expires_at = excluded.warranty_expires_at,
+                        sent_at = CURRENT_TIMESTAMP
+                    """,
+                    [(order["id"], order["warranty_expires_at"]) for order in orders],
+                )
+                await self._connection.commit()
+            except Exception:
+                await self._connection.rollback()
+                raise
+
     async def get_active_orders(self, user_discord_id: Optional[int] = None) -> list[aiosqlite.Row]:
         """Get orders that are currently active (not refunded)."""
         if self._connection is None:
@@ -2259,6 +2662,8 @@ class Database:
             (referrer_id, referred_id),
         )
         await self._connection.commit()
+        if self._referred_users is not None:
+            self._referred_users.add(referred_id)
         return cursor.lastrowid
 
     async def log_referral_purchase(
@@ -2278,45 +2683,55 @@ class Database:
         if self._connection is None:
             raise RuntimeError("Database connection not initialized.")
 
-        # Get the referral record
-        cursor = await self._connection.execute(
-            """
-            SELECT id, referrer_user_id, is_blacklisted
-            FROM referrals
-            WHERE referred_user_id = ?
-            """,
-            (referred_id,),
-        )
-        referral = await cursor.fetchone()
+        cashback = await self._accrue_referral_cashback(referred_id, amount_cents, cashback_percent)
+        await self._connection.commit()
+        self._log_referral_cashback(cashback, order_id)
+        return cashback[1] if cashback else None
 
-        if not referral:
-            return None
+    async def _accrue_referral_cashback(
+        self, referred_id: int, amount_cents: int, cashback_percent: float = 0.5
+    ) -> Optional[tuple[int, int]]:
+        """Credit a referred user's purchase to their referral, without committing.
 
-        if referral["is_blacklisted"]:
-            logger.info(f"Referral for user {referred_id} is blacklisted, skipping cashback")
+        Runs inside the caller's purchase transaction, so cashback is written
+        or lost together with the order. Buyers without an active referral are
+        answered from ``_referred_users`` and never touch the table.
+
+        Returns:
+            (referrer_id, cashback_cents), or None if there is no active referral
+        """
+        if self._referred_users is None:
+            cursor = await self._connection.execute(
+                "SELECT referred_user_id FROM referrals WHERE is_blacklisted = 0"
+            )
+            self._referred_users = {row[0] for row in await cursor.fetchall()}
+        if referred_id not in self._referred_users:
             return None
 
-        # Calculate cashback based on configuration
         cashback_cents = int(amount_cents * (cashback_percent / 100))
-
-        # Update the referral record
-        await self._connection.execute(
+        cursor = await self._connection.execute(
             """
             UPDATE referrals
             SET referred_total_spend_cents = referred_total_spend_cents + ?,
                 cashback_earned_cents = cashback_earned_cents + ?
-            WHERE referred_user_id = ?
+            WHERE referred_user_id = ? AND is_blacklisted = 0
+            RETURNING referrer_user_id
             """,
             (amount_cents, cashback_cents, referred_id),
         )
-        await self._connection.commit()
-
-        logger.info(
-            f"Referral cashback logged: {cashback_cents} cents for referrer "
-            f"{referral['referrer_user_id']} from order {order_id}"
-        )
+        row = await cursor.fetchone()
+        if row is None:
+            # Blacklisted or removed since the set was loaded
+            self._referred_users.discard(referred_id)
+            return None
+        return row[0], cashback_cents
 
-        return cashback_cents
+    def _log_referral_cashback(self, cashback: Optional[tuple[int, int]], order_id: int) -> None:
+        if cashback is not None:
+            logger.info(
+                f"Referral cashback logged: {cashback[1]} cents for referrer "
+                f"{cashback[0]} from order {order_id}"
+            )
 
     async def get_referral_stats(self, referrer_id: int) -> dict:
         """Get referral statistics for a user.
@@ -2462,18 +2877,7 @@ class Database:
             raise RuntimeError("Database connection not initialized.")
 
         cursor = await self._connection.execute(
-            """
-            SELECT 
-                referrer_user_id,
-                COUNT(*) as referral_count,
-                SUM(cashback_earned_cents - cashback_paid_cents) as pending_cents
-            FROM referrals
-            WHERE is_blacklisted = 0
-              AND (cashback_earned_cents - cashback_paid_cents) > 0
-            GROUP BY referrer_user_id
-            HAVING pending_cents > 0
-            ORDER BY pending_cents DESC
-            """
+            PENDING_CASHBACK_SQL.format(referrer_filter="") + " ORDER BY pending_cents DESC"
         )
         rows = await cursor.fetchall()
         
@@ -2486,36 +2890,147 @@ class Database:
             for row in rows
         ]
 
-    async def get_pending_cashback_for_user(self, referrer_id: int) -> dict:
-        """Get pending cashback details for a specific referrer.
-        
-        Args:
-            referrer_id: Discord ID of the referrer
-            
+    async def pay_referral_cashbacks(
+        self,
+        batch_id: str,
+        *,
+        referrer_ids: Optional[Iterable[int]] = None,
+    ) -> list[dict]:
+        """Pay every pending referral cashback in one transaction.
+
+        Payouts use the :meth:`get_all_pending_referral_cashbacks` aggregation,
+        limited to ``referrer_ids`` when given. Wallets are credited with one
+        ``UPDATE ... FROM``, the ledger rows are written with one
+        ``INSERT ... SELECT`` and the referrals are marked paid, so either the
+        whole batch is paid or none of it is.
+
         Returns:
-            Dict with pending_cents, referral_count, is_blacklisted, referral_details
+            One dict per referrer paid, with referrer_id, amount_cents,
+            referral_count and balance_after_cents, largest payout first
         """
         if self._connection is None:
             raise RuntimeError("Database connection not initialized.")
 
-        # Get aggregated stats
-        cursor = await self._connection.execute(
-            """
-            SELECT 
-                COUNT(*) as referral_count,
-                SUM(cashback_earned_cents - cashback_paid_cents) as pending_cents,
-                MAX(is_blacklisted) as is_blacklisted
-            FROM referrals
-            WHERE referrer_user_id = ?
-              AND (cashback_earned_cents - cashback_paid_cents) > 0
-            """,
-            (referrer_id,),
-        )
-        row = await cursor.fetchone()
-        
-        if not row or row["pending_cents"] is None or row["pending_cents"] <= 0:
-            return {
-                "pending_cents": 0,
+        referrer_filter = ""
+        params: tuple = ()
+        if referrer_ids is not None:
+            referrer_filter = "AND referrer_user_id IN (SELECT value FROM json_each(?))"
+            params = (json.dumps(list(referrer_ids)),)
+        pending = f"WITH pending AS ({PENDING_CASHBACK_SQL.format(referrer_filter=referrer_filter)})"
+
+        async with self._wallet_lock:
+            await self._connection.execute("BEGIN IMMEDIATE;")
+            try:
+                cursor = await self._connection.execute(
+                    f"{pending} SELECT * FROM pending ORDER BY pending_cents DESC", params
+                )
+                payouts = [
+                    {
+                        "referrer_id": row["referrer_user_id"],
+                        "amount_cents": row["pending_cents"],
+                        "referral_count": row["referral_count"],
+                    }
+                    for row in await cursor.fetchall()
+                ]
+                if not payouts:
+                    await self._connection.commit()
+                    return []
+
+                await self._connection.execute(
+                    f"""
+                    {pending}
+                    INSERT INTO users (discord_id)
+                    SELECT referrer_user_id FROM pending WHERE 1
+                    ON CONFLICT(discord_id) DO NOTHING
+                    """,
+                    params,
+                )
+                cursor = await self._connection.execute(
+                    f"""
+                    {pending}
+                    UPDATE users
+                    SET wallet_balance_cents = wallet_balance_cents + pending.pending_cents,
+                        updated_at = CURRENT_TIMESTAMP
+                    FROM pending
+                    WHERE users.discord_id = pending.referrer_user_id
+                    RETURNING users.discord_id, users.wallet_balance_cents
+                    """,
+                    params,
+                )
+                balances = {row[0]: row[1] for row in await cursor.fetchall()}
+                await self._connection.execute(
+                    f"""
+                    {pending}
+                    INSERT INTO wallet_transactions (
+                        user_discord_id, amount_cents, balance_after_cents,
+                        transaction_type, description, metadata
+                    )
+                    SELECT
+                        pending.referrer_user_id,
+                        pending.pending_cents,
+                        users.wallet_balance_cents,
+                        'referral_cashback',
+                        'Referral cashback - ' || pending.referral_count || ' active referrals',
+                        json_object('batch_id', ?, 'referral_count', pending.referral_count)
+                    FROM pending
+                    JOIN users ON users.discord_id = pending.referrer_user_id
+                    ORDER BY pending.pending_cents DESC
+                    """,
+                    (*params, batch_id),
+                )
+                await self._connection.execute(
+                    f"""
+                    UPDATE referrals
+                    SET cashback_paid_cents = cashback_earned_cents
+                    WHERE is_blacklisted = 0
+                      AND (cashback_earned_cents - cashback_paid_cents) > 0
+                      {referrer_filter}
+                    """,
+                    params,
+                )
+                await self._connection.commit()
+            except Exception:
+                await self._connection.rollback()
+                raise
+
+        for payout in payouts:
+            payout["balance_after_cents"] = balances[payout["referrer_id"]]
+        logger.info(
+            f"Referral cashback batch {batch_id} paid {len(payouts)} referrers "
+            f"{sum(p['amount_cents'] for p in payouts)} cents"
+        )
+        return payouts
+
+    async def get_pending_cashback_for_user(self, referrer_id: int) -> dict:
+        """Get pending cashback details for a specific referrer.
+        
+        Args:
+            referrer_id: Discord ID of the referrer
+            
+        Returns:
+            Dict with pending_cents, referral_count, is_blacklisted, referral_details
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        # Get aggregated stats
+        cursor = await self._connection.execute(
+            """
+            SELECT 
+                COUNT(*) as referral_count,
+                SUM(cashback_earned_cents - cashback_paid_cents) as pending_cents,
+                MAX(is_blacklisted) as is_blacklisted
+            FROM referrals
+            WHERE referrer_user_id = ?
+              AND (cashback_earned_cents - cashback_paid_cents) > 0
+            """,
+            (referrer_id,),
+        )
+        row = await cursor.fetchone()
+        
+        if not row or row["pending_cents"] is None or row["pending_cents"] <= 0:
+            return {
+                "pending_cents": 0,
                 "referral_count": 0,
                 "is_blacklisted": False,
                 "referral_details": [],
@@ -3071,7 +3586,7 @@ class Database:
             if not product:
                 return False
             
-            stock = product.get("stock_quantity")
+            stock = product["stock_quantity"]
             
             # NULL stock = unlimited
             if stock is None:
@@ -3537,9 +4052,8 @@ class Database:
         if self._connection is None:
             raise RuntimeError("Database connection not initialized.")
 
-        valid_statuses = ["pending", "fulfilled", "refill", "refunded"]
-        if status not in valid_statuses:
-            raise ValueError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+        if status not in ORDER_STATUSES:
+            raise ValueError(f"Invalid status. Must be one of: {', '.join(ORDER_STATUSES)}")
         
         await self._connection.execute(
             """
@@ -3556,6 +4070,65 @@ class Database:
         
         return await self.get_order_by_id(order_id)
 
+    async def bulk_update_order_status(
+        self,
+        order_ids: Iterable[int],
+        status: str,
+        *,
+        estimated_delivery: Optional[str] = None,
+        notes: Optional[str] = None,
+    ) -> list[dict]:
+        """Set the status of many orders in one transaction.
+
+        The previous status and product of every order are read with one
+        joined query and the orders are updated with one statement, so IDs
+        that do not exist are simply absent from the result.
+
+        Returns:
+            One dict per updated order, in ID order, with id, user_discord_id,
+            old_status, product_id, product_name and price_paid_cents
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        if status not in ORDER_STATUSES:
+            raise ValueError(f"Invalid status. Must be one of: {', '.join(ORDER_STATUSES)}")
+        ids = json.dumps(list(dict.fromkeys(order_ids)))
+
+        async with self._wallet_lock:
+            await self._connection.execute("BEGIN IMMEDIATE;")
+            try:
+                cursor = await self._connection.execute(
+                    """
+                    SELECT o.id, o.user_discord_id, o.status AS old_status, o.product_id,
+                           o.price_paid_cents, p.variant_name AS product_name
+                    FROM orders o
+                    LEFT JOIN products p ON p.id = o.product_id
+                    WHERE o.id IN (SELECT value FROM json_each(?))
+                    """,
+                    (ids,),
+                )
+                orders = {row["id"]: dict(row) for row in await cursor.fetchall()}
+                cursor = await self._connection.execute(
+                    """
+                    UPDATE orders
+                    SET status = ?,
+                        estimated_delivery = ?,
+                        status_notes = ?,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id IN (SELECT value FROM json_each(?))
+                    RETURNING id
+                    """,
+                    (status, estimated_delivery, notes, ids),
+                )
+                updated = sorted(row[0] for row in await cursor.fetchall())
+                await self._connection.commit()
+            except Exception:
+                await self._connection.rollback()
+                raise
+
+        return [orders[order_id] for order_id in updated]
+
     async def get_order_by_id(self, order_id: int) -> Optional[aiosqlite.Row]:
         """Get order by ID."""
         if self._connection is None:
@@ -3581,6 +4154,8 @@ class Database:
         channel_id: Optional[int] = None,
         created_by_staff_id: int,
         scheduled_for: Optional[str] = None,
+        guild_id: Optional[int] = None,
+        status: str = "completed",
     ) -> int:
         """Create an announcement record.
         
@@ -3594,12 +4169,14 @@ class Database:
             """
             INSERT INTO announcements (
                 title, message, announcement_type, target_role_id, target_vip_tier,
-                delivery_method, channel_id, created_by_staff_id, scheduled_for
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                delivery_method, channel_id, created_by_staff_id, scheduled_for,
+                guild_id, status
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 title, message, announcement_type, target_role_id, target_vip_tier,
-                delivery_method, channel_id, created_by_staff_id, scheduled_for
+                delivery_method, channel_id, created_by_staff_id, scheduled_for,
+                guild_id, status
             )
         )
         await self._connection.commit()
@@ -3649,6 +4226,161 @@ class Database:
         )
         return await cursor.fetchall()
 
+    async def get_announcement(self, announcement_id: int) -> Optional[aiosqlite.Row]:
+        """Get a single announcement by ID."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            "SELECT * FROM announcements WHERE id = ?",
+            (announcement_id,)
+        )
+        return await cursor.fetchone()
+
+    async def set_announcement_status(self, announcement_id: int, status: str) -> None:
+        """Set the broadcast status of an announcement ('sending' or 'completed')."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        await self._connection.execute(
+            "UPDATE announcements SET status = ? WHERE id = ?",
+            (status, announcement_id)
+        )
+        await self._connection.commit()
+
+    async def get_incomplete_announcements(self) -> list[aiosqlite.Row]:
+        """Get DM announcements whose broadcast was interrupted before completing."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            """
+            SELECT * FROM announcements
+            WHERE status = 'sending' AND delivery_method = 'dm'
+            ORDER BY id
+            """
+        )
+        return await cursor.fetchall()
+
+    async def enqueue_announcement_deliveries(
+        self,
+        announcement_id: int,
+        user_discord_ids: list[int],
+    ) -> int:
+        """Queue recipients in the announcement outbox.
+
+        Recipients already queued for the announcement are left untouched.
+
+        Returns:
+            Number of newly queued recipients
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        before = self._connection.total_changes
+        await self._connection.executemany(
+            """
+            INSERT OR IGNORE INTO announcement_deliveries (announcement_id, user_discord_id)
+            VALUES (?, ?)
+            """,
+            [(announcement_id, user_id) for user_id in user_discord_ids]
+        )
+        await self._connection.commit()
+        return self._connection.total_changes - before
+
+    async def get_pending_announcement_deliveries(
+        self,
+        announcement_id: int,
+        *,
+        limit: int = 50,
+    ) -> list[int]:
+        """Get the next batch of recipients still waiting for delivery."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            """
+            SELECT user_discord_id FROM announcement_deliveries
+            WHERE announcement_id = ? AND status = 'pending'
+            ORDER BY id
+            LIMIT ?
+            """,
+            (announcement_id, limit)
+        )
+        return [row["user_discord_id"] for row in await cursor.fetchall()]
+
+    async def record_announcement_deliveries(
+        self,
+        announcement_id: int,
+        results: list[tuple[int, str, Optional[str]]],
+    ) -> None:
+        """Persist delivery outcomes for a batch of recipients in one transaction.
+
+        Args:
+            announcement_id: Announcement the deliveries belong to
+            results: (user_discord_id, status, error) tuples where status is
+                'sent', 'failed' or 'pending' (to retry later)
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        if not results:
+            return
+
+        await self._connection.executemany(
+            """
+            UPDATE announcement_deliveries
+            SET status = ?,
+                last_error = ?,
+                attempts = attempts + 1,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE announcement_id = ? AND user_discord_id = ?
+            """,
+            [
+                (status, error, announcement_id, user_id)
+                for user_id, status, error in results
+            ]
+        )
+        await self._connection.commit()
+
+    async def get_announcement_delivery_counts(self, announcement_id: int) -> dict[str, int]:
+        """Get delivery counts per status for an announcement."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            """
+            SELECT status, COUNT(*) AS count FROM announcement_deliveries
+            WHERE announcement_id = ?
+            GROUP BY status
+            """,
+            (announcement_id,)
+        )
+        counts = {"pending": 0, "sent": 0, "failed": 0}
+        for row in await cursor.fetchall():
+            counts[row["status"]] = row["count"]
+        return counts
+
+    async def retry_failed_announcement_deliveries(self, announcement_id: int) -> int:
+        """Re-queue failed deliveries of an announcement.
+
+        Returns:
+            Number of recipients moved back to pending
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            """
+            UPDATE announcement_deliveries
+            SET status = 'pending', updated_at = CURRENT_TIMESTAMP
+            WHERE announcement_id = ? AND status = 'failed'
+            """,
+            (announcement_id,)
+        )
+        await self._connection.commit()
+        return cursor.rowcount
+
     async def _migration_v14(self) -> None:
         """Migration v14: Add stock tracking to products table."""
         if self._connection is None:
@@ -4073,6 +4805,185 @@ class Database:
         await self._connection.commit()
         logger.info("Created crypto wallet and transaction verification tables")
 
+    async def _migration_v25(self) -> None:
+        """Migration v25: Add persistent per-recipient outbox for DM announcements."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute("PRAGMA table_info(announcements)")
+        columns = [row[1] for row in await cursor.fetchall()]
+
+        if "guild_id" not in columns:
+            await self._connection.execute(
+                "ALTER TABLE announcements ADD COLUMN guild_id INTEGER"
+            )
+        if "status" not in columns:
+            await self._connection.execute(
+                "ALTER TABLE announcements ADD COLUMN status TEXT NOT NULL DEFAULT 'completed'"
+            )
+
+        await self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS announcement_deliveries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                announcement_id INTEGER NOT NULL,
+                user_discord_id INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(announcement_id) REFERENCES announcements(id) ON DELETE CASCADE,
+                UNIQUE(announcement_id, user_discord_id)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_announcement_deliveries_status
+                ON announcement_deliveries(announcement_id, status);
+            CREATE INDEX IF NOT EXISTS idx_announcements_status ON announcements(status);
+            """
+        )
+        await self._connection.commit()
+        logger.info("Created announcement delivery outbox")
+
+    async def _migration_v26(self) -> None:
+        """Migration v26: Persist airdrops and their claims."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        await self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS airdrops (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                code TEXT NOT NULL UNIQUE,
+                creator_discord_id INTEGER NOT NULL,
+                creator_name TEXT,
+                total_amount_cents INTEGER NOT NULL,
+                per_claim_cents INTEGER NOT NULL,
+                max_claims INTEGER NOT NULL,
+                claim_count INTEGER NOT NULL DEFAULT 0,
+                message TEXT,
+                expires_at TIMESTAMP NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(creator_discord_id) REFERENCES users(discord_id),
+                CHECK (claim_count <= max_claims)
+            );
+
+            CREATE TABLE IF NOT EXISTS airdrop_claims (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                airdrop_id INTEGER NOT NULL,
+                user_discord_id INTEGER NOT NULL,
+                amount_cents INTEGER NOT NULL,
+                claimed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(airdrop_id) REFERENCES airdrops(id) ON DELETE CASCADE,
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id),
+                UNIQUE(airdrop_id, user_discord_id)
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_airdrops_expires ON airdrops(expires_at);
+            """
+        )
+        await self._connection.commit()
+        logger.info("Created airdrops and airdrop_claims tables")
+
+    async def _migration_v27(self) -> None:
+        """Migration v27: Full-text product search index kept in sync by triggers."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        try:
+            await self._connection.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+                    variant_name, service_name, main_category, sub_category, tags, additional_info,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
+                )
+                """
+            )
+        except aiosqlite.OperationalError as e:
+            # SQLite without FTS5: search_products falls back to LIKE scans
+            logger.warning(f"FTS5 unavailable, product search index not created: {e}")
+            return
+
+        tags_of = "(SELECT group_concat(tag, ' ') FROM product_tags WHERE product_id = {0})"
+        await self._connection.executescript(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+                INSERT INTO products_fts (
+                    rowid, variant_name, service_name, main_category, sub_category, tags, additional_info
+                ) VALUES (
+                    new.id, new.variant_name, new.service_name, new.main_category, new.sub_category,
+                    {tags_of.format("new.id")}, new.additional_info
+                );
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS products_fts_update
+            AFTER UPDATE OF variant_name, service_name, main_category, sub_category, additional_info
+            ON products BEGIN
+                UPDATE products_fts
+                SET variant_name = new.variant_name,
+                    service_name = new.service_name,
+                    main_category = new.main_category,
+                    sub_category = new.sub_category,
+                    additional_info = new.additional_info
+                WHERE rowid = new.id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+                DELETE FROM products_fts WHERE rowid = old.id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS product_tags_fts_insert AFTER INSERT ON product_tags BEGIN
+                UPDATE products_fts SET tags = {tags_of.format("new.product_id")}
+                WHERE rowid = new.product_id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS product_tags_fts_delete AFTER DELETE ON product_tags BEGIN
+                UPDATE products_fts SET tags = {tags_of.format("old.product_id")}
+                WHERE rowid = old.product_id;
+            END;
+
+            DELETE FROM products_fts;
+            INSERT INTO products_fts (
+                rowid, variant_name, service_name, main_category, sub_category, tags, additional_info
+            )
+            SELECT p.id, p.variant_name, p.service_name, p.main_category, p.sub_category,
+                   {tags_of.format("p.id")}, p.additional_info
+            FROM products p;
+            """
+        )
+        await self._connection.commit()
+        logger.info("Created products_fts search index")
+
+    async def _migration_v28(self) -> None:
+        """Migration v28: Index matching the storefront's sub-category listing order."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        await self._connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_products_category_listing
+                ON products(main_category, sub_category, is_active, service_name, variant_name)
+            """
+        )
+        await self._connection.commit()
+
+    async def _migration_v29(self) -> None:
+        """Migration v29: Ledger of warranty expiry notices already sent."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        await self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS warranty_notifications_sent (
+                order_id INTEGER PRIMARY KEY,
+                warranty_expires_at TIMESTAMP NOT NULL,
+                sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE
+            )
+            """
+        )
+        await self._connection.commit()
+
     # ==================== SUPPLIER METHODS ====================
     
     async def get_product_by_supplier_service(
@@ -4516,6 +5427,77 @@ class Database:
             (user_discord_id, days)
         )
         return await cursor.fetchall()
+
+    async def get_ai_daily_usage(self, user_discord_id: int, usage_date: str) -> dict:
+        """Get a user's AI question counts for a day (zeros if nothing recorded)."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            """
+            SELECT general_questions, product_questions, images_generated
+            FROM ai_daily_usage
+            WHERE user_discord_id = ? AND usage_date = ?
+            """,
+            (user_discord_id, usage_date)
+        )
+        row = await cursor.fetchone()
+        if row is None:
+            return {"general_questions": 0, "product_questions": 0, "images_generated": 0}
+        return dict(row)
+
+    async def flush_ai_usage(
+        self,
+        increments: list[tuple[int, str, int, int, int]],
+        logs: list[tuple],
+    ) -> None:
+        """Apply buffered AI usage in a single transaction.
+
+        Args:
+            increments: (user_discord_id, usage_date, general, product, images)
+                deltas added to ``ai_daily_usage``
+            logs: (user_discord_id, tier, model, input_tokens, output_tokens,
+                total_tokens, estimated_cost_cents, question_preview) rows for
+                ``ai_usage_logs``
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        if not increments and not logs:
+            return
+
+        user_ids = {row[0] for row in increments} | {row[0] for row in logs}
+        async with self._wallet_lock:
+            await self._connection.execute("BEGIN IMMEDIATE;")
+            try:
+                await self._connection.executemany(
+                    "INSERT OR IGNORE INTO users (discord_id) VALUES (?)",
+                    [(user_id,) for user_id in user_ids]
+                )
+                await self._connection.executemany(
+                    """
+                    INSERT INTO ai_daily_usage
+                        (user_discord_id, usage_date, general_questions, product_questions, images_generated)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(user_discord_id, usage_date) DO UPDATE SET
+                        general_questions = general_questions + excluded.general_questions,
+                        product_questions = product_questions + excluded.product_questions,
+                        images_generated = images_generated + excluded.images_generated
+                    """,
+                    increments
+                )
+                await self._connection.executemany(
+                    """
+                    INSERT INTO ai_usage_logs
+                    (user_discord_id, tier, model, input_tokens, output_tokens, total_tokens, estimated_cost_cents, question_preview)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    logs
+                )
+                await self._connection.commit()
+            except Exception:
+                await self._connection.rollback()
+                raise
     
     # ==================== WISHLIST METHODS ====================
     
@@ -4640,6 +5622,118 @@ class Database:
             (tag.lower(),)
         )
         return await cursor.fetchall()
+
+    async def has_search_index(self) -> bool:
+        """Whether the products_fts index exists (it needs SQLite with FTS5)."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        if self._has_search_index is None:
+            cursor = await self._connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+            )
+            self._has_search_index = await cursor.fetchone() is not None
+        return self._has_search_index
+
+    async def search_products(
+        self,
+        query: str = "",
+        *,
+        main_category: Optional[str] = None,
+        sub_category: Optional[str] = None,
+        tag: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        match_any: bool = False,
+        active_only: bool = True,
+        limit: int = 25,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[aiosqlite.Row], Optional[str]]:
+        """Ranked product search over names, categories, tags and additional info.
+
+        Returns one page of products, best match first with ``id`` breaking
+        ties, and the cursor for the next page (None on the last page). Each
+        row carries a ``search_rank`` column (lower is better). An empty query
+        lists the products matching the filters by ID. ``tag`` is an exact tag
+        filter; ``query`` and ``columns`` are described in
+        :func:`build_search_query`.
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        after_rank, after_id = 0.0, 0
+        if cursor:
+            try:
+                rank_text, _, id_text = cursor.rpartition(":")
+                after_rank, after_id = float(rank_text), int(id_text)
+            except ValueError:
+                raise ValueError(f"Invalid search cursor: {cursor!r}") from None
+
+        conditions: list[str] = []
+        params: list = []
+        if active_only:
+            conditions.append("p.is_active = 1")
+        if main_category is not None:
+            conditions.append("p.main_category = ?")
+            params.append(main_category)
+        if sub_category is not None:
+            conditions.append("p.sub_category = ?")
+            params.append(sub_category)
+        if tag is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM product_tags pt WHERE pt.product_id = p.id AND pt.tag = ?)"
+            )
+            params.append(tag.lower())
+
+        match = build_search_query(query, columns=columns, match_any=match_any)
+        if match and await self.has_search_index():
+            weights = ", ".join(str(weight) for weight in SEARCH_COLUMNS.values())
+            if cursor:
+                conditions.append("(hits.search_rank > ? OR (hits.search_rank = ? AND p.id > ?))")
+                params.extend([after_rank, after_rank, after_id])
+            sql = f"""
+                WITH hits AS (
+                    SELECT rowid AS id, bm25(products_fts, {weights}) AS search_rank
+                    FROM products_fts
+                    WHERE products_fts MATCH ?
+                )
+                SELECT p.*, hits.search_rank
+                FROM hits JOIN products p ON p.id = hits.id
+                WHERE {" AND ".join(conditions) or "1"}
+                ORDER BY hits.search_rank, p.id
+                LIMIT ?
+            """
+            params = [match, *params, limit + 1]
+        else:
+            if match:
+                # No FTS5: every term (or any, with match_any) as a substring
+                parts = [f"COALESCE(p.{column}, '')" for column in (columns or SEARCH_COLUMNS) if column != "tags"]
+                if columns is None or "tags" in columns:
+                    parts.append(
+                        "COALESCE((SELECT group_concat(tag, ' ') FROM product_tags WHERE product_id = p.id), '')"
+                    )
+                haystack = " || ' ' || ".join(parts)
+                terms = list(dict.fromkeys(_SEARCH_TOKEN.findall(query.lower())))
+                joiner = " OR " if match_any else " AND "
+                conditions.append("(" + joiner.join(f"LOWER({haystack}) LIKE ?" for _ in terms) + ")")
+                params.extend(f"%{term}%" for term in terms)
+            conditions.append("p.id > ?")
+            params.append(after_id)
+            sql = f"""
+                SELECT p.*, 0.0 AS search_rank
+                FROM products p
+                WHERE {" AND ".join(conditions)}
+                ORDER BY p.id
+                LIMIT ?
+            """
+            params.append(limit + 1)
+
+        result = await self._connection.execute(sql, params)
+        rows = await result.fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1]['search_rank']!r}:{rows[-1]['id']}"
+        return rows, next_cursor
     
     # ==================== PIN SECURITY METHODS ====================
     
@@ -4965,3 +6059,337 @@ class Database:
         )
         await self._connection.commit()
         return cursor.lastrowid
+
+    async def get_existing_atto_transaction_hashes(self, transaction_hashes: list[str]) -> set[str]:
+        """Return which of the given transaction hashes are already recorded."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        hashes = list({tx_hash for tx_hash in transaction_hashes if tx_hash})
+        existing: set[str] = set()
+        # Stay well below SQLite's bound parameter limit
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = await self._connection.execute(
+                f"SELECT transaction_hash FROM atto_transactions WHERE transaction_hash IN ({placeholders})",
+                chunk
+            )
+            existing.update(row["transaction_hash"] for row in await cursor.fetchall())
+        return existing
+
+    async def credit_atto_deposits(
+        self,
+        deposits: list[dict],
+        *,
+        to_address: Optional[str] = None,
+    ) -> list[dict]:
+        """Credit a batch of Atto deposits in a single transaction.
+
+        Each deposit is a dict with ``user_discord_id``, ``amount_raw``,
+        ``cashback_raw``, ``amount_usd_cents``, ``transaction_hash`` and ``memo``.
+        Deposits whose hash is already recorded (or repeated within the batch)
+        are skipped.
+
+        Returns:
+            The deposits that were credited
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        if not deposits:
+            return []
+
+        async with self._wallet_lock:
+            await self._connection.execute("BEGIN IMMEDIATE;")
+            try:
+                seen = await self.get_existing_atto_transaction_hashes(
+                    [deposit["transaction_hash"] for deposit in deposits]
+                )
+                credited: list[dict] = []
+                for deposit in deposits:
+                    tx_hash = deposit["transaction_hash"]
+                    if not tx_hash or tx_hash in seen:
+                        continue
+                    seen.add(tx_hash)
+                    credited.append(deposit)
+
+                user_ids = {deposit["user_discord_id"] for deposit in credited}
+                await self._connection.executemany(
+                    "INSERT OR IGNORE INTO users (discord_id) VALUES (?)",
+                    [(user_id,) for user_id in user_ids]
+                )
+                await self._connection.executemany(
+                    "INSERT OR IGNORE INTO atto_user_balances (user_discord_id, deposit_memo) VALUES (?, ?)",
+                    [(user_id, f"USER_{user_id}") for user_id in user_ids]
+                )
+                await self._connection.executemany(
+                    """
+                    UPDATE atto_user_balances
+                    SET balance_raw = CAST(balance_raw AS INTEGER) + CAST(? AS INTEGER),
+                        total_deposited_raw = CAST(total_deposited_raw AS INTEGER) + CAST(? AS INTEGER),
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE user_discord_id = ?
+                    """,
+                    [
+                        (
+                            str(int(deposit["amount_raw"]) + int(deposit["cashback_raw"])),
+                            deposit["amount_raw"],
+                            deposit["user_discord_id"],
+                        )
+                        for deposit in credited
+                    ]
+                )
+                await self._connection.executemany(
+                    """
+                    INSERT INTO atto_transactions
+                    (user_discord_id, transaction_type, amount_raw, amount_usd_cents, cashback_raw, to_address, transaction_hash, memo, status)
+                    VALUES (?, 'deposit', ?, ?, ?, ?, ?, ?, 'completed')
+                    """,
+                    [
+                        (
+                            deposit["user_discord_id"],
+                            deposit["amount_raw"],
+                            deposit["amount_usd_cents"],
+                            deposit["cashback_raw"],
+                            to_address,
+                            deposit["transaction_hash"],
+                            deposit["memo"],
+                        )
+                        for deposit in credited
+                    ]
+                )
+                await self._connection.commit()
+            except Exception:
+                await self._connection.rollback()
+                raise
+
+        return credited
+
+    # ==================== AIRDROP METHODS ====================
+
+    async def create_airdrop(
+        self,
+        *,
+        code: str,
+        creator_discord_id: int,
+        creator_name: str,
+        total_amount_cents: int,
+        per_claim_cents: int,
+        max_claims: int,
+        expires_at: str,
+        message: Optional[str] = None,
+    ) -> tuple[int, int]:
+        """Reserve the creator's funds and persist a new airdrop atomically.
+
+        ``expires_at`` is an SQLite timestamp (``YYYY-MM-DD HH:MM:SS``, UTC).
+
+        Returns:
+            Tuple of (airdrop_id, creator_balance_after_cents)
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        async with self._wallet_lock:
+            await self._connection.execute("BEGIN IMMEDIATE;")
+            try:
+                cursor = await self._connection.execute(
+                    "SELECT wallet_balance_cents FROM users WHERE discord_id = ?",
+                    (creator_discord_id,),
+                )
+                row = await cursor.fetchone()
+                if row is None:
+                    raise ValueError("User not found")
+                if row["wallet_balance_cents"] < total_amount_cents:
+                    raise ValueError("Insufficient balance")
+
+                cursor = await self._connection.execute(
+                    """
+                    INSERT INTO airdrops (
+                        code, creator_discord_id, creator_name, total_amount_cents,
+                        per_claim_cents, max_claims, message, expires_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        code, creator_discord_id, creator_name, total_amount_cents,
+                        per_claim_cents, max_claims, message, expires_at,
+                    ),
+                )
+                airdrop_id = cursor.lastrowid
+
+                new_balance = row["wallet_balance_cents"] - total_amount_cents
+                await self._connection.execute(
+                    """
+                    UPDATE users
+                    SET wallet_balance_cents = wallet_balance_cents - ?,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE discord_id = ?
+                    """,
+                    (total_amount_cents, creator_discord_id),
+                )
+                await self._connection.execute(
+                    """
+                    INSERT INTO wallet_transactions (
+                        user_discord_id, amount_cents, balance_after_cents,
+                        transaction_type, description, metadata
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        creator_discord_id,
+                        -total_amount_cents,
+                        new_balance,
+                        "airdrop_created",
+                        f"Airdrop created: {code}",
+                        json.dumps({
+                            "airdrop_code": code,
+                            "max_claims": max_claims,
+                            "per_claim": per_claim_cents,
+                        }),
+                    ),
+                )
+                await self._connection.commit()
+            except Exception:
+                await self._connection.rollback()
+                raise
+
+        return airdrop_id, new_balance
+
+    async def get_airdrop(self, code: str) -> Optional[aiosqlite.Row]:
+        """Get an airdrop by its claim code."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            "SELECT * FROM airdrops WHERE code = ?",
+            (code,),
+        )
+        return await cursor.fetchone()
+
+    async def get_airdrop_claimants(self, airdrop_id: int) -> set[int]:
+        """Return the Discord IDs of everyone who claimed an airdrop."""
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        cursor = await self._connection.execute(
+            "SELECT user_discord_id FROM airdrop_claims WHERE airdrop_id = ?",
+            (airdrop_id,),
+        )
+        return {row["user_discord_id"] for row in await cursor.fetchall()}
+
+    async def claim_airdrop_batch(self, airdrop_id: int, user_ids: list[int]) -> dict[int, int]:
+        """Credit a batch of airdrop claims in a single transaction.
+
+        Claims are accepted in order while the airdrop has claims left and is
+        not expired. ``UNIQUE(airdrop_id, user_discord_id)`` drops duplicates,
+        and the claim counter is only advanced if it stays within
+        ``max_claims``, so the airdrop can never be over-claimed.
+
+        Returns:
+            Mapping of accepted user ID to their wallet balance after the claim
+        """
+        if self._connection is None:
+            raise RuntimeError("Database connection not initialized.")
+
+        if not user_ids:
+            return {}
+
+        async with self._wallet_lock:
+            await self._connection.execute("BEGIN IMMEDIATE;")
+            try:
+                cursor = await self._connection.execute(
+                    """
+                    SELECT code, creator_discord_id, per_claim_cents, max_claims, claim_count
+                    FROM airdrops
+                    WHERE id = ? AND expires_at > CURRENT_TIMESTAMP
+                    """,
+                    (airdrop_id,),
+                )
+                airdrop = await cursor.fetchone()
+                if airdrop is None:
+                    await self._connection.rollback()
+                    return {}
+
+                remaining = airdrop["max_claims"] - airdrop["claim_count"]
+                per_claim = airdrop["per_claim_cents"]
+                candidates = [
+                    user_id for user_id in dict.fromkeys(user_ids)
+                    if user_id != airdrop["creator_discord_id"]
+                ]
+                await self._connection.executemany(
+                    "INSERT OR IGNORE INTO users (discord_id) VALUES (?)",
+                    [(user_id,) for user_id in candidates],
+                )
+
+                accepted: list[int] = []
+                for user_id in candidates:
+                    if len(accepted) >= remaining:
+                        break
+                    cursor = await self._connection.execute(
+                        """
+                        INSERT OR IGNORE INTO airdrop_claims (airdrop_id, user_discord_id, amount_cents)
+                        VALUES (?, ?, ?)
+                        """,
+                        (airdrop_id, user_id, per_claim),
+                    )
+                    if cursor.rowcount:
+                        accepted.append(user_id)
+
+                if not accepted:
+                    await self._connection.rollback()
+                    return {}
+
+                cursor = await self._connection.execute(
+                    """
+                    UPDATE airdrops
+                    SET claim_count = claim_count + ?
+                    WHERE id = ? AND claim_count + ? <= max_claims
+                    """,
+                    (len(accepted), airdrop_id, len(accepted)),
+                )
+                if cursor.rowcount != 1:
+                    raise RuntimeError("Airdrop claim counter changed concurrently")
+
+                await self._connection.executemany(
+                    """
+                    UPDATE users
+                    SET wallet_balance_cents = wallet_balance_cents + ?,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE discord_id = ?
+                    """,
+                    [(per_claim, user_id) for user_id in accepted],
+                )
+
+                balances: dict[int, int] = {}
+                for start in range(0, len(accepted), 500):
+                    chunk = accepted[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor = await self._connection.execute(
+                        f"SELECT discord_id, wallet_balance_cents FROM users WHERE discord_id IN ({placeholders})",
+                        chunk,
+                    )
+                    balances.update(
+                        (row["discord_id"], row["wallet_balance_cents"]) for row in await cursor.fetchall()
+                    )
+
+                metadata = json.dumps({
+                    "airdrop_code": airdrop["code"],
+                    "creator_id": airdrop["creator_discord_id"],
+                })
+                await self._connection.executemany(
+                    """
+                    INSERT INTO wallet_transactions (
+                        user_discord_id, amount_cents, balance_after_cents,
+                        transaction_type, description, metadata
+                    ) VALUES (?, ?, ?, 'airdrop_claimed', ?, ?)
+                    """,
+                    [
+                        (user_id, per_claim, balances[user_id], f"Airdrop claimed: {airdrop['code']}", metadata)
+                        for user_id in accepted
+                    ],
+                )
+                await self._connection.commit()
+            except Exception:
+                await self._connection.rollback()
+                raise
+
+        return {user_id: balances[user_id] for user_id in accepted}
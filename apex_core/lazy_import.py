@@ -0,0 +1,33 @@
+"""Optional SDKs that are located at startup but only imported on first use."""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Optional
+
+from .logger import get_logger
+
+logger = get_logger()
+
+
+@functools.lru_cache(maxsize=None)
+def is_available(module_name: str) -> bool:
+    """Whether ``module_name`` is installed, without importing it."""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        # A missing parent package (e.g. "google" for "google.generativeai")
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def optional_import(module_name: str) -> Optional[ModuleType]:
+    """Import ``module_name`` once, returning None if it cannot be imported."""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        logger.warning(f"Optional dependency {module_name} could not be imported: {e}")
+        return None
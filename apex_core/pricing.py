@@ -0,0 +1,312 @@
+"""Cached per-user price resolution for the storefront."""
+
+from __future__ import annotations
+
+import heapq
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from operator import attrgetter
+from typing import Iterable, Mapping, Optional
+
+from .config import Config, Role
+from .utils.roles import role_ladder
+
+
+@dataclass(frozen=True)
+class CachedDiscount:
+    """One row of the discounts table, with ``expires_at`` parsed once."""
+
+    discount_id: int
+    user_id: Optional[int]
+    product_id: Optional[int]
+    vip_tier: Optional[str]
+    discount_percent: float
+    is_stackable: bool
+    expires_at_text: Optional[str] = None
+    expires_at: Optional[datetime] = None
+    unparseable_expiry: bool = False
+
+    @classmethod
+    def from_row(cls, row: Mapping) -> "CachedDiscount":
+        expires_at_text = row["expires_at"]
+        expires_at = None
+        unparseable = False
+        if expires_at_text:
+            try:
+                expires_at = datetime.fromisoformat(expires_at_text)
+            except (ValueError, TypeError):
+                unparseable = True
+        return cls(
+            discount_id=row["id"],
+            user_id=row["user_id"],
+            product_id=row["product_id"],
+            vip_tier=row["vip_tier"],
+            discount_percent=row["discount_percent"],
+            is_stackable=bool(row["is_stackable"]),
+            expires_at_text=expires_at_text or None,
+            expires_at=expires_at,
+            unparseable_expiry=unparseable,
+        )
+
+    @property
+    def can_be_active(self) -> bool:
+        """False for expiries that :meth:`is_active` always rejects."""
+        return not self.unparseable_expiry and (self.expires_at is None or self.expires_at.tzinfo is None)
+
+    def is_active(self, now: datetime, now_sql: str) -> bool:
+        """Same checks as the SQL filter and the storefront's defensive expiry check."""
+        if self.expires_at_text is None:
+            return True
+        if self.unparseable_expiry or self.expires_at_text < now_sql:
+            return False
+        if self.expires_at.tzinfo is not None:
+            # Not comparable with the naive local time, which the storefront treated as expired
+            return False
+        return self.expires_at >= now
+
+
+_DISCOUNT_ID = attrgetter("discount_id")
+
+
+def combine_discounts(base_percent: float, discounts: Iterable[CachedDiscount]) -> float:
+    """Apply discount rules in ID order on top of a role discount, capped at 100%.
+
+    Stackable rules add up; the others replace the total when they are larger.
+    """
+    total_discount = base_percent
+    for discount in discounts:
+        if discount.is_stackable:
+            total_discount += discount.discount_percent
+        else:
+            total_discount = max(total_discount, discount.discount_percent)
+    return min(total_discount, 100.0)
+
+
+class DiscountEngine:
+    """In-memory matcher for the discounts table.
+
+    Unexpired rules are bucketed by their exact ``(user_id, product_id,
+    vip_tier)`` key, with ``None`` as the wildcard, so a lookup probes at most
+    eight buckets instead of running the OR-NULL query that SQLite cannot serve
+    from an index. Rules with an expiry also sit in heaps ordered by it and
+    leave their bucket once it passes, so expiry dates are parsed once per
+    load rather than checked per price. The index is rebuilt when
+    :attr:`Database.discounts_version` moves, which :meth:`Database.set_discount`
+    does.
+    """
+
+    def __init__(self, db) -> None:
+        self.db = db
+        self._version: Optional[int] = None
+        self._buckets: dict[tuple, dict[int, CachedDiscount]] = {}
+        # The storefront compares expiries with the local clock, SQL compares
+        # the text with UTC CURRENT_TIMESTAMP: a rule expires on either
+        self._expiry_heap: list[tuple[datetime, int, tuple]] = []
+        self._sql_expiry_heap: list[tuple[str, int, tuple]] = []
+        self.reloads = 0
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    async def refresh(self) -> None:
+        """Reload the rules if a discount was added since the last load."""
+        version = self.db.discounts_version
+        if version == self._version:
+            return
+        rows = await self.db.get_active_discounts()
+        self.load(CachedDiscount.from_row(row) for row in rows)
+        self._version = version
+        self.reloads += 1
+
+    def load(self, discounts: Iterable[CachedDiscount]) -> None:
+        buckets: dict[tuple, dict[int, CachedDiscount]] = {}
+        heap: list[tuple[datetime, int, tuple]] = []
+        sql_heap: list[tuple[str, int, tuple]] = []
+        for discount in discounts:
+            if not discount.can_be_active:
+                continue
+            key = (discount.user_id, discount.product_id, discount.vip_tier)
+            buckets.setdefault(key, {})[discount.discount_id] = discount
+            if discount.expires_at is not None:
+                heap.append((discount.expires_at, discount.discount_id, key))
+                sql_heap.append((discount.expires_at_text, discount.discount_id, key))
+        heapq.heapify(heap)
+        heapq.heapify(sql_heap)
+        self._buckets = buckets
+        self._expiry_heap = heap
+        self._sql_expiry_heap = sql_heap
+
+    def invalidate(self) -> None:
+        self._version = None
+
+    def _expire(self, now: datetime, now_sql: str) -> None:
+        for heap, cutoff in ((self._expiry_heap, now), (self._sql_expiry_heap, now_sql)):
+            while heap and heap[0][0] < cutoff:
+                _, discount_id, key = heapq.heappop(heap)
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.pop(discount_id, None)
+                    if not bucket:
+                        del self._buckets[key]
+
+    def match(
+        self,
+        user_id: Optional[int],
+        product_id: Optional[int],
+        vip_tier: Optional[str],
+        *,
+        now: Optional[datetime] = None,
+    ) -> list[CachedDiscount]:
+        """Unexpired rules for this user, product and tier, in ID order.
+
+        ``user_id`` is the internal users.id, as for
+        :meth:`Database.get_applicable_discounts`, whose result this matches.
+        """
+        now = now or datetime.now()
+        self._expire(now, datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"))
+
+        matched: list[CachedDiscount] = []
+        buckets = 0
+        for user_key in dict.fromkeys((user_id, None)):
+            for product_key in dict.fromkeys((product_id, None)):
+                for tier_key in dict.fromkeys((vip_tier, None)):
+                    bucket = self._buckets.get((user_key, product_key, tier_key))
+                    if bucket:
+                        matched.extend(bucket.values())
+                        buckets += 1
+        if buckets > 1:
+            # Buckets are each in ID order, so this only merges the runs
+            matched.sort(key=_DISCOUNT_ID)
+        return matched
+
+
+@dataclass(frozen=True)
+class UserPricing:
+    """A user's resolved roles and VIP tier."""
+
+    version: tuple[int, int]
+    db_user_id: Optional[int]
+    roles: tuple[Role, ...]
+    vip_tier: Optional[Role]
+    role_discount_percent: float
+
+
+def apply_discount(price_cents: int, discount_percent: float) -> int:
+    return int(price_cents * (1 - discount_percent / 100))
+
+
+class PricingService:
+    """Resolves and caches each user's roles and discounts for price computation.
+
+    Entries are keyed by Discord user ID and tagged with
+    :meth:`Database.pricing_version`, which the database bumps on lifetime
+    spend changes, client/manual role changes and discount edits, so a stale
+    entry is never used. Role tiers come from the precompiled
+    :class:`~apex_core.utils.roles.RoleLadder` and discount rules from a
+    shared :class:`DiscountEngine`.
+    """
+
+    def __init__(self, db, *, max_entries: int = 2048) -> None:
+        self.db = db
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, UserPricing] = OrderedDict()
+        self._ladder = None
+        self.discounts = DiscountEngine(db)
+        self.hits = 0
+        self.misses = 0
+
+    async def get_user_pricing(self, user_id: int, config: Config) -> UserPricing:
+        version = self.db.pricing_version(user_id)
+        ladder = role_ladder(config)
+        if ladder is not self._ladder:
+            # Config roles were reloaded
+            self._entries.clear()
+            self._ladder = ladder
+
+        entry = self._entries.get(user_id)
+        if entry is not None and entry.version == version:
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        user = await self.db.get_user(user_id)
+        if user is None:
+            roles: list[Role] = []
+            vip_tier = None
+            db_user_id = None
+        else:
+            manually_assigned = await self.db.get_manually_assigned_roles(user_id)
+            spent = user["total_lifetime_spent_cents"]
+            roles = ladder.resolve(spent, bool(user["has_client_role"]), manually_assigned)
+            vip_tier = ladder.vip_tier(spent)
+            db_user_id = user["id"]
+
+        entry = UserPricing(
+            version=version,
+            db_user_id=db_user_id,
+            roles=tuple(roles),
+            vip_tier=vip_tier,
+            role_discount_percent=max((role.discount_percent for role in roles), default=0.0),
+        )
+        self._entries[user_id] = entry
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    async def discount_percent(
+        self,
+        user_id: int,
+        product_id: int,
+        config: Config,
+        vip_tier: Optional[Role] = None,
+    ) -> float:
+        pricing = await self.get_user_pricing(user_id, config)
+        await self.discounts.refresh()
+        return self._discount_percent(pricing, product_id, vip_tier.name if vip_tier else None)
+
+    async def price_products(
+        self, user_id: int, products: Iterable[Mapping], config: Config
+    ) -> dict[int, tuple[int, float]]:
+        """Final price and discount for every product, keyed by product ID."""
+        pricing = await self.get_user_pricing(user_id, config)
+        await self.discounts.refresh()
+        now = datetime.now()
+        prices: dict[int, tuple[int, float]] = {}
+        for product in products:
+            percent = self._discount_percent(pricing, product["id"], None, now)
+            prices[product["id"]] = (apply_discount(product["price_cents"], percent), percent)
+        return prices
+
+    def _discount_percent(
+        self,
+        pricing: UserPricing,
+        product_id: Optional[int],
+        vip_tier_name: Optional[str],
+        now: Optional[datetime] = None,
+    ) -> float:
+        """``vip_tier_name`` defaults to the tier resolved from the user's spend."""
+        if vip_tier_name is None and pricing.vip_tier is not None:
+            vip_tier_name = pricing.vip_tier.name
+        matched = self.discounts.match(pricing.db_user_id, product_id, vip_tier_name, now=now)
+        return combine_discounts(pricing.role_discount_percent, matched)
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Drop one user's entry, or every entry and the discount rules."""
+        if user_id is None:
+            self._entries.clear()
+            self.discounts.invalidate()
+        else:
+            self._entries.pop(user_id, None)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "discount_rules": len(self.discounts),
+        }
@@ -0,0 +1,644 @@
+-- schema_version: 29
+-- Generated by scripts/schema_snapshot.py from the migrations in apex_core/database.py.
+-- Do not edit by hand.
+
+CREATE TABLE users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                discord_id INTEGER UNIQUE NOT NULL,
+                wallet_balance_cents INTEGER NOT NULL DEFAULT 0,
+                total_lifetime_spent_cents INTEGER NOT NULL DEFAULT 0,
+                has_client_role INTEGER NOT NULL DEFAULT 0,
+                manually_assigned_roles TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            , pin_hash TEXT, pin_attempts INTEGER DEFAULT 0, pin_locked_until TIMESTAMP);
+
+CREATE TABLE products (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                main_category TEXT NOT NULL,
+                sub_category TEXT NOT NULL,
+                service_name TEXT NOT NULL,
+                variant_name TEXT NOT NULL,
+                price_cents INTEGER NOT NULL,
+                start_time TEXT,
+                duration TEXT,
+                refill_period TEXT,
+                additional_info TEXT,
+                role_id INTEGER,
+                content_payload TEXT,
+                is_active INTEGER NOT NULL DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            , stock_quantity INTEGER DEFAULT NULL, supplier_id TEXT, supplier_name TEXT, supplier_service_id TEXT, supplier_price_cents INTEGER, markup_percent REAL DEFAULT 0, supplier_api_url TEXT, supplier_order_url TEXT);
+
+CREATE TABLE discounts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER,
+                product_id INTEGER,
+                vip_tier TEXT,
+                discount_percent REAL NOT NULL,
+                description TEXT,
+                expires_at TIMESTAMP,
+                is_stackable INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE,
+                FOREIGN KEY(product_id) REFERENCES products(id) ON DELETE CASCADE
+            );
+
+CREATE TABLE tickets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_discord_id INTEGER NOT NULL,
+                channel_id INTEGER UNIQUE NOT NULL,
+                status TEXT NOT NULL DEFAULT 'open',
+                last_activity TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, type TEXT NOT NULL DEFAULT 'support', order_id INTEGER, assigned_staff_id INTEGER, closed_at TIMESTAMP, priority TEXT,
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id) ON DELETE CASCADE
+            );
+
+CREATE TABLE orders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_discord_id INTEGER NOT NULL,
+                product_id INTEGER NOT NULL,
+                price_paid_cents INTEGER NOT NULL,
+                discount_applied_percent REAL NOT NULL DEFAULT 0,
+                order_metadata TEXT,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, status TEXT NOT NULL DEFAULT 'pending', warranty_expires_at TIMESTAMP, last_renewed_at TIMESTAMP, renewal_count INTEGER NOT NULL DEFAULT 0, estimated_delivery TEXT, status_notes TEXT, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id) ON DELETE CASCADE,
+                FOREIGN KEY(product_id) REFERENCES products(id) ON DELETE CASCADE
+            );
+
+CREATE INDEX idx_discounts_expires_at
+                ON discounts(expires_at)
+            ;
+
+CREATE INDEX idx_tickets_user_status
+                ON tickets(user_discord_id, status)
+            ;
+
+CREATE INDEX idx_orders_user
+                ON orders(user_discord_id)
+            ;
+
+CREATE TABLE wallet_transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_discord_id INTEGER NOT NULL,
+                amount_cents INTEGER NOT NULL,
+                balance_after_cents INTEGER NOT NULL,
+                transaction_type TEXT NOT NULL,
+                description TEXT,
+                order_id INTEGER,
+                ticket_id INTEGER,
+                staff_discord_id INTEGER,
+                metadata TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id) ON DELETE CASCADE,
+                FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE SET NULL,
+                FOREIGN KEY(ticket_id) REFERENCES tickets(id) ON DELETE SET NULL
+            );
+
+CREATE INDEX idx_wallet_transactions_user
+                ON wallet_transactions(user_discord_id, created_at DESC)
+            ;
+
+CREATE INDEX idx_wallet_transactions_type
+                ON wallet_transactions(transaction_type)
+            ;
+
+CREATE INDEX idx_orders_status
+                ON orders(status)
+            ;
+
+CREATE INDEX idx_orders_warranty_expiry
+                ON orders(warranty_expires_at)
+            ;
+
+CREATE TABLE transcripts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticket_id INTEGER NOT NULL,
+                user_discord_id INTEGER NOT NULL,
+                channel_id INTEGER NOT NULL,
+                storage_type TEXT NOT NULL,
+                storage_path TEXT NOT NULL,
+                file_size_bytes INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(ticket_id) REFERENCES tickets(id) ON DELETE CASCADE
+            );
+
+CREATE INDEX idx_transcripts_ticket
+                ON transcripts(ticket_id)
+            ;
+
+CREATE INDEX idx_transcripts_user
+                ON transcripts(user_discord_id)
+            ;
+
+CREATE TABLE ticket_counter (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                ticket_type TEXT NOT NULL,
+                next_count INTEGER NOT NULL DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(user_id, ticket_type)
+            );
+
+CREATE INDEX idx_ticket_counter_user_type
+                ON ticket_counter(user_id, ticket_type)
+            ;
+
+CREATE TABLE refunds (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                order_id INTEGER NOT NULL,
+                user_discord_id INTEGER NOT NULL,
+                requested_amount_cents INTEGER NOT NULL,
+                handling_fee_cents INTEGER NOT NULL,
+                final_refund_cents INTEGER NOT NULL,
+                reason TEXT NOT NULL,
+                proof_attachment_url TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                resolved_at TIMESTAMP,
+                resolved_by_staff_id INTEGER,
+                rejection_reason TEXT,
+                FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE,
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id) ON DELETE CASCADE,
+                FOREIGN KEY(resolved_by_staff_id) REFERENCES users(discord_id) ON DELETE SET NULL
+            );
+
+CREATE INDEX idx_refunds_order
+                ON refunds(order_id)
+            ;
+
+CREATE INDEX idx_refunds_user
+                ON refunds(user_discord_id)
+            ;
+
+CREATE INDEX idx_refunds_status
+                ON refunds(status)
+            ;
+
+CREATE TABLE referrals (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                referrer_user_id INTEGER NOT NULL,
+                referred_user_id INTEGER UNIQUE NOT NULL,
+                referred_total_spend_cents INTEGER DEFAULT 0,
+                cashback_earned_cents INTEGER DEFAULT 0,
+                cashback_paid_cents INTEGER DEFAULT 0,
+                is_blacklisted INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(referrer_user_id) REFERENCES users(discord_id) ON DELETE CASCADE,
+                FOREIGN KEY(referred_user_id) REFERENCES users(discord_id) ON DELETE CASCADE
+            );
+
+CREATE INDEX idx_referrals_referrer
+                ON referrals(referrer_user_id)
+            ;
+
+CREATE INDEX idx_referrals_referred
+                ON referrals(referred_user_id)
+            ;
+
+CREATE INDEX idx_referrals_blacklist
+                ON referrals(is_blacklisted)
+            ;
+
+CREATE TABLE permanent_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                type TEXT NOT NULL,
+                message_id INTEGER UNIQUE NOT NULL,
+                channel_id INTEGER NOT NULL,
+                guild_id INTEGER NOT NULL,
+                title TEXT,
+                description TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_by_staff_id INTEGER
+            );
+
+CREATE INDEX idx_permanent_messages_type_guild
+                ON permanent_messages(type, guild_id)
+            ;
+
+CREATE INDEX idx_permanent_messages_channel
+                ON permanent_messages(channel_id)
+            ;
+
+CREATE INDEX idx_wallet_transactions_user_created
+                ON wallet_transactions(user_discord_id, created_at)
+            ;
+
+CREATE TABLE setup_sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                panel_types TEXT NOT NULL,
+                current_index INTEGER NOT NULL DEFAULT 0,
+                completed_panels TEXT,
+                progress TEXT,
+                session_payload TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP,
+                UNIQUE(guild_id, user_id)
+            );
+
+CREATE INDEX idx_setup_sessions_guild_user
+                ON setup_sessions(guild_id, user_id)
+            ;
+
+CREATE INDEX idx_setup_sessions_expires_at
+                ON setup_sessions(expires_at)
+            ;
+
+CREATE INDEX idx_products_stock ON products(stock_quantity) WHERE stock_quantity IS NOT NULL;
+
+CREATE TABLE promo_codes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                code TEXT NOT NULL UNIQUE COLLATE NOCASE,
+                code_type TEXT NOT NULL,
+                discount_value REAL NOT NULL,
+                free_product_id INTEGER,
+                description TEXT,
+                max_uses INTEGER DEFAULT NULL,
+                max_uses_per_user INTEGER DEFAULT 1,
+                current_uses INTEGER DEFAULT 0,
+                minimum_purchase_cents INTEGER DEFAULT 0,
+                applicable_categories TEXT,
+                applicable_products TEXT,
+                first_time_only BOOLEAN DEFAULT 0,
+                starts_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP DEFAULT NULL,
+                is_active BOOLEAN DEFAULT 1,
+                is_stackable BOOLEAN DEFAULT 0,
+                created_by_staff_id INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(free_product_id) REFERENCES products(id) ON DELETE SET NULL
+            );
+
+CREATE TABLE promo_code_usage (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                code_id INTEGER NOT NULL,
+                user_discord_id INTEGER NOT NULL,
+                order_id INTEGER NOT NULL,
+                discount_applied_cents INTEGER NOT NULL,
+                used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(code_id) REFERENCES promo_codes(id) ON DELETE CASCADE,
+                FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE
+            );
+
+CREATE INDEX idx_promo_codes_code ON promo_codes(code);
+
+CREATE INDEX idx_promo_codes_active ON promo_codes(is_active, expires_at);
+
+CREATE INDEX idx_promo_code_usage_user ON promo_code_usage(user_discord_id);
+
+CREATE UNIQUE INDEX idx_promo_code_usage_unique ON promo_code_usage(code_id, user_discord_id);
+
+CREATE TABLE gifts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                gift_type TEXT NOT NULL,
+                sender_discord_id INTEGER NOT NULL,
+                recipient_discord_id INTEGER,
+                product_id INTEGER,
+                wallet_amount_cents INTEGER,
+                gift_code TEXT UNIQUE,
+                gift_message TEXT,
+                anonymous BOOLEAN DEFAULT 0,
+                status TEXT DEFAULT 'pending',
+                claimed_at TIMESTAMP,
+                claimed_by_user_id INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP,
+                FOREIGN KEY(product_id) REFERENCES products(id) ON DELETE SET NULL
+            );
+
+CREATE INDEX idx_gifts_recipient ON gifts(recipient_discord_id, status);
+
+CREATE INDEX idx_gifts_code ON gifts(gift_code) WHERE gift_code IS NOT NULL;
+
+CREATE INDEX idx_gifts_sender ON gifts(sender_discord_id);
+
+CREATE TABLE announcements (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                message TEXT NOT NULL,
+                announcement_type TEXT NOT NULL,
+                target_role_id INTEGER,
+                target_vip_tier TEXT,
+                delivery_method TEXT NOT NULL,
+                channel_id INTEGER,
+                total_recipients INTEGER DEFAULT 0,
+                successful_deliveries INTEGER DEFAULT 0,
+                failed_deliveries INTEGER DEFAULT 0,
+                created_by_staff_id INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                scheduled_for TIMESTAMP,
+                sent_at TIMESTAMP
+            , guild_id INTEGER, status TEXT NOT NULL DEFAULT 'completed');
+
+CREATE INDEX idx_announcements_created ON announcements(created_at);
+
+CREATE TABLE reviews (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_discord_id INTEGER NOT NULL,
+                order_id INTEGER NOT NULL,
+                rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),
+                comment TEXT NOT NULL,
+                photo_url TEXT,
+                status TEXT DEFAULT 'pending',
+                reviewed_by_staff_id INTEGER,
+                reviewed_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id) ON DELETE CASCADE,
+                FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE
+            );
+
+CREATE INDEX idx_reviews_user ON reviews(user_discord_id);
+
+CREATE INDEX idx_reviews_order ON reviews(order_id);
+
+CREATE INDEX idx_reviews_status ON reviews(status);
+
+CREATE INDEX idx_reviews_rating ON reviews(rating);
+
+CREATE TABLE suppliers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                api_url TEXT NOT NULL,
+                api_key TEXT NOT NULL,
+                supplier_type TEXT NOT NULL,
+                markup_percent REAL DEFAULT 0,
+                is_active INTEGER NOT NULL DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+
+CREATE INDEX idx_products_supplier ON products(supplier_id);
+
+CREATE INDEX idx_suppliers_name ON suppliers(name);
+
+CREATE TABLE ai_usage_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_discord_id INTEGER NOT NULL,
+                tier TEXT NOT NULL,
+                model TEXT NOT NULL,
+                input_tokens INTEGER,
+                output_tokens INTEGER,
+                total_tokens INTEGER,
+                estimated_cost_cents INTEGER,
+                question_preview TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id) ON DELETE CASCADE
+            );
+
+CREATE TABLE ai_subscriptions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_discord_id INTEGER NOT NULL UNIQUE,
+                tier TEXT NOT NULL,
+                subscription_start TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                subscription_end TIMESTAMP,
+                is_active INTEGER NOT NULL DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id) ON DELETE CASCADE
+            );
+
+CREATE TABLE ai_daily_usage (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_discord_id INTEGER NOT NULL,
+                usage_date DATE NOT NULL,
+                general_questions INTEGER NOT NULL DEFAULT 0,
+                product_questions INTEGER NOT NULL DEFAULT 0,
+                images_generated INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(user_discord_id, usage_date),
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id) ON DELETE CASCADE
+            );
+
+CREATE INDEX idx_ai_usage_user ON ai_usage_logs(user_discord_id);
+
+CREATE INDEX idx_ai_usage_date ON ai_usage_logs(created_at);
+
+CREATE INDEX idx_ai_subscriptions_user ON ai_subscriptions(user_discord_id);
+
+CREATE INDEX idx_ai_subscriptions_active ON ai_subscriptions(is_active);
+
+CREATE INDEX idx_ai_daily_usage_user_date ON ai_daily_usage(user_discord_id, usage_date);
+
+CREATE TABLE wishlist (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_discord_id INTEGER NOT NULL,
+                product_id INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(user_discord_id, product_id),
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id) ON DELETE CASCADE,
+                FOREIGN KEY(product_id) REFERENCES products(id) ON DELETE CASCADE
+            );
+
+CREATE TABLE product_tags (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                product_id INTEGER NOT NULL,
+                tag TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(product_id, tag),
+                FOREIGN KEY(product_id) REFERENCES products(id) ON DELETE CASCADE
+            );
+
+CREATE INDEX idx_wishlist_user ON wishlist(user_discord_id);
+
+CREATE INDEX idx_wishlist_product ON wishlist(product_id);
+
+CREATE INDEX idx_product_tags_product ON product_tags(product_id);
+
+CREATE INDEX idx_product_tags_tag ON product_tags(tag);
+
+CREATE TABLE atto_user_balances (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_discord_id INTEGER NOT NULL UNIQUE,
+                balance_raw TEXT NOT NULL DEFAULT '0',
+                total_deposited_raw TEXT NOT NULL DEFAULT '0',
+                total_withdrawn_raw TEXT NOT NULL DEFAULT '0',
+                deposit_memo TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id) ON DELETE CASCADE
+            );
+
+CREATE TABLE atto_transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_discord_id INTEGER NOT NULL,
+                transaction_type TEXT NOT NULL,
+                amount_raw TEXT NOT NULL,
+                amount_usd_cents INTEGER,
+                cashback_raw TEXT DEFAULT '0',
+                from_address TEXT,
+                to_address TEXT,
+                transaction_hash TEXT,
+                memo TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id) ON DELETE CASCADE
+            );
+
+CREATE TABLE atto_swaps (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_discord_id INTEGER NOT NULL,
+                from_currency TEXT NOT NULL,
+                to_currency TEXT NOT NULL,
+                from_amount_cents INTEGER NOT NULL,
+                to_amount_raw TEXT NOT NULL,
+                exchange_rate REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id) ON DELETE CASCADE
+            );
+
+CREATE TABLE atto_config (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+
+CREATE INDEX idx_atto_balances_user ON atto_user_balances(user_discord_id);
+
+CREATE INDEX idx_atto_transactions_user ON atto_transactions(user_discord_id);
+
+CREATE INDEX idx_atto_transactions_hash ON atto_transactions(transaction_hash);
+
+CREATE INDEX idx_atto_transactions_memo ON atto_transactions(memo);
+
+CREATE INDEX idx_atto_swaps_user ON atto_swaps(user_discord_id);
+
+CREATE TABLE crypto_order_addresses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                order_id INTEGER NOT NULL,
+                network TEXT NOT NULL,
+                address TEXT NOT NULL,
+                amount_cents INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE,
+                UNIQUE(order_id, network)
+            );
+
+CREATE TABLE crypto_transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                order_id INTEGER NOT NULL,
+                network TEXT NOT NULL,
+                transaction_hash TEXT NOT NULL,
+                address TEXT NOT NULL,
+                amount_cents INTEGER,
+                amount_crypto TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                confirmations INTEGER DEFAULT 0,
+                verified_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE
+            );
+
+CREATE INDEX idx_crypto_addresses_order ON crypto_order_addresses(order_id);
+
+CREATE INDEX idx_crypto_addresses_network ON crypto_order_addresses(network);
+
+CREATE INDEX idx_crypto_tx_order ON crypto_transactions(order_id);
+
+CREATE INDEX idx_crypto_tx_hash ON crypto_transactions(transaction_hash);
+
+CREATE INDEX idx_crypto_tx_status ON crypto_transactions(status);
+
+CREATE TABLE announcement_deliveries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                announcement_id INTEGER NOT NULL,
+                user_discord_id INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(announcement_id) REFERENCES announcements(id) ON DELETE CASCADE,
+                UNIQUE(announcement_id, user_discord_id)
+            );
+
+CREATE INDEX idx_announcement_deliveries_status
+                ON announcement_deliveries(announcement_id, status);
+
+CREATE INDEX idx_announcements_status ON announcements(status);
+
+CREATE TABLE airdrops (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                code TEXT NOT NULL UNIQUE,
+                creator_discord_id INTEGER NOT NULL,
+                creator_name TEXT,
+                total_amount_cents INTEGER NOT NULL,
+                per_claim_cents INTEGER NOT NULL,
+                max_claims INTEGER NOT NULL,
+                claim_count INTEGER NOT NULL DEFAULT 0,
+                message TEXT,
+                expires_at TIMESTAMP NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(creator_discord_id) REFERENCES users(discord_id),
+                CHECK (claim_count <= max_claims)
+            );
+
+CREATE TABLE airdrop_claims (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                airdrop_id INTEGER NOT NULL,
+                user_discord_id INTEGER NOT NULL,
+                amount_cents INTEGER NOT NULL,
+                claimed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(airdrop_id) REFERENCES airdrops(id) ON DELETE CASCADE,
+                FOREIGN KEY(user_discord_id) REFERENCES users(discord_id),
+                UNIQUE(airdrop_id, user_discord_id)
+            );
+
+CREATE INDEX idx_airdrops_expires ON airdrops(expires_at);
+
+CREATE VIRTUAL TABLE products_fts USING fts5(
+                    variant_name, service_name, main_category, sub_category, tags, additional_info,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
+                );
+
+CREATE TRIGGER products_fts_insert AFTER INSERT ON products BEGIN
+                INSERT INTO products_fts (
+                    rowid, variant_name, service_name, main_category, sub_category, tags, additional_info
+                ) VALUES (
+                    new.id, new.variant_name, new.service_name, new.main_category, new.sub_category,
+                    (SELECT group_concat(tag, ' ') FROM product_tags WHERE product_id = new.id), new.additional_info
+                );
+            END;
+
+CREATE TRIGGER products_fts_update
+            AFTER UPDATE OF variant_name, service_name, main_category, sub_category, additional_info
+            ON products BEGIN
+                UPDATE products_fts
+                SET variant_name = new.variant_name,
+                    service_name = new.service_name,
+                    main_category = new.main_category,
+                    sub_category = new.sub_category,
+                    additional_info = new.additional_info
+                WHERE rowid = new.id;
+            END;
+
+CREATE TRIGGER products_fts_delete AFTER DELETE ON products BEGIN
+                DELETE FROM products_fts WHERE rowid = old.id;
+            END;
+
+CREATE TRIGGER product_tags_fts_insert AFTER INSERT ON product_tags BEGIN
+                UPDATE products_fts SET tags = (SELECT group_concat(tag, ' ') FROM product_tags WHERE product_id = new.product_id)
+                WHERE rowid = new.product_id;
+            END;
+
+CREATE TRIGGER product_tags_fts_delete AFTER DELETE ON product_tags BEGIN
+                UPDATE products_fts SET tags = (SELECT group_concat(tag, ' ') FROM product_tags WHERE product_id = old.product_id)
+                WHERE rowid = old.product_id;
+            END;
+
+CREATE INDEX idx_products_category_listing
+                ON products(main_category, sub_category, is_active, service_name, variant_name)
+            ;
+
+CREATE TABLE warranty_notifications_sent (
+                order_id INTEGER PRIMARY KEY,
+                warranty_expires_at TIMESTAMP NOT NULL,
+                sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(order_id) REFERENCES orders(id) ON DELETE CASCADE
+            );
+
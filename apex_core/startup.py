@@ -0,0 +1,150 @@
+"""Startup profiling and change-detecting command tree sync."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import discord
+
+from .logger import get_logger
+
+logger = get_logger()
+
+
+@dataclass
+class ExtensionTiming:
+    """Time spent loading one extension."""
+
+    name: str
+    import_seconds: float = 0.0
+    setup_seconds: float = 0.0
+    failed: bool = False
+
+    @property
+    def total_seconds(self) -> float:
+        return self.import_seconds + self.setup_seconds
+
+
+class StartupProfiler:
+    """Records how long each startup phase and each extension takes.
+
+    ``import`` covers executing the extension module and building its cog;
+    ``setup`` starts at the first ``add_cog`` call and includes ``cog_load``.
+    Timing is cheap, so it is always collected; ``enabled`` only controls
+    whether the report is logged.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.extensions: list[ExtensionTiming] = []
+        self._current: Optional[ExtensionTiming] = None
+        self._mark = 0.0
+        self._setup_started: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    @contextmanager
+    def extension(self, name: str) -> Iterator[ExtensionTiming]:
+        timing = ExtensionTiming(name)
+        self._current = timing
+        self._setup_started = None
+        self._mark = time.perf_counter()
+        try:
+            yield timing
+        except Exception:
+            timing.failed = True
+            raise
+        finally:
+            end = time.perf_counter()
+            split = self._setup_started if self._setup_started is not None else end
+            timing.import_seconds = split - self._mark
+            timing.setup_seconds = end - split
+            self.extensions.append(timing)
+            self._current = None
+
+    def cog_setup_started(self) -> None:
+        """Called from ``add_cog``: the current extension's import phase is over."""
+        if self._current is not None and self._setup_started is None:
+            self._setup_started = time.perf_counter()
+
+    def mark_ready(self) -> None:
+        self.phases.setdefault("ready", time.perf_counter() - self.started)
+
+    def report(self) -> str:
+        lines = ["Startup profile:"]
+        for name, seconds in self.phases.items():
+            label = "time to ready" if name == "ready" else name
+            lines.append(f"  {label:<28} {seconds * 1000:9.1f} ms")
+        if self.extensions:
+            lines.append(f"  {'extension':<28} {'import':>9} {'setup':>9} {'total':>9}")
+            for timing in sorted(self.extensions, key=lambda t: t.total_seconds, reverse=True):
+                suffix = "  (failed)" if timing.failed else ""
+                lines.append(
+                    f"  {timing.name:<28} {timing.import_seconds * 1000:7.1f}ms "
+                    f"{timing.setup_seconds * 1000:7.1f}ms {timing.total_seconds * 1000:7.1f}ms{suffix}"
+                )
+        return "\n".join(lines)
+
+
+def command_tree_hash(tree: discord.app_commands.CommandTree, guild: discord.abc.Snowflake) -> str:
+    """Hash of the command payloads Discord would receive for ``guild``."""
+    payloads = [command.to_dict(tree) for command in tree.get_commands(guild=guild)]
+    payloads.sort(key=lambda p: (p.get("type", 1), p["name"]))
+    encoded = json.dumps(payloads, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _load_sync_state(path: Path) -> dict[str, str]:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+async def sync_command_tree(
+    tree: discord.app_commands.CommandTree,
+    guild_ids: Iterable[int],
+    state_path: Path,
+    *,
+    force: bool = False,
+) -> list[int]:
+    """Sync the tree to each guild whose command signatures changed since the last sync.
+
+    The per-guild hashes are kept in ``state_path``; a hash is only stored
+    after Discord accepted the sync. Returns the guild IDs that were synced.
+    """
+    state = _load_sync_state(state_path)
+    synced: list[int] = []
+
+    for guild_id in guild_ids:
+        guild = discord.Object(id=guild_id)
+        tree.copy_global_to(guild=guild)
+        digest = command_tree_hash(tree, guild)
+        if not force and state.get(str(guild_id)) == digest:
+            logger.info(f"Command tree unchanged for guild {guild_id}; skipping sync")
+            continue
+
+        await tree.sync(guild=guild)
+        state[str(guild_id)] = digest
+        synced.append(guild_id)
+        logger.info(f"Command tree synced for guild {guild_id}")
+
+    if synced:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        state_path.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+    return synced
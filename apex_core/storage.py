@@ -9,12 +9,10 @@ import os
 from pathlib import Path
 from typing import Optional, Tuple
 
-try:
-    import boto3
-    from botocore.exceptions import ClientError
-    BOTO3_AVAILABLE = True
-except ImportError:
-    BOTO3_AVAILABLE = False
+from .lazy_import import is_available, optional_import
+
+# boto3 is only imported when S3 storage is actually used
+BOTO3_AVAILABLE = is_available("boto3")
 
 logger = logging.getLogger(__name__)
 
@@ -115,12 +113,15 @@ class TranscriptStorage:
             self._initialize_local()
             return
         
+        from botocore.exceptions import ClientError
+
         try:
             if not all([self.s3_bucket, self.s3_access_key, self.s3_secret_key]):
                 raise RuntimeError(
                     "S3 storage requires S3_BUCKET, S3_ACCESS_KEY, and S3_SECRET_KEY environment variables"
                 )
             
+            boto3 = optional_import("boto3")
             self._s3_client = boto3.client(
                 's3',
                 region_name=self.s3_region,
@@ -268,6 +269,8 @@ class TranscriptStorage:
             )
             return await self._save_to_local(filename, content_bytes, file_size)
         
+        from botocore.exceptions import ClientError
+
         try:
             s3_key = f"transcripts/{filename}"
             
@@ -352,6 +355,8 @@ class TranscriptStorage:
             logger.warning(f"S3 storage not available. Cannot retrieve: {s3_key}")
             return None
         
+        from botocore.exceptions import ClientError
+
         try:
             if not self._initialized:
                 self.initialize()
@@ -5,7 +5,7 @@ from .embeds import create_embed
 from .error_messages import ERROR_MESSAGES, get_error_message
 from .permissions import is_admin, is_admin_from_bot, is_admin_member
 from .purchase import handle_vip_promotion, process_post_purchase
-from .roles import check_and_update_roles, get_user_roles
+from .roles import EditPacer, check_and_update_roles, get_user_roles, reconcile_guild_roles
 from .timestamps import discord_timestamp, operating_hours_window, render_operating_hours
 from .vip import calculate_vip_tier
 
@@ -20,6 +20,8 @@ __all__ = [
     "handle_vip_promotion",
     "check_and_update_roles",
     "get_user_roles",
+    "reconcile_guild_roles",
+    "EditPacer",
     "is_admin",
     "is_admin_from_bot",
     "is_admin_member",
@@ -2,31 +2,121 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from typing import TYPE_CHECKING
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, Optional, Sequence, TypeVar
+
+import discord
 
 if TYPE_CHECKING:
     from ..config import Config, Role
     from ..database import Database
-    import discord
+
+T = TypeVar("T")
 
 logger = logging.getLogger(__name__)
 
 
+class RoleLadder:
+    """Config roles precompiled so spend-based lookups are a bisection.
+
+    ``automatic_spend`` roles are sorted by threshold, so the roles unlocked
+    by a lifetime spend are a prefix of that order. Resolution gives the same
+    roles, in the same order, as scanning ``config.roles``.
+    """
+
+    def __init__(self, roles: Sequence[Role]) -> None:
+        self.roles = tuple(roles)
+        indexed = list(enumerate(self.roles))
+
+        # First config entry wins on duplicate IDs or names, as with a scan
+        self.by_id: dict[int, Role] = {}
+        self.by_name: dict[str, Role] = {}
+        for role in self.roles:
+            self.by_id.setdefault(role.role_id, role)
+            self.by_name.setdefault(role.name, role)
+
+        self._spend = sorted(
+            (
+                index for index, role in indexed
+                if role.assignment_mode == "automatic_spend" and isinstance(role.unlock_condition, int)
+            ),
+            key=lambda index: self.roles[index].unlock_condition,
+        )
+        self._thresholds = [self.roles[index].unlock_condition for index in self._spend]
+
+        # Best VIP tier among the first n unlocked spend roles: lowest
+        # tier_priority, earliest in config order on ties
+        self._best_tier: list[int] = []
+        for index in self._spend:
+            best = self._best_tier[-1] if self._best_tier else None
+            if best is None or (self.roles[index].tier_priority, index) < (self.roles[best].tier_priority, best):
+                best = index
+            self._best_tier.append(best)
+
+        self._first_purchase = [
+            index for index, role in indexed if role.assignment_mode == "automatic_first_purchase"
+        ]
+        self._manual = [(index, role.name) for index, role in indexed if role.assignment_mode == "manual"]
+        self._all_ranks = [index for index, role in indexed if role.assignment_mode == "automatic_all_ranks"]
+        self._non_zenith_names = frozenset(
+            role.name for role in self.roles if role.assignment_mode != "automatic_all_ranks"
+        )
+
+    def matches(self, roles: Sequence[Role]) -> bool:
+        """Whether this ladder was built from exactly these role objects."""
+        return len(roles) == len(self.roles) and all(a is b for a, b in zip(roles, self.roles))
+
+    def vip_tier(self, total_spent_cents: int) -> Role | None:
+        """Highest ``automatic_spend`` tier unlocked by ``total_spent_cents``."""
+        unlocked = bisect_right(self._thresholds, total_spent_cents)
+        return self.roles[self._best_tier[unlocked - 1]] if unlocked else None
+
+    def resolve(
+        self,
+        total_spent_cents: int,
+        has_client_role: bool,
+        manually_assigned: Iterable[str],
+    ) -> list[Role]:
+        """All roles a user qualifies for, in config order with Zenith roles last."""
+        manual = set(manually_assigned)
+        indices = self._spend[:bisect_right(self._thresholds, total_spent_cents)]
+        if has_client_role or total_spent_cents > 0:
+            indices += self._first_purchase
+        indices += [index for index, name in self._manual if name in manual]
+        indices.sort()
+
+        if self._all_ranks:
+            held = {self.roles[index].name for index in indices} | manual
+            if self._non_zenith_names <= held:
+                indices += self._all_ranks
+
+        return [self.roles[index] for index in indices]
+
+
+_ladder: Optional[RoleLadder] = None
+
+
+def role_ladder(config: Config) -> RoleLadder:
+    """The :class:`RoleLadder` for ``config.roles``, rebuilt when the roles change."""
+    global _ladder
+    if _ladder is None or not _ladder.matches(config.roles):
+        _ladder = RoleLadder(config.roles)
+    return _ladder
+
+
 def get_role_by_name(config: Config, role_name: str) -> Role | None:
     """Get a role configuration by name."""
-    for role in config.roles:
-        if role.name == role_name:
-            return role
-    return None
+    return role_ladder(config).by_name.get(role_name)
 
 
 def get_role_by_id(config: Config, role_id: int) -> Role | None:
     """Get a role configuration by role ID."""
-    for role in config.roles:
-        if role.role_id == role_id:
-            return role
-    return None
+    return role_ladder(config).by_id.get(role_id)
 
 
 async def get_user_roles(user_id: int, db: Database, config: Config) -> list[Role]:
@@ -35,121 +125,179 @@ async def get_user_roles(user_id: int, db: Database, config: Config) -> list[Rol
     if not user:
         return []
 
-    applicable_roles: list[Role] = []
-    total_spent = user["total_lifetime_spent_cents"]
-    has_client_role = bool(user["has_client_role"])
     manually_assigned = await db.get_manually_assigned_roles(user_id)
+    return role_ladder(config).resolve(
+        user["total_lifetime_spent_cents"],
+        bool(user["has_client_role"]),
+        manually_assigned,
+    )
 
-    # First pass: get all non-zenith roles
-    for role in config.roles:
-        if role.assignment_mode == "automatic_all_ranks":
-            continue
-
-        # Check automatic_spend roles
-        if role.assignment_mode == "automatic_spend":
-            if isinstance(role.unlock_condition, int):
-                if total_spent >= role.unlock_condition:
-                    applicable_roles.append(role)
-
-        # Check automatic_first_purchase role
-        elif role.assignment_mode == "automatic_first_purchase":
-            if has_client_role or total_spent > 0:
-                applicable_roles.append(role)
-
-        # Check manual roles
-        elif role.assignment_mode == "manual":
-            if role.name in manually_assigned:
-                applicable_roles.append(role)
-
-    # Second pass: check automatic_all_ranks (Zenith) - must have all other roles
-    for role in config.roles:
-        if role.assignment_mode == "automatic_all_ranks":
-            non_zenith_roles = [r for r in config.roles if r.assignment_mode != "automatic_all_ranks"]
-            user_role_names = {r.name for r in applicable_roles}
 
-            has_all = all(
-                r.name in user_role_names or r.name in manually_assigned
-                for r in non_zenith_roles
-            )
+class EditPacer:
+    """Spaces out Discord writes made by bulk jobs.
 
-            if has_all:
-                applicable_roles.append(role)
+    discord.py already waits out 429s, but a job that edits members back to
+    back drains the guild's bucket and delays the role updates that follow
+    purchases. Calls run at most once per ``min_interval`` seconds; a 429
+    that still reaches us pushes the next slot back by its ``retry_after``.
+    """
 
-    return applicable_roles
+    def __init__(
+        self,
+        min_interval: float = 1.0,
+        *,
+        max_retries: int = 3,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self._sleep = sleep
+        self._clock = clock
+        self._next_at = 0.0
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        attempt = 0
+        while True:
+            wait = self._next_at - self._clock()
+            if wait > 0:
+                await self._sleep(wait)
+            self._next_at = self._clock() + self.min_interval
+            try:
+                return await call()
+            except discord.HTTPException as e:
+                if e.status != 429 or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                retry_after = getattr(e, "retry_after", None) or self.min_interval * 2 ** attempt
+                logger.warning("Rate limited editing roles, retrying in %.1fs", retry_after)
+                self._next_at = self._clock() + retry_after
 
 
 async def update_user_roles(
     user: discord.Member,
     applicable_roles: list[Role],
     config: Config,
+    *,
+    pacer: Optional[EditPacer] = None,
 ) -> tuple[list[Role], list[Role]]:
     """
-    Update user roles on Discord.
+    Update user roles on Discord with a single member edit.
+    
+    Roles outside ``config.roles`` are left as they are. Nothing is sent when
+    the member already has the right roles.
     
     Returns:
         Tuple of (roles_added, roles_removed)
     """
-    # Get current roles
+    ladder = role_ladder(config)
     current_role_ids = {role.id for role in user.roles}
     target_role_ids = {role.role_id for role in applicable_roles}
 
-    # Determine what to add and remove
-    role_ids_to_add = target_role_ids - current_role_ids
-    role_ids_to_remove = current_role_ids & {role.role_id for role in config.roles}
-    role_ids_to_remove -= target_role_ids
-
-    roles_added: list[Role] = []
-    roles_removed: list[Role] = []
-
-    # Add roles
-    for role_id in role_ids_to_add:
-        role_config = get_role_by_id(config, role_id)
-        if role_config:
-            discord_role = user.guild.get_role(role_id)
-            if discord_role:
-                try:
-                    await user.add_roles(discord_role, reason=f"Role assignment: {role_config.name}")
-                    roles_added.append(role_config)
-                    logger.info(
-                        "Added role %s (%s) to user %s",
-                        role_config.name,
-                        role_id,
-                        user.id,
-                    )
-                except Exception as e:
-                    logger.error(
-                        "Failed to add role %s to user %s: %s",
-                        role_id,
-                        user.id,
-                        e,
-                    )
-
-    # Remove roles
-    for role_id in role_ids_to_remove:
-        role_config = get_role_by_id(config, role_id)
-        if role_config:
-            discord_role = user.guild.get_role(role_id)
-            if discord_role:
-                try:
-                    await user.remove_roles(discord_role, reason=f"Role revocation: {role_config.name}")
-                    roles_removed.append(role_config)
-                    logger.info(
-                        "Removed role %s (%s) from user %s",
-                        role_config.name,
-                        role_id,
-                        user.id,
-                    )
-                except Exception as e:
-                    logger.error(
-                        "Failed to remove role %s from user %s: %s",
-                        role_id,
-                        user.id,
-                        e,
-                    )
+    roles_added = [
+        role
+        for role_id, role in {role.role_id: role for role in applicable_roles}.items()
+        if role_id not in current_role_ids and user.guild.get_role(role_id)
+    ]
+    roles_removed = [
+        ladder.by_id[role.id] for role in user.roles
+        if role.id in ladder.by_id and role.id not in target_role_ids
+    ]
+    if not roles_added and not roles_removed:
+        return [], []
+
+    removed_ids = {role.role_id for role in roles_removed}
+    added_ids = {role.role_id for role in roles_added}
+    reason = "Role sync: " + ", ".join(
+        [f"+{role.name}" for role in roles_added] + [f"-{role.name}" for role in roles_removed]
+    )
+
+    async def edit() -> None:
+        # Read the member's roles right before the edit: other roles granted
+        # while the pacer waited must not be overwritten
+        new_roles = [
+            role for role in user.roles
+            if not role.is_default() and role.id not in removed_ids and role.id not in added_ids
+        ]
+        new_roles += [user.guild.get_role(role.role_id) for role in roles_added]
+        await user.edit(roles=new_roles, reason=reason)
+
+    try:
+        if pacer is None:
+            await edit()
+        else:
+            await pacer.run(edit)
+    except Exception as e:
+        logger.error("Failed to update roles for user %s: %s", user.id, e)
+        return [], []
 
+    logger.info(
+        "Updated roles for user %s: added %s, removed %s",
+        user.id,
+        [role.name for role in roles_added],
+        [role.name for role in roles_removed],
+    )
     return roles_added, roles_removed
 
 
+@dataclass
+class RoleSyncResult:
+    """Counts from one :func:`reconcile_guild_roles` run."""
+
+    members_checked: int = 0
+    members_updated: int = 0
+    roles_added: int = 0
+    roles_removed: int = 0
+
+
+def _parse_manual_roles(value: Optional[str]) -> list[str]:
+    if not value:
+        return []
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+
+async def reconcile_guild_roles(
+    db: Database,
+    guild: discord.Guild,
+    config: Config,
+    *,
+    pacer: Optional[EditPacer] = None,
+) -> RoleSyncResult:
+    """Bring every registered member's config roles in line with the database.
+
+    Target roles for all users come from one query, so a changed spend
+    threshold or role list reaches members without waiting for their next
+    purchase. Members whose roles already match cost no API call.
+    """
+    ladder = role_ladder(config)
+    client_role = ladder.by_name.get("Client")
+    result = RoleSyncResult()
+
+    for row in await db.get_role_sync_rows():
+        member = guild.get_member(row["discord_id"])
+        if member is None:
+            continue
+        result.members_checked += 1
+
+        target = ladder.resolve(
+            row["total_lifetime_spent_cents"],
+            bool(row["has_client_role"]),
+            _parse_manual_roles(row["manually_assigned_roles"]),
+        )
+        added, removed = await update_user_roles(member, target, config, pacer=pacer)
+        if added or removed:
+            result.members_updated += 1
+            result.roles_added += len(added)
+            result.roles_removed += len(removed)
+        if client_role in added and not row["has_client_role"]:
+            await db.mark_client_role_assigned(row["discord_id"])
+
+    return result
+
+
 async def check_and_update_roles(
     user_id: int,
     db: Database,
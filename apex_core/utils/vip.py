@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from .roles import role_ladder
+
 if TYPE_CHECKING:
     from ..config import Config, Role
 
@@ -19,15 +21,4 @@ def calculate_vip_tier(total_spent_cents: int, config: Config) -> Role | None:
     Returns:
         Highest applicable automatic_spend role or None if user doesn't qualify
     """
-    qualified_role: Role | None = None
-    
-    for role in config.roles:
-        if role.assignment_mode != "automatic_spend":
-            continue
-        
-        if isinstance(role.unlock_condition, int):
-            if total_spent_cents >= role.unlock_condition:
-                if qualified_role is None or role.tier_priority < qualified_role.tier_priority:
-                    qualified_role = role
-    
-    return qualified_role
+    return role_ladder(config).vip_tier(total_spent_cents)
@@ -0,0 +1,19 @@
+"""Offline load tests: seeded SQLite volumes replayed through the real cogs.
+
+Run ``python -m benchmarks --help`` for the command line.
+"""
+
+from .runner import compare_reports, run_benchmarks, run_scenario
+from .scenarios import SCENARIOS, Scenario, ScenarioError
+from .seed import SeedVolumes, seed_database
+
+__all__ = [
+    "SCENARIOS",
+    "Scenario",
+    "ScenarioError",
+    "SeedVolumes",
+    "compare_reports",
+    "run_benchmarks",
+    "run_scenario",
+    "seed_database",
+]
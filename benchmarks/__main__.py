@@ -0,0 +1,102 @@
+"""
+Load-test the bot offline and print the results as JSON.
+
+Seeds a temporary SQLite database (100k users, 50k products, 1M orders,
+1M ledger rows and 50k discount rules at --scale 1) and replays each scenario
+through the cogs with Discord mocked out.
+
+Usage:
+    python -m benchmarks                                  # Every scenario, full volumes
+    python -m benchmarks --scale 0.01 --output bench.json # CI-sized run
+    python -m benchmarks --scenario purchase_rush --ops 200
+    python -m benchmarks --scale 0.01 --compare baseline.json  # Exit 1 on a regression
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from .runner import compare_reports, run_benchmarks
+from .scenarios import SCENARIOS
+from .seed import SeedVolumes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Replay synthetic traffic through the cogs against a seeded database",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run; repeat for several (default: all)",
+    )
+    parser.add_argument("--list", action="store_true", help="List the scenarios and exit")
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiplier for the seeded row counts (default: 1.0)"
+    )
+    parser.add_argument("--ops", type=int, help="Operations per scenario (default: per scenario)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Simultaneous users (default: 8)")
+    parser.add_argument("--db", type=Path, help="Seed this file and keep it (default: a temporary file)")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="Baseline report to check for regressions")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="Allowed throughput drop or p99 increase against --compare (default: 0.25)",
+    )
+    args = parser.parse_args()
+
+    if args.list:
+        for name, scenario in SCENARIOS.items():
+            print(f"{name:18} {scenario.description} ({scenario.default_ops} ops)")
+        sys.exit(0)
+
+    logging.disable(logging.CRITICAL)
+    volumes = SeedVolumes().scaled(args.scale)
+    scenario_names = args.scenario or list(SCENARIOS)
+
+    with tempfile.TemporaryDirectory(prefix="apex-bench-") as tmp:
+        db_path = args.db or Path(tmp) / "benchmark.db"
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
+        report = asyncio.run(
+            run_benchmarks(
+                scenario_names,
+                volumes=volumes,
+                db_path=db_path,
+                ops=args.ops,
+                concurrency=args.concurrency,
+            )
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    failed = [name for name, result in report["scenarios"].items() if result["errors"]]
+    if failed:
+        print(f"❌ Errors in: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare_reports(baseline, report, max_regression=args.max_regression)
+        if regressions:
+            print("❌ Performance regressions:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  - {regression}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ No regressions against {args.compare}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
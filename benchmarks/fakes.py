@@ -0,0 +1,325 @@
+"""In-process stand-ins for the Discord objects cog callbacks touch.
+
+Nothing here talks to Discord: responses, follow-ups and DMs are recorded
+on the fake objects, so a benchmark measures the bot's own work (database,
+pricing, view building) rather than network round trips. ``FakeMember`` and
+``FakeTextChannel`` subclass the real discord.py classes because handlers
+check ``isinstance`` before doing anything.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import discord
+from discord.ext import commands
+
+from apex_core.config import (
+    Config,
+    LoggingChannels,
+    OperatingHours,
+    PaymentMethod,
+    PaymentSettings,
+    Role,
+    RoleIDs,
+    TicketCategories,
+)
+
+_snowflakes = itertools.count(800_000_000_000_000_000)
+
+
+@dataclass(frozen=True)
+class FakeRole:
+    id: int
+    name: str
+
+    @property
+    def mention(self) -> str:
+        return f"<@&{self.id}>"
+
+
+class FakeMember(discord.Member):
+    """A guild member with just the attributes the cogs read."""
+
+    def __init__(self, user_id: int, name: str = "loadtest", roles: tuple[FakeRole, ...] = ()) -> None:
+        self._fake_id = user_id
+        self._fake_name = name
+        self._fake_roles = list(roles)
+        self.sent: list[dict] = []
+
+    id = property(lambda self: self._fake_id)
+    name = property(lambda self: self._fake_name)
+    display_name = property(lambda self: self._fake_name)
+    mention = property(lambda self: f"<@{self._fake_id}>")
+    roles = property(lambda self: self._fake_roles)
+    display_avatar = property(lambda self: SimpleNamespace(url=f"https://cdn.invalid/avatars/{self._fake_id}.png"))
+    bot = False
+
+    def __repr__(self) -> str:
+        return f"<FakeMember id={self._fake_id}>"
+
+    def __hash__(self) -> int:
+        # Members key permission overwrites; discord.Member hashes its _user
+        return hash(self._fake_id)
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        self.sent.append({"content": content, **kwargs})
+
+
+class FakeTextChannel(discord.TextChannel):
+    def __init__(self, channel_id: int, name: str) -> None:
+        self.id = channel_id
+        self.name = name
+        self.sent: list[dict] = []
+
+    def __repr__(self) -> str:
+        return f"<FakeTextChannel id={self.id}>"
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        self.sent.append({"content": content, **kwargs})
+
+
+class FakeCategoryChannel(discord.CategoryChannel):
+    """A channel category whose new text channels exist only in memory."""
+
+    def __init__(self, channel_id: int, name: str) -> None:
+        self.id = channel_id
+        self.name = name
+        self.created: list[FakeTextChannel] = []
+
+    def __repr__(self) -> str:
+        return f"<FakeCategoryChannel id={self.id}>"
+
+    async def create_text_channel(self, name: str, **kwargs: Any) -> FakeTextChannel:
+        channel = FakeTextChannel(next(_snowflakes), name)
+        self.created.append(channel)
+        return channel
+
+
+class FakeGuild:
+    """The guild lookups ticket creation makes: categories, roles and members."""
+
+    def __init__(self, channels: tuple[Any, ...] = (), roles: tuple[FakeRole, ...] = ()) -> None:
+        self.id = next(_snowflakes)
+        self.default_role = FakeRole(self.id, "@everyone")
+        self.me = None
+        self._channels = {channel.id: channel for channel in channels}
+        self._roles = {role.id: role for role in roles}
+
+    def get_channel(self, channel_id: int) -> Any:
+        return self._channels.get(channel_id)
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return self._roles.get(role_id)
+
+    def get_member(self, user_id: int) -> None:
+        return None
+
+
+@dataclass
+class FakeMessage:
+    author: FakeMember
+    channel: FakeTextChannel
+    content: str = ""
+    guild: Optional[Any] = None
+
+    def __post_init__(self) -> None:
+        self.id = next(_snowflakes)
+        self.attachments: list = []
+
+
+class FakeInteractionResponse:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict]] = []
+        self.modal: Optional[discord.ui.Modal] = None
+
+    def is_done(self) -> bool:
+        return bool(self.calls)
+
+    def _record(self, kind: str, kwargs: dict) -> None:
+        if self.calls:
+            raise discord.InteractionResponded(None)  # type: ignore[arg-type]
+        self.calls.append((kind, kwargs))
+
+    async def send_message(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        self._record("send_message", {"content": content, **kwargs})
+
+    async def edit_message(self, **kwargs: Any) -> None:
+        self._record("edit_message", kwargs)
+
+    async def defer(self, **kwargs: Any) -> None:
+        self._record("defer", kwargs)
+
+    async def send_modal(self, modal: discord.ui.Modal) -> None:
+        self._record("send_modal", {"modal": modal})
+        self.modal = modal
+
+
+class FakeFollowup:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        self.sent.append({"content": content, **kwargs})
+
+
+class FakeInteraction:
+    """A component or slash-command interaction from a DM-less guild context.
+
+    ``guild`` is None unless a :class:`FakeGuild` is passed, so handlers skip
+    role grants and log-channel posts, which would be network calls in
+    production.
+    """
+
+    def __init__(
+        self,
+        client: FakeBot,
+        user: FakeMember,
+        *,
+        channel_id: Optional[int] = None,
+        guild: Optional[FakeGuild] = None,
+    ) -> None:
+        self.id = next(_snowflakes)
+        self.client = client
+        self.user = user
+        self.guild = guild
+        self.guild_id = guild.id if guild else None
+        self.channel = None
+        self.channel_id = channel_id or next(_snowflakes)
+        self.message = None
+        self.response = FakeInteractionResponse()
+        self.followup = FakeFollowup()
+        self.edits: list[dict] = []
+
+    async def edit_original_response(self, **kwargs: Any) -> None:
+        self.edits.append(kwargs)
+
+    def last_view(self) -> Optional[discord.ui.View]:
+        """The view from the last message this interaction sent or edited."""
+        payloads = [kwargs for _, kwargs in self.response.calls] + self.edits
+        for payload in reversed(payloads):
+            if payload.get("view") is not None:
+                return payload["view"]
+        return None
+
+    def last_embed_title(self) -> Optional[str]:
+        payloads = [kwargs for _, kwargs in self.response.calls] + self.edits + self.followup.sent
+        for payload in reversed(payloads):
+            embed = payload.get("embed")
+            if embed is not None:
+                return embed.title
+        return None
+
+
+class FakeBot:
+    """Enough of ``ApexCoreBot`` for cogs to be constructed and called."""
+
+    def __init__(self, db, config: Config) -> None:
+        self.db = db
+        self.config = config
+        self.cogs: dict[str, Any] = {}
+        self.guilds: list = []
+        self.user = None
+
+    def get_cog(self, name: str) -> Any:
+        return self.cogs.get(name)
+
+    async def add_cog(self, cog: commands.Cog) -> Any:
+        """Load a cog as ``Bot.add_cog`` does, without registering its commands with Discord."""
+        await discord.utils.maybe_coroutine(cog.cog_load)
+        for command in cog.__cog_commands__:
+            # Cog methods decorated as commands are called through the bound command
+            command.cog = cog
+        self.cogs[cog.qualified_name] = cog
+        return cog
+
+    async def close(self) -> None:
+        for cog in reversed(list(self.cogs.values())):
+            await discord.utils.maybe_coroutine(cog.cog_unload)
+        self.cogs.clear()
+
+    def get_guild(self, guild_id: int) -> None:
+        return None
+
+    def get_channel(self, channel_id: int) -> None:
+        return None
+
+    def get_user(self, user_id: int) -> FakeMember:
+        return FakeMember(user_id)
+
+    async def fetch_user(self, user_id: int) -> FakeMember:
+        return FakeMember(user_id)
+
+    def add_view(self, view: discord.ui.View, **kwargs: Any) -> None:
+        pass
+
+    def add_dynamic_items(self, *items: Any) -> None:
+        pass
+
+    def remove_dynamic_items(self, *items: Any) -> None:
+        pass
+
+    def is_closed(self) -> bool:
+        return False
+
+    async def wait_until_ready(self) -> None:
+        # Background loops never start; scenarios drive the handlers directly
+        await asyncio.Event().wait()
+
+
+async def click(item: discord.ui.DynamicItem, interaction: FakeInteraction, value: Optional[str] = None) -> None:
+    """Dispatch a component interaction the way discord.py does for dynamic items.
+
+    The item is rebuilt from its custom_id with ``from_custom_id``, as after
+    a restart, then the picked select ``value`` is applied and the callback runs.
+    """
+    cls = type(item)
+    match = cls.__discord_ui_compiled_template__.fullmatch(item.custom_id)
+    if match is None:
+        raise ValueError(f"{item.custom_id!r} does not match {cls.__name__}")
+    rebuilt = await cls.from_custom_id(interaction, item.item, match)
+    if value is not None:
+        rebuilt.item._values = [value]
+    await rebuilt.callback(interaction)
+
+
+def benchmark_config() -> Config:
+    """A config with the store open for the whole run, so purchases never bounce."""
+    hour = datetime.now(timezone.utc).hour
+    payment_methods = [
+        PaymentMethod(
+            name="Wallet",
+            instructions="Use your Apex wallet for instant checkout.",
+            emoji="💼",
+            metadata={"type": "internal", "is_enabled": True},
+        ),
+    ]
+    roles = [
+        Role(name="Client", role_id=1001, assignment_mode="automatic_spend",
+             unlock_condition=0, discount_percent=0.0, tier_priority=5),
+        Role(name="Apex VIP", role_id=1002, assignment_mode="automatic_spend",
+             unlock_condition=50_000, discount_percent=1.5, tier_priority=4),
+        Role(name="Apex Elite", role_id=1003, assignment_mode="automatic_spend",
+             unlock_condition=500_000, discount_percent=2.5, tier_priority=3),
+    ]
+    return Config(
+        token="BENCHMARK",
+        guild_ids=[],
+        role_ids=RoleIDs(admin=42),
+        ticket_categories=TicketCategories(support=111, billing=222, sales=333),
+        # Open from the current hour for the next 23 hours, so a run never closes the store
+        operating_hours=OperatingHours(start_hour_utc=hour, end_hour_utc=(hour - 1) % 24),
+        payment_methods=payment_methods,
+        payment_settings=PaymentSettings(
+            payment_methods=list(payment_methods),
+            order_confirmation_template="Order #{order_id} for {service_name} {variant_name} costs {price} ETA {eta}",
+            refund_policy="3 days from completion | 10% handling fee",
+        ),
+        logging_channels=LoggingChannels(audit=555001, payments=555002, tickets=555003, errors=555004),
+        roles=roles,
+    )
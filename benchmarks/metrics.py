@@ -0,0 +1,111 @@
+"""Latency, event-loop lag and memory measurements for benchmark runs."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list; 0.0 when empty."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_ms(samples: list[float]) -> dict[str, float]:
+    """p50/p90/p99/max/mean of samples in seconds, reported in milliseconds."""
+    ordered = sorted(samples)
+    summary = {
+        "p50": percentile(ordered, 0.50),
+        "p90": percentile(ordered, 0.90),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1] if ordered else 0.0,
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+    }
+    return {key: round(value * 1000, 3) for key, value in summary.items()}
+
+
+def peak_rss_mib() -> Optional[float]:
+    """Peak resident set size of this process so far, or None where unsupported."""
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a task that sleeps ``interval`` seconds.
+
+    Lag is the time a callback waits behind others, which is what users feel
+    as slow replies when a handler blocks the loop.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> dict[str, float]:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        summary = summarize_ms(self.samples)
+        return {"p99": summary["p99"], "max": summary["max"], "mean": summary["mean"]}
+
+
+@dataclass
+class ScenarioResult:
+    """Outcome of one scenario, serialised into the JSON report."""
+
+    scenario: str
+    description: str
+    ops: int
+    concurrency: int
+    duration_seconds: float
+    latencies: list[float] = field(default_factory=list, repr=False)
+    loop_lag_ms: dict[str, float] = field(default_factory=dict)
+    errors: int = 0
+    first_error: Optional[str] = None
+    peak_rss_mib: Optional[float] = None
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.ops / self.duration_seconds if self.duration_seconds else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "scenario": self.scenario,
+            "description": self.description,
+            "ops": self.ops,
+            "concurrency": self.concurrency,
+            "errors": self.errors,
+            "first_error": self.first_error,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "ops_per_second": round(self.ops_per_second, 1),
+            "latency_ms": summarize_ms(self.latencies),
+            "loop_lag_ms": self.loop_lag_ms,
+            "peak_rss_mib": self.peak_rss_mib,
+        }
@@ -0,0 +1,123 @@
+"""Run scenarios against a seeded database and collect their metrics."""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import platform
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from apex_core.database import Database
+
+from .fakes import FakeBot, benchmark_config
+from .metrics import LoopLagMonitor, ScenarioResult, peak_rss_mib
+from .scenarios import SCENARIOS
+from .seed import SeedVolumes, seed_database
+
+
+async def run_scenario(
+    name: str,
+    db_path: str | Path,
+    volumes: SeedVolumes,
+    *,
+    ops: Optional[int] = None,
+    concurrency: int = 8,
+) -> ScenarioResult:
+    """Replay ``ops`` operations of one scenario with ``concurrency`` users at a time.
+
+    The scenario gets its own connection and cogs, like a freshly started bot.
+    """
+    scenario_cls = SCENARIOS[name]
+    ops = scenario_cls.default_ops if ops is None else ops
+
+    db = Database(db_path)
+    await db.connect()
+    bot = FakeBot(db, benchmark_config())
+    try:
+        scenario = scenario_cls(bot, volumes)
+        await scenario.setup()
+        result = ScenarioResult(
+            scenario=name,
+            description=scenario_cls.description,
+            ops=ops,
+            concurrency=concurrency,
+            duration_seconds=0.0,
+        )
+        next_index = iter(range(ops))
+
+        async def worker() -> None:
+            for index in next_index:
+                started = time.perf_counter()
+                try:
+                    await scenario.run(index)
+                except Exception as e:
+                    result.errors += 1
+                    if result.first_error is None:
+                        result.first_error = f"{type(e).__name__}: {e}"[:500]
+                result.latencies.append(time.perf_counter() - started)
+
+        gc.collect()
+        monitor = LoopLagMonitor()
+        monitor.start()
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+        finally:
+            result.duration_seconds = time.perf_counter() - started
+            result.loop_lag_ms = await monitor.stop()
+            await scenario.teardown()
+        result.peak_rss_mib = peak_rss_mib()
+        return result
+    finally:
+        await bot.close()
+        await db.close()
+
+
+async def run_benchmarks(
+    scenario_names: list[str],
+    *,
+    volumes: SeedVolumes,
+    db_path: str | Path,
+    ops: Optional[int] = None,
+    concurrency: int = 8,
+) -> dict:
+    """Seed ``db_path`` and run the scenarios in order; returns the JSON report."""
+    seed_seconds = await seed_database(db_path, volumes)
+    scenarios = {}
+    for name in scenario_names:
+        result = await run_scenario(name, db_path, volumes, ops=ops, concurrency=concurrency)
+        scenarios[name] = result.to_dict()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "volumes": volumes.as_dict(),
+            "seed_seconds": round(seed_seconds, 2),
+            "db_size_mib": round(Path(db_path).stat().st_size / 2**20, 1),
+        },
+        # Peak RSS is process-wide, so each figure includes the scenarios before it
+        "scenarios": scenarios,
+    }
+
+
+def compare_reports(baseline: dict, current: dict, *, max_regression: float) -> list[str]:
+    """Regressions of throughput or p99 latency beyond ``max_regression`` (0.2 = 20%)."""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        if result["errors"] > before["errors"]:
+            regressions.append(f"{name}: {result['errors']} errors (baseline {before['errors']})")
+        if before["ops_per_second"] and result["ops_per_second"] < before["ops_per_second"] * (1 - max_regression):
+            regressions.append(
+                f"{name}: {result['ops_per_second']} ops/s (baseline {before['ops_per_second']})"
+            )
+        p99, baseline_p99 = result["latency_ms"]["p99"], before["latency_ms"]["p99"]
+        if baseline_p99 and p99 > baseline_p99 * (1 + max_regression):
+            regressions.append(f"{name}: p99 {p99} ms (baseline {baseline_p99} ms)")
+    return regressions
@@ -0,0 +1,330 @@
+"""Scripted user traffic, replayed through the real cog callbacks.
+
+Each scenario loads the cogs it needs onto a :class:`FakeBot` in
+:meth:`Scenario.setup` and performs one user action per :meth:`Scenario.run`
+call. ``index`` picks the user, product or channel so concurrent operations
+touch different rows, the way a crowd of users would. An operation raises
+:class:`ScenarioError` when the bot answered with anything but success, so a
+fast failure is never reported as throughput.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from operator import attrgetter
+from typing import ClassVar, Optional
+
+import discord
+
+from apex_core.pricing import CachedDiscount, apply_discount, combine_discounts
+from cogs.ai_support import AISupportCog
+from cogs.referrals import ReferralsCog
+from cogs.storefront import (
+    CategorySelect,
+    NextPageButton,
+    OpenTicketButton,
+    ProductActionView,
+    StorefrontCog,
+    SubCategorySelect,
+)
+from cogs.ticket_management import TicketManagementCog
+
+from .fakes import (
+    FakeBot,
+    FakeCategoryChannel,
+    FakeGuild,
+    FakeInteraction,
+    FakeMember,
+    FakeMessage,
+    FakeRole,
+    FakeTextChannel,
+    click,
+)
+from .seed import TICKET_CHANNEL_BASE, USER_ID_BASE, SeedVolumes
+
+
+class ScenarioError(Exception):
+    """The bot did not complete the scripted action."""
+
+
+def _spread(index: int, size: int) -> int:
+    """Map 0, 1, 2, ... onto 0..size-1 without neighbours sharing a row."""
+    return (index * 7919) % size
+
+
+class Scenario:
+    name: ClassVar[str]
+    description: ClassVar[str]
+    default_ops: ClassVar[int] = 1000
+
+    def __init__(self, bot: FakeBot, volumes: SeedVolumes) -> None:
+        self.bot = bot
+        self.volumes = volumes
+
+    async def setup(self) -> None:
+        pass
+
+    async def run(self, index: int) -> None:
+        raise NotImplementedError
+
+    async def teardown(self) -> None:
+        pass
+
+    def user(self, index: int, *, roles: tuple[FakeRole, ...] = ()) -> FakeMember:
+        user_id = USER_ID_BASE + 1 + _spread(index, self.volumes.users)
+        return FakeMember(user_id, f"user{user_id % 100_000}", roles)
+
+    def interaction(self, user: FakeMember) -> FakeInteraction:
+        return FakeInteraction(self.bot, user)
+
+    def active_product(self, index: int) -> int:
+        product_id = 1 + _spread(index, self.volumes.products)
+        if product_id % 20 == 19:
+            # Seeded products 19, 39, ... are inactive
+            product_id -= 1
+        return product_id
+
+
+def _child(view: Optional[discord.ui.View], item_type: type) -> Optional[discord.ui.Item]:
+    for child in view.children if view else ():
+        if isinstance(child, item_type):
+            return child
+    return None
+
+
+class BrowseStorm(Scenario):
+    name = "browse_storm"
+    description = "Category select, sub-category select, then the next product page"
+
+    async def setup(self) -> None:
+        self.storefront = await self.bot.add_cog(StorefrontCog(self.bot))
+        self.categories = await self.bot.db.get_distinct_main_categories()
+
+    async def run(self, index: int) -> None:
+        user = self.user(index)
+        categories = self.categories[:25]
+        category_select = CategorySelect(categories)
+
+        interaction = self.interaction(user)
+        await click(category_select, interaction, categories[index % len(categories)])
+        sub_category_select = _child(interaction.last_view(), SubCategorySelect)
+        if sub_category_select is None:
+            raise ScenarioError("category select did not offer sub-categories")
+
+        options = sub_category_select.item.options
+        interaction = self.interaction(user)
+        await click(sub_category_select, interaction, options[index % len(options)].value)
+        products_view = interaction.last_view()
+        if products_view is None:
+            raise ScenarioError("sub-category select did not show products")
+
+        next_button = _child(products_view, NextPageButton)
+        if next_button is not None and not next_button.item.disabled:
+            interaction = self.interaction(user)
+            await click(next_button, interaction)
+            if interaction.last_view() is None:
+                raise ScenarioError("next page did not show products")
+
+
+class PurchaseRush(Scenario):
+    name = "purchase_rush"
+    description = "Buy with Wallet, then submit the CONFIRM modal"
+    default_ops = 500
+
+    async def setup(self) -> None:
+        self.storefront = await self.bot.add_cog(StorefrontCog(self.bot))
+
+    async def run(self, index: int) -> None:
+        # Every index is a different user, so no purchase changes another's price
+        user = self.user(index)
+        product_id = self.active_product(index)
+
+        interaction = self.interaction(user)
+        buy_button = ProductActionView(product_id).children[0]
+        await buy_button.callback(interaction)
+        modal = interaction.response.modal
+        if modal is None:
+            raise ScenarioError(f"no confirmation modal for product {product_id}: {interaction.response.calls}")
+
+        modal.confirmation._value = "CONFIRM"
+        interaction = self.interaction(user)
+        await modal.on_submit(interaction)
+        if interaction.last_embed_title() != "Purchase Complete!":
+            raise ScenarioError(f"purchase of product {product_id} failed: {interaction.followup.sent}")
+
+
+class OpenTickets(Scenario):
+    name = "open_ticket"
+    description = "Open Ticket on a product page: ticket row, channel, owner summary and payment prompt"
+    default_ops = 500
+
+    async def setup(self) -> None:
+        self.storefront = await self.bot.add_cog(StorefrontCog(self.bot))
+        config = self.bot.config
+        self.category = FakeCategoryChannel(config.ticket_categories.support, "Support")
+        self.guild = FakeGuild(
+            channels=(self.category,), roles=(FakeRole(config.role_ids.admin, "Admin"),)
+        )
+
+    async def run(self, index: int) -> None:
+        product_id = self.active_product(index)
+        interaction = FakeInteraction(self.bot, self.user(index), guild=self.guild)
+        await click(OpenTicketButton(product_id), interaction)
+        # The handler reports its own failures as a follow-up instead of raising
+        replies = [str(sent["content"]) for sent in interaction.followup.sent]
+        if not replies or not replies[-1].startswith("Your support ticket is ready"):
+            raise ScenarioError(f"no ticket for product {product_id}: {replies}")
+
+
+class TicketFlood(Scenario):
+    name = "ticket_flood"
+    description = "Chat messages in open ticket channels, through every on_message listener"
+    default_ops = 2000
+
+    async def setup(self) -> None:
+        self.tickets = await self.bot.add_cog(TicketManagementCog(self.bot))
+        # Its lifecycle loop would sweep tickets on a timer; only messages are measured
+        self.tickets.cog_unload()
+        await self.bot.add_cog(StorefrontCog(self.bot))
+        self.listeners = [
+            listener
+            for cog in self.bot.cogs.values()
+            for name, listener in cog.get_listeners()
+            if name == "on_message"
+        ]
+
+    async def run(self, index: int) -> None:
+        channel_id = TICKET_CHANNEL_BASE + 1 + index % self.volumes.open_tickets
+        channel = FakeTextChannel(channel_id, f"ticket-user{channel_id % 1000}-support")
+        message = FakeMessage(self.user(index), channel, content=f"Any update on this? ({index})")
+        for listener in self.listeners:
+            await listener(message)
+
+
+class ReferralPayouts(Scenario):
+    name = "referral_payouts"
+    description = "Cashback payout batches of 25 referrers, as confirmed from !batchcashback"
+    default_ops = 200
+    batch_size: ClassVar[int] = 25
+
+    async def setup(self) -> None:
+        self.referrals = await self.bot.add_cog(ReferralsCog(self.bot))
+
+    async def run(self, index: int) -> None:
+        # Batches walk the referrer pool; once it has been paid they pay nothing
+        referrers = self.volumes.referrers
+        start = index * self.batch_size
+        pending = [
+            {"referrer_id": USER_ID_BASE + 1 + (start + offset) % referrers}
+            for offset in range(min(self.batch_size, referrers))
+        ]
+        result = await self.referrals._execute_cashback_payout(pending, f"BENCH-{index}")
+        if result["failed_count"]:
+            raise ScenarioError(f"payout batch {index} failed: {result['failed_users'][:1]}")
+
+    async def teardown(self) -> None:
+        # Payout DMs are paced for Discord's rate limits and not part of the payout
+        tasks = list(self.referrals._notification_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+AI_QUESTIONS = (
+    "How long does delivery take for Instagram followers?",
+    "What is the price of 5000 followers?",
+    "Can I get a refund if my order is late?",
+    "Do you have any YouTube services?",
+    "How do I top up my wallet?",
+    "What are your opening hours?",
+    "Which product is best for a new account?",
+    "Tell me a joke about cats",
+)
+AI_PREMIUM_ROLE = FakeRole(3001, "⚡ AI Premium")
+
+
+class AIQuestions(Scenario):
+    name = "ai_questions"
+    description = "/ai questions with the model provider replaced by an instant reply"
+
+    async def setup(self) -> None:
+        self.ai = await self.bot.add_cog(AISupportCog(self.bot))
+        # Swapped on the instance: the benchmark must never reach a real provider
+        self.ai._get_gemini_response = self._fake_provider
+        self.ai._get_groq_response = self._fake_provider_without_model
+
+    async def _fake_provider(self, question: str, system_prompt: str, model_name: str = "") -> tuple[str, int, int]:
+        await asyncio.sleep(0)
+        return f"Here is what I know about: {question}", len(system_prompt) // 4, 50
+
+    async def _fake_provider_without_model(self, question: str, system_prompt: str) -> tuple[str, int, int]:
+        return await self._fake_provider(question, system_prompt)
+
+    async def run(self, index: int) -> None:
+        # One paid user in five, whose context includes their orders
+        roles = (AI_PREMIUM_ROLE,) if index % 5 == 0 else ()
+        interaction = self.interaction(self.user(index, roles=roles))
+        question = AI_QUESTIONS[index % len(AI_QUESTIONS)]
+        await self.ai.ai_command.callback(self.ai, interaction, question)
+        if interaction.last_embed_title() != "🤖 AI Assistant Response":
+            raise ScenarioError(f"/ai did not answer: {interaction.followup.sent}")
+
+
+class DiscountPricing(Scenario):
+    name = "discount_pricing"
+    description = "Price a page of products against every discount rule, through the in-memory engine"
+    page_size: ClassVar[int] = 10
+
+    async def setup(self) -> None:
+        self.storefront = await self.bot.add_cog(StorefrontCog(self.bot))
+        self.products = await self.bot.db.get_all_products()
+        # Rules are loaded once per set_discount, not per page
+        await self.storefront.pricing.discounts.refresh()
+
+    def page(self, index: int) -> list:
+        start = _spread(index, len(self.products))
+        return self.products[start : start + self.page_size]
+
+    async def price_page(self, user: FakeMember, products: list) -> dict[int, tuple[int, float]]:
+        return await self.storefront.pricing.price_products(user.id, products, self.bot.config)
+
+    async def run(self, index: int) -> None:
+        products = self.page(index)
+        prices = await self.price_page(self.user(index), products)
+        if len(prices) != len(products):
+            raise ScenarioError(f"priced {len(prices)} of {len(products)} products")
+
+
+class DiscountLookupSQL(DiscountPricing):
+    name = "discount_lookup_sql"
+    description = "The same pages with one get_applicable_discounts query per product, as before the engine"
+    default_ops = 100
+
+    async def price_page(self, user: FakeMember, products: list) -> dict[int, tuple[int, float]]:
+        pricing = await self.storefront.pricing.get_user_pricing(user.id, self.bot.config)
+        vip_tier = pricing.vip_tier.name if pricing.vip_tier else None
+        prices = {}
+        for product in products:
+            rows = await self.bot.db.get_applicable_discounts(
+                user_id=pricing.db_user_id, product_id=product["id"], vip_tier=vip_tier
+            )
+            # The query has no ORDER BY; rules combine in ID order, as in the engine
+            discounts = sorted(map(CachedDiscount.from_row, rows), key=attrgetter("discount_id"))
+            percent = combine_discounts(pricing.role_discount_percent, discounts)
+            prices[product["id"]] = (apply_discount(product["price_cents"], percent), percent)
+        return prices
+
+
+SCENARIOS: dict[str, type[Scenario]] = {
+    scenario.name: scenario
+    for scenario in (
+        BrowseStorm,
+        PurchaseRush,
+        OpenTickets,
+        TicketFlood,
+        ReferralPayouts,
+        AIQuestions,
+        DiscountPricing,
+        DiscountLookupSQL,
+    )
+}
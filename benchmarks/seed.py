@@ -0,0 +1,252 @@
+"""Populate a benchmark database with production-sized tables.
+
+Rows are generated inside SQLite from a recursive counter, with IDs, prices
+and statuses derived from the row number by multiplicative hashing, so the
+same volumes always produce the same database and a million rows take
+seconds rather than a Python loop.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+from apex_core.database import Database
+
+# Discord IDs of seeded users are USER_ID_BASE + 1 .. USER_ID_BASE + users
+USER_ID_BASE = 100_000_000_000_000_000
+# Channel IDs of seeded open tickets are TICKET_CHANNEL_BASE + 1 .. + tickets
+TICKET_CHANNEL_BASE = 900_000_000_000_000_000
+
+MAIN_CATEGORIES = 20
+SUB_CATEGORIES_PER_MAIN = 25
+# Every seeded user can afford any seeded product many times over
+STARTING_BALANCE_CENTS = 5_000_000
+
+
+@dataclass(frozen=True)
+class SeedVolumes:
+    """Row counts for the seeded tables; the defaults match a large store."""
+
+    users: int = 100_000
+    products: int = 50_000
+    orders: int = 1_000_000
+    ledger: int = 1_000_000
+    discounts: int = 50_000
+
+    def scaled(self, factor: float) -> SeedVolumes:
+        """The same volumes multiplied by ``factor``, at least one row each."""
+        return SeedVolumes(**{f.name: max(1, int(getattr(self, f.name) * factor)) for f in fields(self)})
+
+    @property
+    def referrers(self) -> int:
+        return max(1, self.users // 20)
+
+    @property
+    def referrals(self) -> int:
+        """One user in ten was referred, by one of :attr:`referrers`."""
+        return max(0, min(self.users // 10, self.users - self.referrers))
+
+    @property
+    def open_tickets(self) -> int:
+        return max(1, self.users // 100)
+
+    @property
+    def products_per_sub_category(self) -> int:
+        return max(1, self.products // (MAIN_CATEGORIES * SUB_CATEGORIES_PER_MAIN))
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "users": self.users,
+            "products": self.products,
+            "orders": self.orders,
+            "ledger": self.ledger,
+            "discounts": self.discounts,
+            "referrals": self.referrals,
+            "open_tickets": self.open_tickets,
+        }
+
+
+def _counter(name: str = "seq") -> str:
+    """CTE yielding i = 1..? for INSERT ... SELECT statements."""
+    return f"WITH RECURSIVE {name}(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM {name} WHERE i < ?)"
+
+
+async def _seed_products(db: Database, volumes: SeedVolumes) -> None:
+    per_sub = volumes.products_per_sub_category
+    await db._connection.execute(
+        f"""
+        {_counter()}
+        INSERT INTO products (
+            main_category, sub_category, service_name, variant_name, price_cents,
+            start_time, duration, refill_period, additional_info,
+            content_payload, stock_quantity, is_active
+        )
+        SELECT
+            'Category ' || ((i - 1) / ({per_sub} * {SUB_CATEGORIES_PER_MAIN}) % {MAIN_CATEGORIES}),
+            'Service ' || ((i - 1) / {per_sub} % {SUB_CATEGORIES_PER_MAIN}),
+            'Service ' || ((i - 1) / {per_sub} % {SUB_CATEGORIES_PER_MAIN}),
+            ((i % 10) + 1) * 1000 || ' Followers #' || i,
+            100 + (i * 7919) % 20000,
+            'Instant', '30 days', '30 day', 'High quality, refill included',
+            CASE WHEN i % 3 = 0 THEN 'Login details for order ' || i END,
+            CASE WHEN i % 4 = 0 THEN 1000000 END,
+            CASE WHEN i % 20 = 19 THEN 0 ELSE 1 END
+        FROM seq
+        """,
+        (volumes.products,),
+    )
+
+
+async def _seed_users(db: Database, volumes: SeedVolumes) -> None:
+    await db._connection.execute(
+        f"""
+        {_counter()}
+        INSERT INTO users (discord_id, wallet_balance_cents, total_lifetime_spent_cents, has_client_role)
+        SELECT {USER_ID_BASE} + i, {STARTING_BALANCE_CENTS}, (i * 104729) % 2000000, i % 2
+        FROM seq
+        """,
+        (volumes.users,),
+    )
+
+
+async def _seed_orders(db: Database, volumes: SeedVolumes) -> None:
+    await db._connection.execute(
+        f"""
+        {_counter()}
+        INSERT INTO orders (
+            user_discord_id, product_id, price_paid_cents, discount_applied_percent,
+            order_metadata, created_at, status, warranty_expires_at
+        )
+        SELECT
+            {USER_ID_BASE} + 1 + (i * 7919) % ?,
+            1 + (i * 104729) % ?,
+            100 + (i * 31) % 20000,
+            0,
+            NULL,
+            datetime('now', '-' || (i % 365) || ' days'),
+            CASE i % 10
+                WHEN 0 THEN 'pending' WHEN 1 THEN 'processing' WHEN 2 THEN 'refunded'
+                ELSE 'completed'
+            END,
+            CASE WHEN i % 10 = 5 THEN datetime('now', (i % 60 - 10) || ' days') END
+        FROM seq
+        """,
+        (volumes.orders, volumes.users, volumes.products),
+    )
+    # One approved review per hundred orders, for the storefront's rating lines
+    await db._connection.execute(
+        """
+        INSERT INTO reviews (user_discord_id, order_id, rating, comment, status)
+        SELECT user_discord_id, id, 1 + id % 5, 'Fast delivery', 'approved'
+        FROM orders WHERE id % 100 = 0
+        """
+    )
+
+
+async def _seed_ledger(db: Database, volumes: SeedVolumes) -> None:
+    await db._connection.execute(
+        f"""
+        {_counter()}
+        INSERT INTO wallet_transactions (
+            user_discord_id, amount_cents, balance_after_cents,
+            transaction_type, description, created_at
+        )
+        SELECT
+            {USER_ID_BASE} + 1 + (i * 15485863) % ?,
+            CASE WHEN i % 4 = 0 THEN 2500 ELSE -(100 + i % 20000) END,
+            {STARTING_BALANCE_CENTS},
+            CASE i % 4 WHEN 0 THEN 'deposit' WHEN 1 THEN 'purchase' WHEN 2 THEN 'purchase' ELSE 'refund' END,
+            'Seeded transaction',
+            datetime('now', '-' || (i % 365) || ' days')
+        FROM seq
+        """,
+        (volumes.ledger, volumes.users),
+    )
+
+
+async def _seed_discounts(db: Database, volumes: SeedVolumes) -> None:
+    # Mostly per-user product deals, one rule in ten for everyone buying a product,
+    # one in seven for a user's whole basket and one in a thousand store-wide;
+    # a fifth expire in the future and a fifth have already expired
+    await db._connection.execute(
+        f"""
+        {_counter()}
+        INSERT INTO discounts (
+            user_id, product_id, vip_tier, discount_percent, description, expires_at, is_stackable
+        )
+        SELECT
+            CASE WHEN i % 10 = 0 THEN NULL ELSE 1 + (i * 7919) % ? END,
+            CASE WHEN i % 1000 = 0 OR (i % 7 = 0 AND i % 10 != 0) THEN NULL
+                ELSE 1 + (i * 104729) % ? END,
+            CASE i % 13 WHEN 0 THEN 'Apex VIP' WHEN 1 THEN 'Apex Elite' END,
+            1 + i % 15,
+            'Seeded discount ' || i,
+            CASE i % 5
+                WHEN 0 THEN datetime('now', '+' || (1 + i % 90) || ' days')
+                WHEN 1 THEN datetime('now', '-' || (1 + i % 90) || ' days')
+            END,
+            i % 3 = 0
+        FROM seq
+        """,
+        (volumes.discounts, volumes.users, volumes.products),
+    )
+
+
+async def _seed_referrals(db: Database, volumes: SeedVolumes) -> None:
+    if not volumes.referrals:
+        return
+    # Referred users follow the referrer pool, so nobody refers themselves
+    await db._connection.execute(
+        f"""
+        {_counter()}
+        INSERT INTO referrals (
+            referrer_user_id, referred_user_id, referred_total_spend_cents, cashback_earned_cents
+        )
+        SELECT
+            {USER_ID_BASE} + 1 + i % {volumes.referrers},
+            {USER_ID_BASE} + {volumes.referrers} + i,
+            10000 + (i * 31) % 100000,
+            50 + i % 500
+        FROM seq
+        """,
+        (volumes.referrals,),
+    )
+
+
+async def _seed_tickets(db: Database, volumes: SeedVolumes) -> None:
+    await db._connection.execute(
+        f"""
+        {_counter()}
+        INSERT INTO tickets (user_discord_id, channel_id, status, type)
+        SELECT {USER_ID_BASE} + 1 + (i * 7919) % {volumes.users}, {TICKET_CHANNEL_BASE} + i, 'open', 'support'
+        FROM seq
+        """,
+        (volumes.open_tickets,),
+    )
+
+
+async def seed_database(path: str | Path, volumes: SeedVolumes) -> float:
+    """Create the schema at ``path`` and fill it; returns the seconds taken."""
+    started = time.perf_counter()
+    db = Database(path)
+    await db.connect()
+    try:
+        await db._connection.execute("BEGIN IMMEDIATE;")
+        try:
+            await _seed_products(db, volumes)
+            await _seed_users(db, volumes)
+            await _seed_orders(db, volumes)
+            await _seed_ledger(db, volumes)
+            await _seed_discounts(db, volumes)
+            await _seed_referrals(db, volumes)
+            await _seed_tickets(db, volumes)
+        except Exception:
+            await db._connection.rollback()
+            raise
+        # No ANALYZE: the bot never runs it, so query plans stay those of production
+        await db._connection.commit()
+    finally:
+        await db.close()
+    return time.perf_counter() - started
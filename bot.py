@@ -17,7 +17,9 @@ from discord.ext import commands, tasks
 from dotenv import load_dotenv
 
 from apex_core import load_config, load_payment_settings, Database, TranscriptStorage
+from apex_core.lazy_import import is_available
 from apex_core.logger import setup_logger
+from apex_core.startup import StartupProfiler, sync_command_tree
 
 # Load environment variables from .env file
 load_dotenv()
@@ -25,18 +27,14 @@ load_dotenv()
 # Set up enhanced logger
 logger = setup_logger(level=logging.INFO)
 
-# Check for optional dependencies
-try:
-    import chat_exporter
-    CHAT_EXPORTER_AVAILABLE = True
-except ImportError:
-    CHAT_EXPORTER_AVAILABLE = False
+# Check for optional dependencies without importing them (they load on first use)
+CHAT_EXPORTER_AVAILABLE = is_available("chat_exporter")
+BOTO3_AVAILABLE = is_available("boto3")
 
-try:
-    import boto3
-    BOTO3_AVAILABLE = True
-except ImportError:
-    BOTO3_AVAILABLE = False
+# Log per-extension import/setup time and time to ready
+STARTUP_PROFILE = os.getenv("APEX_STARTUP_PROFILE", "").lower() in ("1", "true", "yes")
+# Sync the command tree even if the command signatures are unchanged
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC", "").lower() in ("1", "true", "yes")
 
 
 def _validate_token_format(token: str) -> bool:
@@ -74,6 +72,7 @@ class ApexCoreBot(commands.Bot):
     def __init__(self, *args, **kwargs):
         self.config = kwargs.pop("config")
         self.config_path = kwargs.pop("config_path", "config.json")
+        self.profiler = kwargs.pop("profiler", None) or StartupProfiler(enabled=STARTUP_PROFILE)
         self.db = Database()
         self.storage = TranscriptStorage()
         super().__init__(*args, **kwargs)
@@ -105,10 +104,12 @@ class ApexCoreBot(commands.Bot):
             raise
 
     async def setup_hook(self):
-        await self.db.connect()
+        with self.profiler.phase("database"):
+            await self.db.connect()
         logger.info("Database connected and schema initialized.")
         
-        self.storage.initialize()
+        with self.profiler.phase("storage"):
+            self.storage.initialize()
         logger.info("Transcript storage initialized.")
         
         # Set up Discord channel logging if channels are configured
@@ -136,13 +137,16 @@ class ApexCoreBot(commands.Bot):
             logger.info("ℹ boto3 library not found - transcripts will be stored locally")
             logger.info("  Install with: pip install -r requirements-optional.txt (for S3 support)")
 
-        await self._load_cogs()
+        with self.profiler.phase("extensions"):
+            await self._load_cogs()
 
-        for guild_id in self.config.guild_ids:
-            guild = discord.Object(id=guild_id)
-            self.tree.copy_global_to(guild=guild)
-            await self.tree.sync(guild=guild)
-            logger.info(f"Command tree synced for guild {guild_id}")
+        with self.profiler.phase("command sync"):
+            await sync_command_tree(
+                self.tree,
+                self.config.guild_ids,
+                self.db.db_path.with_name("command_tree_hashes.json"),
+                force=FORCE_COMMAND_SYNC,
+            )
 
     async def _load_cogs(self):
         cogs_dir = Path("cogs")
@@ -156,14 +160,23 @@ class ApexCoreBot(commands.Bot):
 
             extension = f"cogs.{cog_file.stem}"
             try:
-                await self.load_extension(extension)
+                with self.profiler.extension(extension):
+                    await self.load_extension(extension)
                 logger.info(f"Loaded extension: {extension}")
             except Exception as e:
                 logger.error(f"Failed to load extension {extension}: {e}", exc_info=True)
 
+    async def add_cog(self, cog, /, **kwargs):
+        self.profiler.cog_setup_started()
+        await super().add_cog(cog, **kwargs)
+
     async def on_ready(self):
         logger.info(f"Logged in as {self.user} (ID: {self.user.id})")
         logger.info("Apex Core is ready!")
+        if "ready" not in self.profiler.phases:
+            self.profiler.mark_ready()
+            if self.profiler.enabled:
+                logger.info(self.profiler.report())
 
     async def close(self):
         # Cancel background tasks
@@ -175,6 +188,14 @@ class ApexCoreBot(commands.Bot):
             daily_backup_task.cancel()
             logger.info("Daily backup task cancelled.")
 
+        # Unload extensions while the database is still open so cogs can
+        # persist buffered state in cog_unload
+        for extension in tuple(self.extensions):
+            try:
+                await self.unload_extension(extension)
+            except Exception as e:
+                logger.error(f"Failed to unload extension {extension}: {e}", exc_info=True)
+
         await self.db.close()
         logger.info("Database connection closed.")
         await super().close()
@@ -258,6 +279,7 @@ async def before_daily_backup_task():
 
 
 async def main():
+    profiler = StartupProfiler(enabled=STARTUP_PROFILE)
     config_path = os.environ.get("CONFIG_PATH", "config.json")
     token = os.environ.get("DISCORD_TOKEN")
     
@@ -299,6 +321,7 @@ async def main():
         intents=intents,
         config=config,
         config_path=config_path,
+        profiler=profiler,
     )
 
     # Start background tasks
@@ -19,18 +19,14 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+from apex_core.lazy_import import is_available, optional_import
 
-try:
-    from groq import Groq
-    GROQ_AVAILABLE = True
-except ImportError:
-    GROQ_AVAILABLE = False
+# The AI SDKs are slow to import, so they are loaded on the first question
+GEMINI_AVAILABLE = is_available("google.generativeai")
+GROQ_AVAILABLE = is_available("groq")
 
+from apex_core.ai_cache import PRODUCT_INDICATORS, ProductContextBuilder, ResponseCache
+from apex_core.ai_usage import AIUsageTracker
 from apex_core.logger import get_logger
 from apex_core.utils import create_embed
 from apex_core.utils.admin_checks import admin_only
@@ -51,6 +47,10 @@ MODELS = {
     "ultra": "gemini-2.5-flash"
 }
 
+# Response cache settings
+AI_RESPONSE_CACHE_SIZE = int(os.getenv("AI_RESPONSE_CACHE_SIZE", "512"))
+AI_RESPONSE_CACHE_TTL = int(os.getenv("AI_RESPONSE_CACHE_TTL", "3600"))
+
 # Cost per 1K tokens (in cents)
 COST_PER_1K_TOKENS = {
     "free": 0,  # Free tier
@@ -72,64 +72,17 @@ def _get_user_tier(user: discord.Member) -> str:
 
 
 def _is_product_question(question: str, product_keywords: list[str]) -> bool:
-    """Check if question is about products/bot."""
-    question_lower = question.lower()
-    product_keywords_lower = [kw.lower() for kw in product_keywords]
-    
-    # Check for product-related keywords
-    product_indicators = [
-        "product", "buy", "purchase", "order", "price", "cost", "service",
-        "available", "stock", "catalog", "store", "shop", "item", "variant",
-        "category", "discount", "promo", "wallet", "balance", "refund",
-        "ticket", "support", "command", "/", "!", "bot"
-    ]
-    
-    # Check if question contains product keywords or bot-related terms
-    if any(indicator in question_lower for indicator in product_indicators):
-        return True
-    
-    # Check if question mentions any product names
-    if any(kw in question_lower for kw in product_keywords_lower):
-        return True
-    
-    return False
-
+    """Check if question is about products/bot.
 
-async def _build_product_context(db) -> str:
-    """Build product context for AI."""
-    try:
-        products = await db.get_all_products(active_only=True)
-        if not products:
-            return "No products available."
-        
-        context = "AVAILABLE PRODUCTS:\n"
-        for product in products[:50]:  # Limit to 50 products to avoid token limits
-            # SQLite Row objects don't have .get() - convert to dict or use direct access
-            if hasattr(product, "keys") and not isinstance(product, dict):
-                product_dict = dict(product)
-                name = product_dict.get("variant_name", "Unknown")
-                price_cents = product_dict.get("price_cents", 0)
-                category = product_dict.get("main_category", "Unknown")
-                subcategory = product_dict.get("sub_category", "")
-            else:
-                name = product.get("variant_name", "Unknown")
-                price_cents = product.get("price_cents", 0)
-                category = product.get("main_category", "Unknown")
-                subcategory = product.get("sub_category", "")
-            price = f"${price_cents / 100:.2f}"
-            
-            context += f"- {name} ({category}"
-            if subcategory:
-                context += f" > {subcategory}"
-            context += f"): {price}\n"
-        
-        if len(products) > 50:
-            context += f"\n... and {len(products) - 50} more products."
-        
-        return context
-    except Exception as e:
-        logger.error(f"Error building product context: {e}")
-        return "Product information unavailable."
+    Kept for ad-hoc callers; the /ai command uses the precomputed matcher
+    from :class:`ProductContextBuilder` instead.
+    """
+    question_lower = question.lower()
+    return any(
+        keyword.lower() in question_lower
+        for keyword in (*PRODUCT_INDICATORS, *product_keywords)
+        if keyword
+    )
 
 
 async def _build_user_context(db, user_id: int, tier: str) -> str:
@@ -185,87 +138,78 @@ class AISupportCog(commands.Cog):
         self.bot = bot
         self.gemini_client = None
         self.groq_client = None
+        self.context_builder = ProductContextBuilder(bot.db)
+        self.response_cache = ResponseCache(
+            max_entries=AI_RESPONSE_CACHE_SIZE,
+            ttl_seconds=AI_RESPONSE_CACHE_TTL
+        )
+        self.usage_tracker = AIUsageTracker(bot.db)
         
         # Initialize API clients
         self._init_clients()
     
+    async def cog_load(self) -> None:
+        """Start periodic flushing of buffered AI usage."""
+        self.usage_tracker.start()
+    
+    async def cog_unload(self) -> None:
+        """Persist any buffered AI usage."""
+        try:
+            await self.usage_tracker.close()
+        except Exception as e:
+            logger.error(f"Failed to flush AI usage on unload: {e}")
+    
     def _init_clients(self):
-        """Initialize AI API clients."""
-        # Gemini API
-        gemini_key = os.getenv("GEMINI_API_KEY")
-        if gemini_key and GEMINI_AVAILABLE:
-            try:
-                genai.configure(api_key=gemini_key)
-                self.gemini_client = genai
-                logger.info("✅ Gemini API initialized")
-            except Exception as e:
-                logger.error(f"Failed to initialize Gemini API: {e}")
-        else:
-            if not gemini_key:
-                logger.warning("⚠️ GEMINI_API_KEY not found in environment")
-            if not GEMINI_AVAILABLE:
-                logger.warning("⚠️ google-generativeai not installed")
-        
-        # Groq API
-        groq_key = os.getenv("GROQ_API_KEY")
-        if groq_key and GROQ_AVAILABLE:
-            try:
-                self.groq_client = Groq(api_key=groq_key)
-                logger.info("✅ Groq API initialized")
-            except Exception as e:
-                logger.error(f"Failed to initialize Groq API: {e}")
-        else:
-            if not groq_key:
-                logger.warning("⚠️ GROQ_API_KEY not found in environment")
-            if not GROQ_AVAILABLE:
-                logger.warning("⚠️ groq not installed")
+        """Check which AI providers are configured; clients are created on first use."""
+        self._gemini_key = os.getenv("GEMINI_API_KEY")
+        if not self._gemini_key:
+            logger.warning("⚠️ GEMINI_API_KEY not found in environment")
+        if not GEMINI_AVAILABLE:
+            logger.warning("⚠️ google-generativeai not installed")
+
+        self._groq_key = os.getenv("GROQ_API_KEY")
+        if not self._groq_key:
+            logger.warning("⚠️ GROQ_API_KEY not found in environment")
+        if not GROQ_AVAILABLE:
+            logger.warning("⚠️ groq not installed")
+
+    async def _ensure_gemini_client(self):
+        """Import and configure the Gemini SDK the first time it is needed."""
+        if self.gemini_client is None and self._gemini_key and GEMINI_AVAILABLE:
+            genai = await asyncio.to_thread(optional_import, "google.generativeai")
+            if genai is not None:
+                try:
+                    genai.configure(api_key=self._gemini_key)
+                    self.gemini_client = genai
+                    logger.info("✅ Gemini API initialized")
+                except Exception as e:
+                    logger.error(f"Failed to initialize Gemini API: {e}")
+        return self.gemini_client
+
+    async def _ensure_groq_client(self):
+        """Import the Groq SDK and create its client the first time it is needed."""
+        if self.groq_client is None and self._groq_key and GROQ_AVAILABLE:
+            groq = await asyncio.to_thread(optional_import, "groq")
+            if groq is not None:
+                try:
+                    self.groq_client = groq.Groq(api_key=self._groq_key)
+                    logger.info("✅ Groq API initialized")
+                except Exception as e:
+                    logger.error(f"Failed to initialize Groq API: {e}")
+        return self.groq_client
     
     async def _get_daily_usage(self, user_id: int, usage_date: date) -> dict:
-        """Get or create daily usage record."""
+        """Get daily usage counters (served from memory after the first lookup)."""
         try:
-            cursor = await self.bot.db._connection.execute(
-                """
-                SELECT * FROM ai_daily_usage
-                WHERE user_discord_id = ? AND usage_date = ?
-                """,
-                (user_id, usage_date.isoformat())
-            )
-            row = await cursor.fetchone()
-            
-            if row:
-                return {
-                    "general_questions": row["general_questions"],
-                    "product_questions": row["product_questions"],
-                    "images_generated": row["images_generated"]
-                }
-            else:
-                # Create new record
-                await self.bot.db._connection.execute(
-                    """
-                    INSERT INTO ai_daily_usage (user_discord_id, usage_date)
-                    VALUES (?, ?)
-                    """,
-                    (user_id, usage_date.isoformat())
-                )
-                await self.bot.db._connection.commit()
-                return {"general_questions": 0, "product_questions": 0, "images_generated": 0}
+            return await self.usage_tracker.get_usage(user_id, usage_date.isoformat())
         except Exception as e:
             logger.error(f"Error getting daily usage: {e}")
             return {"general_questions": 0, "product_questions": 0, "images_generated": 0}
     
     async def _increment_usage(self, user_id: int, usage_date: date, question_type: str):
-        """Increment usage counter."""
+        """Increment usage counter (persisted on the next batched flush)."""
         try:
-            field = f"{question_type}_questions"
-            await self.bot.db._connection.execute(
-                f"""
-                UPDATE ai_daily_usage
-                SET {field} = {field} + 1
-                WHERE user_discord_id = ? AND usage_date = ?
-                """,
-                (user_id, usage_date.isoformat())
-            )
-            await self.bot.db._connection.commit()
+            await self.usage_tracker.increment(user_id, usage_date.isoformat(), f"{question_type}_questions")
         except Exception as e:
             logger.error(f"Error incrementing usage: {e}")
     
@@ -278,34 +222,24 @@ class AISupportCog(commands.Cog):
         output_tokens: int,
         question_preview: str
     ):
-        """Log AI usage for cost tracking."""
+        """Log AI usage for cost tracking (persisted on the next batched flush)."""
         try:
             total_tokens = input_tokens + output_tokens
             cost_cents = int((total_tokens / 1000) * COST_PER_1K_TOKENS.get(tier, 0))
-            
-            await self.bot.db._connection.execute(
-                """
-                INSERT INTO ai_usage_logs
-                (user_discord_id, tier, model, input_tokens, output_tokens, total_tokens, estimated_cost_cents, question_preview)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (user_id, tier, model, input_tokens, output_tokens, total_tokens, cost_cents, question_preview[:100])
+            await self.usage_tracker.log(
+                user_id, tier, model, input_tokens, output_tokens, cost_cents, question_preview
             )
-            await self.bot.db._connection.commit()
         except Exception as e:
             logger.error(f"Error logging usage: {e}")
     
-    async def _check_limits(self, user: discord.Member, question: str, product_keywords: list[str]) -> tuple[bool, str]:
-        """Check if user has remaining questions."""
+    async def _check_limits(self, user: discord.Member, question_type: str) -> tuple[bool, str]:
+        """Check if user has remaining questions of the given type."""
         tier = _get_user_tier(user)
         limits = TIER_LIMITS.get(tier, TIER_LIMITS["free"])
         
         today = date.today()
         usage = await self._get_daily_usage(user.id, today)
         
-        is_product = _is_product_question(question, product_keywords)
-        question_type = "product" if is_product else "general"
-        
         limit = limits.get(question_type, 0)
         current = usage.get(f"{question_type}_questions", 0)
         
@@ -358,7 +292,8 @@ RULES:
     
     async def _get_gemini_response(self, question: str, system_prompt: str, model_name: str) -> tuple[str, int, int]:
         """Get response from Gemini API."""
-        if not self.gemini_client:
+        genai = await self._ensure_gemini_client()
+        if not genai:
             raise RuntimeError("Gemini API not initialized")
         
         try:
@@ -384,12 +319,13 @@ RULES:
     
     async def _get_groq_response(self, question: str, system_prompt: str) -> tuple[str, int, int]:
         """Get response from Groq API."""
-        if not self.groq_client:
+        groq_client = await self._ensure_groq_client()
+        if not groq_client:
             raise RuntimeError("Groq API not initialized")
         
         try:
             response = await asyncio.to_thread(
-                self.groq_client.chat.completions.create,
+                groq_client.chat.completions.create,
                 model=MODELS["premium"],
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -423,45 +359,62 @@ RULES:
         
         tier = _get_user_tier(user)
         
-        # Get product keywords for context
+        # Product context and keyword matcher are rebuilt only when the catalog changes
         try:
-            products = await self.bot.db.get_all_products(active_only=True)
-            product_keywords = [p.get("variant_name", "") for p in products[:20]]
-        except:
-            product_keywords = []
+            catalog = await self.context_builder.get_snapshot()
+            product_context = catalog.product_context
+            catalog_version = catalog.version
+            is_product = catalog.is_product_question(question)
+        except Exception as e:
+            logger.error(f"Error building product context: {e}")
+            product_context = "Product information unavailable."
+            catalog_version = ""
+            is_product = _is_product_question(question, [])
+        question_type = "product" if is_product else "general"
         
         # Check limits
-        can_ask, limit_message = await self._check_limits(user, question, product_keywords)
+        can_ask, limit_message = await self._check_limits(user, question_type)
         if not can_ask:
             await interaction.followup.send(limit_message, ephemeral=True)
             return
         
-        # Build contexts
-        product_context = await _build_product_context(self.bot.db)
         user_context = await _build_user_context(self.bot.db, user.id, tier)
         
-        # Get AI response
-        try:
-            response_text, input_tokens, output_tokens = await self._get_ai_response(
-                question, tier, product_context, user_context
-            )
-        except Exception as e:
-            logger.error(f"AI response error: {e}")
-            await interaction.followup.send(
-                f"❌ Error getting AI response: {e}\n\nPlease try again later or contact support.",
-                ephemeral=True
-            )
-            return
+        # Identical questions against the same catalog skip the provider entirely
+        cache_key = ResponseCache.make_key(question, tier, catalog_version, user_context)
+        response_text = self.response_cache.get(cache_key) if catalog_version else None
+        if response_text is not None:
+            model_used = "cache"
+            input_tokens = output_tokens = 0
+        else:
+            model_used = MODELS.get(tier, "unknown")
+            if is_product and catalog_version:
+                # Products matching the question rather than the first page of the catalog
+                try:
+                    product_context = await self.context_builder.context_for(question, catalog)
+                except Exception as e:
+                    logger.error(f"Error searching product context: {e}")
+            try:
+                response_text, input_tokens, output_tokens = await self._get_ai_response(
+                    question, tier, product_context, user_context
+                )
+            except Exception as e:
+                logger.error(f"AI response error: {e}")
+                await interaction.followup.send(
+                    f"❌ Error getting AI response: {e}\n\nPlease try again later or contact support.",
+                    ephemeral=True
+                )
+                return
+            if catalog_version:
+                self.response_cache.put(cache_key, response_text)
         
         # Update usage
         today = date.today()
-        is_product = _is_product_question(question, product_keywords)
-        question_type = "product" if is_product else "general"
         await self._increment_usage(user.id, today, question_type)
         
         # Log usage
         await self._log_usage(
-            user.id, tier, MODELS.get(tier, "unknown"),
+            user.id, tier, model_used,
             input_tokens, output_tokens, question
         )
         
@@ -565,11 +518,17 @@ RULES:
         """Admin command for AI statistics."""
         await interaction.response.defer(ephemeral=True)
         
-        # TODO: Implement admin statistics
-        await interaction.followup.send(
-            "🚧 Admin statistics coming soon!",
-            ephemeral=True
+        stats = self.response_cache.stats()
+        embed = create_embed(
+            title="🤖 AI Response Cache",
+            color=discord.Color.blue()
         )
+        embed.add_field(name="Entries", value=str(stats["entries"]), inline=True)
+        embed.add_field(name="Hits", value=str(stats["hits"]), inline=True)
+        embed.add_field(name="Misses", value=str(stats["misses"]), inline=True)
+        embed.add_field(name="Hit Rate", value=f"{stats['hit_rate'] * 100:.1f}%", inline=True)
+        
+        await interaction.followup.send(embed=embed, ephemeral=True)
 
 
 async def setup(bot: commands.Bot):
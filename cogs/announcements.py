@@ -9,15 +9,19 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from apex_core.broadcast import BroadcastEngine, BroadcastProgress, RecipientUnavailable
 from apex_core.logger import get_logger
 from apex_core.utils import create_embed
 from apex_core.utils.permissions import is_admin_from_bot
 
 logger = get_logger()
 
-# Rate limiting constants
-DM_BATCH_SIZE = 5  # Discord allows 5 DMs per 5 seconds
-DM_DELAY_SECONDS = 1.2  # Slightly more than 1 second between batches
+
+def _progress_text(progress: BroadcastProgress) -> str:
+    return (
+        f"Progress: {progress.sent + progress.failed}/{progress.total} sent, "
+        f"{progress.sent} successful, {progress.failed} failed"
+    )
 
 
 class AnnouncementsCog(commands.Cog):
@@ -25,25 +29,42 @@ class AnnouncementsCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.engine = BroadcastEngine(bot.db)
+        self._broadcasts: dict[int, asyncio.Task] = {}  # announcement_id -> task
+        self._resume_task: Optional[asyncio.Task] = None
+
+    async def cog_load(self) -> None:
+        """Resume broadcasts interrupted by a restart."""
+        self._resume_task = asyncio.create_task(self._resume_incomplete_broadcasts())
+
+    async def cog_unload(self) -> None:
+        """Stop running broadcasts; their outbox state is resumed on next load."""
+        if self._resume_task:
+            self._resume_task.cancel()
+        for task in self._broadcasts.values():
+            task.cancel()
+        self._broadcasts.clear()
 
     def _is_admin(self, user: discord.User, guild: Optional[discord.Guild]) -> bool:
         """Check if user is admin."""
         return is_admin_from_bot(user, guild, self.bot)
 
-    async def _get_target_users(
+    async def _get_target_user_ids(
         self,
         guild: discord.Guild,
         target: Optional[str] = None
-    ) -> list[discord.Member]:
-        """Get list of users to send announcement to."""
-        users = []
+    ) -> list[int]:
+        """Get IDs of users to send announcement to from the gateway member cache."""
+        if not guild.chunked:
+            # Populate the member cache over the gateway instead of a REST scan
+            await guild.chunk(cache=True)
+
+        user_ids: list[int] = []
         
         if target is None or target.lower() == "all":
             # All members
             logger.info(f"Getting all members for announcement | Guild: {guild.id}")
-            async for member in guild.fetch_members(limit=None):
-                if not member.bot:
-                    users.append(member)
+            user_ids = [member.id for member in guild.members if not member.bot]
         elif target.startswith("role:"):
             # Specific role
             try:
@@ -51,9 +72,7 @@ class AnnouncementsCog(commands.Cog):
                 role = guild.get_role(role_id)
                 if role:
                     logger.info(f"Getting members with role {role.name} ({role_id}) for announcement")
-                    for member in role.members:
-                        if not member.bot:
-                            users.append(member)
+                    user_ids = [member.id for member in role.members if not member.bot]
                 else:
                     logger.warning(f"Role {role_id} not found for announcement")
             except (ValueError, IndexError):
@@ -75,10 +94,111 @@ class AnnouncementsCog(commands.Cog):
                 for row in rows:
                     member = guild.get_member(row["user_discord_id"])
                     if member and not member.bot:
-                        users.append(member)
+                        user_ids.append(member.id)
         
-        logger.info(f"Found {len(users)} target users for announcement")
-        return users
+        logger.info(f"Found {len(user_ids)} target users for announcement")
+        return user_ids
+
+    async def _resolve_recipient(
+        self,
+        guild_id: Optional[int],
+        user_id: int
+    ) -> discord.abc.Messageable:
+        """Resolve a recipient from the cache, falling back to the API."""
+        guild = self.bot.get_guild(guild_id) if guild_id else None
+        recipient = (guild.get_member(user_id) if guild else None) or self.bot.get_user(user_id)
+        if recipient is None:
+            try:
+                recipient = await self.bot.fetch_user(user_id)
+            except discord.NotFound as e:
+                raise RecipientUnavailable(str(user_id)) from e
+        return recipient
+
+    def _build_announcement_embed(self, title: str, message: str) -> discord.Embed:
+        embed = create_embed(
+            title=title,
+            description=message,
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text="Apex Digital Announcement")
+        return embed
+
+    def _start_broadcast(
+        self,
+        announcement: dict,
+        progress_msg: Optional[discord.WebhookMessage] = None
+    ) -> None:
+        """Drain an announcement's outbox in the background."""
+        announcement_id = announcement["id"]
+        if announcement_id in self._broadcasts:
+            return
+
+        embed = self._build_announcement_embed(announcement["title"], announcement["message"])
+
+        async def send(user_id: int) -> None:
+            recipient = await self._resolve_recipient(announcement["guild_id"], user_id)
+            await recipient.send(embed=embed)
+
+        async def on_progress(progress: BroadcastProgress) -> None:
+            if progress_msg is None:
+                return
+            await progress_msg.edit(embed=create_embed(
+                title="📢 Sending Announcements",
+                description=_progress_text(progress),
+                color=discord.Color.blue()
+            ))
+
+        async def runner() -> None:
+            try:
+                result = await self.engine.run(announcement_id, send, on_progress)
+                if progress_msg is not None:
+                    await self._show_final_stats(progress_msg, result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(
+                    f"Broadcast failed | Announcement: {announcement_id} | Error: {e}",
+                    exc_info=True
+                )
+            finally:
+                self._broadcasts.pop(announcement_id, None)
+
+        self._broadcasts[announcement_id] = asyncio.create_task(runner())
+
+    async def _show_final_stats(
+        self,
+        progress_msg: discord.WebhookMessage,
+        result: BroadcastProgress
+    ) -> None:
+        total = result.total
+        final_embed = create_embed(
+            title="✅ Announcements Sent",
+            description=(
+                f"**Total Recipients:** {total}\n"
+                f"**Successful:** {result.sent}\n"
+                f"**Failed:** {result.failed}\n"
+                f"**Success Rate:** {(result.sent / total * 100 if total else 0):.1f}%"
+            ),
+            color=discord.Color.green() if result.failed == 0 else discord.Color.orange()
+        )
+        try:
+            await progress_msg.edit(embed=final_embed)
+        except discord.HTTPException:
+            # Interaction token expires after 15 minutes; stats stay in /announcements
+            pass
+
+    async def _resume_incomplete_broadcasts(self) -> None:
+        """Restart broadcasts that were interrupted before completing."""
+        await self.bot.wait_until_ready()
+        try:
+            announcements = await self.bot.db.get_incomplete_announcements()
+        except Exception as e:
+            logger.error(f"Failed to load incomplete announcements: {e}", exc_info=True)
+            return
+
+        for announcement in announcements:
+            logger.info(f"Resuming interrupted broadcast | Announcement: {announcement['id']}")
+            self._start_broadcast(dict(announcement))
 
     async def _send_dm_announcement(
         self,
@@ -92,13 +212,7 @@ class AnnouncementsCog(commands.Cog):
             True if sent successfully, False otherwise
         """
         try:
-            embed = create_embed(
-                title=title,
-                description=message,
-                color=discord.Color.blue()
-            )
-            embed.set_footer(text="Apex Digital Announcement")
-            
+            embed = self._build_announcement_embed(title, message)
             await user.send(embed=embed)
             logger.debug(f"Announcement DM sent successfully | User: {user.id}")
             return True
@@ -151,93 +265,40 @@ class AnnouncementsCog(commands.Cog):
         try:
             if method == "dm":
                 # Get target users
-                users = await self._get_target_users(interaction.guild, target)
+                user_ids = await self._get_target_user_ids(interaction.guild, target)
                 
-                if not users:
+                if not user_ids:
                     await interaction.followup.send(
                         "❌ No users found matching the target criteria.",
                         ephemeral=True
                     )
                     return
                 
-                # Show progress embed
-                progress_embed = create_embed(
-                    title="📢 Sending Announcements",
-                    description=f"Progress: 0/{len(users)}",
-                    color=discord.Color.blue()
-                )
-                progress_msg = await interaction.followup.send(embed=progress_embed, ephemeral=True)
-                
-                # Send in batches with rate limiting
-                sent = 0
-                failed = 0
-                total = len(users)
-                
-                logger.info(f"Sending announcements to {total} users in batches of {DM_BATCH_SIZE}")
-                
-                for i in range(0, total, DM_BATCH_SIZE):
-                    batch = users[i:i + DM_BATCH_SIZE]
-                    
-                    # Send batch
-                    results = await asyncio.gather(
-                        *[self._send_dm_announcement(user, title, message) for user in batch],
-                        return_exceptions=True
-                    )
-                    
-                    # Count results
-                    for result in results:
-                        if result is True:
-                            sent += 1
-                        else:
-                            failed += 1
-                    
-                    # Update progress every batch
-                    progress_embed.description = f"Progress: {sent + failed}/{total} sent, {sent} successful, {failed} failed"
-                    try:
-                        await progress_msg.edit(embed=progress_embed)
-                    except:
-                        pass
-                    
-                    logger.debug(f"Announcement batch complete | Sent: {sent} | Failed: {failed} | Total: {total}")
-                    
-                    # Rate limit delay (except for last batch)
-                    if i + DM_BATCH_SIZE < total:
-                        await asyncio.sleep(DM_DELAY_SECONDS)
-                
-                # Record announcement
+                # Record announcement and queue every recipient in the outbox
                 announcement_id = await self.bot.db.create_announcement(
                     title=title,
                     message=message,
                     announcement_type=target or "all",
                     delivery_method="dm",
-                    created_by_staff_id=interaction.user.id
-                )
-                
-                await self.bot.db.update_announcement_stats(
-                    announcement_id,
-                    total_recipients=total,
-                    successful_deliveries=sent,
-                    failed_deliveries=failed
+                    created_by_staff_id=interaction.user.id,
+                    guild_id=interaction.guild.id,
+                    status="sending"
                 )
+                await self.bot.db.enqueue_announcement_deliveries(announcement_id, user_ids)
                 
-                # Final update
-                final_embed = create_embed(
-                    title="✅ Announcements Sent",
-                    description=(
-                        f"**Total Recipients:** {total}\n"
-                        f"**Successful:** {sent}\n"
-                        f"**Failed:** {failed}\n"
-                        f"**Success Rate:** {(sent/total*100):.1f}%"
-                    ),
-                    color=discord.Color.green() if failed == 0 else discord.Color.orange()
+                progress_embed = create_embed(
+                    title="📢 Sending Announcements",
+                    description=f"Progress: 0/{len(user_ids)}",
+                    color=discord.Color.blue()
                 )
-                
-                await progress_msg.edit(embed=final_embed)
+                progress_embed.set_footer(text=f"Announcement ID: {announcement_id}")
+                progress_msg = await interaction.followup.send(embed=progress_embed, ephemeral=True)
                 
                 logger.info(
-                    f"Announcement completed | ID: {announcement_id} | "
-                    f"Sent: {sent} | Failed: {failed} | Total: {total}"
+                    f"Announcement queued | ID: {announcement_id} | Recipients: {len(user_ids)}"
                 )
+                announcement = await self.bot.db.get_announcement(announcement_id)
+                self._start_broadcast(dict(announcement), progress_msg)
                 
             elif method == "channel":
                 # Channel announcement
@@ -290,6 +351,72 @@ class AnnouncementsCog(commands.Cog):
                 ephemeral=True
             )
 
+    @app_commands.command(name="announceretry")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.describe(announcement_id="Announcement ID to retry failed deliveries for")
+    async def retry_announcement(
+        self,
+        interaction: discord.Interaction,
+        announcement_id: int
+    ) -> None:
+        """Retry failed DM deliveries of an announcement (admin only)."""
+        if not self._is_admin(interaction.user, interaction.guild):
+            logger.warning(f"Non-admin attempted announceretry | User: {interaction.user.id}")
+            await interaction.response.send_message(
+                "🚫 You don't have permission to use this command.",
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        try:
+            announcement = await self.bot.db.get_announcement(announcement_id)
+            if not announcement or announcement["delivery_method"] != "dm":
+                await interaction.followup.send(
+                    "❌ DM announcement not found.",
+                    ephemeral=True
+                )
+                return
+            
+            if announcement_id in self._broadcasts:
+                await interaction.followup.send(
+                    "⏳ This announcement is still being delivered.",
+                    ephemeral=True
+                )
+                return
+            
+            requeued = await self.bot.db.retry_failed_announcement_deliveries(announcement_id)
+            if requeued == 0:
+                await interaction.followup.send(
+                    "✅ No failed deliveries to retry.",
+                    ephemeral=True
+                )
+                return
+            
+            logger.info(
+                f"Retrying announcement deliveries | ID: {announcement_id} | "
+                f"Recipients: {requeued} | Admin: {interaction.user.id}"
+            )
+            # Deliveries that already succeeded count towards the total
+            progress = await self.engine.progress(announcement_id)
+            progress_msg = await interaction.followup.send(
+                embed=create_embed(
+                    title="📢 Retrying Announcements",
+                    description=_progress_text(progress),
+                    color=discord.Color.blue()
+                ),
+                ephemeral=True
+            )
+            self._start_broadcast(dict(announcement), progress_msg)
+            
+        except Exception as e:
+            logger.exception(f"Failed to retry announcement | Error: {e}", exc_info=True)
+            await interaction.followup.send(
+                f"❌ Failed to retry announcement: {str(e)}",
+                ephemeral=True
+            )
+
     @app_commands.command(name="announcements")
     @app_commands.default_permissions(administrator=True)
     @app_commands.describe(limit="Number of announcements to show")
@@ -329,7 +456,7 @@ class AnnouncementsCog(commands.Cog):
             
             for ann in announcements[:10]:
                 embed.add_field(
-                    name=f"{ann['title']} ({ann['delivery_method'].upper()})",
+                    name=f"#{ann['id']} {ann['title']} ({ann['delivery_method'].upper()})",
                     value=(
                         f"**Recipients:** {ann['total_recipients']}\n"
                         f"**Successful:** {ann['successful_deliveries']}\n"
@@ -16,7 +16,6 @@ import re
 import asyncio
 from decimal import Decimal, ROUND_DOWN
 from typing import Optional, List
-from collections import deque
 import time
 
 import aiohttp
@@ -35,6 +34,7 @@ ATTO_NODE_APIS_STR = os.getenv("ATTO_NODE_API", "http://localhost:8080")
 ATTO_MAIN_WALLET = os.getenv("ATTO_MAIN_WALLET_ADDRESS", "")
 ATTO_DEPOSIT_CHECK_INTERVAL = int(os.getenv("ATTO_DEPOSIT_CHECK_INTERVAL", "30"))
 XT_API_BASE = "https://api.xt.com/api/v1"
+ATTO_PRICE_CACHE_TTL = int(os.getenv("ATTO_PRICE_CACHE_TTL", "60"))
 
 # Cashback rates
 DEPOSIT_CASHBACK_PERCENT = 10.0  # 10% on deposits
@@ -42,9 +42,14 @@ PAYMENT_DISCOUNT_PERCENT = 2.5  # 2.5% discount or cashback on payments
 
 
 class AttoNodeManager:
-    """Manages multiple Atto node connections with automatic failover."""
+    """Manages multiple Atto node connections with automatic failover.
+
+    Each node gets one long-lived pooled ``ClientSession``. Node health is
+    refreshed by a background task, so picking a node never blocks on the
+    network.
+    """
     
-    def __init__(self, node_urls: str):
+    def __init__(self, node_urls: str, *, health_check_interval: float = 60.0):
         """Initialize with comma-separated node URLs."""
         # Parse node URLs
         urls = [url.strip() for url in node_urls.split(",") if url.strip()]
@@ -52,51 +57,68 @@ class AttoNodeManager:
             urls = ["http://localhost:8080"]
         
         self.nodes: List[str] = urls
-        self.node_queue = deque(urls)  # Round-robin queue
         self.node_health: dict[str, tuple[bool, float]] = {}  # {url: (is_healthy, last_check_time)}
-        self.health_check_interval = 60  # Check health every 60 seconds
+        self.health_check_interval = health_check_interval
         self.timeout = aiohttp.ClientTimeout(total=10)  # 10 second timeout per request
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._health_task: Optional[asyncio.Task] = None
         
         logger.info(f"Atto Node Manager initialized with {len(self.nodes)} node(s): {', '.join(self.nodes)}")
     
+    def _get_session(self, node_url: str) -> aiohttp.ClientSession:
+        """Get the pooled session for a node, creating it on first use."""
+        session = self._sessions.get(node_url)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=60),
+            )
+            self._sessions[node_url] = session
+        return session
+    
+    def start(self) -> None:
+        """Start the background health checker."""
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_check_loop())
+    
+    async def close(self) -> None:
+        """Stop health checks and close pooled sessions."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
+    
+    async def _health_check_loop(self) -> None:
+        while True:
+            await self.check_all_nodes()
+            await asyncio.sleep(self.health_check_interval)
+    
+    async def check_all_nodes(self) -> None:
+        """Refresh the health of every node concurrently."""
+        await asyncio.gather(*(self._check_node_health(node_url) for node_url in self.nodes))
+    
     async def _check_node_health(self, node_url: str) -> bool:
         """Check if a node is healthy by making a simple request."""
         try:
-            async with aiohttp.ClientSession(timeout=self.timeout) as session:
-                # Try to get node info (health check endpoint)
-                async with session.get(f"{node_url}/health", timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                    is_healthy = resp.status == 200
-                    self.node_health[node_url] = (is_healthy, time.time())
-                    return is_healthy
+            session = self._get_session(node_url)
+            async with session.get(f"{node_url}/health", timeout=aiohttp.ClientTimeout(total=5)) as resp:
+                is_healthy = resp.status == 200
         except Exception as e:
             logger.debug(f"Node health check failed for {node_url}: {e}")
-            self.node_health[node_url] = (False, time.time())
-            return False
+            is_healthy = False
+        self.node_health[node_url] = (is_healthy, time.time())
+        return is_healthy
     
-    async def _get_healthy_node(self) -> Optional[str]:
-        """Get a healthy node, checking health if needed."""
-        # Check health of nodes if needed
-        current_time = time.time()
-        for node_url in self.nodes:
-            if node_url not in self.node_health:
-                # First time checking this node
-                await self._check_node_health(node_url)
-            else:
-                is_healthy, last_check = self.node_health[node_url]
-                # Re-check if unhealthy or stale
-                if not is_healthy or (current_time - last_check) > self.health_check_interval:
-                    await self._check_node_health(node_url)
-        
-        # Try to find a healthy node
-        for node_url in self.nodes:
-            if self.node_health.get(node_url, (False, 0))[0]:
-                return node_url
-        
-        # If no healthy node found, try the first one anyway (might be temporary issue)
-        # Only log if we have nodes configured (avoid spam when Atto not set up)
-        if self.nodes and self.nodes[0] != "http://localhost:8080":
-            logger.warning("No healthy nodes found, using first node anyway")
-        return self.nodes[0] if self.nodes else None
+    def _ordered_nodes(self) -> List[str]:
+        """Nodes to try for a request: healthy (or unchecked) nodes first."""
+        healthy = [node for node in self.nodes if self.node_health.get(node, (True, 0))[0]]
+        return healthy + [node for node in self.nodes if node not in healthy]
     
     async def request(
         self, 
@@ -118,61 +140,28 @@ class AttoNodeManager:
             JSON data if successful, None if all nodes failed
         """
         # Try each node in order until one succeeds
-        attempted_nodes = []
-        
-        for _ in range(len(self.nodes)):
-            node_url = await self._get_healthy_node()
-            if not node_url:
-                break
-            
-            if node_url in attempted_nodes:
-                # Already tried this node, move to next
-                self.node_queue.rotate(1)
-                continue
-            
-            attempted_nodes.append(node_url)
-            
+        for node_url in self._ordered_nodes():
             try:
-                async with aiohttp.ClientSession(timeout=self.timeout) as session:
-                    url = f"{node_url}{endpoint}"
-                    
-                    if method.upper() == "GET":
-                        async with session.get(url, params=params) as resp:
-                            if resp.status == 200:
-                                logger.debug(f"Request successful to node: {node_url}")
-                                data = await resp.json()
-                                return data
-                            elif resp.status >= 500:
-                                # Server error, try next node
-                                # Only log if not localhost (avoid spam when Atto not configured)
-                                if "localhost" not in node_url:
-                                    logger.warning(f"Node {node_url} returned {resp.status}, trying next node")
-                                self.node_health[node_url] = (False, time.time())
-                                continue
-                            else:
-                                # Client error (4xx), don't retry
-                                error_data = await resp.json() if resp.content_type == 'application/json' else {}
-                                logger.warning(f"Node {node_url} returned {resp.status}: {error_data}")
-                                return None
-                    
-                    elif method.upper() == "POST":
-                        async with session.post(url, params=params, json=json_data) as resp:
-                            if resp.status == 200:
-                                logger.debug(f"Request successful to node: {node_url}")
-                                data = await resp.json()
-                                return data
-                            elif resp.status >= 500:
-                                # Server error, try next node
-                                # Only log if not localhost (avoid spam when Atto not configured)
-                                if "localhost" not in node_url:
-                                    logger.warning(f"Node {node_url} returned {resp.status}, trying next node")
-                                self.node_health[node_url] = (False, time.time())
-                                continue
-                            else:
-                                # Client error (4xx), don't retry
-                                error_data = await resp.json() if resp.content_type == 'application/json' else {}
-                                logger.warning(f"Node {node_url} returned {resp.status}: {error_data}")
-                                return None
+                session = self._get_session(node_url)
+                async with session.request(
+                    method.upper(), f"{node_url}{endpoint}", params=params, json=json_data
+                ) as resp:
+                    if resp.status == 200:
+                        logger.debug(f"Request successful to node: {node_url}")
+                        data = await resp.json()
+                        return data
+                    elif resp.status >= 500:
+                        # Server error, try next node
+                        # Only log if not localhost (avoid spam when Atto not configured)
+                        if "localhost" not in node_url:
+                            logger.warning(f"Node {node_url} returned {resp.status}, trying next node")
+                        self.node_health[node_url] = (False, time.time())
+                        continue
+                    else:
+                        # Client error (4xx), don't retry
+                        error_data = await resp.json() if resp.content_type == 'application/json' else {}
+                        logger.warning(f"Node {node_url} returned {resp.status}: {error_data}")
+                        return None
                     
             except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 # Only log if not localhost (avoid spam when Atto not configured)
@@ -187,23 +176,62 @@ class AttoNodeManager:
         return None
 
 
-# Initialize node manager
-_node_manager = AttoNodeManager(ATTO_NODE_APIS_STR)
-
-
-async def _get_atto_price_usd() -> Optional[float]:
-    """Get Atto price in USD from XT.com API."""
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{XT_API_BASE}/ticker/price", params={"symbol": "ATTO_USDT"}) as resp:
+class AttoPriceFeed:
+    """ATTO/USDT price from XT.com, cached with a TTL on a pooled session."""
+    
+    def __init__(self, api_base: str = XT_API_BASE, *, ttl: float = ATTO_PRICE_CACHE_TTL):
+        self.api_base = api_base
+        self.ttl = ttl
+        self._price: Optional[float] = None
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def get_price(self) -> Optional[float]:
+        """Return the cached price, refreshing it once the TTL has expired."""
+        if self._price is not None and time.monotonic() - self._fetched_at < self.ttl:
+            return self._price
+        
+        async with self._lock:
+            # Another caller may have refreshed while we waited
+            if self._price is not None and time.monotonic() - self._fetched_at < self.ttl:
+                return self._price
+            
+            price = await self._fetch_price()
+            if price is not None:
+                self._price = price
+                self._fetched_at = time.monotonic()
+            # Fall back to the last known price if the API is unavailable
+            return self._price
+    
+    async def _fetch_price(self) -> Optional[float]:
+        try:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+            async with self._session.get(f"{self.api_base}/ticker/price", params={"symbol": "ATTO_USDT"}) as resp:
                 if resp.status == 200:
                     data = await resp.json()
                     if "data" in data and "price" in data["data"]:
                         return float(data["data"]["price"])
-        return None
-    except Exception as e:
-        logger.error(f"Error fetching Atto price: {e}")
-        return None
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching Atto price: {e}")
+            return None
+    
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+# Initialize node manager and price feed
+_node_manager = AttoNodeManager(ATTO_NODE_APIS_STR)
+_price_feed = AttoPriceFeed()
+
+
+async def _get_atto_price_usd() -> Optional[float]:
+    """Get Atto price in USD from XT.com API (cached)."""
+    return await _price_feed.get_price()
 
 
 async def _get_atto_transactions(address: str, since_hash: Optional[str] = None) -> list[dict]:
@@ -305,6 +333,7 @@ class AttoIntegrationCog(commands.Cog):
     async def cog_load(self) -> None:
         """Start deposit monitoring task."""
         if ATTO_MAIN_WALLET:
+            _node_manager.start()
             self.deposit_monitor_task.start()
             logger.info("Atto deposit monitoring started")
         else:
@@ -313,6 +342,8 @@ class AttoIntegrationCog(commands.Cog):
     async def cog_unload(self) -> None:
         """Stop deposit monitoring task."""
         self.deposit_monitor_task.cancel()
+        await _node_manager.close()
+        await _price_feed.close()
         logger.info("Atto deposit monitoring stopped")
     
     @tasks.loop(seconds=ATTO_DEPOSIT_CHECK_INTERVAL)
@@ -338,23 +369,15 @@ class AttoIntegrationCog(commands.Cog):
                     self._last_atto_error_log = time.time()
                 return
             
+            deposits = []
             for tx in transactions:
                 if tx.get("type") == "receive" and tx.get("memo"):
                     memo = tx.get("memo", "")
                     user_id = _parse_memo(memo)
+                    tx_hash = tx.get("hash", "")
                     
-                    if user_id:
+                    if user_id and tx_hash:
                         amount_raw = tx.get("amount", "0")
-                        tx_hash = tx.get("hash", "")
-                        
-                        # Check if already processed
-                        cursor = await self.bot.db._connection.execute(
-                            "SELECT id FROM atto_transactions WHERE transaction_hash = ?",
-                            (tx_hash,)
-                        )
-                        if await cursor.fetchone():
-                            continue
-                        
                         # Calculate cashback (10%)
                         cashback_raw = str(
                             int(
@@ -365,42 +388,50 @@ class AttoIntegrationCog(commands.Cog):
                                 ).to_integral_value(rounding=ROUND_DOWN)
                             )
                         )
-                        
-                        # Add balance + cashback
-                        await self.bot.db.add_atto_balance(user_id, amount_raw, cashback_raw)
-                        
-                        # Log transaction
-                        price_usd = await _get_atto_price_usd()
-                        amount_usd_cents = _atto_to_usd(amount_raw, price_usd) if price_usd else 0
-                        
-                        await self.bot.db.log_atto_transaction(
-                            user_id, "deposit", amount_raw, amount_usd_cents,
-                            to_address=main_address, transaction_hash=tx_hash, memo=memo,
-                            cashback_raw=cashback_raw, status="completed"
+                        deposits.append({
+                            "user_discord_id": user_id,
+                            "amount_raw": amount_raw,
+                            "cashback_raw": cashback_raw,
+                            "transaction_hash": tx_hash,
+                            "memo": memo,
+                        })
+            
+            if not deposits:
+                return
+            
+            # One price lookup and one transaction for the whole page;
+            # already-processed hashes are filtered out in a single query
+            price_usd = await _get_atto_price_usd()
+            for deposit in deposits:
+                deposit["amount_usd_cents"] = _atto_to_usd(deposit["amount_raw"], price_usd) if price_usd else 0
+            
+            credited = await self.bot.db.credit_atto_deposits(deposits, to_address=main_address)
+            self.last_processed_hash = deposits[-1]["transaction_hash"]
+            
+            for deposit in credited:
+                user_id = deposit["user_discord_id"]
+                # Notify user
+                try:
+                    user = await self.bot.fetch_user(user_id)
+                    if user:
+                        embed = create_embed(
+                            title="✅ Atto Deposit Received",
+                            description=f"Your deposit of {format_usd(deposit['amount_usd_cents'])} has been credited!",
+                            color=discord.Color.green()
+                        )
+                        embed.add_field(
+                            name="🎁 Bonus",
+                            value=f"Received {format_usd(_atto_to_usd(deposit['cashback_raw'], price_usd) if price_usd else 0)} cashback (10%)!",
+                            inline=False
                         )
-                        
-                        # Notify user
-                        try:
-                            user = await self.bot.fetch_user(user_id)
-                            if user:
-                                embed = create_embed(
-                                    title="✅ Atto Deposit Received",
-                                    description=f"Your deposit of {format_usd(amount_usd_cents)} has been credited!",
-                                    color=discord.Color.green()
-                                )
-                                embed.add_field(
-                                    name="🎁 Bonus",
-                                    value=f"Received {format_usd(_atto_to_usd(cashback_raw, price_usd) if price_usd else 0)} cashback (10%)!",
-                                    inline=False
-                                )
-                                await user.send(embed=embed)
-                        except Exception as e:
-                            logger.error(f"Failed to notify user {user_id} of deposit: {e}")
-                        
-                        logger.info(f"Processed Atto deposit: User {user_id}, Amount {amount_raw}, Cashback {cashback_raw}")
-                        
-                        if tx_hash:
-                            self.last_processed_hash = tx_hash
+                        await user.send(embed=embed)
+                except Exception as e:
+                    logger.error(f"Failed to notify user {user_id} of deposit: {e}")
+                
+                logger.info(
+                    f"Processed Atto deposit: User {user_id}, Amount {deposit['amount_raw']}, "
+                    f"Cashback {deposit['cashback_raw']}"
+                )
             
         except Exception as e:
             logger.error(f"Error in deposit monitoring: {e}", exc_info=True)
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import csv
 import shutil
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -12,19 +11,21 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from apex_core.data_export import (
+    DEFAULT_MAX_FILE_BYTES,
+    MAX_MESSAGE_UPLOAD_BYTES,
+    batch_files_for_upload,
+    stream_query_to_files,
+)
+from apex_core.lazy_import import is_available, optional_import
 from apex_core.logger import get_logger
 from apex_core.utils import create_embed
 from apex_core.utils.permissions import is_admin_from_bot
 
 logger = get_logger()
 
-# Check for optional S3 support
-try:
-    import boto3
-    from botocore.exceptions import ClientError
-    BOTO3_AVAILABLE = True
-except ImportError:
-    BOTO3_AVAILABLE = False
+# Check for optional S3 support (boto3 is imported on first upload)
+BOTO3_AVAILABLE = is_available("boto3")
 
 
 class DatabaseManagementCog(commands.Cog):
@@ -54,6 +55,9 @@ class DatabaseManagementCog(commands.Cog):
         if not bucket:
             return False, "S3 bucket not configured"
         
+        boto3 = optional_import("boto3")
+        from botocore.exceptions import ClientError
+
         try:
             s3_client = boto3.client(
                 's3',
@@ -222,15 +226,17 @@ class DatabaseManagementCog(commands.Cog):
     @app_commands.command(name="exportdata")
     @app_commands.describe(
         data_type="Type of data to export",
-        timeframe="Time range (e.g., '7d', '30d', 'all')"
+        timeframe="Time range (e.g., '7d', '30d', 'all')",
+        file_format="Output format (gzip-compressed)"
     )
     async def export_data(
         self,
         interaction: discord.Interaction,
         data_type: Literal["orders", "users", "transactions", "products"],
-        timeframe: str = "30d"
+        timeframe: str = "30d",
+        file_format: Literal["csv", "jsonl"] = "csv"
     ) -> None:
-        """Export data to CSV (admin only)."""
+        """Export data to compressed CSV or JSONL (admin only)."""
         if not self._is_admin(interaction.user, interaction.guild):
             await interaction.response.send_message(
                 "🚫 You don't have permission to use this command.",
@@ -258,59 +264,63 @@ class DatabaseManagementCog(commands.Cog):
             if days:
                 cutoff_date = datetime.now() - timedelta(days=days)
             
-            # Export data based on type
-            if data_type == "orders":
-                rows = await self._export_orders(cutoff_date)
-            elif data_type == "users":
-                rows = await self._export_users(cutoff_date)
-            elif data_type == "transactions":
-                rows = await self._export_transactions(cutoff_date)
-            elif data_type == "products":
-                rows = await self._export_products()
-            else:
+            if self.bot.db._connection is None:
                 await interaction.followup.send(
-                    "❌ Invalid data type.",
+                    "❌ Database is not connected.",
                     ephemeral=True
                 )
                 return
             
-            if not rows:
+            query, params = self._build_export_query(data_type, cutoff_date)
+            
+            # Stream rows in chunks into compressed files split to fit Discord's upload limit
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            max_file_bytes = min(
+                interaction.guild.filesize_limit if interaction.guild else DEFAULT_MAX_FILE_BYTES,
+                MAX_MESSAGE_UPLOAD_BYTES,
+            )
+            result = await stream_query_to_files(
+                self.bot.db._connection,
+                query,
+                params,
+                directory=self.backup_dir,
+                basename=f"{data_type}_export_{timestamp}",
+                fmt=file_format,
+                max_file_bytes=max_file_bytes
+            )
+            
+            if not result.rows:
                 await interaction.followup.send(
                     f"📭 No {data_type} data found for the specified timeframe.",
                     ephemeral=True
                 )
                 return
             
-            # Create CSV file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            csv_file = self.backup_dir / f"{data_type}_export_{timestamp}.csv"
-            
-            with csv_file.open("w", newline="", encoding="utf-8") as f:
-                if rows:
-                    writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-                    writer.writeheader()
-                    writer.writerows(rows)
-            
-            # Send file
-            file_size_mb = csv_file.stat().st_size / (1024 * 1024)
+            file_size_mb = result.total_bytes / (1024 * 1024)
             
             embed = create_embed(
                 title=f"✅ {data_type.title()} Export Complete",
                 description=(
-                    f"**Records:** {len(rows)}\n"
-                    f"**File Size:** {file_size_mb:.2f} MB\n"
+                    f"**Records:** {result.rows}\n"
+                    f"**Files:** {len(result.files)} ({file_format}.gz)\n"
+                    f"**Compressed Size:** {file_size_mb:.2f} MB\n"
                     f"**Timeframe:** {timeframe}"
                 ),
                 color=discord.Color.green()
             )
             
-            await interaction.followup.send(
-                embed=embed,
-                file=discord.File(str(csv_file), filename=csv_file.name),
-                ephemeral=True
-            )
+            # Each message stays under Discord's per-request size and attachment caps
+            for index, batch in enumerate(batch_files_for_upload(result.files)):
+                await interaction.followup.send(
+                    embed=embed if index == 0 else discord.utils.MISSING,
+                    files=[discord.File(str(path), filename=path.name) for path in batch],
+                    ephemeral=True
+                )
             
-            logger.info(f"Data export created: {csv_file} by {interaction.user.id}")
+            logger.info(
+                f"Data export created: {', '.join(str(path) for path in result.files)} "
+                f"({result.rows} rows) by {interaction.user.id}"
+            )
             
         except Exception as e:
             logger.exception("Failed to export data", exc_info=True)
@@ -319,74 +329,31 @@ class DatabaseManagementCog(commands.Cog):
                 ephemeral=True
             )
 
-    async def _export_orders(self, cutoff_date: Optional[datetime]) -> list[dict[str, Any]]:
-        """Export orders to CSV format."""
-        if self.bot.db._connection is None:
-            return []
-        
-        query = "SELECT * FROM orders"
-        params: list[Any] = []
-        
-        if cutoff_date:
-            query += " WHERE created_at >= ?"
-            params.append(cutoff_date.isoformat())
-        
-        query += " ORDER BY created_at DESC"
-        
-        cursor = await self.bot.db._connection.execute(query, params)
-        rows = await cursor.fetchall()
-        
-        return [dict(row) for row in rows]
-
-    async def _export_users(self, cutoff_date: Optional[datetime]) -> list[dict[str, Any]]:
-        """Export users to CSV format."""
-        if self.bot.db._connection is None:
-            return []
-        
-        query = "SELECT * FROM users"
-        params: list[Any] = []
-        
-        if cutoff_date:
-            query += " WHERE created_at >= ?"
-            params.append(cutoff_date.isoformat())
-        
-        query += " ORDER BY created_at DESC"
-        
-        cursor = await self.bot.db._connection.execute(query, params)
-        rows = await cursor.fetchall()
-        
-        return [dict(row) for row in rows]
-
-    async def _export_transactions(self, cutoff_date: Optional[datetime]) -> list[dict[str, Any]]:
-        """Export wallet transactions to CSV format."""
-        if self.bot.db._connection is None:
-            return []
+    def _build_export_query(
+        self,
+        data_type: str,
+        cutoff_date: Optional[datetime]
+    ) -> tuple[str, list[Any]]:
+        """Build the SELECT used to stream an export."""
+        tables = {
+            "orders": "orders",
+            "users": "users",
+            "transactions": "wallet_transactions",
+            "products": "products",
+        }
+        if data_type not in tables:
+            raise ValueError(f"Invalid data type: {data_type}")
         
-        query = "SELECT * FROM wallet_transactions"
+        query = f"SELECT * FROM {tables[data_type]}"
         params: list[Any] = []
         
-        if cutoff_date:
+        # Products are always exported in full
+        if cutoff_date and data_type != "products":
             query += " WHERE created_at >= ?"
             params.append(cutoff_date.isoformat())
         
         query += " ORDER BY created_at DESC"
-        
-        cursor = await self.bot.db._connection.execute(query, params)
-        rows = await cursor.fetchall()
-        
-        return [dict(row) for row in rows]
-
-    async def _export_products(self) -> list[dict[str, Any]]:
-        """Export products to CSV format."""
-        if self.bot.db._connection is None:
-            return []
-        
-        cursor = await self.bot.db._connection.execute(
-            "SELECT * FROM products ORDER BY created_at DESC"
-        )
-        rows = await cursor.fetchall()
-        
-        return [dict(row) for row in rows]
+        return query, params
 
 
 async def setup(bot: commands.Bot) -> None:
@@ -7,12 +7,18 @@ import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 
+from apex_core.broadcast import RecipientUnavailable, fan_out
 from apex_core.utils import create_embed
 
 from apex_core.logger import get_logger
 
 logger = get_logger()
 
+# Orders whose warranty expires within this many days are announced
+WARRANTY_NOTICE_DAYS = 3
+# Embeds hold at most 25 fields
+MAX_EMBED_ORDERS = 25
+
 
 class NotificationsCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
@@ -30,28 +36,17 @@ class NotificationsCog(commands.Cog):
 
     @tasks.loop(hours=6)  # Check every 6 hours
     async def warranty_notification_task(self) -> None:
-        """Check for expiring warranties and send notifications."""
+        """Notify users of warranties newly inside the expiry window."""
         try:
-            # Get orders expiring in the next 3 days
-            expiring_orders = await self.bot.db.get_orders_expiring_soon(3)
-            
-            if not expiring_orders:
+            groups = await self.bot.db.get_pending_warranty_notifications(WARRANTY_NOTICE_DAYS)
+            if not groups:
                 return
 
-            # Group orders by user for consolidated notifications
-            user_orders = {}
-            for order in expiring_orders:
-                user_id = order["user_discord_id"]
-                if user_id not in user_orders:
-                    user_orders[user_id] = []
-                user_orders[user_id].append(order)
+            sent, failed = await fan_out(groups, self._send_warranty_expiry_notification)
+            logger.info(f"Warranty expiry notifications: {sent} sent, {failed} failed")
 
-            # Send notifications to each user
-            for user_id, orders in user_orders.items():
-                await self._send_warranty_expiry_notification(user_id, orders)
-
-            # Send summary to admins if there are expiring orders
-            await self._send_admin_warranty_summary(expiring_orders)
+            # Send summary to admins for the orders announced this run
+            await self._send_admin_warranty_summary([order for group in groups for order in group["orders"]])
 
         except Exception as e:
             logger.error(f"Error in warranty notification task: {e}")
@@ -61,78 +56,59 @@ class NotificationsCog(commands.Cog):
         """Wait until the bot is ready before starting the task."""
         await self.bot.wait_until_ready()
 
-    async def _send_warranty_expiry_notification(self, user_id: int, orders: list) -> None:
-        """Send a DM to a user about their expiring warranties."""
+    async def _send_warranty_expiry_notification(self, group: dict) -> None:
+        """DM one user about their expiring warranties and record the notice.
+
+        Users who cannot be reached are recorded too, so they are not retried
+        every run; rate limits propagate for :func:`fan_out` to retry.
+        """
+        user_id = group["user_discord_id"]
+        orders = group["orders"]
         try:
-            # Try to get the user from the cache/fetch
-            user = self.bot.get_user(user_id)
-            if not user:
-                # If not in cache, try to fetch
-                try:
-                    user = await self.bot.fetch_user(user_id)
-                except discord.NotFound:
-                    logger.warning(f"Could not find user {user_id} for warranty notification")
-                    return
-                except discord.Forbidden:
-                    logger.warning(f"Cannot fetch user {user_id} for warranty notification")
-                    return
-
-            # Create the notification embed
-            embed = create_embed(
-                title="⚠️ Warranty Expiry Notice",
-                description="You have orders with warranties expiring soon!",
-                color=discord.Color.orange(),
+            user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+        except (discord.NotFound, discord.Forbidden) as e:
+            logger.warning(f"Could not find user {user_id} for warranty notification")
+            await self.bot.db.record_warranty_notifications(orders)
+            raise RecipientUnavailable(str(user_id)) from e
+
+        embed = create_embed(
+            title="⚠️ Warranty Expiry Notice",
+            description="You have orders with warranties expiring soon!",
+            color=discord.Color.orange(),
+        )
+
+        for order in orders[:MAX_EMBED_ORDERS]:
+            renewals = order["renewal_count"] or 0
+            renewal_info = f" ({renewals} renewals)" if renewals > 0 else ""
+
+            value = (
+                f"**Product:** {order['product_name']}\n"
+                f"**Order ID:** #{order['id']}\n"
+                f"**Status:** {order['status'].title()}\n"
+                f"**Expires:** {order['warranty_expires_at']}{renewal_info}\n"
+                f"Please contact support if you need to extend your warranty."
             )
 
-            for order_row in orders:
-                order = dict(order_row) if not isinstance(order_row, dict) else order_row
-
-                # Get product info
-                product = None
-                if order["product_id"] != 0:
-                    product = await self.bot.db.get_product(order["product_id"])
-
-                if order["product_id"] == 0:
-                    import json
-                    try:
-                        metadata = json.loads(order["order_metadata"]) if order["order_metadata"] else {}
-                        product_name = metadata.get("product_name", "Manual Order")
-                    except (json.JSONDecodeError, TypeError):
-                        product_name = "Manual Order"
-                elif product:
-                    product_name = f"{product['service_name']} - {product['variant_name']}"
-                else:
-                    product_name = f"Product #{order['product_id']} (deleted)"
-
-                renewals = order.get("renewal_count", 0)
-                renewal_info = f" ({renewals} renewals)" if renewals > 0 else ""
-
-                value = (
-                    f"**Product:** {product_name}\n"
-                    f"**Order ID:** #{order['id']}\n"
-                    f"**Status:** {order['status'].title()}\n"
-                    f"**Expires:** {order['warranty_expires_at']}{renewal_info}\n"
-                    f"Please contact support if you need to extend your warranty."
-                )
-
-                embed.add_field(
-                    name=f"Order #{order['id']}",
-                    value=value,
-                    inline=False,
-                )
+            embed.add_field(
+                name=f"Order #{order['id']}",
+                value=value,
+                inline=False,
+            )
 
-            embed.set_footer(text="This is an automated notification. Please contact staff if you have questions.")
+        footer = "This is an automated notification. Please contact staff if you have questions."
+        if len(orders) > MAX_EMBED_ORDERS:
+            footer = f"And {len(orders) - MAX_EMBED_ORDERS} more orders. {footer}"
+        embed.set_footer(text=footer)
 
-            try:
-                await user.send(embed=embed)
-                logger.info(f"Sent warranty expiry notification to user {user_id}")
-            except discord.Forbidden:
-                logger.warning(f"Cannot send DM to user {user_id} - DMs may be disabled")
-            except Exception as e:
-                logger.error(f"Error sending DM to user {user_id}: {e}")
+        try:
+            await user.send(embed=embed)
+        except discord.Forbidden as e:
+            logger.warning(f"Cannot send DM to user {user_id} - DMs may be disabled")
+            await self.bot.db.record_warranty_notifications(orders)
+            raise RecipientUnavailable(str(user_id)) from e
 
-        except Exception as e:
-            logger.error(f"Error creating warranty notification for user {user_id}: {e}")
+        await self.bot.db.record_warranty_notifications(orders)
+        logger.info(f"Sent warranty expiry notification to user {user_id}")
 
     async def _send_admin_warranty_summary(self, expiring_orders: list) -> None:
         """Send a summary of expiring warranties to admins."""
@@ -158,7 +134,7 @@ class NotificationsCog(commands.Cog):
             # Create summary embed
             embed = create_embed(
                 title="📋 Warranty Expiry Summary",
-                description=f"Found {len(expiring_orders)} order(s) with warranties expiring in the next 3 days",
+                description=f"Found {len(expiring_orders)} order(s) with warranties expiring in the next {WARRANTY_NOTICE_DAYS} days",
                 color=discord.Color.red(),
             )
 
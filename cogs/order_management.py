@@ -2,18 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Literal, Optional
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from apex_core.broadcast import RecipientUnavailable, fan_out
 from apex_core.logger import get_logger
 from apex_core.utils import create_embed, format_usd
 from apex_core.utils.permissions import is_admin_from_bot
 
 logger = get_logger()
 
+# Most orders one /bulkupdateorders call may change
+BULK_UPDATE_LIMIT = 1000
+
 
 async def send_order_status_notification(
     bot: commands.Bot,
@@ -23,8 +28,15 @@ async def send_order_status_notification(
     new_status: str,
     estimated_delivery: Optional[str] = None,
     notes: Optional[str] = None,
+    product_name: Optional[str] = None,
+    *,
+    raise_errors: bool = False,
 ) -> bool:
-    """Send DM notification about order status change."""
+    """Send DM notification about order status change.
+
+    With ``raise_errors`` only an unreachable user returns False; other
+    errors, rate limits included, propagate so ``fan_out`` can retry them.
+    """
     try:
         user = await bot.fetch_user(user_id)
         if not user:
@@ -45,6 +57,8 @@ async def send_order_status_notification(
             color=discord.Color.blue()
         )
         
+        if product_name:
+            embed.add_field(name="Product", value=product_name, inline=False)
         embed.add_field(name="Previous Status", value=old_status.title(), inline=True)
         embed.add_field(name="New Status", value=new_status.title(), inline=True)
         
@@ -61,7 +75,12 @@ async def send_order_status_notification(
     except discord.Forbidden:
         logger.warning(f"Cannot send DM to user {user_id} - DMs disabled")
         return False
+    except discord.NotFound:
+        logger.warning(f"Cannot send DM to user {user_id} - user not found")
+        return False
     except Exception as e:
+        if raise_errors:
+            raise
         logger.error(f"Failed to send order status notification: {e}")
         return False
 
@@ -71,6 +90,7 @@ class OrderManagementCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self._notification_tasks: set[asyncio.Task] = set()
 
     def _is_admin(self, user: discord.User, guild: Optional[discord.Guild]) -> bool:
         """Check if user is admin."""
@@ -224,7 +244,7 @@ class OrderManagementCog(commands.Cog):
         self,
         interaction: discord.Interaction,
         order_ids: str,
-        status: Literal["processing", "completed", "delivered", "cancelled"]
+        status: Literal["pending", "fulfilled", "refill", "refunded"]
     ) -> None:
         """Bulk update order statuses (admin only)."""
         if not self._is_admin(interaction.user, interaction.guild):
@@ -247,46 +267,27 @@ class OrderManagementCog(commands.Cog):
                 )
                 return
             
-            if len(ids) > 50:
+            if len(ids) > BULK_UPDATE_LIMIT:
                 await interaction.followup.send(
-                    "❌ Maximum 50 orders can be updated at once.",
+                    f"❌ Maximum {BULK_UPDATE_LIMIT} orders can be updated at once.",
                     ephemeral=True
                 )
                 return
             
-            updated_count = 0
-            failed_count = 0
+            # One transaction for all orders; unknown IDs are the failures
+            updated = await self.bot.db.bulk_update_order_status(ids, status)
+            updated_count = len(updated)
+            failed_count = len(set(ids)) - updated_count
             
-            for order_id in ids:
-                try:
-                    order = await self.bot.db.get_order_by_id(order_id)
-                    if order:
-                        await self.bot.db.update_order_status(
-                            order_id=order_id,
-                            status=status,
-                            estimated_delivery=None,
-                            notes=None
-                        )
-                        updated_count += 1
-                        
-                        # Send notification
-                        await send_order_status_notification(
-                            self.bot,
-                            order["user_discord_id"],
-                            order_id,
-                            order.get("status", "pending"),
-                            status
-                        )
-                    else:
-                        failed_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to update order {order_id}: {e}")
-                    failed_count += 1
+            if updated:
+                task = asyncio.create_task(self._notify_status_changes(updated, status))
+                self._notification_tasks.add(task)
+                task.add_done_callback(self._notification_tasks.discard)
             
             embed = create_embed(
                 title="✅ Bulk Update Complete",
                 description=(
-                    f"**Total Orders:** {len(ids)}\n"
+                    f"**Total Orders:** {len(set(ids))}\n"
                     f"**Updated:** {updated_count}\n"
                     f"**Failed:** {failed_count}"
                 ),
@@ -303,6 +304,27 @@ class OrderManagementCog(commands.Cog):
                 ephemeral=True
             )
 
+    async def _notify_status_changes(self, orders: list[dict], status: str) -> None:
+        """DM the owners of bulk-updated orders through the paced fan-out."""
+        async def send(order: dict) -> None:
+            sent = await send_order_status_notification(
+                self.bot,
+                order["user_discord_id"],
+                order["id"],
+                order["old_status"] or "pending",
+                status,
+                product_name=order["product_name"],
+                raise_errors=True,
+            )
+            if not sent:
+                raise RecipientUnavailable(str(order["user_discord_id"]))
+
+        try:
+            sent, failed = await fan_out(orders, send)
+            logger.info(f"Bulk order notifications: {sent} sent, {failed} failed")
+        except Exception as e:
+            logger.error(f"Error sending bulk order notifications: {e}", exc_info=True)
+
 
 async def setup(bot: commands.Bot) -> None:
     """Load the OrderManagementCog cog."""
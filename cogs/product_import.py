@@ -4,12 +4,14 @@ import asyncio
 import csv
 import io
 import logging
+import math
 from typing import Optional
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from apex_core.columnar_import import COLUMNAR_EXTENSIONS, parse_columnar_products
 from apex_core.utils import create_embed, format_usd
 
 from apex_core.logger import get_logger
@@ -67,6 +69,8 @@ def _parse_and_validate_csv(file_content: bytes) -> dict:
                 price_usd_str = row['Price_USD'].strip()
                 try:
                     price_usd = float(price_usd_str)
+                    if not math.isfinite(price_usd) or abs(price_usd * 100) >= 2 ** 63:
+                        raise ValueError(price_usd_str)
                     if price_usd < 0:
                         errors.append(f"Row {row_num}: Price cannot be negative")
                         continue
@@ -126,17 +130,17 @@ class ProductImportCog(commands.Cog):
 
     @app_commands.command(
         name="import_products",
-        description="Import products from a CSV file (admin only)",
+        description="Import products from a CSV, Parquet or Arrow file (admin only)",
     )
     @app_commands.describe(
-        csv_file="CSV file with product data",
+        csv_file="CSV, Parquet or Arrow file with product data",
     )
     async def import_products(
         self,
         interaction: discord.Interaction,
         csv_file: discord.Attachment,
     ) -> None:
-        """Import products from a CSV file."""
+        """Import products from a CSV file or a scraper Parquet/Arrow export."""
         logger.info(
             "Command: /import_products | User: %s | File: %s | Size: %s bytes",
             interaction.user.id, csv_file.filename, csv_file.size
@@ -150,9 +154,11 @@ class ProductImportCog(commands.Cog):
 
         await interaction.response.defer(ephemeral=True, thinking=True)
 
-        if not csv_file.filename.lower().endswith('.csv'):
+        filename = csv_file.filename.lower()
+        is_columnar = filename.endswith(COLUMNAR_EXTENSIONS)
+        if not is_columnar and not filename.endswith('.csv'):
             await interaction.followup.send(
-                "❌ Invalid file format. Please upload a CSV file.", ephemeral=True
+                "❌ Invalid file format. Please upload a CSV, Parquet or Arrow file.", ephemeral=True
             )
             return
 
@@ -172,7 +178,8 @@ class ProductImportCog(commands.Cog):
                 )
                 return
             
-            parse_result = await asyncio.to_thread(_parse_and_validate_csv, file_content)
+            parser = parse_columnar_products if is_columnar else _parse_and_validate_csv
+            parse_result = await asyncio.to_thread(parser, file_content)
             
             if not parse_result['success']:
                 error_msg = parse_result['error']
@@ -140,7 +140,10 @@ class ProductTagsCog(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         try:
-            product_rows = await self.bot.db.search_products_by_tag(tag)
+            # Ranked match on the tags column, so "netflix" also finds "netflix-premium"
+            product_rows, next_cursor = await self.bot.db.search_products(
+                tag, columns=("tags",), limit=10
+            )
             products = [row for row in (_row_to_dict(p) for p in product_rows) if row]
 
             if not products:
@@ -152,11 +155,11 @@ class ProductTagsCog(commands.Cog):
 
             embed = create_embed(
                 title=f"🔍 Products with tag '{tag}'",
-                description=f"Found {len(products)} product(s):",
+                description=f"Best {len(products)} match(es):" if next_cursor else f"Found {len(products)} product(s):",
                 color=discord.Color.green(),
             )
 
-            for product in products[:10]:
+            for product in products:
                 name = product.get("variant_name") or "Unknown"
                 price_cents = int(product.get("price_cents") or 0)
                 price = f"${price_cents / 100:.2f}"
@@ -168,8 +171,8 @@ class ProductTagsCog(commands.Cog):
                     inline=False,
                 )
 
-            if len(products) > 10:
-                embed.set_footer(text=f"... and {len(products) - 10} more products")
+            if next_cursor:
+                embed.set_footer(text="More products match; try a more specific tag")
 
             await interaction.followup.send(embed=embed, ephemeral=True)
 
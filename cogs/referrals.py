@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 from datetime import datetime
 from typing import Optional
@@ -9,6 +9,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from apex_core.broadcast import fan_out
 from apex_core.financial_cooldown_manager import financial_cooldown
 from apex_core.rate_limiter import rate_limit
 from apex_core.utils import create_embed, format_usd
@@ -21,6 +22,7 @@ logger = get_logger()
 class ReferralsCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self._notification_tasks: set[asyncio.Task] = set()
 
     def _get_cashback_percent(self) -> float:
         """Get the configured cashback percentage, defaulting to 0.5% if not configured."""
@@ -547,86 +549,57 @@ class ReferralsCog(commands.Cog):
         Returns:
             Dict with results: successful_count, failed_count, total_amount_cents, failed_users
         """
-        successful_count = 0
-        failed_count = 0
-        total_paid_cents = 0
-        failed_users = []
-        
-        for payout in pending_list:
-            referrer_id = payout["referrer_id"]
-            amount_cents = payout["pending_cents"]
-            referral_count = payout["referral_count"]
-            
-            try:
-                # Ensure user exists and has wallet
-                await self.bot.db.ensure_user(referrer_id)
-                
-                # Credit wallet
-                new_balance = await self.bot.db.update_wallet_balance(
-                    referrer_id, amount_cents
-                )
-                
-                # Create wallet transaction
-                metadata = json.dumps({
-                    "batch_id": batch_id,
-                    "referral_count": referral_count,
-                })
-                
-                await self.bot.db.log_wallet_transaction(
-                    user_discord_id=referrer_id,
-                    amount_cents=amount_cents,
-                    balance_after_cents=new_balance,
-                    transaction_type="referral_cashback",
-                    description=f"Referral cashback - {referral_count} active referrals",
-                    metadata=metadata,
-                )
-                
-                # Mark cashback as paid in referrals table
-                await self.bot.db.mark_cashback_paid(referrer_id, amount_cents)
-                
-                # Send DM to user
-                try:
-                    user = await self.bot.fetch_user(referrer_id)
-                    if user:
-                        dm_embed = create_embed(
-                            title="💰 Referral Cashback Received!",
-                            description=(
-                                "Your referral cashback has been paid out!\n\n"
-                                f"**Amount Credited:** {format_usd(amount_cents)}\n"
-                                f"**From Referrals:** {referral_count} users\n"
-                                f"**New Wallet Balance:** {format_usd(new_balance)}\n\n"
-                                "Thank you for helping grow our community! 🎉"
-                            ),
-                            color=discord.Color.green(),
-                        )
-                        dm_embed.set_footer(text=f"Apex Core • Batch ID: {batch_id}")
-                        await user.send(embed=dm_embed)
-                except (discord.Forbidden, discord.NotFound):
-                    logger.info(f"Could not DM user {referrer_id} about cashback payout")
-                
-                successful_count += 1
-                total_paid_cents += amount_cents
-                
-                logger.info(
-                    f"Referral cashback paid: {amount_cents} cents to user {referrer_id} "
-                    f"(batch: {batch_id})"
-                )
-                
-            except Exception as e:
-                logger.error(
-                    f"Failed to process cashback for user {referrer_id}: {e}",
-                    exc_info=True,
-                )
-                failed_count += 1
-                failed_users.append({"user_id": referrer_id, "error": str(e)})
-        
+        try:
+            payouts = await self.bot.db.pay_referral_cashbacks(
+                batch_id, referrer_ids=[payout["referrer_id"] for payout in pending_list]
+            )
+        except Exception as e:
+            # The batch is one transaction: nobody was paid
+            logger.error(f"Failed to process cashback batch {batch_id}: {e}", exc_info=True)
+            return {
+                "successful_count": 0,
+                "failed_count": len(pending_list),
+                "total_amount_cents": 0,
+                "failed_users": [
+                    {"user_id": payout["referrer_id"], "error": str(e)} for payout in pending_list
+                ],
+            }
+
+        # DMs go out after the commit, paced, without holding up the results
+        task = asyncio.create_task(self._notify_cashback_payouts(payouts, batch_id))
+        self._notification_tasks.add(task)
+        task.add_done_callback(self._notification_tasks.discard)
+
         return {
-            "successful_count": successful_count,
-            "failed_count": failed_count,
-            "total_amount_cents": total_paid_cents,
-            "failed_users": failed_users,
+            "successful_count": len(payouts),
+            "failed_count": 0,
+            "total_amount_cents": sum(payout["amount_cents"] for payout in payouts),
+            "failed_users": [],
         }
 
+    async def _notify_cashback_payouts(self, payouts: list[dict], batch_id: str) -> None:
+        async def send(payout: dict) -> None:
+            user = await self.bot.fetch_user(payout["referrer_id"])
+            dm_embed = create_embed(
+                title="💰 Referral Cashback Received!",
+                description=(
+                    "Your referral cashback has been paid out!\n\n"
+                    f"**Amount Credited:** {format_usd(payout['amount_cents'])}\n"
+                    f"**From Referrals:** {payout['referral_count']} users\n"
+                    f"**New Wallet Balance:** {format_usd(payout['balance_after_cents'])}\n\n"
+                    "Thank you for helping grow our community! 🎉"
+                ),
+                color=discord.Color.green(),
+            )
+            dm_embed.set_footer(text=f"Apex Core • Batch ID: {batch_id}")
+            await user.send(embed=dm_embed)
+
+        try:
+            sent, failed = await fan_out(payouts, send)
+            logger.info(f"Cashback notifications for {batch_id}: {sent} sent, {failed} failed")
+        except Exception as e:
+            logger.error(f"Error sending cashback notifications for {batch_id}: {e}", exc_info=True)
+
 
 class CashbackConfirmView(discord.ui.View):
     """Confirmation view for cashback batch processing."""
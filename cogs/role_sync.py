@@ -0,0 +1,111 @@
+"""
+Role Sync Cog
+
+Keeps members' configured roles in line with their spend and manual role
+assignments, including after the role configuration changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+
+from apex_core.logger import get_logger
+from apex_core.utils import EditPacer, create_embed, reconcile_guild_roles
+from apex_core.utils.admin_checks import admin_only
+from apex_core.utils.roles import RoleLadder, RoleSyncResult, role_ladder
+
+logger = get_logger()
+
+# Seconds between member edits during a sync, leaving room for purchases
+ROLE_SYNC_EDIT_INTERVAL = 1.0
+# Full re-sync even when the role config is unchanged
+FULL_SYNC_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+class RoleSyncCog(commands.Cog):
+    """Background and on-demand role reconciliation."""
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.pacer = EditPacer(ROLE_SYNC_EDIT_INTERVAL)
+        self._lock = asyncio.Lock()
+        self._synced_ladder: Optional[RoleLadder] = None
+        self._last_sync: Optional[float] = None
+        self.role_sync_task.start()
+
+    def cog_unload(self) -> None:
+        self.role_sync_task.cancel()
+
+    @tasks.loop(minutes=15)
+    async def role_sync_task(self) -> None:
+        """Re-sync when the role config changed, or once a day."""
+        try:
+            ladder = role_ladder(self.bot.config)
+            due = self._last_sync is None or time.monotonic() - self._last_sync >= FULL_SYNC_INTERVAL_SECONDS
+            if ladder is self._synced_ladder and not due:
+                return
+            result = await self.sync_all()
+            logger.info(
+                f"Role sync: {result.members_updated}/{result.members_checked} members updated, "
+                f"{result.roles_added} roles added, {result.roles_removed} removed"
+            )
+        except Exception as e:
+            logger.error(f"Error in role sync task: {e}")
+
+    @role_sync_task.before_loop
+    async def before_role_sync_task(self) -> None:
+        await self.bot.wait_until_ready()
+
+    async def sync_all(self) -> RoleSyncResult:
+        """Reconcile every configured guild; concurrent calls run one after another."""
+        async with self._lock:
+            ladder = role_ladder(self.bot.config)
+            total = RoleSyncResult()
+            for guild_id in self.bot.config.guild_ids:
+                guild = self.bot.get_guild(guild_id)
+                if guild is None:
+                    continue
+                if not guild.chunked:
+                    await guild.chunk()
+                result = await reconcile_guild_roles(self.bot.db, guild, self.bot.config, pacer=self.pacer)
+                total.members_checked += result.members_checked
+                total.members_updated += result.members_updated
+                total.roles_added += result.roles_added
+                total.roles_removed += result.roles_removed
+            self._synced_ladder = ladder
+            self._last_sync = time.monotonic()
+            return total
+
+    @app_commands.command(name="syncroles", description="[Admin] Re-sync every member's roles now")
+    @app_commands.default_permissions(administrator=True)
+    @admin_only()
+    async def sync_roles_command(self, interaction: discord.Interaction) -> None:
+        await interaction.response.defer(ephemeral=True)
+        try:
+            result = await self.sync_all()
+        except Exception:
+            logger.exception("Error syncing roles")
+            await interaction.followup.send("❌ Role sync failed. Check the logs.", ephemeral=True)
+            return
+
+        embed = create_embed(
+            title="✅ Roles Synced",
+            description=(
+                f"**Members checked:** {result.members_checked}\n"
+                f"**Members updated:** {result.members_updated}\n"
+                f"**Roles added:** {result.roles_added}\n"
+                f"**Roles removed:** {result.roles_removed}"
+            ),
+            color=discord.Color.green(),
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(RoleSyncCog(bot))
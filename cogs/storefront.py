@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import json
 import logging
+import re
 from datetime import datetime, timezone
 from typing import Any, Optional, Sequence
 
 import discord
+from discord import app_commands
 from discord.ext import commands
 
 from apex_core.rate_limiter import enforce_interaction_rate_limit
@@ -18,6 +20,8 @@ from apex_core.utils import (
     render_operating_hours,
 )
 from apex_core.config import PaymentMethod
+from apex_core.database import build_search_query
+from apex_core.pricing import PricingService
 
 from apex_core.logger import get_logger
 
@@ -91,6 +95,31 @@ def _safe_get_metadata(metadata: Any, key: str, default: Any = None) -> Any:
     return metadata.get(key, default)
 
 
+def _enabled_payment_methods(config: Any) -> list[PaymentMethod]:
+    """Payment methods from the config that are not disabled."""
+    payment_methods = []
+    if config.payment_settings:
+        payment_methods = config.payment_settings.payment_methods
+    elif config.payment_methods:
+        payment_methods = config.payment_methods
+
+    return [
+        m for m in payment_methods
+        if getattr(m, 'is_enabled', m.metadata.get('is_enabled', True)) != False
+    ]
+
+
+def _crypto_networks(payment_methods: Sequence[PaymentMethod]) -> Optional[list[str]]:
+    """Networks of the enabled crypto method, or None if there is none."""
+    crypto_method = next(
+        (m for m in payment_methods if m.name == "Crypto" and m.metadata.get("type") == "custom_networks"),
+        None
+    )
+    if crypto_method is None:
+        return None
+    return crypto_method.metadata.get("networks", ["Bitcoin", "Ethereum", "Solana"])
+
+
 def _build_payment_embed(
     product: dict[str, Any],
     user: discord.User | discord.Member,
@@ -275,6 +304,26 @@ def _build_payment_embed(
     return embed
 
 
+def _format_price(base_price_cents: int, final_price_cents: int, discount_percent: float) -> str:
+    """Price for listings, with the base price struck through when discounted."""
+    if discount_percent > 0:
+        return f"~~{format_usd(base_price_cents)}~~ {format_usd(final_price_cents)} (-{discount_percent:g}%)"
+    return format_usd(final_price_cents)
+
+
+def _promo_price(
+    base_price_cents: int, discount_percent: float, promo_discount_cents: int, is_stackable: bool
+) -> int:
+    """Price with a promo code, which stacks with the VIP discount or replaces it if larger."""
+    price_after_vip = int(base_price_cents * (1 - discount_percent / 100))
+    if is_stackable or discount_percent == 0:
+        final_price = price_after_vip - promo_discount_cents
+    else:
+        vip_discount_cents = base_price_cents - price_after_vip
+        final_price = base_price_cents - max(vip_discount_cents, promo_discount_cents)
+    return max(final_price, 0)
+
+
 def _product_display_name(product: Any) -> str:
     """
     Extract display name from a product object using multiple strategies.
@@ -316,11 +365,48 @@ def _product_display_name(product: Any) -> str:
     return "Unknown Product"
 
 
+# ============================================================================
+# Stateless components
+#
+# Storefront components are DynamicItems: whatever state they need (page,
+# cursor, product) is encoded in the custom_id and parsed back by the
+# template regex when clicked, so discord.py never has to keep a View per
+# message. Categories are identified by an anchor product in them, which
+# keeps custom_ids short whatever the category names.
+# ============================================================================
+
+# Shown when a component's anchor product has been deleted since it was rendered
+LISTING_CHANGED_MESSAGE = "This listing has changed. Please browse the store again."
+# Modals are held by discord.py until submitted, so abandoned ones must expire
+MODAL_TIMEOUT = 600
+# Discord's custom_id limit
+CUSTOM_ID_MAX_LENGTH = 100
+
+
+def _custom_id(prefix: str, free_text: Optional[str] = None) -> str:
+    """Join a custom_id, cutting trailing free text to Discord's limit."""
+    return (prefix + (free_text or ""))[:CUSTOM_ID_MAX_LENGTH]
+
+
+async def _anchor_categories(
+    interaction: discord.Interaction, product_id: int
+) -> Optional[tuple[str, str]]:
+    """Main and sub-category of a component's anchor product.
+
+    Replies to the interaction and returns None if the product is gone.
+    """
+    product = await interaction.client.db.get_product(product_id) if product_id else None  # type: ignore
+    if product is None:
+        await interaction.response.send_message(LISTING_CHANGED_MESSAGE, ephemeral=True)
+        return None
+    return product["main_category"], product["sub_category"]
+
+
 # ============================================================================
 # LEVEL 1: Main Category Selection (Persistent)
 # ============================================================================
 
-class CategorySelect(discord.ui.Select["CategorySelectView"]):
+class CategorySelect(discord.ui.DynamicItem[discord.ui.Select], template=r"storefront:category_select"):
     def __init__(self, categories: list[str]) -> None:
         options = [
             discord.SelectOption(
@@ -329,35 +415,44 @@ class CategorySelect(discord.ui.Select["CategorySelectView"]):
             )
             for category in categories[:25]
         ]
-        
+
         if not options:
             options = [discord.SelectOption(label="No categories available", value="none")]
-        
+
         super().__init__(
-            placeholder="Select Category (Scroll down for more)",
-            options=options,
-            custom_id="storefront:category_select",
+            discord.ui.Select(
+                placeholder="Select Category (Scroll down for more)",
+                options=options,
+                custom_id="storefront:category_select",
+            )
         )
 
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Select, match: re.Match[str], /
+    ) -> CategorySelect:
+        return cls([option.value for option in item.options])
+
     async def callback(self, interaction: discord.Interaction) -> None:
+        values = self.item.values
         logger.info(
             "Category selected: %s | User: %s (%s) | Guild: %s | Channel: %s",
-            self.values[0] if self.values else "none",
+            values[0] if values else "none",
             interaction.user.name,
             interaction.user.id,
             interaction.guild_id,
             interaction.channel_id,
         )
-        
-        if self.values[0] == "none":
+
+        if not values or values[0] == "none":
             logger.debug("No categories available for user %s", interaction.user.id)
             await interaction.response.send_message(
                 "No products available at this time.",
                 ephemeral=True,
             )
             return
-        
-        main_category = self.values[0]
+
+        main_category = values[0]
         cog: StorefrontCog = interaction.client.get_cog("StorefrontCog")  # type: ignore
         if not cog:
             logger.error("StorefrontCog not loaded when category selected by user %s", interaction.user.id)
@@ -365,7 +460,7 @@ class CategorySelect(discord.ui.Select["CategorySelectView"]):
                 "Storefront cog not loaded.", ephemeral=True
             )
             return
-        
+
         logger.debug("Showing sub-categories for category: %s | User: %s", main_category, interaction.user.id)
         await cog._show_sub_categories(interaction, main_category)
 
@@ -388,16 +483,32 @@ class CategorySelectView(discord.ui.View):
     def _build_view(self) -> None:
         self.add_item(CategorySelect(self._current_slice()))
         if self.total_pages > 1:
-            self.add_item(CategoryPaginatorButton(direction="previous"))
-            self.add_item(CategoryPaginatorButton(direction="next"))
+            self.add_item(CategoryPaginatorButton(direction="previous", page=self.page))
+            self.add_item(CategoryPaginatorButton(direction="next", page=self.page))
 
 
-class CategoryPaginatorButton(discord.ui.Button["CategorySelectView"]):
-    def __init__(self, direction: str) -> None:
+class CategoryPaginatorButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    # Panels posted before the page was encoded carry no page and start at 0
+    template=r"storefront:category_page:(?P<direction>previous|next)(?::(?P<page>\d+))?",
+):
+    def __init__(self, direction: str, page: int = 0) -> None:
         label = "◀️ Previous" if direction == "previous" else "Next ▶️"
-        custom_id = f"storefront:category_page:{direction}"
-        super().__init__(label=label, style=discord.ButtonStyle.secondary, custom_id=custom_id)
+        super().__init__(
+            discord.ui.Button(
+                label=label,
+                style=discord.ButtonStyle.secondary,
+                custom_id=f"storefront:category_page:{direction}:{page}",
+            )
+        )
         self.direction = direction
+        self.page = page
+
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str], /
+    ) -> CategoryPaginatorButton:
+        return cls(match["direction"], int(match["page"] or 0))
 
     async def callback(self, interaction: discord.Interaction) -> None:
         # Apply rate limiting to prevent spam
@@ -423,62 +534,65 @@ class CategoryPaginatorButton(discord.ui.Button["CategorySelectView"]):
             interaction.guild_id,
         )
 
-        view = self.view
-        if not isinstance(view, CategorySelectView):
-            logger.warning("Invalid view type for category pagination | User: %s", interaction.user.id)
-            await interaction.response.send_message(
-                "Pagination unavailable. Please run the setup command again.",
-                ephemeral=True,
-            )
-            return
-        
-        total_pages = view.total_pages
+        categories = await interaction.client.db.get_distinct_main_categories()  # type: ignore
+        total_pages = max(1, (len(categories) + CategorySelectView.PAGE_SIZE - 1) // CategorySelectView.PAGE_SIZE)
         if total_pages <= 1:
             logger.debug("Single page, no pagination needed | User: %s", interaction.user.id)
             await interaction.response.defer()
             return
-        
+
         if self.direction == "next":
-            new_page = (view.page + 1) % total_pages
+            new_page = (self.page + 1) % total_pages
         else:
-            new_page = (view.page - 1) % total_pages
-        
-        logger.debug("Paginating categories: page %s -> %s | User: %s", view.page, new_page, interaction.user.id)
-        new_view = CategorySelectView(view.categories, page=new_page)
-        await interaction.response.edit_message(view=new_view)
+            new_page = (self.page - 1) % total_pages
+
+        logger.debug("Paginating categories: page %s -> %s | User: %s", self.page, new_page, interaction.user.id)
+        await interaction.response.edit_message(view=CategorySelectView(categories, page=new_page))
 
 
 # ============================================================================
 # LEVEL 2: Sub Category Selection (Ephemeral)
 # ============================================================================
 
-class SubCategorySelect(discord.ui.Select["SubCategorySelectView"]):
-    def __init__(self, main_category: str, sub_categories: list[str]) -> None:
-        self.main_category = main_category
-        options = [
-            discord.SelectOption(
-                label=sub_cat[:100],
-                value=sub_cat[:100],
-            )
-            for sub_cat in sub_categories[:25]
-        ]
-        
+class SubCategorySelect(discord.ui.DynamicItem[discord.ui.Select], template=r"storefront:sub_category_select"):
+    """Option values are the anchor product of each sub-category."""
+
+    def __init__(self, options: list[discord.SelectOption]) -> None:
         super().__init__(
-            placeholder="Select Sub-Category...",
-            options=options,
+            discord.ui.Select(
+                placeholder="Select Sub-Category...",
+                options=options,
+                custom_id="storefront:sub_category_select",
+            )
         )
 
+    @classmethod
+    def for_sub_categories(cls, sub_categories: Sequence[tuple[str, int]]) -> SubCategorySelect:
+        return cls([
+            discord.SelectOption(label=sub_category[:100], value=str(anchor_id))
+            for sub_category, anchor_id in sub_categories[:25]
+        ])
+
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Select, match: re.Match[str], /
+    ) -> SubCategorySelect:
+        return cls(item.options)
+
     async def callback(self, interaction: discord.Interaction) -> None:
-        sub_category = self.values[0]
+        categories = await _anchor_categories(interaction, int(self.item.values[0]))
+        if categories is None:
+            return
+        main_category, sub_category = categories
         logger.info(
             "Sub-category selected: %s > %s | User: %s (%s) | Guild: %s",
-            self.main_category,
+            main_category,
             sub_category,
             interaction.user.name,
             interaction.user.id,
             interaction.guild_id,
         )
-        
+
         cog: StorefrontCog = interaction.client.get_cog("StorefrontCog")  # type: ignore
         if not cog:
             logger.error("StorefrontCog not loaded when sub-category selected by user %s", interaction.user.id)
@@ -486,45 +600,68 @@ class SubCategorySelect(discord.ui.Select["SubCategorySelectView"]):
                 "Storefront cog not loaded.", ephemeral=True
             )
             return
-        
-        logger.debug("Fetching products for: %s > %s | User: %s", self.main_category, sub_category, interaction.user.id)
-        await cog._show_products(interaction, self.main_category, sub_category, page=1, quantity_filter=None)
+
+        logger.debug("Fetching products for: %s > %s | User: %s", main_category, sub_category, interaction.user.id)
+        await cog._show_products(interaction, main_category, sub_category, page=1, quantity_filter=None)
 
 
 class SubCategorySelectView(discord.ui.View):
-    def __init__(self, main_category: str, sub_categories: list[str]) -> None:
-        super().__init__(timeout=120)
-        self.add_item(SubCategorySelect(main_category, sub_categories))
+    def __init__(self, sub_categories: Sequence[tuple[str, int]]) -> None:
+        super().__init__(timeout=None)
+        self.add_item(SubCategorySelect.for_sub_categories(sub_categories))
 
 
 # ============================================================================
 # LEVEL 3: Product Display with Ticket Button (Ephemeral)
 # ============================================================================
 
-class VariantSelect(discord.ui.Select["ProductDisplayView"]):
-    def __init__(self, products: list[dict]) -> None:
-        options: list[discord.SelectOption] = []
-        for index, product in enumerate(products[:25]):
-            option = discord.SelectOption(
-                label=product["variant_name"][:100],
-                value=str(product["id"]),
-                description=f"{format_usd(product['price_cents'])}"[:100],
-                default=index == 0,
-            )
-            options.append(option)
+def _variant_options(products: Sequence[dict], selected_product_id: Optional[int] = None) -> list[discord.SelectOption]:
+    """Options for a page of products; the first is selected by default."""
+    if selected_product_id is None and products:
+        selected_product_id = products[0]["id"]
+    return [
+        discord.SelectOption(
+            label=product["variant_name"][:100],
+            value=str(product["id"]),
+            description=f"{format_usd(product['price_cents'])}"[:100],
+            default=product["id"] == selected_product_id,
+        )
+        for product in products[:25]
+    ]
 
+
+class VariantSelect(
+    discord.ui.DynamicItem[discord.ui.Select],
+    template=r"storefront:variant:(?P<page>\d+):(?P<total_pages>\d+):(?P<quantity_filter>.*)",
+):
+    """Picking a variant re-renders the page with the ticket button pointing at it."""
+
+    def __init__(
+        self,
+        options: list[discord.SelectOption],
+        page: int,
+        total_pages: int,
+        quantity_filter: Optional[str] = None,
+    ) -> None:
         super().__init__(
-            placeholder="Select a service to include in your ticket...",
-            options=options,
-            custom_id="storefront:variant_select",
+            discord.ui.Select(
+                placeholder="Select a service to include in your ticket...",
+                options=options,
+                custom_id=_custom_id(f"storefront:variant:{page}:{total_pages}:", quantity_filter),
+            )
         )
+        self.page = page
+        self.total_pages = total_pages
+        self.quantity_filter = quantity_filter
+
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Select, match: re.Match[str], /
+    ) -> VariantSelect:
+        return cls(item.options, int(match["page"]), int(match["total_pages"]), match["quantity_filter"] or None)
 
     async def callback(self, interaction: discord.Interaction) -> None:
-        view = self.view
-        selected_id = int(self.values[0])
-        if isinstance(view, ProductDisplayView):
-            view.selected_product_id = selected_id
-        
+        selected_id = int(self.item.values[0])
         logger.info(
             "Product variant selected: ID=%s | User: %s (%s) | Guild: %s",
             selected_id,
@@ -532,31 +669,50 @@ class VariantSelect(discord.ui.Select["ProductDisplayView"]):
             interaction.user.id,
             interaction.guild_id,
         )
-        await interaction.response.defer()
+        options = [
+            discord.SelectOption(
+                label=option.label,
+                value=option.value,
+                description=option.description,
+                default=option.value == str(selected_id),
+            )
+            for option in self.item.options
+        ]
+        view = ProductDisplayView(
+            options, page=self.page, total_pages=self.total_pages, quantity_filter=self.quantity_filter
+        )
+        await interaction.response.edit_message(view=view)
 
 
-class OpenTicketButton(discord.ui.Button["ProductDisplayView"]):
-    def __init__(self, main_category: str, sub_category: str) -> None:
+class OpenTicketButton(discord.ui.DynamicItem[discord.ui.Button], template=r"storefront:open_ticket:(?P<product_id>\d+)"):
+    """Opens a ticket for the selected product; 0 when the page is empty."""
+
+    def __init__(self, product_id: Optional[int]) -> None:
         super().__init__(
-            label="📩 Open Ticket",
-            style=discord.ButtonStyle.primary,
+            discord.ui.Button(
+                label="📩 Open Ticket",
+                style=discord.ButtonStyle.primary,
+                custom_id=f"storefront:open_ticket:{product_id or 0}",
+            )
         )
-        self.main_category = main_category
-        self.sub_category = sub_category
+        self.product_id = product_id or None
+
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str], /
+    ) -> OpenTicketButton:
+        return cls(int(match["product_id"]))
 
     async def callback(self, interaction: discord.Interaction) -> None:
-        from apex_core.logger import get_logger
-        logger = get_logger()
-        
+        selected_product_id = self.product_id
         logger.info(
-            "Open ticket button clicked | Category: %s > %s | User: %s (%s) | Guild: %s",
-            self.main_category,
-            self.sub_category,
+            "Open ticket button clicked | Product: %s | User: %s (%s) | Guild: %s",
+            selected_product_id,
             interaction.user.name,
             interaction.user.id,
             interaction.guild_id,
         )
-        
+
         cog: StorefrontCog = interaction.client.get_cog("StorefrontCog")  # type: ignore
         if not cog:
             logger.error("StorefrontCog not loaded when open ticket clicked by user %s", interaction.user.id)
@@ -564,12 +720,7 @@ class OpenTicketButton(discord.ui.Button["ProductDisplayView"]):
                 "Storefront cog not loaded.", ephemeral=True
             )
             return
-        
-        view = self.view
-        selected_product_id = None
-        if isinstance(view, ProductDisplayView):
-            selected_product_id = view.selected_product_id
-        
+
         if selected_product_id is None:
             logger.warning("No product selected when opening ticket | User: %s", interaction.user.id)
             await interaction.response.send_message(
@@ -577,30 +728,23 @@ class OpenTicketButton(discord.ui.Button["ProductDisplayView"]):
                 ephemeral=True,
             )
             return
-        
+
         # Check if product requires customization BEFORE deferring
         # This allows us to show modal if needed
         try:
             product = await interaction.client.db.get_product(selected_product_id)  # type: ignore
-            requires_customization = False
-            product_name = "Product"
-            
-            if product:
-                # SQLite Row objects don't have .get() - convert to dict or use direct access
-                if hasattr(product, "keys") and not isinstance(product, dict):
-                    # It's a Row object - convert to dict
-                    product_dict = dict(product)
-                    requires_customization = bool(product_dict.get("requires_customization", False))
-                    variant_name = product_dict.get("variant_name", "Product")
-                    service_name = product_dict.get("service_name", "")
-                else:
-                    # It's already a dict or has .get() method
-                    requires_customization = bool(product.get("requires_customization", False))
-                    variant_name = product.get("variant_name", "Product")
-                    service_name = product.get("service_name", "")
-                
-                product_name = f"{service_name} - {variant_name}" if service_name else variant_name
-            
+            if product is None:
+                await interaction.response.send_message(LISTING_CHANGED_MESSAGE, ephemeral=True)
+                return
+
+            product_dict = dict(product)
+            main_category = product_dict["main_category"]
+            sub_category = product_dict["sub_category"]
+            requires_customization = bool(product_dict.get("requires_customization", False))
+            variant_name = product_dict.get("variant_name", "Product")
+            service_name = product_dict.get("service_name", "")
+            product_name = f"{service_name} - {variant_name}" if service_name else variant_name
+
             if requires_customization:
                 # Show customization modal BEFORE deferring
                 logger.info(
@@ -611,8 +755,8 @@ class OpenTicketButton(discord.ui.Button["ProductDisplayView"]):
                 modal = ProductCustomizationModal(
                     product_name=product_name,
                     product_id=selected_product_id,
-                    main_category=self.main_category,
-                    sub_category=self.sub_category
+                    main_category=main_category,
+                    sub_category=sub_category
                 )
                 await interaction.response.send_modal(modal)
             else:
@@ -621,8 +765,8 @@ class OpenTicketButton(discord.ui.Button["ProductDisplayView"]):
                 await interaction.response.defer(ephemeral=True, thinking=True)
                 await cog._handle_open_ticket(
                     interaction,
-                    self.main_category,
-                    self.sub_category,
+                    main_category,
+                    sub_category,
                     selected_product_id,
                 )
         except Exception as e:
@@ -646,84 +790,146 @@ class OpenTicketButton(discord.ui.Button["ProductDisplayView"]):
 
 
 class ProductDisplayView(discord.ui.View):
-    def __init__(self, products: list[dict], main_category: str, sub_category: str, page: int = 1, total_pages: int = 1, quantity_filter: Optional[str] = None) -> None:
-        super().__init__(timeout=120)
-        self.products = products
-        self.main_category = main_category
-        self.sub_category = sub_category
-        self.page = page
-        self.total_pages = total_pages
-        self.quantity_filter = quantity_filter
-        self.selected_product_id: int | None = products[0]["id"] if products else None
-        if products:
-            self.add_item(VariantSelect(products))
-        self.add_item(OpenTicketButton(main_category, sub_category))
-        
+    """One page of a sub-category, rendered from the page's variant options.
+
+    ``anchor_id`` is any product of the sub-category, used by the filter
+    button when no product matched the filter.
+    """
+
+    def __init__(
+        self,
+        options: list[discord.SelectOption],
+        *,
+        page: int = 1,
+        total_pages: int = 1,
+        quantity_filter: Optional[str] = None,
+        anchor_id: Optional[int] = None,
+    ) -> None:
+        super().__init__(timeout=None)
+        product_ids = [int(option.value) for option in options]
+        self.selected_product_id: Optional[int] = next(
+            (int(option.value) for option in options if option.default),
+            product_ids[0] if product_ids else None,
+        )
+        if options:
+            self.add_item(VariantSelect(options, page, total_pages, quantity_filter))
+        self.add_item(OpenTicketButton(self.selected_product_id))
+
         # Add pagination buttons
-        if total_pages > 1:
+        if total_pages > 1 and product_ids:
+            # Pages are fetched by keyset: the neighbouring page starts
+            # after the last product shown or ends before the first one
             if page > 1:
-                self.add_item(PreviousPageButton(main_category, sub_category, page - 1, quantity_filter))
+                self.add_item(PreviousPageButton(page - 1, product_ids[0], quantity_filter))
             if page < total_pages:
-                self.add_item(NextPageButton(main_category, sub_category, page + 1, quantity_filter))
-        
+                self.add_item(NextPageButton(page + 1, product_ids[-1], quantity_filter))
+
         # Add filter button
-        self.add_item(FilterProductsButton(main_category, sub_category, page))
+        self.add_item(FilterProductsButton(product_ids[0] if product_ids else anchor_id))
 
 
-class PreviousPageButton(discord.ui.Button):
-    def __init__(self, main_category: str, sub_category: str, page: int, quantity_filter: Optional[str] = None):
-        super().__init__(label="◀ Previous", style=discord.ButtonStyle.secondary, emoji="◀")
-        self.main_category = main_category
-        self.sub_category = sub_category
+class PreviousPageButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"storefront:page:previous:(?P<page>\d+):(?P<before_id>\d+):(?P<quantity_filter>.*)",
+):
+    def __init__(self, page: int, before_id: int, quantity_filter: Optional[str] = None) -> None:
+        super().__init__(
+            discord.ui.Button(
+                label="◀ Previous",
+                style=discord.ButtonStyle.secondary,
+                emoji="◀",
+                custom_id=_custom_id(f"storefront:page:previous:{page}:{before_id}:", quantity_filter),
+            )
+        )
         self.page = page
+        self.before_id = before_id
         self.quantity_filter = quantity_filter
-    
+
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str], /
+    ) -> PreviousPageButton:
+        return cls(int(match["page"]), int(match["before_id"]), match["quantity_filter"] or None)
+
     async def callback(self, interaction: discord.Interaction) -> None:
         cog: StorefrontCog = interaction.client.get_cog("StorefrontCog")
-        if cog:
-            await cog._show_products(interaction, self.main_category, self.sub_category, self.page, self.quantity_filter)
+        categories = await _anchor_categories(interaction, self.before_id)
+        if cog and categories:
+            await cog._show_products(
+                interaction, *categories, self.page, self.quantity_filter,
+                before_id=self.before_id,
+            )
 
 
-class NextPageButton(discord.ui.Button):
-    def __init__(self, main_category: str, sub_category: str, page: int, quantity_filter: Optional[str] = None):
-        super().__init__(label="Next ▶", style=discord.ButtonStyle.secondary, emoji="▶")
-        self.main_category = main_category
-        self.sub_category = sub_category
+class NextPageButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"storefront:page:next:(?P<page>\d+):(?P<after_id>\d+):(?P<quantity_filter>.*)",
+):
+    def __init__(self, page: int, after_id: int, quantity_filter: Optional[str] = None) -> None:
+        super().__init__(
+            discord.ui.Button(
+                label="Next ▶",
+                style=discord.ButtonStyle.secondary,
+                emoji="▶",
+                custom_id=_custom_id(f"storefront:page:next:{page}:{after_id}:", quantity_filter),
+            )
+        )
         self.page = page
+        self.after_id = after_id
         self.quantity_filter = quantity_filter
-    
+
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str], /
+    ) -> NextPageButton:
+        return cls(int(match["page"]), int(match["after_id"]), match["quantity_filter"] or None)
+
     async def callback(self, interaction: discord.Interaction) -> None:
         cog: StorefrontCog = interaction.client.get_cog("StorefrontCog")
-        if cog:
-            await cog._show_products(interaction, self.main_category, self.sub_category, self.page, self.quantity_filter)
+        categories = await _anchor_categories(interaction, self.after_id)
+        if cog and categories:
+            await cog._show_products(
+                interaction, *categories, self.page, self.quantity_filter,
+                after_id=self.after_id,
+            )
 
 
-class FilterProductsButton(discord.ui.Button):
-    def __init__(self, main_category: str, sub_category: str, page: int):
-        super().__init__(label="🔍 Filter", style=discord.ButtonStyle.secondary)
-        self.main_category = main_category
-        self.sub_category = sub_category
-        self.page = page
-    
+class FilterProductsButton(discord.ui.DynamicItem[discord.ui.Button], template=r"storefront:filter:(?P<anchor_id>\d+)"):
+    def __init__(self, anchor_id: Optional[int]) -> None:
+        super().__init__(
+            discord.ui.Button(
+                label="🔍 Filter",
+                style=discord.ButtonStyle.secondary,
+                custom_id=f"storefront:filter:{anchor_id or 0}",
+            )
+        )
+        self.anchor_id = anchor_id or 0
+
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str], /
+    ) -> FilterProductsButton:
+        return cls(int(match["anchor_id"]))
+
     async def callback(self, interaction: discord.Interaction) -> None:
-        modal = QuantityFilterModal(self.main_category, self.sub_category, self.page)
-        await interaction.response.send_modal(modal)
+        categories = await _anchor_categories(interaction, self.anchor_id)
+        if categories:
+            await interaction.response.send_modal(QuantityFilterModal(*categories))
 
 
 class QuantityFilterModal(discord.ui.Modal, title="Filter Products by Quantity"):
-    def __init__(self, main_category: str, sub_category: str, page: int):
-        super().__init__()
+    def __init__(self, main_category: str, sub_category: str):
+        super().__init__(timeout=MODAL_TIMEOUT)
         self.main_category = main_category
         self.sub_category = sub_category
-        self.page = page
-    
+
     quantity = discord.ui.TextInput(
         label="Quantity Filter",
         placeholder="e.g., 1000, 5000, 10000 (leave empty to show all)",
         required=False,
         max_length=50
     )
-    
+
     async def on_submit(self, interaction: discord.Interaction) -> None:
         quantity_filter = self.quantity.value.strip() if self.quantity.value else None
         cog: StorefrontCog = interaction.client.get_cog("StorefrontCog")
@@ -736,26 +942,53 @@ class QuantityFilterModal(discord.ui.Modal, title="Filter Products by Quantity")
 # Payment Method Buttons (for ticket channel)
 # ============================================================================
 
-class WalletPaymentButton(discord.ui.Button["PaymentOptionsView"]):
+class WalletPaymentButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=(
+        r"storefront:pay:wallet:(?P<product_id>\d+):(?P<price>\d+)"
+        r"(?::(?P<promo_discount>\d+):(?P<promo_code>.+))?"
+    ),
+):
+    """Pays the quoted price, which includes any applied promo code."""
+
     def __init__(
         self,
         product_id: int,
         final_price_cents: int,
-        user_balance_cents: int,
         sufficient: bool,
-        payment_view: Optional["PaymentOptionsView"] = None,
+        *,
+        promo_code: Optional[str] = None,
+        promo_discount_cents: int = 0,
     ) -> None:
         style = discord.ButtonStyle.success if sufficient else discord.ButtonStyle.danger
         label = "💳 Pay with Wallet"
+        custom_id = f"storefront:pay:wallet:{product_id}:{final_price_cents}"
+        if promo_code:
+            custom_id += f":{promo_discount_cents}:{promo_code}"
         super().__init__(
-            label=label,
-            style=style,
-            disabled=not sufficient,
+            discord.ui.Button(
+                label=label,
+                style=style,
+                disabled=not sufficient,
+                custom_id=custom_id,
+            )
         )
         self.product_id = product_id
         self.final_price_cents = final_price_cents
-        self.user_balance_cents = user_balance_cents
-        self.payment_view = payment_view
+        self.promo_code = promo_code
+        self.promo_discount_cents = promo_discount_cents
+
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str], /
+    ) -> WalletPaymentButton:
+        return cls(
+            int(match["product_id"]),
+            int(match["price"]),
+            not item.disabled,
+            promo_code=match["promo_code"],
+            promo_discount_cents=int(match["promo_discount"] or 0),
+        )
 
     async def callback(self, interaction: discord.Interaction) -> None:
         from bot import ApexCoreBot
@@ -815,17 +1048,42 @@ class WalletPaymentButton(discord.ui.Button["PaymentOptionsView"]):
         logger.debug("Fetching user balance | User: %s", interaction.user.id)
         user_row = await bot.db.get_user(interaction.user.id)
         
-        # Get final price (may have been updated by promo code)
-        final_price = self.final_price_cents
-        if self.payment_view and self.payment_view.applied_promo_code:
-            final_price = self.payment_view.final_price_cents
-            logger.info(
-                "Using promo code price | User: %s | Promo: %s | Price: %s cents",
+        # The quote in the custom_id may be old: price it again as of now
+        vip_tier = calculate_vip_tier(
+            user_row["total_lifetime_spent_cents"] if user_row else 0, bot.config
+        )
+        discount_percent = await cog._calculate_discount(
+            interaction.user.id, self.product_id, vip_tier
+        )
+        current_price: Optional[int] = int(product["price_cents"] * (1 - discount_percent / 100))
+        promo_code = self.promo_code
+        promo_discount_cents = 0
+        if promo_code:
+            is_valid, _, promo_discount_cents = await bot.db.validate_promo_code(
+                promo_code, interaction.user.id, product["price_cents"], self.product_id
+            )
+            promo = await bot.db.get_promo_code(promo_code) if is_valid else None
+            current_price = None if promo is None else _promo_price(
+                product["price_cents"], discount_percent, promo_discount_cents, promo["is_stackable"]
+            )
+        
+        if current_price != self.final_price_cents or promo_discount_cents != self.promo_discount_cents:
+            logger.warning(
+                "Stale wallet quote | User: %s | Product: %s | Quoted: %s cents | Current: %s cents | Promo: %s",
                 interaction.user.id,
-                self.payment_view.applied_promo_code,
-                final_price
+                self.product_id,
+                self.final_price_cents,
+                current_price,
+                promo_code or "None",
             )
+            await interaction.followup.send(
+                "Price has changed since this payment panel was opened. "
+                "Please reopen the payment panel to see the current price.",
+                ephemeral=True,
+            )
+            return
         
+        final_price = self.final_price_cents
         if not user_row or user_row["wallet_balance_cents"] < final_price:
             current_balance = user_row['wallet_balance_cents'] if user_row else 0
             logger.warning(
@@ -844,20 +1102,6 @@ class WalletPaymentButton(discord.ui.Button["PaymentOptionsView"]):
         product_name = _product_display_name(product)
         
         try:
-            vip_tier = calculate_vip_tier(
-                user_row["total_lifetime_spent_cents"], bot.config
-            )
-            discount_percent = await cog._calculate_discount(
-                interaction.user.id, self.product_id, vip_tier
-            )
-            
-            # Check for promo code
-            promo_code = None
-            promo_discount_cents = 0
-            if self.payment_view and self.payment_view.applied_promo_code:
-                promo_code = self.payment_view.applied_promo_code
-                promo_discount_cents = self.payment_view.promo_discount_cents
-            
             logger.info(
                 "Processing wallet payment | User: %s | Product: %s | VIP Tier: %s | Discount: %s%% | Promo: %s",
                 interaction.user.id,
@@ -939,7 +1183,7 @@ class WalletPaymentButton(discord.ui.Button["PaymentOptionsView"]):
                                 f"💰 **Wallet Payment**\n"
                                 f"User: {interaction.user.mention}\n"
                                 f"Product: {product_name}\n"
-                                f"Amount: {format_usd(self.final_price_cents)}\n"
+                                f"Amount: {format_usd(final_price)}\n"
                                 f"New Balance: {format_usd(new_balance)}\n"
                                 f"Order ID: {order_id}"
                             )
@@ -992,13 +1236,22 @@ class WalletPaymentButton(discord.ui.Button["PaymentOptionsView"]):
             )
 
 
-class PaymentProofUploadButton(discord.ui.Button["PaymentOptionsView"]):
+class PaymentProofUploadButton(discord.ui.DynamicItem[discord.ui.Button], template=r"storefront:pay:proof"):
     def __init__(self) -> None:
         super().__init__(
-            label="💾 Upload Payment Proof",
-            style=discord.ButtonStyle.primary,
+            discord.ui.Button(
+                label="💾 Upload Payment Proof",
+                style=discord.ButtonStyle.primary,
+                custom_id="storefront:pay:proof",
+            )
         )
 
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str], /
+    ) -> PaymentProofUploadButton:
+        return cls()
+
     async def callback(self, interaction: discord.Interaction) -> None:
         logger.info(
             "Payment proof upload requested | User: %s (%s) | Guild: %s | Channel: %s",
@@ -1016,16 +1269,27 @@ class PaymentProofUploadButton(discord.ui.Button["PaymentOptionsView"]):
         )
 
 
-class RequestCryptoAddressButton(discord.ui.Button["PaymentOptionsView"]):
-    def __init__(self, available_networks: list[str]) -> None:
+class RequestCryptoAddressButton(discord.ui.DynamicItem[discord.ui.Button], template=r"storefront:pay:crypto"):
+    """Networks are read from the payment config when clicked."""
+
+    def __init__(self) -> None:
         super().__init__(
-            label="₿ Request Crypto Address",
-            style=discord.ButtonStyle.secondary,
+            discord.ui.Button(
+                label="₿ Request Crypto Address",
+                style=discord.ButtonStyle.secondary,
+                custom_id="storefront:pay:crypto",
+            )
         )
-        self.available_networks = available_networks
+
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str], /
+    ) -> RequestCryptoAddressButton:
+        return cls()
 
     async def callback(self, interaction: discord.Interaction) -> None:
-        networks_text = ", ".join(self.available_networks)
+        methods = _enabled_payment_methods(interaction.client.config)  # type: ignore
+        networks_text = ", ".join(_crypto_networks(methods) or [])
         
         logger.info(
             "Crypto address requested | Networks: %s | User: %s (%s) | Guild: %s | Channel: %s",
@@ -1056,13 +1320,20 @@ class RequestCryptoAddressButton(discord.ui.Button["PaymentOptionsView"]):
 class PromoCodeModal(discord.ui.Modal, title="Apply Promo Code"):
     """Modal to enter promo code."""
     
-    def __init__(self, cog_instance, product_id: int, base_price_cents: int, current_discount: float, payment_view):
-        super().__init__()
+    def __init__(
+        self,
+        cog_instance,
+        product_id: int,
+        base_price_cents: int,
+        current_discount: float,
+        payment_message: Optional[discord.Message] = None,
+    ):
+        super().__init__(timeout=MODAL_TIMEOUT)
         self.cog = cog_instance
         self.product_id = product_id
         self.base_price_cents = base_price_cents
         self.current_discount = current_discount
-        self.payment_view = payment_view
+        self.payment_message = payment_message
         
         self.code_input = discord.ui.TextInput(
             label="Promo Code",
@@ -1117,24 +1388,10 @@ class PromoCodeModal(discord.ui.Modal, title="Apply Promo Code"):
                 )
                 return
             
-            # Calculate new price with promo code
             price_after_vip = int(self.base_price_cents * (1 - self.current_discount / 100))
-            
-            # Check if stackable or no VIP discount
-            if promo["is_stackable"] or self.current_discount == 0:
-                final_price = price_after_vip - promo_discount_cents
-            else:
-                # Use better discount
-                vip_discount_cents = self.base_price_cents - price_after_vip
-                final_price = self.base_price_cents - max(vip_discount_cents, promo_discount_cents)
-            
-            if final_price < 0:
-                final_price = 0
-            
-            # Store promo code in payment view
-            self.payment_view.applied_promo_code = code
-            self.payment_view.promo_discount_cents = promo_discount_cents
-            self.payment_view.final_price_cents = final_price
+            final_price = _promo_price(
+                self.base_price_cents, self.current_discount, promo_discount_cents, promo["is_stackable"]
+            )
             
             logger.info(
                 f"Promo code applied | User: {interaction.user.id} | "
@@ -1143,15 +1400,15 @@ class PromoCodeModal(discord.ui.Modal, title="Apply Promo Code"):
             )
             
             # Update payment embed with new price
-            if self.payment_view.payment_message:
+            if self.payment_message:
                 try:
                     # Rebuild payment embed with promo code
-                    from apex_core.utils import _build_payment_embed
                     user_row = await self.cog.bot.db.get_user(interaction.user.id)
                     user_balance = user_row["wallet_balance_cents"] if user_row else 0
                     
                     product = await self.cog.bot.db.get_product(self.product_id)
                     member = interaction.guild.get_member(interaction.user.id) if interaction.guild else None
+                    payment_methods = _enabled_payment_methods(self.cog.bot.config)
                     
                     if product and member:
                         updated_embed = _build_payment_embed(
@@ -1159,26 +1416,22 @@ class PromoCodeModal(discord.ui.Modal, title="Apply Promo Code"):
                             user=member,
                             final_price_cents=final_price,
                             user_balance_cents=user_balance,
-                            payment_methods=self.payment_view.payment_methods,
+                            payment_methods=payment_methods,
                             promo_code=code,
                             promo_discount_cents=promo_discount_cents,
                         )
                         
-                        # Update wallet button if needed
+                        # The wallet button now quotes the promo price
                         new_view = PaymentOptionsView(
                             product_id=self.product_id,
                             final_price_cents=final_price,
                             user_balance_cents=user_balance,
-                            payment_methods=self.payment_view.payment_methods,
-                            cog_instance=self.cog,
-                            base_price_cents=self.base_price_cents,
-                            current_discount=self.current_discount,
-                            payment_message=self.payment_view.payment_message,
+                            payment_methods=payment_methods,
+                            promo_code=code,
+                            promo_discount_cents=promo_discount_cents,
                         )
-                        new_view.applied_promo_code = code
-                        new_view.promo_discount_cents = promo_discount_cents
                         
-                        await self.payment_view.payment_message.edit(embed=updated_embed, view=new_view)
+                        await self.payment_message.edit(embed=updated_embed, view=new_view)
                 except Exception as e:
                     logger.error(f"Failed to update payment embed: {e}", exc_info=True)
             
@@ -1205,59 +1458,68 @@ class PromoCodeModal(discord.ui.Modal, title="Apply Promo Code"):
             )
 
 
-class PromoCodeButton(discord.ui.Button["PaymentOptionsView"]):
+class PromoCodeButton(discord.ui.DynamicItem[discord.ui.Button], template=r"storefront:pay:promo:(?P<product_id>\d+)"):
     """Button to apply promo code."""
     
-    def __init__(self, cog_instance, product_id: int, base_price_cents: int, current_discount: float, payment_view):
+    def __init__(self, product_id: int) -> None:
         super().__init__(
-            label="🎟️ Apply Promo Code",
-            style=discord.ButtonStyle.secondary,
-            emoji="🎟️"
+            discord.ui.Button(
+                label="🎟️ Apply Promo Code",
+                style=discord.ButtonStyle.secondary,
+                emoji="🎟️",
+                custom_id=f"storefront:pay:promo:{product_id}",
+            )
         )
-        self.cog = cog_instance
         self.product_id = product_id
-        self.base_price_cents = base_price_cents
-        self.current_discount = current_discount
-        self.payment_view = payment_view
+
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction, item: discord.ui.Button, match: re.Match[str], /
+    ) -> PromoCodeButton:
+        return cls(int(match["product_id"]))
     
     async def callback(self, interaction: discord.Interaction) -> None:
-        """Show promo code modal."""
-        from apex_core.logger import get_logger
-        logger = get_logger()
-        
+        """Show promo code modal, priced as of now."""
         logger.info(f"Promo code button clicked | User: {interaction.user.id} | Product: {self.product_id}")
-        
-        modal = PromoCodeModal(self.cog, self.product_id, self.base_price_cents, self.current_discount, self.payment_view)
+
+        cog: StorefrontCog = interaction.client.get_cog("StorefrontCog")  # type: ignore
+        product = await interaction.client.db.get_product(self.product_id)  # type: ignore
+        if not cog or not product:
+            await interaction.response.send_message(
+                "This product is no longer available.", ephemeral=True
+            )
+            return
+
+        user_row = await cog.bot.db.get_user(interaction.user.id)
+        vip_tier = calculate_vip_tier(
+            user_row["total_lifetime_spent_cents"] if user_row else 0, cog.bot.config
+        )
+        current_discount = await cog._calculate_discount(interaction.user.id, self.product_id, vip_tier)
+        modal = PromoCodeModal(
+            cog, self.product_id, product["price_cents"], current_discount, interaction.message
+        )
         await interaction.response.send_modal(modal)
 
 
 class PaymentOptionsView(discord.ui.View):
+    """Payment buttons for a ticket; they keep working across restarts."""
+
     def __init__(
         self,
         product_id: int,
         final_price_cents: int,
         user_balance_cents: int,
         payment_methods: list,
-        cog_instance=None,
-        base_price_cents: int = 0,
-        current_discount: float = 0.0,
-        payment_message: Optional[discord.Message] = None,
+        *,
+        promo_code: Optional[str] = None,
+        promo_discount_cents: int = 0,
     ) -> None:
         super().__init__(timeout=None)
-        self.cog = cog_instance
-        self.base_price_cents = base_price_cents
-        self.current_discount = current_discount
         self.product_id = product_id
         self.final_price_cents = final_price_cents
-        self.user_balance_cents = user_balance_cents
-        self.payment_methods = payment_methods
-        self.payment_message = payment_message
-        self.applied_promo_code: Optional[str] = None
-        self.promo_discount_cents: int = 0
         
         # Add promo code button
-        if cog_instance:
-            self.add_item(PromoCodeButton(cog_instance, product_id, base_price_cents, current_discount, self))
+        self.add_item(PromoCodeButton(product_id))
         
         # Check if wallet is enabled and add wallet button if user has sufficient balance
         has_wallet_method = any(
@@ -1268,24 +1530,19 @@ class PaymentOptionsView(discord.ui.View):
         if has_wallet_method:
             sufficient = user_balance_cents >= final_price_cents
             self.add_item(WalletPaymentButton(
-                product_id=product_id,
-                final_price_cents=final_price_cents,
-                user_balance_cents=user_balance_cents,
-                sufficient=sufficient,
-                payment_view=self,
+                product_id,
+                final_price_cents,
+                sufficient,
+                promo_code=promo_code,
+                promo_discount_cents=promo_discount_cents,
             ))
         
         # Add payment proof upload button
         self.add_item(PaymentProofUploadButton())
         
-        # Check if crypto method is enabled and add crypto address request button
-        crypto_method = next(
-            (m for m in payment_methods if m.name == "Crypto" and m.metadata.get("type") == "custom_networks"),
-            None
-        )
-        if crypto_method:
-            networks = crypto_method.metadata.get("networks", ["Bitcoin", "Ethereum", "Solana"])
-            self.add_item(RequestCryptoAddressButton(networks))
+        # Add crypto address request button if crypto method is enabled
+        if _crypto_networks(payment_methods):
+            self.add_item(RequestCryptoAddressButton())
 
 
 # ============================================================================
@@ -1328,6 +1585,8 @@ class ProductSelect(discord.ui.Select["ProductSelectView"]):
                 "Product not found or no longer active.", ephemeral=True
             )
             return
+        # SQLite rows have no .get()
+        product = dict(product)
 
         user_row = await interaction.client.db.get_user(interaction.user.id)  # type: ignore
         vip_tier = None
@@ -1452,6 +1711,43 @@ class ProductSelectView(discord.ui.View):
         self.add_item(select)
 
 
+class SearchResultsView(discord.ui.View):
+    """One page of /search results; pages are fetched with the search cursor."""
+
+    def __init__(
+        self,
+        query: str,
+        products: list[dict],
+        prices: dict[int, tuple[int, float]],
+        next_cursor: Optional[str],
+    ) -> None:
+        super().__init__(timeout=300)
+        select = ProductSelect()
+        select.options = [
+            discord.SelectOption(
+                label=_product_display_name(product)[:100],
+                value=str(product["id"]),
+                description=f"{format_usd(prices[product['id']][0])} • ID: {product['id']}"[:100],
+            )
+            for product in products[:25]
+        ]
+        self.add_item(select)
+        if next_cursor:
+            self.add_item(SearchMoreButton(query, next_cursor))
+
+
+class SearchMoreButton(discord.ui.Button["SearchResultsView"]):
+    def __init__(self, query: str, cursor: str) -> None:
+        super().__init__(label="More results", style=discord.ButtonStyle.secondary, emoji="▶")
+        self.query = query
+        self.cursor = cursor
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        cog: StorefrontCog = interaction.client.get_cog("StorefrontCog")  # type: ignore
+        if cog:
+            await cog._show_search(interaction, self.query, self.cursor)
+
+
 class BuyButton(discord.ui.Button["ProductActionView"]):
     def __init__(self, product_id: int) -> None:
         super().__init__(
@@ -1504,7 +1800,7 @@ class ProductCustomizationModal(discord.ui.Modal, title="Product Details"):
     """Modal to collect product customization info."""
     
     def __init__(self, product_name: str, product_id: int, main_category: str, sub_category: str):
-        super().__init__()
+        super().__init__(timeout=MODAL_TIMEOUT)
         self.product_name = product_name
         self.product_id = product_id
         self.main_category = main_category
@@ -1605,17 +1901,40 @@ class PurchaseConfirmModal(discord.ui.Modal):
         )
 
 
+SEARCH_RESULTS_PER_PAGE = 10
+PRODUCTS_PER_PAGE = 10
+
+# Registered with the bot so their messages keep working without stored views
+STOREFRONT_DYNAMIC_ITEMS = (
+    CategorySelect,
+    CategoryPaginatorButton,
+    SubCategorySelect,
+    VariantSelect,
+    OpenTicketButton,
+    PreviousPageButton,
+    NextPageButton,
+    FilterProductsButton,
+    WalletPaymentButton,
+    PaymentProofUploadButton,
+    RequestCryptoAddressButton,
+    PromoCodeButton,
+)
+
+
 class StorefrontCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.pricing = PricingService(bot.db)
+
+    async def cog_load(self) -> None:
+        self.bot.add_dynamic_items(*STOREFRONT_DYNAMIC_ITEMS)
+
+    async def cog_unload(self) -> None:
+        self.bot.remove_dynamic_items(*STOREFRONT_DYNAMIC_ITEMS)
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         self.bot.add_view(ProductSelectView())
-        
-        categories = await self.bot.db.get_distinct_main_categories()
-        if categories:
-            self.bot.add_view(CategorySelectView(categories))
 
     def _is_admin(self, member: discord.Member | None) -> bool:
         if member is None:
@@ -1645,54 +1964,19 @@ class StorefrontCog(commands.Cog):
     ) -> float:
         """Calculate total discount for a user, enforcing discount expiry.
         
-        This method calculates discounts from both role-based and legacy discount systems.
-        As a defensive measure, it filters out any expired discounts even though the
-        database query should already exclude them, ensuring expired discounts can
-        never be applied.
+        Role-based and legacy discounts are resolved once per user by the
+        pricing service and reused until the user's spend, roles or the
+        discounts change. Expired discounts are excluded by the query and
+        checked again whenever a price is computed, so they can never apply.
         """
-        from apex_core.utils.roles import get_user_roles
-        
-        total_discount = 0.0
-
-        # Check all applicable roles for discounts
-        user_roles = await get_user_roles(user_id, self.bot.db, self.bot.config)
-        for role in user_roles:
-            total_discount = max(total_discount, role.discount_percent)
-
-        # Check legacy discount system
-        user_row = await self.bot.db.get_user(user_id)
-        db_user_id = user_row["id"] if user_row else None
-
-        vip_tier_name = vip_tier.name if vip_tier else None
-        discounts = await self.bot.db.get_applicable_discounts(
-            user_id=db_user_id,
-            product_id=product_id,
-            vip_tier=vip_tier_name,
+        return await self.pricing.discount_percent(
+            user_id, product_id, self.bot.config, vip_tier
         )
 
-        for discount in discounts:
-            # Defensive check: ensure discount hasn't expired
-            if discount["expires_at"]:
-                try:
-                    from datetime import datetime
-                    expires_at = datetime.fromisoformat(discount["expires_at"])
-                    if expires_at < datetime.now():
-                        continue  # Skip expired discount
-                except (ValueError, TypeError):
-                    # If we can't parse the date, skip it for safety
-                    continue
-            
-            if discount["is_stackable"]:
-                total_discount += discount["discount_percent"]
-            else:
-                total_discount = max(total_discount, discount["discount_percent"])
-
-        return min(total_discount, 100.0)
-
     async def _show_sub_categories(
         self, interaction: discord.Interaction, main_category: str
     ) -> None:
-        sub_categories = await self.bot.db.get_distinct_sub_categories(main_category)
+        sub_categories = await self.bot.db.get_sub_category_anchors(main_category)
         
         if not sub_categories:
             await interaction.response.send_message(
@@ -1707,47 +1991,62 @@ class StorefrontCog(commands.Cog):
             color=discord.Color.blue(),
         )
         
-        view = SubCategorySelectView(main_category, sub_categories)
+        view = SubCategorySelectView(sub_categories)
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
     async def _show_products(
-        self, interaction: discord.Interaction, main_category: str, sub_category: str, page: int = 1, quantity_filter: Optional[str] = None
+        self,
+        interaction: discord.Interaction,
+        main_category: str,
+        sub_category: str,
+        page: int = 1,
+        quantity_filter: Optional[str] = None,
+        *,
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None,
     ) -> None:
-        products = await self.bot.db.get_products_by_category(main_category, sub_category)
-        
-        if not products:
+        """Show one page of a sub-category.
+
+        ``after_id``/``before_id`` are the keyset cursor from the paginator
+        buttons: the last product of the previous page or the first of the next.
+        """
+        # Quantity filter (e.g. "1000", "5000") matches product names in SQL
+        name_query = None
+        if quantity_filter:
+            quantity_num = re.search(r'\d+', quantity_filter)
+            if quantity_num:
+                name_query = quantity_num.group()
+
+        paginated_products, total_products = await self.bot.db.get_products_page(
+            main_category,
+            sub_category,
+            name_query=name_query,
+            after_id=after_id,
+            before_id=before_id,
+            limit=PRODUCTS_PER_PAGE,
+        )
+        if (after_id is not None or before_id is not None) and not paginated_products and total_products:
+            # The cursor product was removed or deactivated: start over
+            page = 1
+            paginated_products, total_products = await self.bot.db.get_products_page(
+                main_category, sub_category, name_query=name_query, limit=PRODUCTS_PER_PAGE
+            )
+
+        if not total_products and not quantity_filter:
             await interaction.response.send_message(
                 f"No products found for **{main_category} - {sub_category}**.",
                 ephemeral=True,
             )
             return
-        
-        product_dicts = [dict(product) for product in products]
-        
-        # Apply quantity filter if provided (e.g., "1000", "5000")
-        if quantity_filter:
-            import re
-            quantity_num = re.search(r'\d+', quantity_filter)
-            if quantity_num:
-                target_qty = quantity_num.group()
-                # Filter products that contain this quantity in their name
-                product_dicts = [
-                    p for p in product_dicts 
-                    if target_qty in p.get("variant_name", "").lower() or target_qty in p.get("service_name", "").lower()
-                ]
-        
-        # Pagination: 10 products per page
-        PRODUCTS_PER_PAGE = 10
-        total_pages = (len(product_dicts) + PRODUCTS_PER_PAGE - 1) // PRODUCTS_PER_PAGE
+
+        paginated_products = [dict(product) for product in paginated_products]
+        total_pages = (total_products + PRODUCTS_PER_PAGE - 1) // PRODUCTS_PER_PAGE
         page = max(1, min(page, total_pages))
-        start_idx = (page - 1) * PRODUCTS_PER_PAGE
-        end_idx = start_idx + PRODUCTS_PER_PAGE
-        paginated_products = product_dicts[start_idx:end_idx]
         
         embed = create_embed(
             title=f"🛍️ {main_category} • {sub_category}",
             description=(
-                f"**📄 Page {page}/{total_pages}** • **📦 {len(product_dicts)} Total Products**\n"
+                f"**📄 Page {page}/{total_pages}** • **📦 {total_products} Total Products**\n"
                 f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
             ),
             color=discord.Color.blue(),
@@ -1760,13 +2059,18 @@ class StorefrontCog(commands.Cog):
                 inline=False
             )
         
+        # One pricing lookup for the whole page
+        prices = await self.pricing.price_products(
+            interaction.user.id, paginated_products, self.bot.config
+        )
+
         # Group products into fields for better display
         product_fields = []
         current_field = ""
         
         for idx, product in enumerate(paginated_products, 1):
             variant_name = product["variant_name"]
-            price_usd = format_usd(product["price_cents"])
+            price_usd = _format_price(product["price_cents"], *prices[product["id"]])
             product_id = product["id"]
             service_name = product.get("service_name", "N/A")
             
@@ -1821,7 +2125,7 @@ class StorefrontCog(commands.Cog):
         if not paginated_products:
             embed.add_field(
                 name="❌ No Products Found",
-                value=f"No products match your filter.\n\n**Total in category:** {len(product_dicts)} products",
+                value=f"No products match your filter.\n\n**Matching products:** {total_products}",
                 inline=False
             )
         
@@ -1829,7 +2133,18 @@ class StorefrontCog(commands.Cog):
             text=f"Select a product from dropdown • Page {page}/{total_pages} • Use filters to narrow results"
         )
         
-        view = ProductDisplayView(paginated_products, main_category, sub_category, page=page, total_pages=total_pages, quantity_filter=quantity_filter)
+        anchor_id = None
+        if not paginated_products:
+            # Nothing matched the filter: the filter button still needs a product of the sub-category
+            anchor_rows, _ = await self.bot.db.get_products_page(main_category, sub_category, limit=1)
+            anchor_id = anchor_rows[0]["id"] if anchor_rows else None
+        view = ProductDisplayView(
+            _variant_options(paginated_products),
+            page=page,
+            total_pages=total_pages,
+            quantity_filter=quantity_filter,
+            anchor_id=anchor_id,
+        )
         
         # Use edit_message if already responded, otherwise send new message
         if interaction.response.is_done():
@@ -1837,118 +2152,59 @@ class StorefrontCog(commands.Cog):
         else:
             await interaction.response.edit_message(embed=embed, view=view)
 
-    async def _handle_open_ticket(
-        self, interaction: discord.Interaction, main_category: str, sub_category: str, product_id: int, customization_data: Optional[dict] = None
+    async def _show_search(
+        self, interaction: discord.Interaction, query: str, cursor: Optional[str] = None
     ) -> None:
-        if interaction.guild is None:
-            await interaction.response.send_message(
-                "This command can only be used inside a server.", ephemeral=True
-            )
-            return
-
-        member = self._resolve_member(interaction)
-        if member is None:
+        """Show one page of search results; follow-up pages replace the message."""
+        rows, next_cursor = await self.bot.db.search_products(
+            query, limit=SEARCH_RESULTS_PER_PAGE, cursor=cursor
+        )
+        products = [dict(row) for row in rows]
+        if not products:
             await interaction.response.send_message(
-                "Unable to resolve your member profile. Please try again.", ephemeral=True
+                f"No products found for **{query}**.", ephemeral=True
             )
             return
 
-        await interaction.response.defer(ephemeral=True, thinking=True)
-        await self.bot.db.ensure_user(member.id)
-
-        product = await self.bot.db.get_product(product_id)
-        if not product or not product["is_active"]:
-            await interaction.followup.send(
-                "The selected product is no longer available.",
-                ephemeral=True,
-            )
-            return
-        
-        # Check stock availability
-        stock = product.get("stock_quantity")
-        if stock is not None and stock == 0:
-            from apex_core.utils.error_messages import get_error_message
-            error_msg = get_error_message("out_of_stock")
-            await interaction.followup.send(error_msg, ephemeral=True)
-            return
-        
-        if stock is not None and stock < 1:
-            from apex_core.utils.error_messages import get_error_message
-            error_msg = get_error_message(
-                "insufficient_stock",
-                available_quantity=stock,
-                requested_quantity=1
-            )
-            await interaction.followup.send(error_msg, ephemeral=True)
-            return
-        
-        if (
-            product["main_category"] != main_category
-            or product["sub_category"] != sub_category
-        ):
-            await interaction.followup.send(
-                "Product selection mismatch. Please try again.",
-                ephemeral=True,
+        prices = await self.pricing.price_products(
+            interaction.user.id, products, self.bot.config
+        )
+        embed = create_embed(
+            title=f"🔍 Search: {query}",
+            description="Best matches first. Select a product to view details.",
+            color=discord.Color.blue(),
+        )
+        for product in products:
+            embed.add_field(
+                name=_product_display_name(product)[:256],
+                value=(
+                    f"{product['main_category']} › {product['sub_category']}\n"
+                    f"💰 {_format_price(product['price_cents'], *prices[product['id']])} "
+                    f"| 🆔 `{product['id']}`"
+                ),
+                inline=False,
             )
-            return
+        if next_cursor:
+            embed.set_footer(text="More results available")
 
-        support_category_id = self.bot.config.ticket_categories.support
-        category = interaction.guild.get_channel(support_category_id)
-        if not isinstance(category, discord.CategoryChannel):
-            await interaction.followup.send(
-                "Support category is not configured correctly. Please contact an admin.",
-                ephemeral=True,
-            )
-            return
+        view = SearchResultsView(query, products, prices, next_cursor)
+        if cursor:
+            await interaction.response.edit_message(embed=embed, view=view)
+        else:
+            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
-        admin_role = interaction.guild.get_role(self.bot.config.role_ids.admin)
-        if admin_role is None:
-            await interaction.followup.send(
-                "Admin role is missing or misconfigured. Please notify the server owner.",
-                ephemeral=True,
-            )
+    @app_commands.command(name="search", description="Search the store by product name, category or tag")
+    @app_commands.describe(query="What you are looking for, e.g. \"netflix premium\"")
+    async def search_command(self, interaction: discord.Interaction, query: str) -> None:
+        if not build_search_query(query):
+            await interaction.response.send_message("Please enter something to search for.", ephemeral=True)
             return
+        logger.info("Product search | Query: %s | User: %s", query, interaction.user.id)
+        await self._show_search(interaction, query.strip())
 
-        ticket_id, counter = await self.bot.db.create_ticket_with_counter(
-            user_discord_id=member.id,
-            channel_id=0,
-            status="open",
-            ticket_type="order",
-        )
-
-        sanitized_username = member.name.lower()
-        sanitized_username = ''.join(c if c.isalnum() or c == '-' else '-' for c in sanitized_username)
-        sanitized_username = sanitized_username.strip('-')[:20]
-        if not sanitized_username:
-            sanitized_username = "user"
-        
-        channel_name = f"ticket-{sanitized_username}-order{counter}"
-
-        overwrites: dict[discord.abc.Snowflake, discord.PermissionOverwrite] = {
-            interaction.guild.default_role: discord.PermissionOverwrite(view_channel=False),
-            member: discord.PermissionOverwrite(
-                view_channel=True,
-                send_messages=True,
-                attach_files=True,
-                read_message_history=True,
-            ),
-            admin_role: discord.PermissionOverwrite(
-                view_channel=True,
-                send_messages=True,
-                manage_channels=True,
-                manage_messages=True,
-                read_message_history=True,
-            ),
-        }
-        if interaction.guild.me:
-            overwrites[interaction.guild.me] = discord.PermissionOverwrite(
-                view_channel=True,
-                send_messages=True,
-                manage_channels=True,
-                manage_messages=True,
-                read_message_history=True,
-            )
-
+    async def _handle_open_ticket(
+        self, interaction: discord.Interaction, main_category: str, sub_category: str, product_id: int, customization_data: Optional[dict] = None
+    ) -> None:
         try:
             logger.info(
                 "Starting ticket creation | Category: %s > %s | Product ID: %s | User: %s (%s)",
@@ -1974,8 +2230,10 @@ class StorefrontCog(commands.Cog):
                 )
                 return
 
-            logger.debug("Deferring interaction | User: %s", interaction.user.id)
-            await interaction.response.defer(ephemeral=True, thinking=True)
+            if not interaction.response.is_done():
+                # The button and the customization modal defer before calling in
+                logger.debug("Deferring interaction | User: %s", interaction.user.id)
+                await interaction.response.defer(ephemeral=True, thinking=True)
 
             logger.debug("Ensuring user exists in database | User: %s", interaction.user.id)
             await self.bot.db.ensure_user(member.id)
@@ -1989,6 +2247,24 @@ class StorefrontCog(commands.Cog):
                 )
                 return
 
+            # SQLite rows have no .get()
+            product = dict(product)
+
+            # Check stock availability
+            stock = product.get("stock_quantity")
+            if stock is not None and stock < 1:
+                from apex_core.utils.error_messages import get_error_message
+                if stock == 0:
+                    error_msg = get_error_message("out_of_stock")
+                else:
+                    error_msg = get_error_message(
+                        "insufficient_stock",
+                        available_quantity=stock,
+                        requested_quantity=1
+                    )
+                await interaction.followup.send(error_msg, ephemeral=True)
+                return
+
             logger.debug("Product validated | Product: %s | User: %s", product.get("variant_name"), interaction.user.id)
             if (
                 product["main_category"] != main_category
@@ -2023,13 +2299,9 @@ class StorefrontCog(commands.Cog):
                 )
                 return
 
-            logger.debug("Creating ticket record in database | User: %s", interaction.user.id)
-            ticket_id, counter = await self.bot.db.create_ticket_with_counter(
-                user_discord_id=member.id,
-                channel_id=0,
-                status="open",
-                ticket_type="order",
-            )
+            # The ticket row is written once the channel exists: channel_id is unique,
+            # so a placeholder would collide with any ticket opened in the meantime
+            counter = await self.bot.db.get_next_ticket_count(member.id, "order")
 
             sanitized_username = member.name.lower()
             sanitized_username = ''.join(c if c.isalnum() or c == '-' else '-' for c in sanitized_username)
@@ -2075,11 +2347,13 @@ class StorefrontCog(commands.Cog):
                     ),
                 )
 
-                await self.bot.db._connection.execute(
-                    "UPDATE tickets SET channel_id = ? WHERE id = ?",
-                    (channel.id, ticket_id)
+                logger.debug("Creating ticket record in database | User: %s", interaction.user.id)
+                ticket_id = await self.bot.db.create_ticket(
+                    user_discord_id=member.id,
+                    channel_id=channel.id,
+                    status="open",
+                    ticket_type="order",
                 )
-                await self.bot.db._connection.commit()
                 logger.info("Ticket channel created successfully | Channel: %s | Ticket ID: %s | User: %s", channel.name, ticket_id, interaction.user.id)
 
             except discord.HTTPException as error:
@@ -2104,16 +2378,7 @@ class StorefrontCog(commands.Cog):
             )
             final_price_cents = int(product["price_cents"] * (1 - discount_percent / 100))
             
-            payment_methods = []
-            if self.bot.config.payment_settings:
-                payment_methods = self.bot.config.payment_settings.payment_methods
-            elif self.bot.config.payment_methods:
-                payment_methods = self.bot.config.payment_methods
-            
-            enabled_methods = [
-                m for m in payment_methods 
-                if getattr(m, 'is_enabled', m.metadata.get('is_enabled', True)) != False
-            ]
+            enabled_methods = _enabled_payment_methods(self.bot.config)
             
             payment_embed = _build_payment_embed(
                 product=product,
@@ -2128,9 +2393,6 @@ class StorefrontCog(commands.Cog):
                 final_price_cents=final_price_cents,
                 user_balance_cents=user_balance_cents,
                 payment_methods=enabled_methods,
-                cog_instance=self,
-                base_price_cents=product["price_cents"],
-                current_discount=discount_percent,
             )
             
             price_text = format_usd(product["price_cents"])
@@ -2236,14 +2498,11 @@ class StorefrontCog(commands.Cog):
                 embed=owner_embed,
             )
             
-            payment_message = await channel.send(
+            await channel.send(
                 content=f"{member.mention}",
                 embed=payment_embed,
                 view=payment_view,
             )
-            
-            # Store payment message in view for promo code updates
-            payment_view.payment_message = payment_message
 
             try:
                 dm_embed = create_embed(
@@ -2401,8 +2660,8 @@ class StorefrontCog(commands.Cog):
                 order_metadata=order_metadata,
             )
             
-            # Decrease stock after successful purchase
-            stock = product.get("stock_quantity")
+            # Decrease stock after successful purchase (rows have no .get())
+            stock = product["stock_quantity"]
             if stock is not None:
                 success = await self.bot.db.decrease_product_stock(product_id, 1)
                 if not success:
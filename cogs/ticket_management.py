@@ -14,11 +14,10 @@ from discord.ext import commands, tasks
 if TYPE_CHECKING:
     from bot import ApexCoreBot
 
-try:
-    import chat_exporter
-    CHAT_EXPORTER_AVAILABLE = True
-except ImportError:
-    CHAT_EXPORTER_AVAILABLE = False
+from apex_core.lazy_import import is_available, optional_import
+
+# chat_exporter is imported the first time a transcript is generated
+CHAT_EXPORTER_AVAILABLE = is_available("chat_exporter")
 
 from apex_core.utils import (
     create_embed,
@@ -779,6 +778,7 @@ class TicketManagementCog(commands.Cog):
         
         if CHAT_EXPORTER_AVAILABLE:
             try:
+                chat_exporter = optional_import("chat_exporter")
                 transcript_html = await chat_exporter.export(
                     channel,
                     limit=None,
@@ -11,6 +11,16 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from apex_core.airdrops import (
+    ALREADY_CLAIMED,
+    EXHAUSTED,
+    EXPIRED,
+    NOT_FOUND,
+    OWN_AIRDROP,
+    AirdropClaimEngine,
+    AirdropState,
+    format_timestamp,
+)
 from apex_core.logger import get_logger
 from apex_core.utils import create_embed, format_usd
 from apex_core.utils.admin_checks import admin_only
@@ -25,7 +35,7 @@ class TipsAndAirdropsCog(commands.Cog):
     
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self.active_airdrops: dict[str, dict] = {}  # airdrop_code -> airdrop_data
+        self.airdrops = AirdropClaimEngine(bot.db)
     
     @app_commands.command(name="tip", description="Tip another user from your wallet")
     @app_commands.guild_only()
@@ -276,56 +286,36 @@ class TipsAndAirdropsCog(commands.Cog):
             import secrets
             airdrop_code = secrets.token_urlsafe(8).upper()[:8]
             
-            # Reserve funds
-            async with self.bot.db._wallet_lock:
-                await self.bot.db._connection.execute("BEGIN IMMEDIATE;")
-                
-                # Deduct from sender
-                await self.bot.db._connection.execute(
-                    """
-                    UPDATE users
-                    SET wallet_balance_cents = wallet_balance_cents - ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE discord_id = ?
-                    """,
-                    (amount_cents, interaction.user.id)
-                )
-                
-                # Log transaction
-                sender_balance = sender["wallet_balance_cents"] - amount_cents
-                await self.bot.db._connection.execute(
-                    """
-                    INSERT INTO wallet_transactions (
-                        user_discord_id, amount_cents, balance_after_cents,
-                        transaction_type, description, metadata
-                    ) VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        interaction.user.id,
-                        -amount_cents,
-                        sender_balance,
-                        "airdrop_created",
-                        f"Airdrop created: {airdrop_code}",
-                        f'{{"airdrop_code": "{airdrop_code}", "max_claims": {max_claims}, "per_claim": {per_claim_cents}}}'
-                    )
+            # Reserve funds and persist the airdrop
+            created_at = datetime.now(timezone.utc)
+            expires_at = (created_at + timedelta(hours=expires_hours)).replace(microsecond=0)
+            try:
+                airdrop_id, sender_balance = await self.bot.db.create_airdrop(
+                    code=airdrop_code,
+                    creator_discord_id=interaction.user.id,
+                    creator_name=interaction.user.display_name,
+                    total_amount_cents=amount_cents,
+                    per_claim_cents=per_claim_cents,
+                    max_claims=max_claims,
+                    expires_at=format_timestamp(expires_at),
+                    message=message,
                 )
-                
-                await self.bot.db._connection.commit()
-            
-            # Store airdrop data
-            expires_at = datetime.now(timezone.utc) + timedelta(hours=expires_hours)
-            self.active_airdrops[airdrop_code] = {
-                "creator_id": interaction.user.id,
-                "creator_name": interaction.user.display_name,
-                "total_amount_cents": amount_cents,
-                "per_claim_cents": per_claim_cents,
-                "max_claims": max_claims,
-                "current_claims": 0,
-                "claimed_by": set(),
-                "expires_at": expires_at,
-                "message": message,
-                "created_at": datetime.now(timezone.utc)
-            }
+            except ValueError as e:
+                await interaction.followup.send(f"❌ {e}", ephemeral=True)
+                return
+
+            self.airdrops.register(AirdropState(
+                id=airdrop_id,
+                code=airdrop_code,
+                creator_id=interaction.user.id,
+                creator_name=interaction.user.display_name,
+                total_amount_cents=amount_cents,
+                per_claim_cents=per_claim_cents,
+                max_claims=max_claims,
+                claim_count=0,
+                expires_at=expires_at,
+                message=message,
+            ))
             
             # Send confirmation
             embed = create_embed(
@@ -401,118 +391,47 @@ class TipsAndAirdropsCog(commands.Cog):
         
         code_upper = code.upper().strip()
         
-        if code_upper not in self.active_airdrops:
-            await interaction.followup.send(
-                "❌ Invalid airdrop code or airdrop has expired.",
-                ephemeral=True
-            )
-            return
-        
-        airdrop = self.active_airdrops[code_upper]
-        
-        # Check if expired
-        if datetime.now(timezone.utc) > airdrop["expires_at"]:
-            del self.active_airdrops[code_upper]
+        try:
+            result = await self.airdrops.claim(code_upper, interaction.user.id)
+        except Exception as e:
+            logger.error(f"Error claiming airdrop: {e}", exc_info=True)
             await interaction.followup.send(
-                "❌ This airdrop has expired.",
+                f"❌ Error claiming airdrop: {str(e)}",
                 ephemeral=True
             )
             return
         
-        # Check if user already claimed
-        if interaction.user.id in airdrop["claimed_by"]:
-            await interaction.followup.send(
-                "❌ You have already claimed this airdrop!",
-                ephemeral=True
-            )
+        rejections = {
+            NOT_FOUND: "❌ Invalid airdrop code or airdrop has expired.",
+            EXPIRED: "❌ This airdrop has expired.",
+            ALREADY_CLAIMED: "❌ You have already claimed this airdrop!",
+            OWN_AIRDROP: "❌ You cannot claim your own airdrop!",
+            EXHAUSTED: "❌ This airdrop has reached its maximum number of claims.",
+        }
+        if not result.ok:
+            await interaction.followup.send(rejections[result.status], ephemeral=True)
             return
         
-        # Check if creator trying to claim their own
-        if interaction.user.id == airdrop["creator_id"]:
-            await interaction.followup.send(
-                "❌ You cannot claim your own airdrop!",
-                ephemeral=True
-            )
-            return
+        airdrop = result.airdrop
         
-        # Check if max claims reached
-        if airdrop["current_claims"] >= airdrop["max_claims"]:
-            await interaction.followup.send(
-                "❌ This airdrop has reached its maximum number of claims.",
-                ephemeral=True
-            )
-            return
+        # Send confirmation
+        embed = create_embed(
+            title="🎁 Airdrop Claimed!",
+            description=(
+                f"You claimed {format_usd(airdrop.per_claim_cents)} from airdrop `{code_upper}`!\n\n"
+                f"**Your new balance:** {format_usd(result.balance_after_cents)}\n"
+                f"**Remaining claims:** {airdrop.remaining}"
+            ),
+            color=discord.Color.green()
+        )
+        if airdrop.message:
+            embed.add_field(name="Message from Creator", value=airdrop.message, inline=False)
+        await interaction.followup.send(embed=embed, ephemeral=True)
         
-        try:
-            # Ensure user exists
-            await self.bot.db.ensure_user(interaction.user.id)
-            
-            # Add funds to user
-            async with self.bot.db._wallet_lock:
-                await self.bot.db._connection.execute("BEGIN IMMEDIATE;")
-                
-                # Add to recipient
-                await self.bot.db._connection.execute(
-                    """
-                    UPDATE users
-                    SET wallet_balance_cents = wallet_balance_cents + ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE discord_id = ?
-                    """,
-                    (airdrop["per_claim_cents"], interaction.user.id)
-                )
-                
-                # Log transaction
-                recipient = await self.bot.db.get_user(interaction.user.id)
-                recipient_balance = (recipient["wallet_balance_cents"] if recipient else 0) + airdrop["per_claim_cents"]
-                await self.bot.db._connection.execute(
-                    """
-                    INSERT INTO wallet_transactions (
-                        user_discord_id, amount_cents, balance_after_cents,
-                        transaction_type, description, metadata
-                    ) VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        interaction.user.id,
-                        airdrop["per_claim_cents"],
-                        recipient_balance,
-                        "airdrop_claimed",
-                        f"Airdrop claimed: {code_upper}",
-                        f'{{"airdrop_code": "{code_upper}", "creator_id": {airdrop["creator_id"]}}}'
-                    )
-                )
-                
-                await self.bot.db._connection.commit()
-            
-            # Update airdrop
-            airdrop["current_claims"] += 1
-            airdrop["claimed_by"].add(interaction.user.id)
-            
-            # Send confirmation
-            embed = create_embed(
-                title="🎁 Airdrop Claimed!",
-                description=(
-                    f"You claimed {format_usd(airdrop['per_claim_cents'])} from airdrop `{code_upper}`!\n\n"
-                    f"**Your new balance:** {format_usd(recipient_balance)}\n"
-                    f"**Remaining claims:** {airdrop['max_claims'] - airdrop['current_claims']}"
-                ),
-                color=discord.Color.green()
-            )
-            if airdrop.get("message"):
-                embed.add_field(name="Message from Creator", value=airdrop["message"], inline=False)
-            await interaction.followup.send(embed=embed, ephemeral=True)
-            
-            logger.info(
-                f"Airdrop claimed | User: {interaction.user.id} | Code: {code_upper} | "
-                f"Amount: {format_usd(airdrop['per_claim_cents'])}"
-            )
-            
-        except Exception as e:
-            logger.error(f"Error claiming airdrop: {e}", exc_info=True)
-            await interaction.followup.send(
-                f"❌ Error claiming airdrop: {str(e)}",
-                ephemeral=True
-            )
+        logger.info(
+            f"Airdrop claimed | User: {interaction.user.id} | Code: {code_upper} | "
+            f"Amount: {format_usd(airdrop.per_claim_cents)}"
+        )
     
     @app_commands.command(name="airdropinfo", description="View information about an airdrop")
     @app_commands.guild_only()
@@ -527,18 +446,16 @@ class TipsAndAirdropsCog(commands.Cog):
         
         code_upper = code.upper().strip()
         
-        if code_upper not in self.active_airdrops:
+        airdrop = await self.airdrops.get(code_upper)
+        if airdrop is None:
             await interaction.followup.send(
                 "❌ Invalid airdrop code or airdrop has expired.",
                 ephemeral=True
             )
             return
         
-        airdrop = self.active_airdrops[code_upper]
-        
         # Check if expired
-        if datetime.now(timezone.utc) > airdrop["expires_at"]:
-            del self.active_airdrops[code_upper]
+        if airdrop.expired:
             await interaction.followup.send(
                 "❌ This airdrop has expired.",
                 ephemeral=True
@@ -546,22 +463,22 @@ class TipsAndAirdropsCog(commands.Cog):
             return
         
         # Check if user already claimed
-        has_claimed = interaction.user.id in airdrop["claimed_by"]
+        has_claimed = interaction.user.id in airdrop.claimed_by
         
         embed = create_embed(
             title=f"🎁 Airdrop: {code_upper}",
             description=(
-                f"**Creator:** {airdrop['creator_name']}\n"
-                f"**Amount per claim:** {format_usd(airdrop['per_claim_cents'])}\n"
-                f"**Total amount:** {format_usd(airdrop['total_amount_cents'])}\n"
-                f"**Claims:** {airdrop['current_claims']}/{airdrop['max_claims']}\n"
-                f"**Expires:** {airdrop['expires_at'].strftime('%Y-%m-%d %H:%M UTC')}\n\n"
+                f"**Creator:** {airdrop.creator_name}\n"
+                f"**Amount per claim:** {format_usd(airdrop.per_claim_cents)}\n"
+                f"**Total amount:** {format_usd(airdrop.total_amount_cents)}\n"
+                f"**Claims:** {airdrop.claim_count}/{airdrop.max_claims}\n"
+                f"**Expires:** {airdrop.expires_at.strftime('%Y-%m-%d %H:%M UTC')}\n\n"
                 f"**Status:** {'✅ You have claimed this' if has_claimed else '⏳ Available to claim'}"
             ),
             color=discord.Color.blue()
         )
-        if airdrop.get("message"):
-            embed.add_field(name="Message", value=airdrop["message"], inline=False)
+        if airdrop.message:
+            embed.add_field(name="Message", value=airdrop.message, inline=False)
         
         await interaction.followup.send(embed=embed, ephemeral=True)
 
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Schema Snapshot Generator for Apex Core Bot
+
+New databases are created from apex_core/schema_snapshot.sql instead of
+replaying every migration. This script rebuilds that snapshot by running the
+migrations on an in-memory database, or checks that the committed snapshot
+still matches them.
+
+Usage:
+    python3 scripts/schema_snapshot.py          # Rewrite the snapshot
+    python3 scripts/schema_snapshot.py --check  # Exit 1 if the snapshot is stale
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from apex_core.database import SCHEMA_SNAPSHOT_HEADER, SCHEMA_SNAPSHOT_PATH, Database  # noqa: E402
+
+
+async def render_snapshot() -> str:
+    """The snapshot text produced by replaying all migrations."""
+    database = Database(":memory:")
+    database.schema_snapshot_path = None
+    await database.connect()
+    try:
+        statements = await database.get_schema_statements()
+    finally:
+        await database.close()
+
+    header = (
+        f"{SCHEMA_SNAPSHOT_HEADER}{database.target_schema_version}\n"
+        "-- Generated by scripts/schema_snapshot.py from the migrations in apex_core/database.py.\n"
+        "-- Do not edit by hand.\n\n"
+    )
+    return header + "".join(f"{statement};\n\n" for statement in statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild or verify the schema snapshot used for new databases",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only compare the committed snapshot with the migrations",
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    snapshot = asyncio.run(render_snapshot())
+
+    if args.check:
+        current = SCHEMA_SNAPSHOT_PATH.read_text(encoding="utf-8") if SCHEMA_SNAPSHOT_PATH.exists() else ""
+        if current != snapshot:
+            print(f"❌ {SCHEMA_SNAPSHOT_PATH} is out of date; run scripts/schema_snapshot.py")
+            sys.exit(1)
+        print(f"✅ {SCHEMA_SNAPSHOT_PATH} matches the migrations")
+        sys.exit(0)
+
+    SCHEMA_SNAPSHOT_PATH.write_text(snapshot, encoding="utf-8")
+    print(f"✅ Wrote {SCHEMA_SNAPSHOT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
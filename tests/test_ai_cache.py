@@ -0,0 +1,87 @@
+"""Tests for AI product context precomputation and response caching."""
+
+import pytest
+
+from apex_core.ai_cache import (
+    KeywordMatcher,
+    ProductContextBuilder,
+    ResponseCache,
+    normalize_question,
+    render_product_context,
+)
+
+
+def test_keyword_matcher_matches_like_substring_search():
+    keywords = ["he", "she", "his", "hers", "Netflix Premium"]
+    matcher = KeywordMatcher(keywords)
+
+    for text in ["ushers", "This is it", "buy NETFLIX premium now", "nothing", "sh", ""]:
+        expected = any(keyword.lower() in text.lower() for keyword in keywords)
+        assert matcher.matches(text) is expected, text
+
+
+def test_keyword_matcher_handles_overlapping_suffixes():
+    matcher = KeywordMatcher(["abcd", "bc"])
+    assert matcher.matches("xabcx")
+    assert not matcher.matches("abxd")
+    assert not KeywordMatcher([]).matches("anything")
+
+
+def test_render_product_context_truncates_long_catalogs():
+    products = [
+        {"variant_name": f"Item {i}", "main_category": "Games", "sub_category": "", "price_cents": 150}
+        for i in range(55)
+    ]
+    context = render_product_context(products)
+    assert context.startswith("AVAILABLE PRODUCTS:\n- Item 0 (Games): $1.50")
+    assert "... and 5 more products." in context
+    assert render_product_context([]) == "No products available."
+
+
+@pytest.mark.asyncio
+async def test_context_builder_rebuilds_only_when_catalog_changes(db, product_factory):
+    await product_factory(variant_name="Spotify Family", main_category="Music", sub_category="Plans")
+    builder = ProductContextBuilder(db)
+
+    first = await builder.get_snapshot()
+    assert "Spotify Family (Music > Plans): $10.00" in first.product_context
+    assert first.is_product_question("is spotify family any good")
+    assert not first.is_product_question("what is the weather like")
+    assert await builder.get_snapshot() is first
+
+    await product_factory(variant_name="Weather Pack", price_cents=250)
+    second = await builder.get_snapshot()
+    assert second is not first
+    assert second.version != first.version
+    assert second.is_product_question("is the weather pack worth it")
+
+
+def test_response_cache_lru_ttl_and_metrics():
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    key_a = ResponseCache.make_key("  What is Apex?  ", "free", "v1")
+    assert key_a == ResponseCache.make_key("what is   apex", "free", "v1")
+    assert key_a != ResponseCache.make_key("what is apex", "free", "v2")
+    assert key_a != ResponseCache.make_key("what is apex", "free", "v1", "USER INFORMATION")
+
+    assert cache.get(key_a) is None
+    cache.put(key_a, "A store")
+    assert cache.get(key_a) == "A store"
+
+    key_b = ResponseCache.make_key("b", "free", "v1")
+    key_c = ResponseCache.make_key("c", "free", "v1")
+    cache.put(key_b, "B")
+    cache.get(key_a)  # touch A so B is least recently used
+    cache.put(key_c, "C")
+    assert cache.get(key_b) is None
+    assert cache.get(key_a) == "A store"
+
+    expired = ResponseCache(ttl_seconds=-1)
+    expired.put(key_a, "stale")
+    assert expired.get(key_a) is None
+    assert expired.stats()["entries"] == 0
+
+    assert cache.stats() == {"entries": 2, "hits": 3, "misses": 2, "hit_rate": 0.6}
+
+
+def test_normalize_question_strips_punctuation_and_case():
+    assert normalize_question("  How do I REFUND??  ") == "how do i refund"
@@ -0,0 +1,114 @@
+"""Tests for in-memory AI quota counters and batched usage flushing."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from apex_core.ai_usage import AIUsageTracker
+
+
+async def _count_rows(db, table: str) -> int:
+    cursor = await db._connection.execute(f"SELECT COUNT(*) FROM {table}")
+    return (await cursor.fetchone())[0]
+
+
+@pytest.mark.asyncio
+async def test_usage_counts_are_served_from_memory_and_flushed_in_batches(db):
+    tracker = AIUsageTracker(db, max_pending=1_000)
+
+    for _ in range(3):
+        await tracker.increment(701, "2026-01-01", "general_questions")
+        await tracker.log(701, "free", "gemini", 10, 5, 0, "hello")
+    await tracker.increment(701, "2026-01-01", "product_questions")
+
+    db.get_ai_daily_usage = AsyncMock(wraps=db.get_ai_daily_usage)
+    usage = await tracker.get_usage(701, "2026-01-01")
+    assert usage["general_questions"] == 3
+    assert usage["product_questions"] == 1
+    db.get_ai_daily_usage.assert_not_called()
+
+    # Nothing hits the tables until the flush
+    assert await _count_rows(db, "ai_usage_logs") == 0
+    assert await tracker.flush() == 4
+    assert await _count_rows(db, "ai_usage_logs") == 3
+    assert await tracker.flush() == 0
+
+    stored = await db.get_ai_daily_usage(701, "2026-01-01")
+    assert stored == {"general_questions": 3, "product_questions": 1, "images_generated": 0}
+
+
+@pytest.mark.asyncio
+async def test_usage_survives_restart_via_close(db):
+    tracker = AIUsageTracker(db, flush_interval=3600)
+    tracker.start()
+    await tracker.increment(702, "2026-01-02", "general_questions")
+    await tracker.increment(702, "2026-01-02", "general_questions")
+    await tracker.close()
+
+    restarted = AIUsageTracker(db)
+    usage = await restarted.get_usage(702, "2026-01-02")
+    assert usage["general_questions"] == 2
+
+    # Increments after a restart add to the stored counters
+    await restarted.increment(702, "2026-01-02", "general_questions")
+    await restarted.flush()
+    assert (await db.get_ai_daily_usage(702, "2026-01-02"))["general_questions"] == 3
+
+
+@pytest.mark.asyncio
+async def test_usage_flushes_early_when_buffer_is_full(db):
+    tracker = AIUsageTracker(db, max_pending=2)
+    await tracker.increment(703, "2026-01-03", "product_questions")
+    await tracker.log(703, "premium", "llama", 100, 50, 1, "x" * 300)
+
+    cursor = await db._connection.execute("SELECT question_preview, total_tokens FROM ai_usage_logs")
+    row = await cursor.fetchone()
+    assert len(row["question_preview"]) == 100
+    assert row["total_tokens"] == 150
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_buffered_usage(db):
+    tracker = AIUsageTracker(db)
+    await tracker.increment(704, "2026-01-04", "general_questions")
+    await tracker.log(704, "free", "gemini", 1, 1, 0, "q")
+
+    original = db.flush_ai_usage
+    db.flush_ai_usage = AsyncMock(side_effect=RuntimeError("disk full"))
+    with pytest.raises(RuntimeError):
+        await tracker.flush()
+
+    db.flush_ai_usage = original
+    assert await tracker.flush() == 2
+    assert (await db.get_ai_daily_usage(704, "2026-01-04"))["general_questions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_counters_reset_on_new_day_and_reject_unknown_fields(db):
+    tracker = AIUsageTracker(db)
+    await tracker.increment(705, "2026-01-05", "general_questions")
+    assert (await tracker.get_usage(705, "2026-01-06"))["general_questions"] == 0
+
+    with pytest.raises(ValueError):
+        await tracker.increment(705, "2026-01-06", "videos")
+
+
+@pytest.mark.asyncio
+async def test_flush_waits_for_open_wallet_transactions(db, user_factory, product_factory):
+    product_id = await product_factory(price_cents=100)
+    await user_factory(706, balance=10_000)
+
+    async def purchase() -> None:
+        await db.purchase_product(
+            user_discord_id=706, product_id=product_id, price_paid_cents=100, discount_applied_percent=0.0
+        )
+
+    async def flush(n: int) -> None:
+        await db.flush_ai_usage([(706, "2026-01-07", 1, 0, 0)], [(706, "free", "gemini", 1, 1, 2, 0, f"q{n}")])
+
+    await asyncio.gather(*(op for n in range(10) for op in (purchase(), flush(n))))
+
+    assert (await db.get_user(706))["wallet_balance_cents"] == 9_000
+    assert (await db.get_ai_daily_usage(706, "2026-01-07"))["general_questions"] == 10
+    assert await _count_rows(db, "ai_usage_logs") == 10
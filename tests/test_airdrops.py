@@ -0,0 +1,145 @@
+"""Tests for persisted airdrops and the batched claim engine."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from apex_core.airdrops import (
+    ALREADY_CLAIMED,
+    CLAIMED,
+    EXHAUSTED,
+    EXPIRED,
+    NOT_FOUND,
+    OWN_AIRDROP,
+    AirdropClaimEngine,
+    format_timestamp,
+)
+
+CREATOR_ID = 900
+
+
+async def _create_airdrop(db, *, code="DROP1", max_claims=10, per_claim=100, hours=1):
+    await db.ensure_user(CREATOR_ID)
+    await db.update_wallet_balance(CREATOR_ID, max_claims * per_claim)
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=hours)
+    airdrop_id, _ = await db.create_airdrop(
+        code=code,
+        creator_discord_id=CREATOR_ID,
+        creator_name="Creator",
+        total_amount_cents=max_claims * per_claim,
+        per_claim_cents=per_claim,
+        max_claims=max_claims,
+        expires_at=format_timestamp(expires_at),
+        message="gl",
+    )
+    return airdrop_id
+
+
+async def _scalar(db, query, params=()):
+    cursor = await db._connection.execute(query, params)
+    return (await cursor.fetchone())[0]
+
+
+@pytest.mark.asyncio
+async def test_create_airdrop_reserves_funds(db):
+    airdrop_id = await _create_airdrop(db, max_claims=5, per_claim=200)
+
+    creator = await db.get_user(CREATOR_ID)
+    assert creator["wallet_balance_cents"] == 0
+    row = await db.get_airdrop("DROP1")
+    assert row["id"] == airdrop_id
+    assert row["claim_count"] == 0
+
+    with pytest.raises(ValueError, match="Insufficient balance"):
+        await db.create_airdrop(
+            code="DROP2",
+            creator_discord_id=CREATOR_ID,
+            creator_name="Creator",
+            total_amount_cents=100,
+            per_claim_cents=100,
+            max_claims=1,
+            expires_at="2999-01-01 00:00:00",
+        )
+    assert await db.get_airdrop("DROP2") is None
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_never_exceeds_max_claims(db):
+    airdrop_id = await _create_airdrop(db, max_claims=3)
+
+    balances = await db.claim_airdrop_batch(airdrop_id, [1, 2, 2, CREATOR_ID, 3, 4])
+    assert set(balances) == {1, 2, 3}
+    assert balances[1] == 100
+
+    # Duplicates and late claims are dropped by the table itself
+    assert await db.claim_airdrop_batch(airdrop_id, [1, 5]) == {}
+    assert await _scalar(db, "SELECT claim_count FROM airdrops WHERE id = ?", (airdrop_id,)) == 3
+    assert await _scalar(
+        db, "SELECT COUNT(*) FROM wallet_transactions WHERE transaction_type = 'airdrop_claimed'"
+    ) == 3
+
+
+@pytest.mark.asyncio
+async def test_engine_rejections(db):
+    await _create_airdrop(db, max_claims=1)
+    engine = AirdropClaimEngine(db, batch_window=0.01)
+
+    assert (await engine.claim("NOPE", 1)).status == NOT_FOUND
+    assert (await engine.claim("DROP1", CREATOR_ID)).status == OWN_AIRDROP
+
+    result = await engine.claim("DROP1", 1)
+    assert result.status == CLAIMED
+    assert result.balance_after_cents == 100
+    assert result.airdrop.remaining == 0
+
+    assert (await engine.claim("DROP1", 1)).status == ALREADY_CLAIMED
+    assert (await engine.claim("DROP1", 2)).status == EXHAUSTED
+
+
+@pytest.mark.asyncio
+async def test_engine_state_survives_restart(db):
+    await _create_airdrop(db, max_claims=2)
+    await AirdropClaimEngine(db, batch_window=0).claim("DROP1", 1)
+
+    restarted = AirdropClaimEngine(db, batch_window=0)
+    airdrop = await restarted.get("DROP1")
+    assert airdrop.claim_count == 1
+    assert (await restarted.claim("DROP1", 1)).status == ALREADY_CLAIMED
+    assert (await restarted.claim("DROP1", 2)).status == CLAIMED
+
+
+@pytest.mark.asyncio
+async def test_engine_rejects_expired_airdrop(db):
+    await _create_airdrop(db, hours=-1)
+    engine = AirdropClaimEngine(db)
+    assert (await engine.claim("DROP1", 1)).status == EXPIRED
+
+
+@pytest.mark.asyncio
+async def test_thousand_simultaneous_claims_are_batched(db):
+    await _create_airdrop(db, max_claims=100)
+    engine = AirdropClaimEngine(db, batch_window=0.05, max_batch=50)
+    db.claim_airdrop_batch = AsyncMock(wraps=db.claim_airdrop_batch)
+
+    # Every claimant also double-clicks
+    user_ids = list(range(1_000, 2_000))
+    results = await asyncio.gather(
+        *(engine.claim("DROP1", user_id) for user_id in user_ids + user_ids[:100])
+    )
+
+    statuses = [result.status for result in results]
+    assert statuses.count(CLAIMED) == 100
+    assert statuses.count(EXHAUSTED) == 900
+    assert statuses.count(ALREADY_CLAIMED) == 100
+
+    # Late and duplicate claimants never reach the database
+    assert db.claim_airdrop_batch.await_count == 2
+    assert await _scalar(db, "SELECT COUNT(*) FROM airdrop_claims") == 100
+    assert await _scalar(db, "SELECT claim_count FROM airdrops") == 100
+    assert await _scalar(
+        db,
+        "SELECT SUM(wallet_balance_cents) FROM users WHERE discord_id != ?",
+        (CREATOR_ID,),
+    ) == 100 * 100
@@ -0,0 +1,143 @@
+"""Tests for Atto deposit crediting, node pooling and price caching against stub servers."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from cogs.atto_integration import AttoIntegrationCog, AttoNodeManager, AttoPriceFeed
+
+
+def _deposit(user_id: int, tx_hash: str, amount_raw: str = "1000") -> dict:
+    return {
+        "user_discord_id": user_id,
+        "amount_raw": amount_raw,
+        "cashback_raw": str(int(amount_raw) // 10),
+        "amount_usd_cents": 100,
+        "transaction_hash": tx_hash,
+        "memo": f"USER_{user_id}",
+    }
+
+
+class StubAttoNode:
+    """Minimal local Atto node serving /health and /account/history."""
+
+    def __init__(self, history: list[dict], *, healthy: bool = True) -> None:
+        self.history = history
+        self.healthy = healthy
+        self.requests: list[str] = []
+        self.app = web.Application()
+        self.app.router.add_get("/health", self._health)
+        self.app.router.add_get("/account/history", self._history)
+        self.server = TestServer(self.app)
+
+    async def _health(self, request: web.Request) -> web.Response:
+        self.requests.append("/health")
+        return web.Response(status=200 if self.healthy else 503)
+
+    async def _history(self, request: web.Request) -> web.Response:
+        self.requests.append("/account/history")
+        return web.json_response({"history": self.history})
+
+    @property
+    def url(self) -> str:
+        return str(self.server.make_url("")).rstrip("/")
+
+
+@pytest.mark.asyncio
+async def test_credit_atto_deposits_dedupes_in_one_transaction(db):
+    credited = await db.credit_atto_deposits(
+        [_deposit(501, "hash-a"), _deposit(501, "hash-b"), _deposit(502, "hash-a")],
+        to_address="main",
+    )
+    assert [deposit["transaction_hash"] for deposit in credited] == ["hash-a", "hash-b"]
+
+    balance = await db.get_atto_balance(501)
+    assert int(balance["balance_raw"]) == 2200
+    assert int(balance["total_deposited_raw"]) == 2000
+
+    # Re-delivering the same page credits nothing
+    assert await db.credit_atto_deposits([_deposit(501, "hash-a"), _deposit(501, "hash-b")]) == []
+    assert await db.get_existing_atto_transaction_hashes(["hash-a", "hash-c"]) == {"hash-a"}
+
+
+@pytest.mark.asyncio
+async def test_node_manager_reuses_session_and_fails_over():
+    healthy = StubAttoNode([{"hash": "h1"}])
+    unhealthy = StubAttoNode([], healthy=False)
+    await healthy.server.start_server()
+    await unhealthy.server.start_server()
+    manager = AttoNodeManager(f"{unhealthy.url},{healthy.url}")
+    try:
+        await manager.check_all_nodes()
+        assert manager.node_health[unhealthy.url][0] is False
+        assert manager.node_health[healthy.url][0] is True
+
+        first = await manager.request("GET", "/account/history")
+        session = manager._sessions[healthy.url]
+        second = await manager.request("GET", "/account/history")
+
+        assert first == second == {"history": [{"hash": "h1"}]}
+        assert manager._sessions[healthy.url] is session
+        # Requests never trigger inline health checks
+        assert healthy.requests == ["/health", "/account/history", "/account/history"]
+        assert unhealthy.requests == ["/health"]
+    finally:
+        await manager.close()
+        await healthy.server.close()
+        await unhealthy.server.close()
+
+
+@pytest.mark.asyncio
+async def test_price_feed_caches_within_ttl():
+    calls = []
+
+    async def ticker(request: web.Request) -> web.Response:
+        calls.append(request.query["symbol"])
+        return web.json_response({"data": {"price": "0.25"}})
+
+    app = web.Application()
+    app.router.add_get("/ticker/price", ticker)
+    server = TestServer(app)
+    await server.start_server()
+    feed = AttoPriceFeed(str(server.make_url("")).rstrip("/"), ttl=60)
+    try:
+        assert await feed.get_price() == 0.25
+        assert await feed.get_price() == 0.25
+        assert calls == ["ATTO_USDT"]
+    finally:
+        await feed.close()
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_deposit_monitor_credits_page_from_stub_node(db, monkeypatch):
+    node = StubAttoNode([
+        {"type": "receive", "memo": "USER_601", "amount": "5000", "hash": "tx-1"},
+        {"type": "receive", "memo": "USER_602", "amount": "3000", "hash": "tx-2"},
+        {"type": "send", "memo": "USER_601", "amount": "1", "hash": "tx-3"},
+    ])
+    await node.server.start_server()
+    manager = AttoNodeManager(node.url)
+    monkeypatch.setattr("cogs.atto_integration._node_manager", manager)
+    monkeypatch.setattr("cogs.atto_integration.ATTO_MAIN_WALLET", "main-wallet")
+    monkeypatch.setattr("cogs.atto_integration._get_atto_price_usd", AsyncMock(return_value=None))
+
+    user = MagicMock()
+    user.send = AsyncMock()
+    bot = MagicMock()
+    bot.db = db
+    bot.fetch_user = AsyncMock(return_value=user)
+    cog = AttoIntegrationCog(bot)
+    try:
+        await cog.deposit_monitor_task.coro(cog)
+        await cog.deposit_monitor_task.coro(cog)
+    finally:
+        await manager.close()
+        await node.server.close()
+
+    assert int((await db.get_atto_balance(601))["balance_raw"]) == 5500
+    assert int((await db.get_atto_balance(602))["balance_raw"]) == 3300
+    assert user.send.await_count == 2
+    assert cog.last_processed_hash == "tx-2"
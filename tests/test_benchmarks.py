@@ -0,0 +1,92 @@
+import sqlite3
+
+import pytest
+
+from apex_core.database import Database
+from benchmarks import SCENARIOS, SeedVolumes, compare_reports, run_benchmarks
+from benchmarks.fakes import FakeBot, benchmark_config
+from benchmarks.metrics import summarize_ms
+from benchmarks.scenarios import DiscountLookupSQL, DiscountPricing
+from benchmarks.seed import seed_database
+
+
+def test_seed_volumes_scale_down_to_at_least_one_row():
+    volumes = SeedVolumes().scaled(0.00001)
+
+    assert volumes == SeedVolumes(users=1, products=1, orders=10, ledger=10, discounts=1)
+    assert volumes.referrals == 0
+    assert volumes.open_tickets == 1
+
+
+def test_summarize_ms_uses_nearest_rank_percentiles():
+    summary = summarize_ms([i / 1000 for i in range(1, 101)])
+
+    assert summary["p50"] == 50.0
+    assert summary["p99"] == 99.0
+    assert summary["max"] == 100.0
+    assert summarize_ms([])["p99"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_every_scenario_runs_without_errors(tmp_path):
+    volumes = SeedVolumes().scaled(0.001)
+
+    report = await run_benchmarks(
+        list(SCENARIOS), volumes=volumes, db_path=tmp_path / "bench.db", ops=12, concurrency=4
+    )
+
+    assert report["meta"]["volumes"]["orders"] == 1_000
+    assert set(report["scenarios"]) == set(SCENARIOS)
+    for name, result in report["scenarios"].items():
+        assert result["errors"] == 0, (name, result["first_error"])
+        assert result["ops"] == 12
+        assert result["ops_per_second"] > 0
+        assert set(result["latency_ms"]) == {"p50", "p90", "p99", "max", "mean"}
+        assert set(result["loop_lag_ms"]) == {"p99", "max", "mean"}
+
+    # Purchases went through the real wallet path
+    with sqlite3.connect(tmp_path / "bench.db") as connection:
+        assert connection.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == 1_000 + 12
+        assert connection.execute("SELECT COUNT(*) FROM discounts").fetchone()[0] == 50
+        # Each Open Ticket click wrote one ticket, with the channel it created
+        assert connection.execute(
+            "SELECT COUNT(*) FROM tickets WHERE type = 'order' AND channel_id != 0"
+        ).fetchone()[0] == 12
+
+
+@pytest.mark.asyncio
+async def test_discount_engine_prices_match_the_sql_lookup(tmp_path):
+    volumes = SeedVolumes(users=200, products=300, orders=10, ledger=10, discounts=5_000)
+    await seed_database(tmp_path / "bench.db", volumes)
+    db = Database(tmp_path / "bench.db")
+    await db.connect()
+    bot = FakeBot(db, benchmark_config())
+    try:
+        engine = DiscountPricing(bot, volumes)
+        await engine.setup()
+        sql = DiscountLookupSQL(bot, volumes)
+        await sql.setup()
+        discounted = 0
+        for index in range(40):
+            user, products = engine.user(index), engine.page(index)
+            prices = await engine.price_page(user, products)
+            assert prices == await sql.price_page(user, products)
+            discounted += sum(1 for _, percent in prices.values() if percent)
+        assert discounted
+    finally:
+        await bot.close()
+        await db.close()
+
+
+def test_compare_reports_flags_throughput_latency_and_error_regressions():
+    def report(ops_per_second, p99, errors=0):
+        return {"scenarios": {"browse_storm": {
+            "ops_per_second": ops_per_second, "latency_ms": {"p99": p99}, "errors": errors,
+        }}}
+
+    baseline = report(100.0, 10.0)
+
+    assert compare_reports(baseline, report(90.0, 11.0), max_regression=0.25) == []
+    regressions = compare_reports(baseline, report(50.0, 20.0, errors=1), max_regression=0.25)
+    assert len(regressions) == 3
+    assert compare_reports({"scenarios": {}}, report(1.0, 99.0), max_regression=0.25) == []
@@ -0,0 +1,182 @@
+"""Tests for the announcement outbox and broadcast engine."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+from apex_core.broadcast import AdaptiveRateLimiter, BroadcastEngine, RecipientUnavailable, fan_out
+from cogs.order_management import OrderManagementCog
+
+
+async def _create_dm_announcement(db) -> int:
+    return await db.create_announcement(
+        title="Sale",
+        message="Everything is 10% off",
+        announcement_type="all",
+        delivery_method="dm",
+        created_by_staff_id=1,
+        guild_id=987654321,
+        status="sending",
+    )
+
+
+def _fast_engine(db, **kwargs) -> BroadcastEngine:
+    limiter = AdaptiveRateLimiter(rate=1000.0, min_rate=100.0, max_rate=1000.0)
+    return BroadcastEngine(db, limiter=limiter, batch_size=3, progress_interval=0.0, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_announcement_deliveries_ignores_duplicates(db):
+    announcement_id = await _create_dm_announcement(db)
+
+    assert await db.enqueue_announcement_deliveries(announcement_id, [1, 2, 3]) == 3
+    assert await db.enqueue_announcement_deliveries(announcement_id, [3, 4]) == 1
+
+    pending = await db.get_pending_announcement_deliveries(announcement_id, limit=10)
+    assert pending == [1, 2, 3, 4]
+    counts = await db.get_announcement_delivery_counts(announcement_id)
+    assert counts == {"pending": 4, "sent": 0, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_broadcast_engine_records_per_recipient_status(db):
+    announcement_id = await _create_dm_announcement(db)
+    await db.enqueue_announcement_deliveries(announcement_id, [10, 11, 12, 13, 14])
+    forbidden = discord.Forbidden(MagicMock(status=403, reason="Forbidden"), "Cannot DM")
+    delivered: list[int] = []
+    snapshots = []
+
+    async def send(user_id: int) -> None:
+        if user_id == 12:
+            raise forbidden
+        if user_id == 13:
+            raise RecipientUnavailable(str(user_id))
+        delivered.append(user_id)
+
+    async def on_progress(progress) -> None:
+        snapshots.append(progress)
+
+    result = await _fast_engine(db).run(announcement_id, send, on_progress)
+
+    assert sorted(delivered) == [10, 11, 14]
+    assert (result.sent, result.failed, result.pending) == (3, 2, 0)
+    assert result.done
+    assert snapshots and snapshots[-1].total == 5
+
+    announcement = await db.get_announcement(announcement_id)
+    assert announcement["status"] == "completed"
+    assert announcement["successful_deliveries"] == 3
+    assert announcement["failed_deliveries"] == 2
+
+    cursor = await db._connection.execute(
+        "SELECT user_discord_id, last_error FROM announcement_deliveries WHERE status = 'failed' "
+        "ORDER BY user_discord_id"
+    )
+    rows = [tuple(row) for row in await cursor.fetchall()]
+    assert rows == [(12, "dms_disabled"), (13, "recipient_unavailable")]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_engine_backs_off_and_retries_rate_limited_sends(db):
+    announcement_id = await _create_dm_announcement(db)
+    await db.enqueue_announcement_deliveries(announcement_id, [20, 21])
+    limited_once: set[int] = set()
+
+    async def send(user_id: int) -> None:
+        if user_id == 21 and user_id not in limited_once:
+            limited_once.add(user_id)
+            raise discord.RateLimited(0.01)
+
+    engine = _fast_engine(db)
+    result = await engine.run(announcement_id, send)
+
+    assert (result.sent, result.failed) == (2, 0)
+    assert engine.limiter.rate < 1000.0
+
+
+@pytest.mark.asyncio
+async def test_broadcast_engine_gives_up_after_max_attempts(db):
+    announcement_id = await _create_dm_announcement(db)
+    await db.enqueue_announcement_deliveries(announcement_id, [30])
+    response = MagicMock(status=429, reason="Too Many Requests", headers={"Retry-After": "0"})
+
+    async def send(user_id: int) -> None:
+        raise discord.HTTPException(response, "rate limited")
+
+    result = await _fast_engine(db, max_attempts=2).run(announcement_id, send)
+
+    assert (result.sent, result.failed) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_resumes_and_retries_only_unfinished_recipients(db):
+    announcement_id = await _create_dm_announcement(db)
+    await db.enqueue_announcement_deliveries(announcement_id, [40, 41, 42])
+    # Simulate a crash after the first recipient was delivered and one failed
+    await db.record_announcement_deliveries(
+        announcement_id, [(40, "sent", None), (41, "failed", "boom")]
+    )
+
+    incomplete = await db.get_incomplete_announcements()
+    assert [row["id"] for row in incomplete] == [announcement_id]
+
+    delivered: list[int] = []
+
+    async def send(user_id: int) -> None:
+        delivered.append(user_id)
+
+    engine = _fast_engine(db)
+    await engine.run(announcement_id, send)
+    assert delivered == [42]
+    assert await db.get_incomplete_announcements() == []
+
+    assert await db.retry_failed_announcement_deliveries(announcement_id) == 1
+    result = await engine.run(announcement_id, send)
+    assert delivered == [42, 41]
+    assert (result.sent, result.failed) == (3, 0)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_rate_limiter_increases_and_halves_rate():
+    limiter = AdaptiveRateLimiter(rate=1.0, min_rate=0.5, max_rate=1.1, increase_step=0.5)
+
+    limiter.on_success()
+    assert limiter.rate == 1.1
+
+    limiter.on_rate_limited(0.0)
+    assert limiter.rate == 0.55
+    limiter.on_rate_limited(0.0)
+    assert limiter.rate == 0.5
+
+
+@pytest.mark.asyncio
+async def test_fan_out_retries_rate_limits_and_counts_failures():
+    forbidden = discord.Forbidden(MagicMock(status=403, reason="Forbidden"), "Cannot DM")
+    limited_once: set[int] = set()
+    delivered: list[int] = []
+
+    async def send(user_id: int) -> None:
+        if user_id == 2 and user_id not in limited_once:
+            limited_once.add(user_id)
+            raise discord.RateLimited(0.01)
+        if user_id == 3:
+            raise forbidden
+        delivered.append(user_id)
+
+    limiter = AdaptiveRateLimiter(rate=1000.0, min_rate=100.0, max_rate=1000.0)
+    assert await fan_out([1, 2, 3], send, limiter=limiter) == (2, 1)
+    assert sorted(delivered) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_bulk_order_notifications_retry_rate_limited_dms():
+    user = MagicMock()
+    user.send = AsyncMock(side_effect=[discord.RateLimited(0.01), None])
+    bot = MagicMock()
+    bot.fetch_user = AsyncMock(return_value=user)
+    order = {"id": 9, "user_discord_id": 42, "old_status": "pending", "product_name": "Gold"}
+
+    await OrderManagementCog(bot)._notify_status_changes([order], "completed")
+
+    assert user.send.await_count == 2
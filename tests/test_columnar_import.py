@@ -0,0 +1,111 @@
+"""Tests for Parquet/Arrow product imports."""
+
+import pytest
+
+from apex_core.columnar_import import parse_columnar_products
+from cogs.product_import import _parse_and_validate_csv
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+ROWS = {
+    "Main_Category": ["Games", "Games", "Games", " Keys "],
+    "Sub_Category": ["g2g", "g2g", "g2g", "g2a"],
+    "Service_Name": ["Gold", "", "Silver", "Steam"],
+    "Variant_Name": ["100k", "x", "50k", "Key"],
+    "Price_USD": [1.005, 2.0, -1.0, None],
+    "Start_Time": ["", None, "", ""],
+    "Duration": ["30 days", None, None, None],
+    "Refill_Period": [None, None, None, None],
+    "Additional_Info": ["Stock: 3", None, None, None],
+    "product_url": ["u1", "u2", "u3", "u4"],
+}
+
+
+def _csv_bytes() -> bytes:
+    header = [col for col in ROWS if col != "product_url"]
+    lines = [",".join(header)]
+    for i in range(len(ROWS["Main_Category"])):
+        values = ["" if ROWS[col][i] is None else str(ROWS[col][i]) for col in header]
+        lines.append(",".join(values))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def test_parquet_import_matches_csv_import(tmp_path):
+    path = tmp_path / "products.parquet"
+    pq.write_table(pa.table(ROWS), path)
+
+    result = parse_columnar_products(path.read_bytes())
+
+    assert result == _parse_and_validate_csv(_csv_bytes())
+    assert result["rows"][0]["price_cents"] == 100
+    assert result["rows"][0]["start_time"] is None
+    assert result["errors"] == [
+        "Row 3: Missing required field values",
+        "Row 4: Price cannot be negative",
+        "Row 5: Invalid price format ''",
+    ]
+
+
+def test_arrow_file_is_read_from_a_memory_map(tmp_path):
+    path = tmp_path / "products.arrow"
+    table = pa.table(ROWS)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    result = parse_columnar_products(path)
+
+    assert result["success"] is True
+    assert [row["service_name"] for row in result["rows"]] == ["Gold"]
+
+
+def test_columnar_import_rejects_missing_columns_and_bad_files():
+    table = pa.table({"Main_Category": ["Games"]})
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink)
+
+    result = parse_columnar_products(sink.getvalue().to_pybytes())
+    assert result["success"] is False
+    assert result["error"].startswith("Missing required columns: Sub_Category")
+
+    assert parse_columnar_products(b"not a table")["success"] is False
+
+
+def test_non_finite_and_overflowing_prices_are_rejected(tmp_path):
+    prices = ["nan", "inf", "-inf", "1e30", "2.50"]
+    rows = {col: [values[0]] * len(prices) for col, values in ROWS.items()}
+    rows["Price_USD"] = prices
+    path = tmp_path / "products.parquet"
+    pq.write_table(pa.table(rows), path)
+
+    result = parse_columnar_products(path.read_bytes())
+
+    header = [col for col in ROWS if col != "product_url"]
+    csv_lines = [",".join(header)] + [
+        ",".join("" if rows[col][i] is None else str(rows[col][i]) for col in header)
+        for i in range(len(prices))
+    ]
+    assert result == _parse_and_validate_csv(("\n".join(csv_lines) + "\n").encode("utf-8"))
+    assert [row["price_cents"] for row in result["rows"]] == [250]
+    assert result["errors"] == [
+        "Row 2: Invalid price format 'nan'",
+        "Row 3: Invalid price format 'inf'",
+        "Row 4: Invalid price format '-inf'",
+        "Row 5: Invalid price format '1e30'",
+    ]
+
+    floats = pa.table({**rows, "Price_USD": [float("nan"), float("inf"), 1e30, 1e30, 2.5]})
+    result = parse_columnar_products(_parquet_bytes(floats))
+    assert [row["price_cents"] for row in result["rows"]] == [250]
+    assert result["errors"] == [
+        "Row 2: Invalid price format 'nan'",
+        "Row 3: Invalid price format 'inf'",
+        "Row 4: Invalid price format '1e+30'",
+        "Row 5: Invalid price format '1e+30'",
+    ]
+
+
+def _parquet_bytes(table) -> bytes:
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink)
+    return sink.getvalue().to_pybytes()
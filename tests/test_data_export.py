@@ -0,0 +1,114 @@
+"""Tests for streaming, compressed data exports."""
+
+import csv
+import gzip
+import json
+
+import pytest
+
+from apex_core.data_export import batch_files_for_upload, stream_query_to_files
+
+
+async def _seed_transactions(db, count: int) -> None:
+    await db.ensure_user(801)
+    await db._connection.executemany(
+        """
+        INSERT INTO wallet_transactions (
+            user_discord_id, amount_cents, balance_after_cents, transaction_type, description
+        ) VALUES (?, ?, ?, 'admin_credit', ?)
+        """,
+        [(801, i, i, f"credit #{i} " + "x" * 40) for i in range(count)],
+    )
+    await db._connection.commit()
+
+
+@pytest.mark.asyncio
+async def test_stream_export_writes_gzip_csv_in_chunks(db, tmp_path):
+    await _seed_transactions(db, 25)
+
+    result = await stream_query_to_files(
+        db._connection,
+        "SELECT id, amount_cents, description FROM wallet_transactions ORDER BY id",
+        directory=tmp_path,
+        basename="transactions_export",
+        chunk_size=4,
+    )
+
+    assert result.rows == 25
+    assert [path.name for path in result.files] == ["transactions_export.csv.gz"]
+    assert result.total_bytes == result.files[0].stat().st_size
+
+    with gzip.open(result.files[0], "rt", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["id", "amount_cents", "description"]
+    assert len(rows) == 26
+    assert rows[1][1] == "0"
+
+
+@pytest.mark.asyncio
+async def test_stream_export_splits_files_and_supports_jsonl(db, tmp_path):
+    await _seed_transactions(db, 400)
+
+    result = await stream_query_to_files(
+        db._connection,
+        "SELECT id, amount_cents, description FROM wallet_transactions WHERE user_discord_id = ?",
+        (801,),
+        directory=tmp_path,
+        basename="big",
+        fmt="jsonl",
+        max_file_bytes=2_000,
+        chunk_size=50,
+    )
+
+    assert result.rows == 400
+    assert len(result.files) > 1
+    assert result.files[1].name == "big_part2.jsonl.gz"
+
+    records = []
+    for path in result.files:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f)
+    assert len(records) == 400
+    assert records[0].keys() == {"id", "amount_cents", "description"}
+
+
+@pytest.mark.asyncio
+async def test_stream_export_without_rows_creates_no_files(db, tmp_path):
+    result = await stream_query_to_files(
+        db._connection,
+        "SELECT * FROM wallet_transactions",
+        directory=tmp_path,
+        basename="empty",
+    )
+    assert result.rows == 0
+    assert result.files == []
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_stream_export_rejects_unknown_format(db, tmp_path):
+    with pytest.raises(ValueError):
+        await stream_query_to_files(
+            db._connection, "SELECT 1", directory=tmp_path, basename="x", fmt="xml"
+        )
+
+
+def test_upload_batches_respect_total_size_and_attachment_count(tmp_path):
+    sizes = [400_000, 400_000, 300_000, 900_000, 50_000, 50_000, 50_000]
+    files = []
+    for i, size in enumerate(sizes):
+        path = tmp_path / f"part{i}.csv.gz"
+        path.write_bytes(b"x" * size)
+        files.append(path)
+
+    batches = batch_files_for_upload(files, max_bytes=1_000_000, max_files=2)
+
+    assert [[path.name for path in batch] for batch in batches] == [
+        ["part0.csv.gz", "part1.csv.gz"],
+        ["part2.csv.gz"],
+        ["part3.csv.gz"],
+        ["part4.csv.gz", "part5.csv.gz"],
+        ["part6.csv.gz"],
+    ]
+    # An oversized part still goes out, alone
+    assert batch_files_for_upload(files[3:4], max_bytes=100_000) == [files[3:4]]
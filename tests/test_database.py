@@ -67,6 +67,19 @@ async def test_purchase_product_deducts_balance_and_creates_order(db):
     assert user["total_lifetime_spent_cents"] == 1_200
 
 
+@pytest.mark.asyncio
+async def test_decrease_product_stock(db, product_factory):
+    product_id = await product_factory()
+    await db._connection.execute("UPDATE products SET stock_quantity = 2 WHERE id = ?", (product_id,))
+    unlimited_id = await product_factory(variant_name="Unlimited")
+
+    assert await db.decrease_product_stock(product_id, 2)
+    assert not await db.decrease_product_stock(product_id, 1)
+    assert (await db.get_product(product_id))["stock_quantity"] == 0
+    assert await db.decrease_product_stock(unlimited_id, 5)
+    assert (await db.get_product(unlimited_id))["stock_quantity"] is None
+
+
 @pytest.mark.asyncio
 async def test_purchase_product_with_insufficient_funds_raises(db):
     await db.ensure_user(45678)
@@ -454,6 +467,42 @@ async def test_update_order_status(db):
         await db.update_order_status(order_id, "invalid_status")
 
 
+@pytest.mark.asyncio
+async def test_bulk_update_order_status(db):
+    """Test updating many orders in one transaction, skipping unknown IDs."""
+    await db.ensure_user(65433)
+    product_id = await db.create_product(
+        main_category="Test",
+        sub_category="Service",
+        service_name="Test Service",
+        variant_name="Bulk Variant",
+        price_cents=1000,
+    )
+    order_ids = [
+        await db.create_order(
+            user_discord_id=65433,
+            product_id=product_id,
+            price_paid_cents=1000 + i,
+            discount_applied_percent=0.0,
+        )
+        for i in range(3)
+    ]
+    await db.update_order_status(order_ids[0], "refill")
+
+    updated = await db.bulk_update_order_status([order_ids[2], 999_999, *order_ids], "fulfilled")
+
+    assert [order["id"] for order in updated] == order_ids
+    assert [order["old_status"] for order in updated] == ["refill", "pending", "pending"]
+    assert updated[1]["product_name"] == "Bulk Variant"
+    assert updated[1]["price_paid_cents"] == 1001
+    for order_id in order_ids:
+        assert (await db.get_order_by_id(order_id))["status"] == "fulfilled"
+
+    with pytest.raises(ValueError, match="Invalid status"):
+        await db.bulk_update_order_status(order_ids, "completed")
+    assert await db.bulk_update_order_status([], "fulfilled") == []
+
+
 @pytest.mark.asyncio
 async def test_renew_order_warranty(db):
     """Test warranty renewal functionality."""
@@ -538,6 +587,49 @@ async def test_get_orders_expiring_soon(db):
     assert expiring_order["user_discord_id"] == 87654
 
 
+@pytest.mark.asyncio
+async def test_pending_warranty_notifications_are_grouped_and_sent_once(db):
+    """Test that expiring orders are grouped per user and skipped once notified."""
+    from datetime import datetime, timedelta, timezone
+
+    product_id = await db.create_product(
+        main_category="Test",
+        sub_category="Service",
+        service_name="Test Service",
+        variant_name="Warranty Variant",
+        price_cents=1000,
+    )
+    soon = (datetime.now(timezone.utc) + timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")
+    later = (datetime.now(timezone.utc) + timedelta(days=2)).strftime("%Y-%m-%d %H:%M:%S")
+    orders = {}
+    for user_id, expires, pid in [(87001, later, product_id), (87001, soon, 0), (87002, soon, product_id)]:
+        await db.ensure_user(user_id)
+        orders.setdefault(user_id, []).append(await db.create_order(
+            user_discord_id=user_id,
+            product_id=pid,
+            price_paid_cents=1000,
+            discount_applied_percent=0.0,
+            status="fulfilled",
+            warranty_expires_at=expires,
+            order_metadata='{"product_name": "Custom Setup"}' if pid == 0 else None,
+        ))
+
+    groups = await db.get_pending_warranty_notifications(3)
+    assert [group["user_discord_id"] for group in groups] == [87001, 87002]
+    first = groups[0]["orders"]
+    assert [order["id"] for order in first] == orders[87001][::-1]
+    assert [order["product_name"] for order in first] == ["Custom Setup", "Test Service - Warranty Variant"]
+
+    await db.record_warranty_notifications(groups[0]["orders"])
+    groups = await db.get_pending_warranty_notifications(3)
+    assert [group["user_discord_id"] for group in groups] == [87002]
+
+    # A renewed warranty is announced again
+    await db.renew_order_warranty(orders[87001][0], soon, staff_discord_id=1)
+    groups = await db.get_pending_warranty_notifications(3)
+    assert [order["id"] for group in groups for order in group["orders"]] == [orders[87001][0], orders[87002][0]]
+
+
 @pytest.mark.asyncio
 async def test_get_active_orders(db):
     """Test retrieving active (non-refunded) orders."""
@@ -936,6 +1028,55 @@ async def test_wallet_transactions_index_exists_after_migrations(db):
 
 
 @pytest.mark.asyncio
-async def test_database_schema_version_is_24(db):
-     """Test that the target schema version is 24."""
-     assert db.target_schema_version == 24
\ No newline at end of file
+async def test_database_schema_version_is_29(db):
+     """Test that the target schema version is 29."""
+     assert db.target_schema_version == 29
+
+async def _migrated_schema() -> tuple[list[str], list[tuple]]:
+    from apex_core.database import Database
+
+    database = Database(":memory:")
+    database.schema_snapshot_path = None
+    await database.connect()
+    try:
+        cursor = await database._connection.execute(
+            "SELECT version, name FROM schema_migrations ORDER BY version"
+        )
+        return await database.get_schema_statements(), [tuple(row) for row in await cursor.fetchall()]
+    finally:
+        await database.close()
+
+
+@pytest.mark.asyncio
+async def test_schema_snapshot_matches_migrations(db):
+    """Fresh databases built from the snapshot must equal fully migrated ones."""
+    from apex_core.database import SCHEMA_SNAPSHOT_HEADER, SCHEMA_SNAPSHOT_PATH
+
+    statements, migrations = await _migrated_schema()
+    snapshot = SCHEMA_SNAPSHOT_PATH.read_text(encoding="utf-8")
+    assert snapshot.startswith(f"{SCHEMA_SNAPSHOT_HEADER}{db.target_schema_version}\n"), (
+        "Schema snapshot is stale; run scripts/schema_snapshot.py"
+    )
+
+    assert await db.get_schema_statements() == statements, (
+        "Schema snapshot differs from the migrations; run scripts/schema_snapshot.py"
+    )
+    cursor = await db._connection.execute("SELECT version, name FROM schema_migrations ORDER BY version")
+    assert [tuple(row) for row in await cursor.fetchall()] == migrations
+
+
+@pytest.mark.asyncio
+async def test_stale_schema_snapshot_falls_back_to_migrations(tmp_path):
+    from apex_core.database import Database
+
+    stale = tmp_path / "schema_snapshot.sql"
+    stale.write_text("-- schema_version: 1\nCREATE TABLE users (id INTEGER);\n", encoding="utf-8")
+
+    database = Database(":memory:")
+    database.schema_snapshot_path = stale
+    await database.connect()
+    try:
+        statements, _ = await _migrated_schema()
+        assert await database.get_schema_statements() == statements
+    finally:
+        await database.close()
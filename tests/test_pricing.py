@@ -0,0 +1,135 @@
+"""Tests for the role ladder and the cached pricing service."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from apex_core.config import Role
+from apex_core.pricing import DiscountEngine, PricingService
+from apex_core.utils.roles import RoleLadder
+
+
+def _scan_roles(roles, total_spent, has_client_role, manually_assigned):
+    """The original linear scan over config.roles, kept as the reference."""
+    applicable = []
+    for role in roles:
+        if role.assignment_mode == "automatic_spend":
+            if isinstance(role.unlock_condition, int) and total_spent >= role.unlock_condition:
+                applicable.append(role)
+        elif role.assignment_mode == "automatic_first_purchase":
+            if has_client_role or total_spent > 0:
+                applicable.append(role)
+        elif role.assignment_mode == "manual":
+            if role.name in manually_assigned:
+                applicable.append(role)
+    held = {r.name for r in applicable}
+    for role in roles:
+        if role.assignment_mode == "automatic_all_ranks":
+            if all(
+                r.name in held or r.name in manually_assigned
+                for r in roles
+                if r.assignment_mode != "automatic_all_ranks"
+            ):
+                applicable.append(role)
+    return applicable
+
+
+def test_role_ladder_matches_linear_scan(sample_roles):
+    roles = [
+        Role("Zenith", 2000, "automatic_all_ranks", "all", 10.0, tier_priority=0),
+        *sample_roles,
+        Role("Buyer", 2001, "automatic_first_purchase", "first", 0.5, tier_priority=6),
+        Role("Mid", 2002, "automatic_spend", 5_000, 2.0, tier_priority=4),
+    ]
+    ladder = RoleLadder(roles)
+
+    for spent in (0, 1, 4_999, 5_000, 19_999, 20_000, 1_000_000):
+        for has_client in (False, True):
+            for manual in ([], ["Legendary Donor"]):
+                assert ladder.resolve(spent, has_client, manual) == _scan_roles(
+                    roles, spent, has_client, manual
+                )
+
+    # Equal priority and threshold: the earlier config entry wins, as before
+    assert ladder.vip_tier(5_000).name == "Apex VIP"
+    assert ladder.vip_tier(20_000).name == "Apex Elite"
+    assert RoleLadder([]).vip_tier(10_000) is None
+
+
+@pytest.mark.asyncio
+async def test_pricing_service_caches_until_inputs_change(db, sample_config, user_factory, product_factory):
+    user_id = await user_factory(5100, balance=50_000)
+    product_id = await product_factory(price_cents=10_000)
+    pricing = PricingService(db)
+
+    assert await pricing.discount_percent(user_id, product_id, sample_config) == 0.0
+    assert await pricing.discount_percent(user_id, product_id, sample_config) == 0.0
+    assert pricing.stats()["hits"] == 1
+
+    # Lifetime spend reaches Apex VIP
+    await db.purchase_product(
+        user_discord_id=user_id, product_id=product_id, price_paid_cents=6_000, discount_applied_percent=0
+    )
+    assert await pricing.discount_percent(user_id, product_id, sample_config) == 1.5
+
+    await db.add_manually_assigned_role(user_id, "Legendary Donor")
+    assert await pricing.discount_percent(user_id, product_id, sample_config) == 4.0
+
+    await db.set_discount(
+        user_id=None, product_id=product_id, vip_tier=None, discount_percent=3.0,
+        description="stacking sale", is_stackable=True,
+    )
+    await db.set_discount(
+        user_id=None, product_id=None, vip_tier=None, discount_percent=50.0,
+        description="expired", expires_at=(datetime.now() - timedelta(days=1)).isoformat(),
+    )
+    prices = await pricing.price_products(
+        user_id, [{"id": product_id, "price_cents": 10_000}, {"id": 999, "price_cents": 1_000}], sample_config
+    )
+    assert prices == {product_id: (9_300, 7.0), 999: (960, 4.0)}
+    assert pricing.stats()["misses"] == 4
+
+
+@pytest.mark.asyncio
+async def test_discount_engine_matches_sql_and_expires_rules(db, user_factory, product_factory):
+    users = [(await db.get_user(await user_factory(6000 + i)))["id"] for i in range(3)]
+    products = [await product_factory(price_cents=1_000) for _ in range(3)]
+    tiers = ["Apex VIP", "Apex Elite"]
+    now = datetime.now()
+    rng = random.Random(7)
+    for i in range(60):
+        expires = rng.choice([None, now - timedelta(hours=1), now + timedelta(hours=i + 1)])
+        await db.set_discount(
+            user_id=rng.choice([None, *users]),
+            product_id=rng.choice([None, *products]),
+            vip_tier=rng.choice([None, *tiers]),
+            discount_percent=float(i % 7),
+            description=f"rule {i}",
+            expires_at=expires.isoformat() if expires else None,
+            is_stackable=rng.random() < 0.5,
+        )
+
+    engine = DiscountEngine(db)
+    await engine.refresh()
+    for user_id in [None, *users]:
+        for product_id in [None, *products]:
+            for tier in [None, *tiers]:
+                expected = sorted(
+                    row["id"]
+                    for row in await db.get_applicable_discounts(user_id=user_id, product_id=product_id, vip_tier=tier)
+                    if not row["expires_at"] or datetime.fromisoformat(row["expires_at"]) >= now
+                )
+                assert [d.discount_id for d in engine.match(user_id, product_id, tier, now=now)] == expected
+
+    # Rules leave the index as their expiry passes, without a reload
+    loaded = len(engine)
+    later = [d.discount_id for d in engine.match(None, None, None, now=now + timedelta(hours=30))]
+    assert len(engine) < loaded and engine.reloads == 1
+    assert all(row["expires_at"] is None for row in await db._connection.execute_fetchall(
+        f"SELECT expires_at FROM discounts WHERE id IN ({','.join('?' * len(later))})", later
+    ))
+
+    await db.set_discount(user_id=None, product_id=None, vip_tier=None, discount_percent=1.0, description="new")
+    await engine.refresh()
+    assert engine.reloads == 2
@@ -0,0 +1,127 @@
+"""Tests for the FTS5 product search index and search_products."""
+
+import pytest
+
+from apex_core.ai_cache import ProductContextBuilder
+from apex_core.database import build_search_query
+
+
+def test_build_search_query_quotes_terms():
+    assert build_search_query('Netflix "premium" 1000') == '"netflix"* AND "premium"* AND "1000"*'
+    assert build_search_query("a b", match_any=True, columns=("tags",)) == '{tags} : ("a"* OR "b"*)'
+    assert build_search_query("  ?!  ") == ""
+    with pytest.raises(ValueError):
+        build_search_query("x", columns=("price_cents",))
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_products_and_tags(db, product_factory):
+    netflix = await product_factory(
+        main_category="Streaming", sub_category="Netflix",
+        service_name="Netflix Premium", variant_name="1 Month",
+    )
+    followers = await product_factory(
+        main_category="Social", sub_category="Instagram",
+        service_name="Followers", variant_name="1000 Instagram Followers",
+        additional_info="Delivered within a day",
+    )
+
+    async def ids(query, **kwargs):
+        rows, _ = await db.search_products(query, **kwargs)
+        return [row["id"] for row in rows]
+
+    assert await ids("netflix prem") == [netflix]
+    assert await ids("instagram 1000") == [followers]
+    assert await ids("delivered") == [followers]
+    assert await ids("social", main_category="Streaming") == []
+
+    await db.add_product_tag(netflix, "4K-UHD")
+    assert await ids("uhd", columns=("tags",)) == [netflix]
+    assert await ids("", tag="4k-uhd") == [netflix]
+    await db.remove_product_tag(netflix, "4K-UHD")
+    assert await ids("uhd") == []
+
+    await db.update_product(followers, variant_name="5000 Instagram Followers")
+    assert await ids("5000") == [followers]
+    assert await ids("1000") == []
+
+    await db._connection.execute("DELETE FROM products WHERE id = ?", (netflix,))
+    await db._connection.commit()
+    assert await ids("netflix") == []
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_and_pages_with_cursor(db, product_factory):
+    best = await product_factory(variant_name="Spotify Family", service_name="Spotify")
+    others = [
+        await product_factory(variant_name=f"Music Pack {i}", additional_info="works with spotify")
+        for i in range(4)
+    ]
+
+    seen = []
+    rows, cursor = await db.search_products("spotify", limit=2)
+    assert rows[0]["id"] == best
+    while True:
+        seen.extend(row["id"] for row in rows)
+        if cursor is None:
+            break
+        rows, cursor = await db.search_products("spotify", limit=2, cursor=cursor)
+    assert seen[0] == best and sorted(seen[1:]) == others
+
+    # Without FTS5 the same products are found by substring, ordered by ID
+    db._has_search_index = False
+    rows, _ = await db.search_products("spotify", limit=10)
+    assert [row["id"] for row in rows] == [best, *others]
+
+    with pytest.raises(ValueError):
+        await db.search_products("spotify", cursor="garbage")
+
+
+@pytest.mark.asyncio
+async def test_ai_context_uses_products_matching_the_question(db, product_factory):
+    for i in range(60):
+        await product_factory(variant_name=f"Filler {i}")
+    await product_factory(variant_name="Steam Gift Card", main_category="Gaming")
+    builder = ProductContextBuilder(db)
+    snapshot = await builder.get_snapshot()
+
+    assert "Steam Gift Card" not in snapshot.product_context
+    context = await builder.context_for("do you sell steam cards?", snapshot)
+    assert context.startswith("AVAILABLE PRODUCTS:\n- Steam Gift Card (Gaming > Default)")
+    assert await builder.context_for("zzz", snapshot) == snapshot.product_context
+
+
+@pytest.mark.asyncio
+async def test_products_page_walks_listing_by_keyset(db, product_factory):
+    for i in range(7):
+        await product_factory(
+            main_category="Social", sub_category="Instagram",
+            service_name="Followers" if i % 2 else "Likes", variant_name=f"{1000 * (i + 1)} Pack",
+        )
+    await product_factory(main_category="Social", sub_category="TikTok", variant_name="1000 Pack")
+    listing = [row["id"] for row in await db.get_products_by_category("Social", "Instagram")]
+
+    rows, total = await db.get_products_page("Social", "Instagram", limit=3)
+    pages = [[row["id"] for row in rows]]
+    while len(pages) < 3:
+        rows, total = await db.get_products_page("Social", "Instagram", after_id=pages[-1][-1], limit=3)
+        pages.append([row["id"] for row in rows])
+    assert total == 7
+    assert [pid for page in pages for pid in page] == listing
+
+    rows, _ = await db.get_products_page("Social", "Instagram", before_id=pages[2][0], limit=3)
+    assert [row["id"] for row in rows] == pages[1]
+    assert await db.get_products_page("Social", "Instagram", after_id=listing[-1], limit=3) == ([], 7)
+
+    rows, total = await db.get_products_page("Social", "Instagram", name_query="3000", limit=3)
+    assert total == 1 and rows[0]["variant_name"] == "3000 Pack"
+    db._has_search_index = False
+    rows, total = await db.get_products_page("Social", "Instagram", name_query="000 pack", limit=10)
+    assert total == 7 and [row["id"] for row in rows] == listing
+
+    cursor = await db._connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM products WHERE main_category = ? AND sub_category = ? "
+        "AND is_active = 1 ORDER BY service_name, variant_name, id",
+        ("Social", "Instagram"),
+    )
+    assert "idx_products_category_listing" in " ".join(row["detail"] for row in await cursor.fetchall())
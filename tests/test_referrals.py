@@ -311,3 +311,100 @@ async def test_get_referrer_for_user_returns_assignment(tmp_path):
         assert result == referrer_id
     finally:
         await db.close()
+
+
+@pytest.mark.asyncio
+async def test_pay_referral_cashbacks_is_one_atomic_batch(tmp_path):
+    """Balances, ledger rows and paid markers are written together or not at all."""
+    db = Database(tmp_path / "test.db")
+    await db.connect()
+
+    try:
+        for user_id in (100, 101, 102, 200, 201, 300, 301):
+            await db.ensure_user(user_id)
+        await db.update_wallet_balance(100, 1_000)
+        for referrer, referred, spend in ((100, 101, 10000), (100, 102, 20000), (200, 201, 10000), (300, 301, 10000)):
+            await db.create_referral(referrer, referred)
+            await db.log_referral_purchase(referred, referred, spend)
+        await db.blacklist_referral_user(300)
+
+        # A failing ledger insert rolls back the whole batch
+        await db._connection.execute(
+            "CREATE TEMP TRIGGER fail_ledger BEFORE INSERT ON wallet_transactions "
+            "BEGIN SELECT RAISE(ABORT, 'ledger unavailable'); END"
+        )
+        with pytest.raises(Exception, match="ledger unavailable"):
+            await db.pay_referral_cashbacks("BATCH-1")
+        await db._connection.execute("DROP TRIGGER fail_ledger")
+        assert (await db.get_user(100))["wallet_balance_cents"] == 1_000
+        assert len(await db.get_all_pending_referral_cashbacks()) == 2
+
+        assert await db.pay_referral_cashbacks("BATCH-2", referrer_ids=[200]) == [
+            {"referrer_id": 200, "amount_cents": 50, "referral_count": 1, "balance_after_cents": 50}
+        ]
+        payouts = await db.pay_referral_cashbacks("BATCH-3")
+        assert payouts == [
+            {"referrer_id": 100, "amount_cents": 150, "referral_count": 2, "balance_after_cents": 1_150}
+        ]
+        assert await db.pay_referral_cashbacks("BATCH-4") == []
+        assert await db.get_all_pending_referral_cashbacks() == []
+
+        cursor = await db._connection.execute(
+            "SELECT user_discord_id, amount_cents, balance_after_cents, description, metadata "
+            "FROM wallet_transactions WHERE transaction_type = 'referral_cashback' ORDER BY id"
+        )
+        rows = [tuple(row) for row in await cursor.fetchall()]
+        assert rows == [
+            (200, 50, 50, "Referral cashback - 1 active referrals", '{"batch_id":"BATCH-2","referral_count":1}'),
+            (100, 150, 1_150, "Referral cashback - 2 active referrals", '{"batch_id":"BATCH-3","referral_count":2}'),
+        ]
+        assert (await db.get_user(300))["wallet_balance_cents"] == 0
+
+    finally:
+        await db.close()
+
+
+@pytest.mark.asyncio
+async def test_purchase_accrues_referral_cashback_in_same_transaction(db, user_factory, product_factory):
+    """Cashback is written with the order, or rolled back with it."""
+    referrer, buyer, stranger = 500, await user_factory(501, balance=100_000), await user_factory(502, balance=100_000)
+    product_id = await product_factory(price_cents=20_000)
+
+    # Non-referred buyers are answered from the cached set
+    await db.purchase_product(
+        user_discord_id=stranger, product_id=product_id, price_paid_cents=20_000, discount_applied_percent=0
+    )
+    assert db._referred_users == set()
+
+    # A referral created after the set was loaded is picked up
+    await db.create_referral(referrer, buyer)
+    await db.purchase_product(
+        user_discord_id=buyer, product_id=product_id, price_paid_cents=20_000, discount_applied_percent=0
+    )
+    await db.create_manual_order(user_discord_id=buyer, product_name="Custom", price_paid_cents=10_000)
+    stats = await db.get_referral_stats(referrer)
+    assert (stats["total_spend_cents"], stats["total_earned_cents"]) == (30_000, 150)
+
+    await db._connection.execute(
+        "CREATE TEMP TRIGGER fail_referral BEFORE UPDATE ON referrals "
+        "BEGIN SELECT RAISE(ABORT, 'referrals unavailable'); END"
+    )
+    with pytest.raises(Exception, match="referrals unavailable"):
+        await db.purchase_product(
+            user_discord_id=buyer, product_id=product_id, price_paid_cents=20_000, discount_applied_percent=0
+        )
+    await db._connection.execute("DROP TRIGGER fail_referral")
+    assert (await db.get_user(buyer))["wallet_balance_cents"] == 80_000
+    cursor = await db._connection.execute("SELECT COUNT(*) FROM orders WHERE user_discord_id = ?", (buyer,))
+    assert (await cursor.fetchone())[0] == 2
+
+    # Blacklisted referrals stop accruing
+    await db.blacklist_referral_user(referrer)
+    await db.purchase_product(
+        user_discord_id=buyer, product_id=product_id, price_paid_cents=20_000, discount_applied_percent=0
+    )
+    cursor = await db._connection.execute(
+        "SELECT cashback_earned_cents FROM referrals WHERE referred_user_id = ?", (buyer,)
+    )
+    assert (await cursor.fetchone())[0] == 150
+    assert buyer not in db._referred_users
@@ -0,0 +1,127 @@
+"""Tests for single-edit role updates and guild-wide role reconciliation."""
+
+import discord
+import pytest
+
+from apex_core.utils.roles import EditPacer, reconcile_guild_roles, update_user_roles
+
+
+class FakeRole:
+    def __init__(self, role_id: int, default: bool = False) -> None:
+        self.id = role_id
+        self._default = default
+
+    def is_default(self) -> bool:
+        return self._default
+
+
+class FakeGuild:
+    def __init__(self, role_ids) -> None:
+        self.id = 1
+        self.roles = {role_id: FakeRole(role_id) for role_id in role_ids}
+        self.everyone = FakeRole(1, default=True)
+        self.members = {}
+        self.rate_limited_edits = 0
+
+    def get_role(self, role_id):
+        return self.roles.get(role_id)
+
+    def get_member(self, member_id):
+        return self.members.get(member_id)
+
+    def add_member(self, member_id, *role_ids):
+        member = FakeMember(member_id, self, [self.everyone, *(self.roles[r] for r in role_ids)])
+        self.members[member_id] = member
+        return member
+
+
+class FakeMember:
+    def __init__(self, member_id, guild, roles) -> None:
+        self.id = member_id
+        self.guild = guild
+        self.roles = roles
+        self.edits = []
+
+    async def edit(self, *, roles, reason=None):
+        if self.guild.rate_limited_edits:
+            self.guild.rate_limited_edits -= 1
+            response = type("Response", (), {"status": 429, "reason": "Too Many Requests"})()
+            raise discord.HTTPException(response, "rate limited")
+        self.edits.append(reason)
+        self.roles = [self.guild.everyone, *roles]
+
+
+def _role_ids(member):
+    return sorted(role.id for role in member.roles if not role.is_default())
+
+
+@pytest.mark.asyncio
+async def test_update_user_roles_makes_one_edit(sample_config, sample_roles):
+    client, vip, elite, donor = sample_roles
+    guild = FakeGuild([1001, 1002, 1003, 1004, 555])
+    member = guild.add_member(42, 1001, 1004, 555)
+
+    added, removed = await update_user_roles(member, [client, vip, elite], sample_config)
+
+    assert added == [vip, elite] and removed == [donor]
+    assert member.edits == ["Role sync: +Apex VIP, +Apex Elite, -Legendary Donor"]
+    assert _role_ids(member) == [555, 1001, 1002, 1003]
+
+    assert await update_user_roles(member, [client, vip, elite], sample_config) == ([], [])
+    assert len(member.edits) == 1
+
+
+@pytest.mark.asyncio
+async def test_update_user_roles_keeps_roles_granted_during_the_pacer_wait(sample_config, sample_roles):
+    client, vip, elite, donor = sample_roles
+    guild = FakeGuild([1001, 1002, 1003, 1004, 555, 777])
+    member = guild.add_member(42, 1004, 555)
+
+    async def grant_while_waiting(seconds):
+        member.roles = [*member.roles, guild.roles[777]]
+
+    pacer = EditPacer(2.0, sleep=grant_while_waiting, clock=lambda: 0.0)
+    # Another member's edit takes the current slot, so this one has to wait
+    other = guild.add_member(43)
+    await pacer.run(lambda: other.edit(roles=[], reason="other"))
+
+    added, removed = await update_user_roles(member, [client, vip], sample_config, pacer=pacer)
+
+    assert added == [client, vip] and removed == [donor]
+    assert _role_ids(member) == [555, 777, 1001, 1002]
+
+
+@pytest.mark.asyncio
+async def test_reconcile_applies_only_diffs_with_pacing(db, sample_config, user_factory):
+    guild = FakeGuild([1001, 1002, 1003, 1004])
+    for discord_id, spent in ((100, 0), (101, 6_000), (102, 25_000)):
+        await user_factory(discord_id)
+        await db._connection.execute(
+            "UPDATE users SET total_lifetime_spent_cents = ? WHERE discord_id = ?", (spent, discord_id)
+        )
+    await db._connection.commit()
+    await db.add_manually_assigned_role(101, "Legendary Donor")
+
+    in_sync = guild.add_member(100, 1001)
+    promoted = guild.add_member(101)
+    demoted = guild.add_member(102, 1001, 1002, 1003, 1004)
+
+    sleeps = []
+    now = [0.0]
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    guild.rate_limited_edits = 1
+    pacer = EditPacer(2.0, sleep=fake_sleep, clock=lambda: now[0])
+
+    result = await reconcile_guild_roles(db, guild, sample_config, pacer=pacer)
+
+    assert (result.members_checked, result.members_updated, result.roles_added, result.roles_removed) == (3, 2, 3, 1)
+    assert in_sync.edits == []
+    assert _role_ids(promoted) == [1001, 1002, 1004]
+    assert _role_ids(demoted) == [1001, 1002, 1003]
+    # The 429 backs off, then the second edit waits for its slot
+    assert sleeps == [4.0, 2.0]
+    assert (await db.get_user(101))["has_client_role"] == 1
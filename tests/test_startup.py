@@ -0,0 +1,94 @@
+"""Tests for startup profiling, lazy optional imports and command tree sync."""
+
+import json
+from unittest.mock import AsyncMock
+
+import discord
+import pytest
+from discord import app_commands
+
+from apex_core.lazy_import import is_available, optional_import
+from apex_core.startup import StartupProfiler, command_tree_hash, sync_command_tree
+
+
+def _tree() -> app_commands.CommandTree:
+    tree = app_commands.CommandTree(discord.Client(intents=discord.Intents.none()))
+
+    @tree.command(name="balance", description="Show your balance")
+    async def balance(interaction: discord.Interaction) -> None:
+        pass
+
+    tree.sync = AsyncMock(return_value=[])
+    return tree
+
+
+def test_lazy_import_checks_without_importing():
+    assert is_available("json") is True
+    assert is_available("definitely_not_installed_sdk") is False
+    assert is_available("definitely_missing_pkg.submodule") is False
+    assert optional_import("definitely_not_installed_sdk") is None
+    assert optional_import("json") is json
+
+
+@pytest.mark.asyncio
+async def test_sync_only_when_command_signatures_change(tmp_path):
+    state_path = tmp_path / "command_tree_hashes.json"
+    tree = _tree()
+
+    assert await sync_command_tree(tree, [111, 222], state_path) == [111, 222]
+    assert tree.sync.await_count == 2
+
+    assert await sync_command_tree(tree, [111, 222], state_path) == []
+    assert tree.sync.await_count == 2
+
+    @tree.command(name="deposit", description="Deposit funds")
+    @app_commands.describe(amount="Amount in USD")
+    async def deposit(interaction: discord.Interaction, amount: float) -> None:
+        pass
+
+    assert await sync_command_tree(tree, [111, 222, 333], state_path) == [111, 222, 333]
+    assert await sync_command_tree(tree, [111], state_path, force=True) == [111]
+    assert set(json.loads(state_path.read_text())) == {"111", "222", "333"}
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_is_retried_next_start(tmp_path):
+    state_path = tmp_path / "command_tree_hashes.json"
+    tree = _tree()
+    tree.sync.side_effect = discord.HTTPException(AsyncMock(status=500, reason="boom"), "boom")
+
+    with pytest.raises(discord.HTTPException):
+        await sync_command_tree(tree, [111], state_path)
+    assert not state_path.exists()
+
+    tree.sync.side_effect = None
+    assert await sync_command_tree(tree, [111], state_path) == [111]
+
+
+def test_command_tree_hash_tracks_option_changes():
+    tree = _tree()
+    guild = discord.Object(id=1)
+    tree.copy_global_to(guild=guild)
+    before = command_tree_hash(tree, guild)
+    assert command_tree_hash(tree, guild) == before
+
+    tree.get_command("balance", guild=guild).description = "Show your wallet balance"
+    assert command_tree_hash(tree, guild) != before
+
+
+def test_profiler_splits_import_and_setup_per_extension():
+    profiler = StartupProfiler(enabled=True)
+    with profiler.phase("extensions"):
+        with profiler.extension("cogs.fast"):
+            profiler.cog_setup_started()
+        with pytest.raises(RuntimeError):
+            with profiler.extension("cogs.broken"):
+                raise RuntimeError("import failed")
+    profiler.mark_ready()
+
+    fast, broken = profiler.extensions
+    assert fast.name == "cogs.fast" and not fast.failed
+    assert broken.failed and broken.setup_seconds == 0.0
+    report = profiler.report()
+    assert "time to ready" in report
+    assert "cogs.broken" in report and "(failed)" in report
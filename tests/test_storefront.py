@@ -1,8 +1,27 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 import discord
-
-from cogs.storefront import _build_payment_embed, _validate_payment_method, _safe_get_metadata
+from discord.ui.view import ViewStore
+
+from benchmarks.fakes import FakeBot, FakeInteraction, FakeMember
+from cogs.storefront import (
+    STOREFRONT_DYNAMIC_ITEMS,
+    CategorySelectView,
+    OpenTicketButton,
+    PaymentOptionsView,
+    ProductActionView,
+    ProductDisplayView,
+    ProductSelect,
+    SearchResultsView,
+    StorefrontCog,
+    SubCategorySelectView,
+    VariantSelect,
+    WalletPaymentButton,
+    _build_payment_embed,
+    _safe_get_metadata,
+    _validate_payment_method,
+    _variant_options,
+)
 from apex_core.config import PaymentMethod
 
 
@@ -34,6 +53,146 @@ async def test_get_products_by_category_filters_inactive_entries(db, product_fac
     assert "Legacy" not in names
 
 
+@pytest.mark.asyncio
+async def test_get_sub_category_anchors_returns_one_product_per_sub_category(db, product_factory):
+    likes = await product_factory(main_category="TikTok", sub_category="Likes")
+    followers = await product_factory(main_category="TikTok", sub_category="Followers")
+    await product_factory(main_category="TikTok", sub_category="Likes")
+    hidden = await product_factory(main_category="TikTok", sub_category="Views")
+    await db._connection.execute("UPDATE products SET is_active = 0 WHERE id = ?", (hidden,))
+    await db._connection.commit()
+
+    assert await db.get_sub_category_anchors("TikTok") == [("Followers", followers), ("Likes", likes)]
+
+
+def _storefront_views() -> list[discord.ui.View]:
+    products = [
+        {"id": 40 + i, "variant_name": f"{1000 * (i + 1)} Followers", "price_cents": 500 + i}
+        for i in range(3)
+    ]
+    wallet = PaymentMethod(name="Wallet", instructions="Pay", emoji="💳", metadata={"type": "internal"})
+    crypto = PaymentMethod(
+        name="Crypto", instructions="Send", emoji="₿",
+        metadata={"type": "custom_networks", "networks": ["Bitcoin"]},
+    )
+    return [
+        CategorySelectView([f"Category {i}" for i in range(30)], page=1),
+        SubCategorySelectView([("Followers", 41), ("Likes", 40)]),
+        ProductDisplayView(_variant_options(products), page=2, total_pages=3, quantity_filter="1000: fast"),
+        ProductDisplayView([], anchor_id=40),
+        PaymentOptionsView(41, 450, 1000, [wallet, crypto], promo_code="SUMMER25", promo_discount_cents=50),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_storefront_components_keep_state_in_custom_ids():
+    store = ViewStore(state=None)
+    store.add_dynamic_items(*STOREFRONT_DYNAMIC_ITEMS)
+    interaction = Mock()
+
+    for message_id, view in enumerate(_storefront_views()):
+        # Nothing is kept per message once a view is sent
+        store.add_view(view, message_id)
+        assert store._views == {} and store._synced_message_views == {}
+
+        for child in view.children:
+            factories = [
+                factory for factory in STOREFRONT_DYNAMIC_ITEMS
+                if factory.__discord_ui_compiled_template__.fullmatch(child.custom_id)
+            ]
+            assert factories == [type(child)], child.custom_id
+            match = type(child).__discord_ui_compiled_template__.fullmatch(child.custom_id)
+            rebuilt = await type(child).from_custom_id(interaction, child.item, match)
+            assert rebuilt.to_component_dict() == child.to_component_dict()
+
+
+@pytest.mark.asyncio
+async def test_variant_select_points_ticket_button_at_selection():
+    products = [{"id": 70 + i, "variant_name": f"Variant {i}", "price_cents": 100} for i in range(3)]
+    view = ProductDisplayView(_variant_options(products), page=1, total_pages=2, quantity_filter="500")
+    select = next(child for child in view.children if isinstance(child, VariantSelect))
+    ticket = next(child for child in view.children if isinstance(child, OpenTicketButton))
+    assert ticket.product_id == 70
+
+    match = VariantSelect.__discord_ui_compiled_template__.fullmatch(select.custom_id)
+    clicked = await VariantSelect.from_custom_id(Mock(), select.item, match)
+    clicked.item._values = ["72"]
+    interaction = Mock()
+    interaction.response.edit_message = AsyncMock()
+    await clicked.callback(interaction)
+
+    new_view = interaction.response.edit_message.await_args.kwargs["view"]
+    assert [child.custom_id for child in new_view.children] == [
+        "storefront:variant:1:2:500",
+        "storefront:open_ticket:72",
+        "storefront:page:next:2:72:500",
+        "storefront:filter:70",
+    ]
+    assert [option.default for option in new_view.children[0].item.options] == [False, False, True]
+
+
+@pytest.mark.asyncio
+async def test_search_result_opens_product_details(db, product_factory, sample_config):
+    product_id = await product_factory(
+        service_name="Netflix", variant_name="Premium 1 Month", price_cents=1_500,
+        additional_info=None,
+    )
+    await db.update_product_stock(product_id, 3)
+    bot = FakeBot(db, sample_config)
+    await bot.add_cog(StorefrontCog(bot))
+    product = dict(await db.get_product(product_id))
+    view = SearchResultsView("netflix", [product], {product_id: (1_500, 0.0)}, None)
+    select = next(child for child in view.children if isinstance(child, ProductSelect))
+
+    interaction = FakeInteraction(bot, FakeMember(5150))
+    select._values = [str(product_id)]
+    await select.callback(interaction)
+
+    ((kind, payload),) = interaction.response.calls
+    assert kind == "send_message"
+    assert payload["embed"].title == "📦 Premium 1 Month"
+    assert "🟡 3 left" in [field.value for field in payload["embed"].fields]
+    assert isinstance(payload["view"], ProductActionView)
+    await bot.close()
+
+
+@pytest.mark.asyncio
+async def test_wallet_payment_refuses_a_stale_quote(db, user_factory, product_factory, sample_config):
+    product_id = await product_factory(price_cents=1_000)
+    await user_factory(7070, balance=5_000)
+    await db.create_promo_code(
+        code="SAVE2", code_type="fixed_amount", discount_value=2.0, created_by_staff_id=1
+    )
+    bot = FakeBot(db, sample_config)
+    await bot.add_cog(StorefrontCog(bot))
+    quote = WalletPaymentButton(product_id, 800, True, promo_code="SAVE2", promo_discount_cents=200)
+
+    async def pay(button: WalletPaymentButton) -> str:
+        interaction = FakeInteraction(bot, FakeMember(7070))
+        with patch("bot.ApexCoreBot", FakeBot), patch(
+            "cogs.storefront.enforce_interaction_rate_limit", AsyncMock(return_value=True)
+        ):
+            await button.callback(interaction)
+        sent = interaction.followup.sent[0]
+        return sent["content"] or sent["embed"].title
+
+    await db._connection.execute("UPDATE products SET price_cents = 1200 WHERE id = ?", (product_id,))
+    await db._connection.commit()
+    assert (await pay(quote)).startswith("Price has changed")
+
+    await db._connection.execute("UPDATE products SET price_cents = 1000 WHERE id = ?", (product_id,))
+    await db._connection.execute("UPDATE promo_codes SET is_active = 0 WHERE code = 'SAVE2'")
+    await db._connection.commit()
+    assert (await pay(quote)).startswith("Price has changed")
+    assert (await db.get_user(7070))["wallet_balance_cents"] == 5_000
+
+    await db._connection.execute("UPDATE promo_codes SET is_active = 1 WHERE code = 'SAVE2'")
+    await db._connection.commit()
+    assert await pay(quote) == "Payment Confirmed!"
+    assert (await db.get_user(7070))["wallet_balance_cents"] == 4_200
+    await bot.close()
+
+
 @pytest.mark.asyncio
 async def test_bulk_upsert_products_tracks_counts(db):
     products_to_add = [